@@ -1,10 +1,22 @@
-import pandas as pd
 import os
-from datetime import datetime
+import re
+import sys
+from collections.abc import Mapping
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+# Solo la tabla de pruebas se importa al arrancar: los módulos de
+# herramientas_red que usan NumPy o pandas se importan en cada opción
+from herramientas_red.tablas import FilasVista, TablaColumnar
+
+COLUMNAS_DIRECCIONES = ["Dispositivo", "Interfaz", "Dirección IP", "Máscara de subred", "Puerta de enlace predeterminada"]
+COLUMNAS_PRUEBAS = ["Prueba", "¿Se realizó correctamente?", "Problemas", "Solución", "Verificado"]
+
+# "PC1 a PC2"
+PRUEBA = re.compile(r'^\s*(.+?)\s+a\s+(.+?)\s*$')
 
 class NetworkTablesGenerator:
     def __init__(self):
-        self.address_data = [
+        address_data = [
             {"Dispositivo": "R1", "Interfaz": "G0/0", "Dirección IP": "192.168.10.1", "Máscara de subred": "255.255.255.0", "Puerta de enlace predeterminada": "N/A"},
             {"Dispositivo": "R1", "Interfaz": "G0/1", "Dirección IP": "192.168.11.1", "Máscara de subred": "255.255.255.0", "Puerta de enlace predeterminada": "N/A"},
             {"Dispositivo": "S1", "Interfaz": "VLAN 1", "Dirección IP": "192.168.10.2", "Máscara de subred": "255.255.255.0", "Puerta de enlace predeterminada": ""},
@@ -15,18 +27,83 @@ class NetworkTablesGenerator:
             {"Dispositivo": "PC4", "Interfaz": "NIC", "Dirección IP": "192.168.11.11", "Máscara de subred": "255.255.255.0", "Puerta de enlace predeterminada": ""}
         ]
         
-        self.test_data = [
+        test_data = [
             {"Prueba": "PC1 a PC2", "¿Se realizó correctamente?": "No", "Problemas": "Dirección IP en la PC1", "Solución": "Cambiar la dirección IP de la PC1", "Verificado": ""},
             {"Prueba": "PC1 a S1", "¿Se realizó correctamente?": "", "Problemas": "", "Solución": "", "Verificado": ""},
             {"Prueba": "PC1 a R1", "¿Se realizó correctamente?": "", "Problemas": "", "Solución": "", "Verificado": ""},
             {"Prueba": "", "¿Se realizó correctamente?": "", "Problemas": "", "Solución": "", "Verificado": ""},
             {"Prueba": "", "¿Se realizó correctamente?": "", "Problemas": "", "Solución": "", "Verificado": ""}
         ]
+        
+        # Las tablas se guardan por columnas; los DataFrames se arman al pedirlos
+        self._direcciones = self._address_table(address_data)
+        self._pruebas = TablaColumnar(COLUMNAS_PRUEBAS, test_data)
+        
+        # Exportaciones incrementales por archivo: recuerdan qué se escribió
+        self._exportaciones = {}
+        
+        # Rutas de los routers para revisar gateways sueltos: se descartan
+        # cuando cambian las filas de router o se carga otra tabla
+        self._rutas = None
+
+    @staticmethod
+    def _address_table(filas=()):
+        """Tabla de direcciones con índices para buscar por dispositivo o por (dispositivo, interfaz)"""
+        from herramientas_red.registros import TablaDirecciones
+
+        tabla = TablaDirecciones(COLUMNAS_DIRECCIONES, filas)
+        tabla.indexar("Dispositivo")
+        tabla.indexar("Dispositivo", "Interfaz")
+        return tabla
+
+    @staticmethod
+    def _rows(filas):
+        # Las filas de una FilasVista se copian antes de rearmar la tabla que leen
+        return [dict(fila) if isinstance(fila, Mapping) else fila for fila in filas]
+
+    def _address_changed(self):
+        self._rutas = None
+
+    @property
+    def address_data(self):
+        """
+        Filas de la tabla de direcciones como lista de dicts: leer, asignar y
+        agregar pasan directo a la tabla
+        """
+        return FilasVista(self._direcciones, self._replace_addresses, self._address_changed)
+
+    @address_data.setter
+    def address_data(self, filas):
+        self._replace_addresses(filas)
+
+    def _replace_addresses(self, filas):
+        self._direcciones = self._address_table(self._rows(filas))
+        self._rutas = None
+
+    @property
+    def test_data(self):
+        """Filas de la tabla de pruebas como lista de dicts, igual que address_data"""
+        return FilasVista(self._pruebas, self._replace_tests)
+
+    @test_data.setter
+    def test_data(self, filas):
+        self._replace_tests(filas)
+
+    def _replace_tests(self, filas):
+        self._pruebas = TablaColumnar(COLUMNAS_PRUEBAS, self._rows(filas))
+
+    @property
+    def df_address(self):
+        """Copia de la tabla de direcciones como DataFrame (cambiarla no cambia la tabla)"""
+        return self._direcciones.a_dataframe().copy()
+
+    @property
+    def df_test(self):
+        """Copia de la tabla de pruebas como DataFrame (cambiarla no cambia la tabla)"""
+        return self._pruebas.a_dataframe().copy()
 
     def create_dataframes(self):
         """Crea los DataFrames de pandas para ambas tablas"""
-        self.df_address = pd.DataFrame(self.address_data)
-        self.df_test = pd.DataFrame(self.test_data)
         return self.df_address, self.df_test
 
     def display_tables(self):
@@ -34,63 +111,69 @@ class NetworkTablesGenerator:
         print("=" * 80)
         print("TABLA DE ASIGNACIÓN DE DIRECCIONES")
         print("=" * 80)
-        print(self.df_address.to_string(index=False))
+        print(self._direcciones.a_dataframe().to_string(index=False))
         
         print("\n" + "=" * 80)
         print("TABLA DE PRUEBAS DE CONECTIVIDAD")
         print("=" * 80)
-        print(self.df_test.to_string(index=False))
+        print(self._pruebas.a_dataframe().to_string(index=False))
 
-    def export_to_excel(self, filename=None):
-        """Exporta ambas tablas a un archivo Excel con múltiples hojas"""
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"tablas_red_{timestamp}.xlsx"
-        
+    def _seccion(self, tabla):
+        """Tabla columnar como sección exportable, sin pasar por un DataFrame"""
+        from herramientas_red.exportacion import Seccion
+
+        return Seccion([[tabla.columna(columna) for columna in tabla.columnas]],
+                       encabezados=tabla.columnas, estilo_encabezado='encabezado_verde')
+
+    def _tablas_hojas(self):
+        """(nombre de hoja, tabla, anchos de columna) de cada tabla"""
+        anchos_direcciones = [max(len(columna), 15) for columna in COLUMNAS_DIRECCIONES]
+        # Más ancho para problemas y solución
+        anchos_pruebas = [30 if numero in (2, 3) else max(len(columna), 15)
+                          for numero, columna in enumerate(COLUMNAS_PRUEBAS)]
+        return [
+            ('Asignación_Direcciones', self._direcciones, anchos_direcciones),
+            ('Pruebas_Conectividad', self._pruebas, anchos_pruebas),
+        ]
+
+    def _hojas(self):
+        """Hojas de exportación con los anchos de columna de cada tabla"""
+        from herramientas_red.exportacion import Hoja
+
+        return [Hoja(nombre, [self._seccion(tabla)], anchos) for nombre, tabla, anchos in self._tablas_hojas()]
+
+    def _exportacion(self, clase, archivo, *opciones):
+        """Exportación incremental de un archivo (se crea la primera vez)"""
+        clave = os.path.abspath(archivo)
+        if not isinstance(self._exportaciones.get(clave), clase):
+            self._exportaciones[clave] = clase(archivo, *opciones)
+        return self._exportaciones[clave]
+
+    def export_to_excel(self, filename="tablas_red.xlsx", backend=None):
+        """
+        Exporta ambas tablas a un archivo Excel con múltiples hojas. Sin
+        backend la exportación es incremental: se rearma solo lo que cambió
+        desde la última exportación a ese archivo y se anota en
+        <archivo>.cambios.csv. Con un backend se escribe todo de nuevo.
+        """
         try:
-            with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
-                # Escribir las tablas en hojas separadas
-                self.df_address.to_excel(writer, sheet_name='Asignación_Direcciones', index=False)
-                self.df_test.to_excel(writer, sheet_name='Pruebas_Conectividad', index=False)
-                
-                # Obtener el workbook y worksheets para formateo
-                workbook = writer.book
-                worksheet1 = writer.sheets['Asignación_Direcciones']
-                worksheet2 = writer.sheets['Pruebas_Conectividad']
-                
-                # Crear formatos
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'top',
-                    'fg_color': '#D7E4BC',
-                    'border': 1
-                })
-                
-                cell_format = workbook.add_format({
-                    'text_wrap': True,
-                    'valign': 'top',
-                    'border': 1
-                })
-                
-                # Aplicar formato a la primera hoja
-                for col_num, value in enumerate(self.df_address.columns.values):
-                    worksheet1.write(0, col_num, value, header_format)
-                    # Ajustar ancho de columnas
-                    column_width = max(len(value), 15)
-                    worksheet1.set_column(col_num, col_num, column_width)
-                
-                # Aplicar formato a la segunda hoja
-                for col_num, value in enumerate(self.df_test.columns.values):
-                    worksheet2.write(0, col_num, value, header_format)
-                    # Ajustar ancho de columnas (más ancho para problemas y solución)
-                    if col_num in [2, 3]:  # Columnas de problemas y solución
-                        column_width = 30
-                    else:
-                        column_width = max(len(value), 15)
-                    worksheet2.set_column(col_num, col_num, column_width)
-            
-            print(f"\n✅ Archivo Excel creado exitosamente: {filename}")
+            from herramientas_red.exportacion import exportar
+            from herramientas_red.incremental import ExcelIncremental
+
+            if backend is not None:
+                # Escribir las tablas en hojas separadas (backend: ver exportacion.BACKENDS)
+                exportar(filename, self._hojas(), backend)
+                print(f"\n✅ Archivo Excel creado exitosamente: {filename}")
+                return filename
+            
+            cambios = self._exportacion(ExcelIncremental, filename, 'encabezado_verde').exportar(self._tablas_hojas())
+            if cambios is None:
+                print(f"\n✅ Sin cambios desde la última exportación: {filename}")
+            else:
+                print(f"\n✅ Archivo Excel actualizado: {filename}")
+                for hoja, cambio in cambios.items():
+                    detalle = "completa" if cambio is None else f"{len(cambio[0])} filas nuevas, {len(cambio[1])} modificadas"
+                    print(f"   - {hoja}: {detalle}")
             return filename
             
         except Exception as e:
@@ -98,23 +181,24 @@ class NetworkTablesGenerator:
             return None
 
     def export_to_csv(self, prefix="tabla_red"):
-        """Exporta las tablas a archivos CSV separados"""
+        """
+        Exporta las tablas a archivos CSV separados, de forma incremental: las
+        filas nuevas se agregan al final, el archivo se reescribe desde la
+        primera fila modificada y las modificadas se anotan en <archivo>.cambios.csv
+        """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Exportar tabla de direcciones
-            address_filename = f"{prefix}_direcciones_{timestamp}.csv"
-            self.df_address.to_csv(address_filename, index=False, encoding='utf-8-sig')
-            
-            # Exportar tabla de pruebas
-            test_filename = f"{prefix}_pruebas_{timestamp}.csv"
-            self.df_test.to_csv(test_filename, index=False, encoding='utf-8-sig')
-            
-            print(f"✅ Archivos CSV creados:")
-            print(f"   - {address_filename}")
-            print(f"   - {test_filename}")
+            from herramientas_red.incremental import CsvIncremental
+
+            archivos = []
+            print(f"✅ Archivos CSV actualizados:")
+            for tabla, nombre in ((self._direcciones, "direcciones"), (self._pruebas, "pruebas")):
+                archivo = f"{prefix}_{nombre}.csv"
+                cambio = self._exportacion(CsvIncremental, archivo).exportar(tabla)
+                detalle = "completo" if cambio is None else f"{cambio[0]} filas nuevas, {cambio[1]} modificadas"
+                print(f"   - {archivo}: {detalle}")
+                archivos.append(archivo)
             
-            return address_filename, test_filename
+            return tuple(archivos)
             
         except Exception as e:
             print(f"❌ Error al crear los archivos CSV: {e}")
@@ -129,10 +213,17 @@ class NetworkTablesGenerator:
             "Máscara de subred": mascara,
             "Puerta de enlace predeterminada": gateway
         }
-        self.address_data.append(new_device)
-        self.df_address = pd.DataFrame(self.address_data)
+        self._direcciones.append(new_device)
+        self._router_changed(dispositivo, gateway)
         print(f"✅ Dispositivo {dispositivo} agregado exitosamente")
 
+    def add_devices(self, devices):
+        """Agrega varios dispositivos de una vez (dicts o tuplas dispositivo, interfaz, ip, máscara[, gateway])"""
+        agregados = self._direcciones.extend(devices)
+        self._rutas = None
+        print(f"✅ {agregados} dispositivos agregados exitosamente")
+        return agregados
+
     def add_test(self, prueba, realizado="", problemas="", solucion="", verificado=""):
         """Agrega una nueva prueba a la tabla de pruebas"""
         new_test = {
@@ -142,21 +233,283 @@ class NetworkTablesGenerator:
             "Solución": solucion,
             "Verificado": verificado
         }
-        self.test_data.append(new_test)
-        self.df_test = pd.DataFrame(self.test_data)
+        self._pruebas.append(new_test)
         print(f"✅ Prueba '{prueba}' agregada exitosamente")
 
+    def _router_routes(self):
+        """Rutas de las interfaces de router, armadas la primera vez que se piden"""
+        from herramientas_red.validacion import RutasRouters
+
+        if self._rutas is None:
+            self._rutas = RutasRouters(self._direcciones)
+        return self._rutas
+
+    def _router_changed(self, dispositivo, gateway):
+        """Descarta las rutas guardadas si el dispositivo es (o era) un router"""
+        from herramientas_red.validacion import es_router
+
+        if self._rutas is not None and (es_router(dispositivo, gateway) or dispositivo in self._rutas.dispositivos):
+            self._rutas = None
+
     def update_gateway(self, dispositivo, gateway):
-        """Actualiza el gateway de un dispositivo específico"""
-        for item in self.address_data:
-            if item["Dispositivo"] == dispositivo:
-                item["Puerta de enlace predeterminada"] = gateway
-                print(f"✅ Gateway actualizado para {dispositivo}: {gateway}")
-                break
-        else:
+        """Actualiza el gateway de todas las interfaces de un dispositivo específico"""
+        posiciones = self._direcciones.buscar(("Dispositivo",), dispositivo)
+        if not posiciones:
             print(f"❌ Dispositivo {dispositivo} no encontrado")
+            return 0
+        
+        for posicion in posiciones:
+            self._direcciones.asignar(posicion, "Puerta de enlace predeterminada", gateway)
+        self._router_changed(dispositivo, gateway)
+        print(f"✅ Gateway actualizado para {dispositivo}: {gateway}")
+        # Se guarda igual, pero se avisa si ningún router responde en esa
+        # dirección: solo se busca el gateway y las IP del dispositivo en el trie
+        rutas = self._router_routes()
+        if dispositivo not in rutas.dispositivos:
+            ips = [self._direcciones.valor(posicion, "Dirección IP") for posicion in posiciones]
+            etiquetas = [f"{dispositivo} {self._direcciones.valor(posicion, 'Interfaz')}".strip()
+                         for posicion in posiciones]
+            for conflicto in rutas.revisar(gateway, ips, etiquetas):
+                print(f"❌ {conflicto['Tipo']}: {conflicto['Detalle']}")
+        return len(posiciones)
+
+    def update_gateways(self, mapping):
+        """
+        Actualiza gateways en bloque. Las claves pueden ser un nombre de
+        dispositivo (todas sus interfaces) o una tupla (dispositivo, interfaz).
+        """
+        actualizadas = 0
+        no_encontrados = []
+        for clave, gateway in mapping.items():
+            if isinstance(clave, tuple):
+                posiciones = self._direcciones.buscar(("Dispositivo", "Interfaz"), clave)
+            else:
+                posiciones = self._direcciones.buscar(("Dispositivo",), clave)
+            if not posiciones:
+                no_encontrados.append(clave)
+            for posicion in posiciones:
+                self._direcciones.asignar(posicion, "Puerta de enlace predeterminada", gateway)
+            actualizadas += len(posiciones)
+        self._rutas = None
+        
+        print(f"✅ Gateway actualizado en {actualizadas} interfaces")
+        if no_encontrados:
+            print(f"❌ No encontrados: {', '.join(map(str, no_encontrados))}")
+        return actualizadas
+
+    def validate_gateways(self):
+        """
+        Revisa que cada gateway sea la IP de la interfaz de router que atiende
+        la subred del host (búsqueda del prefijo más largo, IPv4 e IPv6)
+        """
+        from herramientas_red.validacion import validar_gateways_tabla
+
+        conflictos = validar_gateways_tabla(self._direcciones)
+        if not conflictos:
+            print("✅ Todos los gateways corresponden a una interfaz de router")
+        for conflicto in conflictos:
+            print(f"❌ {conflicto['Tipo']}: {conflicto['Dirección']} ({conflicto['Filas']}) - {conflicto['Detalle']}")
+        return conflictos
+
+    def _connectivity(self):
+        from herramientas_red.conectividad import Conectividad
+
+        direcciones = self._direcciones
+        return Conectividad(
+            direcciones.columna("Dirección IP"), direcciones.columna("Máscara de subred"),
+            direcciones.columna("Puerta de enlace predeterminada"), direcciones.columna("Dispositivo"),
+            direcciones.columna("Interfaz"),
+        )
+
+    def fill_tests(self):
+        """
+        Completa las pruebas "PC1 a PC2" con el resultado calculado desde la
+        tabla de direcciones: si funciona, el problema detectado y la solución
+        """
+        conectividad = self._connectivity()
+        completadas = 0
+        for posicion in range(len(self._pruebas)):
+            coincidencia = PRUEBA.match(self._pruebas.valor(posicion, "Prueba") or "")
+            if not coincidencia:
+                continue
+            exito, problema, solucion = conectividad.probar(*coincidencia.groups())
+            self._pruebas.asignar(posicion, "¿Se realizó correctamente?", "Sí" if exito else "No")
+            self._pruebas.asignar(posicion, "Problemas", problema)
+            self._pruebas.asignar(posicion, "Solución", solucion)
+            completadas += 1
+        print(f"✅ {completadas} pruebas completadas")
+        return completadas
+
+    def connectivity_matrix(self):
+        """
+        DataFrame con el resultado entre cada clase de interfaces (mismo
+        segmento y mismo problema), con la cantidad de interfaces de cada una
+        """
+        import pandas as pd
+        from herramientas_red.conectividad import RESULTADOS
+
+        conectividad = self._connectivity()
+        etiquetas = [conectividad.etiqueta_clase(clase) for clase in range(len(conectividad))]
+        textos = [[RESULTADOS[codigo] for codigo in fila] for fila in conectividad.matriz().tolist()]
+        return pd.DataFrame(textos, index=etiquetas, columns=etiquetas)
+
+    def simulator(self):
+        """Simulador de eventos (ARP, ICMP, TCP, UDP) armado con la tabla de direcciones"""
+        from herramientas_red.simulacion import Simulador
+
+        direcciones = self._direcciones
+        return Simulador(
+            direcciones.columna("Dirección IP"), direcciones.columna("Máscara de subred"),
+            direcciones.columna("Puerta de enlace predeterminada"), direcciones.columna("Dispositivo"),
+            direcciones.columna("Interfaz"),
+        )
+
+    def simulate_ping(self, origen, destino, count=4, protocol="icmp"):
+        """
+        Simula `count` envíos (ping, conexión TCP o datagrama UDP) separados
+        por un segundo y muestra el resultado de cada uno y la tabla ARP del origen
+        """
+        simulador = self.simulator()
+        try:
+            flujos = [simulador.enviar(origen, destino, protocol, tiempo=float(numero)) for numero in range(count)]
+        except ValueError as e:
+            print(f"❌ {e}")
+            return []
+        simulador.ejecutar()
+        resultados = [simulador.resultado(flujo) for flujo in flujos]
+        for numero, (exito, detalle, duracion) in enumerate(resultados, 1):
+            if exito:
+                print(f"✅ {protocol.upper()} {numero} de {origen} a {destino}: {duracion * 1000:.2f} ms")
+            else:
+                print(f"❌ {protocol.upper()} {numero} de {origen} a {destino}: {detalle}")
+        print(f"Tabla ARP de {origen}:")
+        for interfaz, ip, mac in simulador.tabla_arp(origen):
+            print(f"  {interfaz:<10} {ip:<16} {mac}")
+        return resultados
+
+    def export_configs(self, folder="configuraciones", procesos=None):
+        """Escribe la configuración IOS de cada router y switch de la tabla de direcciones"""
+        from herramientas_red.configuracion import escribir_configuraciones
+
+        try:
+            escritos = escribir_configuraciones(self._direcciones, folder, procesos=procesos)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 0
+        print(f"✅ {escritos} configuraciones escritas en {folder}")
+        return escritos
+
+    def load_packet_tracer(self, path, network="respuesta", replace=True):
+        """
+        Carga la tabla de direcciones desde un archivo .pkt/.pka o desde todos
+        los de una carpeta. En un .pka, network elige la red: 'respuesta',
+        'inicial' o 'usuario'. Con replace=False las filas se agregan al final.
+        """
+        from herramientas_red.packet_tracer import leer_arbol
+
+        resultados, errores = leer_arbol(path, red=network)
+        agregadas = self._load_rows(resultados, errores, replace)
+        print(f"✅ {agregadas} interfaces cargadas desde {len(resultados)} archivo(s) de Packet Tracer")
+        return agregadas
+
+    def load_pdf(self, path, replace=True):
+        """
+        Carga la tabla de direcciones desde la "Tabla de direccionamiento" de
+        una guía en PDF o de todas las guías de una carpeta (requiere pdfplumber).
+        """
+        from herramientas_red import pdf_tablas
+
+        try:
+            resultados, errores = pdf_tablas.leer_arbol(path)
+        except ImportError as e:
+            print(f"❌ {e}")
+            return 0
+        agregadas = self._load_rows(resultados, errores, replace)
+        print(f"✅ {agregadas} interfaces cargadas desde {len(resultados)} guía(s) en PDF")
+        return agregadas
+
+    def _load_rows(self, resultados, errores, replace):
+        """Agrega las filas extraídas de cada archivo y avisa de los que fallaron"""
+        from herramientas_red.packet_tracer import filas_como_dicts
+
+        for ruta, error in errores.items():
+            print(f"❌ No se pudo leer {ruta}: {error}")
+        
+        if replace:
+            self._direcciones = self._address_table()
+        self._rutas = None
+        return sum(self._direcciones.extend(filas_como_dicts(filas)) for filas in resultados.values())
+
+    def load_excel(self, filename, replace=True):
+        """
+        Carga las tablas desde un Excel exportado antes; las hojas se
+        reconocen por su encabezado. Con replace=False las filas se agregan al final.
+        """
+        from herramientas_red.diferencias import leer_libro
+
+        try:
+            columnas, filas = leer_libro(filename, COLUMNAS_DIRECCIONES)
+            if replace:
+                self._direcciones = self._address_table()
+            self._rutas = None
+            interfaces = self._direcciones.extend(dict(zip(columnas, fila)) for fila in filas)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"❌ No se pudo leer {filename}: {e}")
+            return 0
         
-        self.df_address = pd.DataFrame(self.address_data)
+        # La hoja de pruebas es opcional
+        pruebas = 0
+        try:
+            columnas, filas = leer_libro(filename, COLUMNAS_PRUEBAS, claves=("Prueba",))
+            if replace:
+                self._pruebas = TablaColumnar(COLUMNAS_PRUEBAS)
+            pruebas = self._pruebas.extend(dict(zip(columnas, fila)) for fila in filas)
+        except ValueError:
+            pass
+        print(f"✅ {interfaces} interfaces y {pruebas} pruebas cargadas desde {filename}")
+        return interfaces
+
+    def compare_excel(self, filename, other=None):
+        """
+        Muestra qué cambió por (dispositivo, interfaz) entre la tabla de
+        direcciones y un Excel exportado, o entre dos Excel si se da other
+        (filename es el anterior). Devuelve las Diferencias.
+        """
+        from herramientas_red.diferencias import comparar_con_libro, comparar_libros, filas_tabla
+
+        try:
+            if other is None:
+                diferencias = comparar_con_libro(
+                    COLUMNAS_DIRECCIONES, filas_tabla(self._direcciones, COLUMNAS_DIRECCIONES), filename
+                )
+            else:
+                diferencias = comparar_libros(filename, other, COLUMNAS_DIRECCIONES)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"❌ No se pudo comparar: {e}")
+            return None
+        
+        resumen = diferencias.resumen()
+        print(f"✅ {resumen['agregadas']} filas agregadas, {resumen['eliminadas']} eliminadas "
+              f"y {resumen['cambiadas']} cambiadas en {other or filename}")
+        for linea in diferencias.describir():
+            print(linea)
+        return diferencias
+
+    def merge_excel(self, filename, remove=True, differences=None):
+        """
+        Trae a la tabla de direcciones lo que cambió en un Excel: agrega sus
+        filas nuevas, actualiza las cambiadas y, con remove, quita las que ya
+        no están. differences son las de compare_excel, para no leerlo de nuevo.
+        """
+        from herramientas_red.diferencias import fusionar
+
+        diferencias = differences if differences is not None else self.compare_excel(filename)
+        if not diferencias:
+            return 0
+        self._direcciones = fusionar(self._direcciones, diferencias, eliminar=remove)
+        self._rutas = None
+        print(f"✅ Cambios de {filename} aplicados a la tabla de direcciones")
+        return len(diferencias)
 
 def main():
     """Función principal - Ejemplo de uso"""
@@ -182,9 +535,17 @@ def main():
         print("4. Exportar a Excel")
         print("5. Exportar a CSV")
         print("6. Mostrar tablas")
-        print("7. Salir")
+        print("7. Cargar direcciones desde Packet Tracer (.pkt/.pka)")
+        print("8. Cargar direcciones desde la guía en PDF")
+        print("9. Validar gateways")
+        print("10. Completar pruebas de conectividad")
+        print("11. Simular ping")
+        print("12. Exportar configuraciones IOS")
+        print("13. Cargar tablas desde Excel")
+        print("14. Comparar y fusionar con un Excel exportado")
+        print("15. Salir")
         
-        opcion = input("\nSelecciona una opción (1-7): ").strip()
+        opcion = input("\nSelecciona una opción (1-15): ").strip()
         
         if opcion == "1":
             dispositivo = input("Dispositivo: ")
@@ -208,10 +569,8 @@ def main():
             generator.update_gateway(dispositivo, gateway)
             
         elif opcion == "4":
-            filename = input("Nombre del archivo (opcional, presiona Enter para auto-generar): ").strip()
-            if not filename:
-                filename = None
-            generator.export_to_excel(filename)
+            filename = input("Nombre del archivo (opcional, presiona Enter para 'tablas_red.xlsx'): ").strip()
+            generator.export_to_excel(filename or "tablas_red.xlsx")
             
         elif opcion == "5":
             prefix = input("Prefijo para archivos (opcional, presiona Enter para 'tabla_red'): ").strip()
@@ -223,6 +582,45 @@ def main():
             generator.display_tables()
             
         elif opcion == "7":
+            ruta = input("Archivo o carpeta: ").strip()
+            generator.load_packet_tracer(ruta)
+            generator.display_tables()
+            
+        elif opcion == "8":
+            ruta = input("Archivo o carpeta: ").strip()
+            generator.load_pdf(ruta)
+            generator.display_tables()
+            
+        elif opcion == "9":
+            generator.validate_gateways()
+            
+        elif opcion == "10":
+            generator.fill_tests()
+            print(generator.connectivity_matrix().to_string())
+            generator.display_tables()
+            
+        elif opcion == "11":
+            origen = input("Origen: ").strip()
+            destino = input("Destino (dispositivo o IP): ").strip()
+            generator.simulate_ping(origen, destino)
+            
+        elif opcion == "12":
+            carpeta = input("Carpeta (opcional, presiona Enter para 'configuraciones'): ").strip()
+            generator.export_configs(carpeta or "configuraciones")
+            
+        elif opcion == "13":
+            archivo = input("Archivo Excel: ").strip()
+            generator.load_excel(archivo)
+            generator.display_tables()
+            
+        elif opcion == "14":
+            archivo = input("Archivo Excel: ").strip()
+            diferencias = generator.compare_excel(archivo)
+            if diferencias and input("¿Aplicar los cambios a la tabla? (s/n): ").strip().lower() == "s":
+                generator.merge_excel(archivo, differences=diferencias)
+                generator.display_tables()
+            
+        elif opcion == "15":
             print("¡Hasta luego! 👋")
             break
             
@@ -230,11 +628,13 @@ def main():
             print("❌ Opción no válida. Intenta de nuevo.")
 
 if __name__ == "__main__":
-    # Verificar si pandas está instalado
+    # Verificar si pandas y NumPy están instalados
     try:
-        import pandas as pd
+        import numpy
+        import pandas
+    except ImportError as e:
+        print(f"❌ Error: {e.name} no está instalado.")
+        print("📦 Instala las dependencias con: pip install pandas numpy")
+        print("📦 Para Excel también instala: pip install xlsxwriter")
+    else:
         main()
-    except ImportError:
-        print("❌ Error: pandas no está instalado.")
-        print("📦 Instala pandas con: pip install pandas")
-        print("📦 Para Excel también instala: pip install xlsxwriter")
\ No newline at end of file
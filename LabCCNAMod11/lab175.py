@@ -1,5 +1,16 @@
+import os
+import sys
+
+import numpy as np
 import pandas as pd
-import ipaddress
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.asignacion import AsignadorHosts, RESERVAS_LAB175, asignar_vectorizado
+from herramientas_red.diferencias import comparar_con_libro, filas_dataframe, fusionar_dataframe, leer_libro
+from herramientas_red.exportacion import Hoja, calcular_anchos, exportar
+from herramientas_red.medicion import etapa
+from herramientas_red.ospf import COLUMNAS_RUTAS, RedOSPF
+from herramientas_red.validacion import validar_tabla
 
 # Crear la estructura base de la tabla
 def crear_tabla_red():
@@ -30,84 +41,70 @@ def crear_tabla_red():
         {'Dispositivo': 'PC4', 'Interfaz': 'NIC', 'Tipo': 'PC'},
     ]
     
-    # Crear DataFrame
-    df = pd.DataFrame(dispositivos)
-    
-    # Agregar columnas vacías para configuración
-    df['Dirección IP'] = ''
-    df['Máscara de subred'] = ''
-    df['Gateway predeterminado'] = ''
+    with etapa('crear_tabla_red', filas=len(dispositivos)):
+        # Crear DataFrame
+        df = pd.DataFrame(dispositivos)
+        
+        # Agregar columnas vacías para configuración
+        df['Dirección IP'] = ''
+        df['Máscara de subred'] = ''
+        df['Gateway predeterminado'] = ''
     
     return df
 
-def asignar_ips_automaticamente(df, red_base="192.168.1.0/24"):
+def asignar_ips_automaticamente(df, red_base="192.168.1.0/24", reservas=RESERVAS_LAB175):
     """
     Asigna direcciones IP automáticamente basado en una red base
     """
-    red = ipaddress.IPv4Network(red_base, strict=False)
-    hosts = list(red.hosts())
-    
-    # Diccionario para asignar IPs por tipo de dispositivo
-    ip_counter = 0
-    
-    for index, row in df.iterrows():
-        dispositivo = row['Dispositivo']
-        tipo = row['Tipo']
+    with etapa('asignar_ips_automaticamente', filas=len(df), red=str(red_base)):
+        # Los hosts se calculan por aritmética entera: no se genera list(red.hosts())
+        asignador = AsignadorHosts(red_base)
+        with etapa('asignar_vectorizado', filas=len(df)):
+            ips, mascaras, gateways = asignar_vectorizado(
+                df['Tipo'].to_numpy(), df['Interfaz'].to_numpy(), asignador, reservas
+            )
         
-        if tipo == 'Router':
-            # Routers usan las primeras IPs
-            if 'G0/0' in row['Interfaz']:
-                df.at[index, 'Dirección IP'] = str(hosts[ip_counter])
-                df.at[index, 'Máscara de subred'] = str(red.netmask)
-                ip_counter += 1
-            elif 'G0/1' in row['Interfaz']:
-                df.at[index, 'Dirección IP'] = str(hosts[ip_counter])
-                df.at[index, 'Máscara de subred'] = str(red.netmask)
-                ip_counter += 1
-            elif 'S0/0/0' in row['Interfaz']:
-                # Interfaces seriales pueden usar otra subred
-                df.at[index, 'Dirección IP'] = f"10.0.0.{ip_counter}"
-                df.at[index, 'Máscara de subred'] = "255.255.255.252"
-                ip_counter += 1
-                
-        elif tipo == 'Switch':
-            # Switches para administración
-            df.at[index, 'Dirección IP'] = str(hosts[ip_counter + 10])
-            df.at[index, 'Máscara de subred'] = str(red.netmask)
-            df.at[index, 'Gateway predeterminado'] = str(hosts[0])  # Primer router
-            
-        elif tipo == 'PC':
-            # PCs usan IPs del final del rango
-            df.at[index, 'Dirección IP'] = str(hosts[ip_counter + 20])
-            df.at[index, 'Máscara de subred'] = str(red.netmask)
-            df.at[index, 'Gateway predeterminado'] = str(hosts[0])  # Primer router
-            ip_counter += 1
+        # Se reemplazan columnas completas; las filas sin reserva conservan su valor
+        asignadas = pd.notna(ips)
+        df['Dirección IP'] = np.where(asignadas, ips, df['Dirección IP'].to_numpy(dtype=object))
+        df['Máscara de subred'] = np.where(asignadas, mascaras, df['Máscara de subred'].to_numpy(dtype=object))
+        df['Gateway predeterminado'] = np.where(  # Primer router
+            pd.notna(gateways), gateways, df['Gateway predeterminado'].to_numpy(dtype=object)
+        )
     
     return df
 
-def exportar_a_excel(df, nombre_archivo="configuracion_red.xlsx"):
+def exportar_a_excel(df, nombre_archivo="configuracion_red.xlsx", backend=None):
     """
     Exporta la tabla a un archivo Excel con formato
     """
-    with pd.ExcelWriter(nombre_archivo, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Configuración de Red', index=False)
-        
-        # Obtener el workbook y worksheet para formato
-        workbook = writer.book
-        worksheet = writer.sheets['Configuración de Red']
-        
-        # Ajustar ancho de columnas
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    # Los anchos salen del DataFrame, así que la hoja se escribe en una sola
+    # pasada sin volver a recorrer las celdas (backend: ver exportacion.BACKENDS)
+    with etapa('exportar_a_excel', filas=len(df)):
+        with etapa('calcular_anchos', filas=len(df)):
+            anchos = calcular_anchos(df)
+        hoja = Hoja.desde_dataframe('Configuración de Red', df, anchos=anchos)
+        exportar(nombre_archivo, [hoja], backend)
+
+def cargar_desde_excel(nombre_archivo="configuracion_red.xlsx"):
+    """
+    Vuelve a cargar una tabla exportada (o completada a mano) como DataFrame
+    """
+    columnas, filas = leer_libro(nombre_archivo)
+    return pd.DataFrame(list(filas), columns=columnas)
+
+def fusionar_desde_excel(df, nombre_archivo="configuracion_red.xlsx", eliminar=True):
+    """
+    Compara la tabla con un Excel exportado por (Dispositivo, Interfaz),
+    muestra lo que cambió y devuelve la tabla con esos cambios aplicados
+    """
+    diferencias = comparar_con_libro(list(df.columns), filas_dataframe(df, df.columns), nombre_archivo)
+    resumen = diferencias.resumen()
+    print(f"✅ {resumen['agregadas']} filas agregadas, {resumen['eliminadas']} eliminadas "
+          f"y {resumen['cambiadas']} cambiadas en {nombre_archivo}")
+    for linea in diferencias.describir():
+        print(linea)
+    return fusionar_dataframe(df, diferencias, eliminar)
 
 def mostrar_tabla(df):
     """
@@ -119,6 +116,31 @@ def mostrar_tabla(df):
     print("=== CONFIGURACIÓN DE RED ===")
     print(df.to_string(index=False))
 
+def validar_configuracion(df, subredes=None):
+    """
+    Muestra los conflictos de direccionamiento de la tabla (IP duplicadas,
+    direcciones de red/broadcast, gateways fuera de subred...) y los devuelve
+    """
+    conflictos = validar_tabla(df, subredes)
+    if not conflictos:
+        print("✅ Sin conflictos de direccionamiento")
+        return conflictos
+    print(f"❌ {len(conflictos)} conflictos de direccionamiento:")
+    for conflicto in conflictos:
+        print(f"  {conflicto['Tipo']}: {conflicto['Dirección']} ({conflicto['Filas']}) {conflicto['Detalle']}".rstrip())
+    return conflictos
+
+def mostrar_rutas_ospf(df):
+    """
+    Calcula las rutas OSPF entre los routers de la tabla (columnas 'Costo' y
+    'Área' opcionales) y muestra la tabla de enrutamiento de cada uno
+    """
+    red = RedOSPF.desde_tabla(df)
+    for router in red.routers:
+        print(f"=== Rutas OSPF de {router} ===")
+        print(pd.DataFrame(red.tabla_rutas(router), columns=COLUMNAS_RUTAS).to_string(index=False))
+    return red
+
 def agregar_dispositivo(df, dispositivo, interfaz, tipo):
     """
     Agrega un nuevo dispositivo a la tabla
@@ -149,6 +171,8 @@ if __name__ == "__main__":
     
     print("2. Tabla con IPs asignadas automáticamente:")
     mostrar_tabla(tabla_con_ips)
+    validar_configuracion(tabla_con_ips)
+    mostrar_rutas_ospf(tabla_con_ips)
     
     print("\n" + "="*80 + "\n")
     
@@ -170,4 +194,8 @@ if __name__ == "__main__":
     print("- asignar_ips_automaticamente(df, red): Asigna IPs automáticamente") 
     print("- agregar_dispositivo(df, device, interface, type): Agrega dispositivo")
     print("- exportar_a_excel(df, filename): Exporta a Excel")
+    print("- cargar_desde_excel(filename): Vuelve a cargar un Excel exportado")
+    print("- fusionar_desde_excel(df, filename): Aplica a la tabla los cambios de un Excel")
+    print("- validar_configuracion(df, subredes): Muestra conflictos de direccionamiento")
+    print("- mostrar_rutas_ospf(df): Muestra las rutas OSPF de cada router")
     print("- mostrar_tabla(df): Muestra tabla formateada")
\ No newline at end of file
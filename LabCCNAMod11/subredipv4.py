@@ -1,7 +1,13 @@
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.calculadora import COLUMNAS_CALCULO, COLUMNAS_EJERCICIO, bloques_calculo, fila_mascara
+from herramientas_red.exportacion import TAM_LOTE, Hoja, Seccion, exportar
+from herramientas_red.medicion import bloques as medir_bloques, etapa
+from herramientas_red.subredes import COLUMNAS_SUBREDES, PlanSubredes, bloques_subredes
+from herramientas_red.validacion import validar
+from herramientas_red.vlsm import COLUMNAS_DISPOSITIVOS, COLUMNAS_VLSM, planificar_vlsm
 
 def crear_tabla_subredes():
     """
@@ -66,150 +72,158 @@ def crear_tabla_subredes():
     
     return subredes_data, dispositivos_data
 
-def formatear_excel(archivo='configuracion_red.xlsx'):
+def formatear_excel(archivo='configuracion_red.xlsx', backend=None):
     """
     Crea un archivo Excel con formato similar a la imagen
     """
     
-    # Crear workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Configuración de Red"
-    
     # Obtener datos
     subredes_data, dispositivos_data = crear_tabla_subredes()
     
-    # Configurar estilos
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Título principal para información de máscara
-    ws['A1'] = '/26'
-    ws['B1'] = '11111111.11111111.11111111.11000000'
-    ws['C1'] = '255.255.255.192'
+    # Título principal para información de máscara (prefijo, binario y
+    # decimal salen de las tablas por prefijo de la calculadora)
+    prefijo = int(subredes_data['Prefijo'][0].lstrip('/'))
+    titulo = Seccion.desde_filas([fila_mascara(prefijo)], estilos='titulo')
     
-    # Aplicar formato al título
-    for col in ['A', 'B', 'C']:
-        ws[f'{col}1'].fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-        ws[f'{col}1'].border = border
-    
-    # Tabla de subredes (empezar en fila 3)
-    row_start = 3
-    
-    # Headers de subredes
+    # Tabla de subredes (empieza en la fila 3)
     headers_subredes = ['Dirección de subred', 'Prefijo', 'Máscara de subred']
-    for col, header in enumerate(headers_subredes, 1):
-        cell = ws.cell(row=row_start, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.border = border
-        cell.alignment = Alignment(horizontal='center')
-    
-    # Datos de subredes
-    for row_idx, row_data in enumerate(zip(
-        subredes_data['Dirección de subred'],
-        subredes_data['Prefijo'],
-        subredes_data['Máscara de subred']
-    ), row_start + 1):
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.border = border
-            cell.alignment = Alignment(horizontal='center')
-    
-    # Tabla de dispositivos (empezar después de subredes + espacio)
-    device_start = row_start + len(subredes_data['Dirección de subred']) + 3
-    
-    # Headers de dispositivos
+    subredes = Seccion(
+        [[subredes_data[header] for header in headers_subredes]],
+        encabezados=headers_subredes, estilo_encabezado='encabezado_azul',
+        estilos='centro', espacio_antes=1
+    )
+    
+    # Tabla de dispositivos (después de subredes + espacio)
     headers_dispositivos = ['Dispositivo', 'Interfaz', 'Dirección IP', 'Máscara de subred', 'Gateway predeterminado']
-    for col, header in enumerate(headers_dispositivos, 1):
-        cell = ws.cell(row=device_start, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.border = border
-        cell.alignment = Alignment(horizontal='center')
-    
-    # Datos de dispositivos
-    for row_idx, row_data in enumerate(zip(
-        dispositivos_data['Dispositivo'],
-        dispositivos_data['Interfaz'],
-        dispositivos_data['Dirección IP'],
-        dispositivos_data['Máscara de subred'],
-        dispositivos_data['Gateway predeterminado']
-    ), device_start + 1):
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.border = border
-            if col_idx == 1:  # Columna de dispositivo
-                cell.alignment = Alignment(horizontal='left')
-            else:
-                cell.alignment = Alignment(horizontal='center')
-    
-    # Ajustar ancho de columnas
-    column_widths = [20, 15, 18, 20, 25]
-    for i, width in enumerate(column_widths, 1):
-        ws.column_dimensions[chr(64 + i)].width = width
+    dispositivos = Seccion(
+        [[dispositivos_data[header] for header in headers_dispositivos]],
+        encabezados=headers_dispositivos, estilo_encabezado='encabezado_azul',
+        estilos=['izquierda'] + ['centro'] * 4,  # Columna de dispositivo a la izquierda
+        espacio_antes=2
+    )
     
-    # Guardar archivo
-    wb.save(archivo)
+    # Guardar archivo (los anchos de columna se fijan al crear la hoja)
+    column_widths = [20, 15, 18, 20, 25]
+    hoja = Hoja("Configuración de Red", [titulo, subredes, dispositivos], anchos=column_widths)
+    exportar(archivo, [hoja], backend)
     print(f"Archivo guardado como: {archivo}")
 
-def generar_tabla_subredes_completa(red_base="192.168.0.0", prefijo_original=24, nuevo_prefijo=26):
+def validar_tabla_subredes():
+    """
+    Revisa las filas de dispositivos de crear_tabla_subredes contra sus
+    subredes y muestra los conflictos
+    """
+    subredes_data, dispositivos_data = crear_tabla_subredes()
+    conflictos = validar(
+        dispositivos_data['Dirección IP'], dispositivos_data['Máscara de subred'],
+        dispositivos_data['Gateway predeterminado'], subredes_data,
+        dispositivos_data['Dispositivo'], dispositivos_data['Interfaz'],
+    )
+    if not conflictos:
+        print("✅ Las direcciones de los dispositivos coinciden con las subredes")
+    for conflicto in conflictos:
+        print(f"❌ {conflicto['Tipo']}: {conflicto['Dirección']} ({conflicto['Filas']}) {conflicto['Detalle']}".rstrip())
+    return conflictos
+
+def generar_tabla_subredes_completa(red_base="192.168.0.0", prefijo_original=24, nuevo_prefijo=26,
+                                    archivo='subredes_completas.xlsx', backend=None):
     """
     Genera tabla completa de subredes basada en parámetros
     """
     
-    # Calcular número de subredes
-    bits_prestados = nuevo_prefijo - prefijo_original
-    num_subredes = 2 ** bits_prestados
-    hosts_por_subred = 2 ** (32 - nuevo_prefijo) - 2
-    
-    # Calcular el salto entre subredes
-    salto = 2 ** (32 - nuevo_prefijo)
-    
-    # Generar subredes
-    subredes = []
-    base_parts = red_base.split('.')
-    base_int = int(base_parts[3])
-    
-    for i in range(num_subredes):
-        subnet_num = base_int + (i * salto)
-        subnet_addr = f"{base_parts[0]}.{base_parts[1]}.{base_parts[2]}.{subnet_num}"
-        
-        # Calcular primera y última IP utilizables
-        primera_ip = subnet_num + 1
-        ultima_ip = subnet_num + salto - 2
-        broadcast = subnet_num + salto - 1
-        
-        subredes.append({
-            'Subred': i + 1,
-            'Dirección de red': subnet_addr,
-            'Prefijo': f'/{nuevo_prefijo}',
-            'Primera IP utilizable': f"{base_parts[0]}.{base_parts[1]}.{base_parts[2]}.{primera_ip}",
-            'Última IP utilizable': f"{base_parts[0]}.{base_parts[1]}.{base_parts[2]}.{ultima_ip}",
-            'Dirección broadcast': f"{base_parts[0]}.{base_parts[1]}.{base_parts[2]}.{broadcast}",
-            'Hosts utilizables': hosts_por_subred
-        })
-    
-    # Crear DataFrame y exportar
-    df = pd.DataFrame(subredes)
-    df.to_excel('subredes_completas.xlsx', index=False)
-    print(f"Tabla completa de subredes guardada como: subredes_completas.xlsx")
-    print(f"Total de subredes generadas: {num_subredes}")
-    print(f"Hosts por subred: {hosts_por_subred}")
+    # Las subredes se calculan sobre enteros de 32/128 bits, así que sirve
+    # para cualquier par de prefijos y no solo para el último octeto
+    plan = PlanSubredes(red_base, prefijo_original, nuevo_prefijo)
+    
+    # Exportar en streaming: los bloques se escriben a medida que se generan
+    # (xlsx pasa a otra hoja al llegar al límite de filas; usa .csv o .parquet
+    # para tablas de millones de filas). Con la medición activa, el cálculo
+    # de los bloques se mide aparte de la escritura
+    with etapa('generar_tabla_subredes_completa', filas=plan.num_subredes, prefijo=nuevo_prefijo):
+        bloques = medir_bloques('bloques_subredes', bloques_subredes(
+            red_base, prefijo_original, nuevo_prefijo, tam_bloque=TAM_LOTE
+        ))
+        hoja = Hoja('Sheet1', [Seccion.desde_bloques(bloques, COLUMNAS_SUBREDES)])
+        exportar(archivo, [hoja], backend)
+    print(f"Tabla completa de subredes guardada como: {archivo}")
+    print(f"Total de subredes generadas: {plan.num_subredes}")
+    print(f"Hosts por subred: {plan.hosts_por_subred}")
+
+def calcular_subredes(ips, mascaras, originales=None, archivo='calculo_subredes.xlsx', backend=None):
+    """
+    Resuelve los ejercicios de cálculo de subredes (lab 11.6.6) para listas
+    de IPs y máscaras nuevas; con las máscaras originales agrega bits de
+    subred, subredes creadas y bits de host
+    """
+    
+    # Se calcula por lotes y se exporta en streaming, así que sirve igual
+    # para seis problemas que para millones de pares (IP, máscara)
+    columnas = COLUMNAS_CALCULO + (COLUMNAS_EJERCICIO if originales is not None else [])
+    bloques = bloques_calculo(ips, mascaras, originales, tam_bloque=TAM_LOTE)
+    hoja = Hoja('Cálculo de subredes', [Seccion.desde_bloques(
+        bloques, columnas, estilo_encabezado='encabezado_azul', estilos='centro'
+    )], anchos=[18, 9, 18, 14, 38, 18, 20, 20, 20, 17, 14, 16, 12])
+    exportar(archivo, [hoja], backend)
+    print(f"Cálculo de subredes guardado como: {archivo}")
+
+def generar_tabla_vlsm(red_base="192.168.33.128/25", requisitos=None, archivo='vlsm.xlsx',
+                       reservadas=(), backend=None):
+    """
+    Genera el esquema VLSM (subredes de mayor a menor) y la tabla de
+    interfaces para una lista de requisitos de hosts
+    """
+    
+    # Requisitos de ejemplo: (nombre, hosts, dispositivo, interfaz)
+    if requisitos is None:
+        requisitos = [
+            ('LAN_A', 50, 'CustomerRouter', 'G0/0/0'),
+            ('LAN_B', 20, 'CustomerRouter', 'G0/0/1'),
+            ('LAN_C', 10, 'ISPRouter', 'G0/0/0'),
+            ('Enlace WAN', 2, 'CustomerRouter', 'S0/1/0'),
+        ]
+    
+    plan = planificar_vlsm(red_base, requisitos, reservadas)
+    
+    # Tabla de subredes y, debajo, las interfaces con la primera IP de su subred
+    secciones = [Seccion.desde_bloques(
+        plan.bloques(TAM_LOTE), COLUMNAS_VLSM, estilo_encabezado='encabezado_azul', estilos='centro'
+    )]
+    filas_dispositivos = list(plan.filas_dispositivos())
+    if filas_dispositivos:
+        secciones.append(Seccion.desde_filas(
+            filas_dispositivos, COLUMNAS_DISPOSITIVOS, estilo_encabezado='encabezado_azul',
+            estilos=['izquierda'] + ['centro'] * 4, espacio_antes=2
+        ))
+    exportar(archivo, [Hoja('VLSM', secciones, anchos=[20, 16, 18, 10, 18, 20, 20, 20, 18])], backend)
+    
+    print(f"Esquema VLSM guardado como: {archivo}")
+    for clave, valor in plan.fragmentacion().items():
+        print(f"{clave}: {valor}")
+    print(f"Espacio sobrante: {', '.join(plan.texto_libres()) or 'ninguno'}")
+    return plan
 
 if __name__ == "__main__":
     print("Generando tabla de configuración de red...")
     formatear_excel()
     
+    print("\nValidando direcciones contra las subredes...")
+    validar_tabla_subredes()
+    
     print("\nGenerando tabla completa de subredes...")
     generar_tabla_subredes_completa()
     
+    print("\nGenerando esquema VLSM...")
+    generar_tabla_vlsm()
+    
+    print("\nResolviendo el cálculo de subredes del lab 11.6.6...")
+    calcular_subredes(
+        ['192.168.200.139', '10.101.99.228', '172.22.32.12', '192.168.1.245', '128.107.0.55', '192.135.250.180'],
+        ['255.255.255.224', '255.255.128.0', '255.255.224.0', '255.255.255.252', '255.255.255.0', '255.255.255.248'],
+        ['255.255.255.0', '255.0.0.0', '255.255.0.0', '255.255.255.0', '255.255.0.0', '255.255.255.0'],
+    )
+    
     print("\n¡Archivos Excel generados exitosamente!")
     print("- configuracion_red.xlsx: Tabla de configuración de dispositivos")
-    print("- subredes_completas.xlsx: Tabla completa de subredes /26")
\ No newline at end of file
+    print("- subredes_completas.xlsx: Tabla completa de subredes /26")
+    print("- calculo_subredes.xlsx: Respuestas del cálculo de subredes")
+    print("- vlsm.xlsx: Esquema VLSM e interfaces")
\ No newline at end of file
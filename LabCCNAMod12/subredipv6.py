@@ -0,0 +1,138 @@
+import ipaddress
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.asignacion import asignar_eui64
+from herramientas_red.configuracion import escribir_configuraciones
+from herramientas_red.direcciones import ipv6_a_texto, par_ipv6, sumar_ipv6
+from herramientas_red.exportacion import TAM_LOTE, Hoja, Seccion, calcular_anchos, exportar
+from herramientas_red.subredes import COLUMNAS_SUBREDES, PlanSubredes, bloques_subredes
+
+# Redes del laboratorio 12.9.1 en el orden de la tabla de subredes
+REDES_LAB1291 = ['LAN G0/0 del R1', 'LAN G0/1 del R1', 'LAN G0/0 del R2', 'LAN G0/1 del R2', 'Red de enlace R1 a R2']
+
+# (dispositivo, interfaz, red, host o MAC, link-local); los hosts toman la
+# primera dirección de su red y las PCs se configuran solas con EUI-64
+INTERFACES_LAB1291 = [
+    ('R1', 'G0/0', 0, 1, 'fe80::1'),
+    ('R1', 'G0/1', 1, 1, 'fe80::1'),
+    ('R1', 'S0/0/0', 4, 1, 'fe80::1'),
+    ('R2', 'G0/0', 2, 1, 'fe80::2'),
+    ('R2', 'G0/1', 3, 1, 'fe80::2'),
+    ('R2', 'S0/0/0', 4, 2, 'fe80::2'),
+    ('PC1', 'NIC', 0, '0001.4296.A1B1', None),
+    ('PC2', 'NIC', 1, '0001.4296.A1B2', None),
+    ('PC3', 'NIC', 2, '0001.4296.A1B3', None),
+    ('PC4', 'NIC', 3, '0001.4296.A1B4', None),
+]
+
+def calcular_subredes(subred_inicial="2001:db8:acad:00c8::/64", cantidad=5, prefijo_global=48):
+    """
+    Subredes consecutivas a partir de una inicial, dentro de su prefijo global
+    """
+    inicial = ipaddress.IPv6Network(subred_inicial, strict=False)
+    global_ = inicial.supernet(new_prefix=prefijo_global)
+    plan = PlanSubredes(str(global_.network_address), prefijo_global, inicial.prefixlen)
+
+    # Índice de la subred inicial dentro del prefijo global
+    primera = (int(inicial.network_address) - plan.base) // plan.salto
+    bloques = bloques_subredes(str(global_.network_address), prefijo_global, inicial.prefixlen,
+                               primera=primera, cantidad=cantidad)
+    return pd.concat([pd.DataFrame(bloque, columns=COLUMNAS_SUBREDES) for bloque in bloques], ignore_index=True)
+
+def crear_tabla_direcciones(subredes, interfaces=INTERFACES_LAB1291):
+    """
+    Tabla de asignación de direcciones IPv6 para las interfaces del laboratorio
+    """
+    redes = [ipaddress.IPv6Network(f"{red}{prefijo}") for red, prefijo
+             in zip(subredes['Dirección de red'], subredes['Prefijo'])]
+    tabla = pd.DataFrame(interfaces, columns=['Dispositivo', 'Interfaz', 'Red', 'Host', 'Link-local'])
+
+    # Routers: red + host, sumado en pares de uint64 para todas las filas a la vez
+    direcciones = np.full(len(tabla), None, dtype=object)
+    fijas = np.array([not isinstance(host, str) for host in tabla['Host']])
+    if fijas.any():
+        pares = [par_ipv6(int(redes[red].network_address)) for red in tabla['Red'][fijas]]
+        altos = np.array([alto for alto, _ in pares], dtype=np.uint64)
+        bajos = np.array([bajo for _, bajo in pares], dtype=np.uint64)
+        hosts = tabla['Host'][fijas].to_numpy(dtype=np.uint64)
+        direcciones[fijas] = ipv6_a_texto(*sumar_ipv6(altos, bajos, 0, hosts))
+
+    # PCs: SLAAC con EUI-64 sobre el /64 de su red; el gateway es el link-local del router
+    for red in np.unique(tabla['Red'][~fijas]).tolist():
+        filas = np.flatnonzero(~fijas & (tabla['Red'].to_numpy() == red))
+        direcciones[filas] = asignar_eui64(redes[red], tabla['Host'].to_numpy()[filas])
+
+    gateways = np.full(len(tabla), '', dtype=object)
+    for fila in np.flatnonzero(~fijas).tolist():
+        router = tabla[fijas & (tabla['Red'] == tabla['Red'][fila])]
+        gateways[fila] = router['Link-local'].iloc[0] if len(router) else ''
+
+    return pd.DataFrame({
+        'Dispositivo': tabla['Dispositivo'],
+        'Interfaz': tabla['Interfaz'],
+        'Dirección IPv6': direcciones,
+        'Prefijo': [subredes['Prefijo'][red] for red in tabla['Red']],
+        'Link-local': tabla['Link-local'].fillna('EUI-64'),
+        'Gateway predeterminado': gateways,
+    })
+
+def generar_tabla_subredes_completa(red_base="2001:db8:acad::", prefijo_original=48, nuevo_prefijo=64,
+                                    archivo='subredes_ipv6.xlsx', backend=None):
+    """
+    Genera la tabla completa de subredes IPv6 (un /48 tiene 65536 /64)
+    """
+
+    # Las direcciones se calculan como pares de uint64 por bloques, sin
+    # objetos IPv6Network por subred
+    plan = PlanSubredes(red_base, prefijo_original, nuevo_prefijo)
+    bloques = bloques_subredes(red_base, prefijo_original, nuevo_prefijo, tam_bloque=TAM_LOTE)
+    hoja = Hoja('Subredes IPv6', [Seccion.desde_bloques(bloques, COLUMNAS_SUBREDES)],
+                anchos=[10, 26, 10, 28, 42, 20, 24])
+    exportar(archivo, [hoja], backend)
+    print(f"Tabla completa de subredes guardada como: {archivo}")
+    print(f"Total de subredes generadas: {plan.num_subredes}")
+
+def exportar_a_excel(subredes, direcciones, nombre_archivo="esquema_ipv6.xlsx", backend=None):
+    """
+    Exporta la tabla de subredes y la de direcciones a un archivo Excel
+    """
+    subredes = subredes.assign(Red=REDES_LAB1291[:len(subredes)])
+    hojas = [
+        Hoja.desde_dataframe('Subredes', subredes, anchos=calcular_anchos(subredes)),
+        Hoja.desde_dataframe('Direcciones', direcciones, anchos=calcular_anchos(direcciones)),
+    ]
+    exportar(nombre_archivo, hojas, backend)
+
+def mostrar_tabla(df, titulo):
+    """
+    Muestra una tabla en formato tabular
+    """
+    pd.set_option('display.max_columns', None)
+    pd.set_option('display.width', None)
+    print(f"=== {titulo} ===")
+    print(df.to_string(index=False))
+
+if __name__ == "__main__":
+    subredes = calcular_subredes()
+    mostrar_tabla(subredes[['Subred', 'Dirección de red', 'Prefijo']].assign(Red=REDES_LAB1291), "TABLA DE SUBREDES")
+
+    print("\n" + "="*80 + "\n")
+
+    direcciones = crear_tabla_direcciones(subredes)
+    mostrar_tabla(direcciones, "TABLA DE ASIGNACIÓN DE DIRECCIONES")
+    escritos = escribir_configuraciones(direcciones, 'configuraciones_ipv6')
+    print(f"✅ {escritos} configuraciones escritas en configuraciones_ipv6")
+
+    try:
+        exportar_a_excel(subredes, direcciones)
+        print(f"\n✅ Archivo 'esquema_ipv6.xlsx' creado exitosamente!")
+
+        print("\nGenerando tabla completa de subredes /64...")
+        generar_tabla_subredes_completa()
+    except Exception as e:
+        print(f"\n❌ Error al crear archivo Excel: {e}")
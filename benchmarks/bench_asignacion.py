@@ -0,0 +1,69 @@
+"""
+Compara asignar_ips_automaticamente (vectorizado) contra el recorrido fila a fila
+con iterrows/df.at que usaba lab175.
+
+Uso: python benchmarks/bench_asignacion.py [filas ...]
+"""
+import importlib.util
+import os
+import sys
+import time
+
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.asignacion import AsignadorHosts, asignar_por_reservas
+
+spec = importlib.util.spec_from_file_location('lab175', os.path.join(RAIZ, 'LabCCNAMod11', 'lab175.py'))
+lab175 = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(lab175)
+
+RED_BASE = '10.0.0.0/8'
+# Por encima de este tamaño el recorrido fila a fila tarda minutos
+MAX_FILAS_FILA_A_FILA = 100_000
+
+
+def asignar_fila_a_fila(df, red_base):
+    """Referencia: el bucle iterrows/df.at anterior"""
+    asignador = AsignadorHosts(red_base)
+    asignaciones = asignar_por_reservas(zip(df['Tipo'], df['Interfaz']), asignador)
+    for (index, row), asignacion in zip(df.iterrows(), asignaciones):
+        if asignacion is None:
+            continue
+        ip, mascara, gateway = asignacion
+        df.at[index, 'Dirección IP'] = ip
+        df.at[index, 'Máscara de subred'] = mascara
+        if gateway is not None:
+            df.at[index, 'Gateway predeterminado'] = gateway
+    return df
+
+
+def tabla_de(filas):
+    """Repite la tabla de crear_tabla_red hasta tener el número de filas pedido"""
+    base = lab175.crear_tabla_red()
+    repeticiones = -(-filas // len(base))
+    return pd.concat([base] * repeticiones, ignore_index=True).iloc[:filas].copy()
+
+
+def medir(funcion, df):
+    inicio = time.perf_counter()
+    resultado = funcion(df, RED_BASE)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'Filas':>10} {'Fila a fila (s)':>16} {'Vectorizado (s)':>16} {'Aceleración':>12}")
+    for filas in tamanos:
+        vectorizado, t_vector = medir(lab175.asignar_ips_automaticamente, tabla_de(filas))
+        if filas <= MAX_FILAS_FILA_A_FILA:
+            referencia, t_fila = medir(asignar_fila_a_fila, tabla_de(filas))
+            assert referencia.equals(vectorizado), "Los resultados no coinciden"
+            print(f"{filas:>10} {t_fila:>16.3f} {t_vector:>16.3f} {t_fila / t_vector:>11.1f}x")
+        else:
+            print(f"{filas:>10} {'(omitido)':>16} {t_vector:>16.3f} {'-':>12}")
+
+
+if __name__ == '__main__':
+    main()
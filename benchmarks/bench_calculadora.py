@@ -0,0 +1,65 @@
+"""
+Mide la calculadora de subredes por lotes contra ipaddress fila a fila:
+columnas numéricas, lectura de textos y columnas en texto para exportar.
+
+Uso: python benchmarks/bench_calculadora.py [filas]
+"""
+import ipaddress
+import os
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.calculadora import MASCARAS_TEXTO, bloques_calculo, calcular
+from herramientas_red.direcciones import ipv4_a_texto
+
+# ipaddress se mide sobre una muestra y se extrapola
+MUESTRA_IPADDRESS = 100_000
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def con_ipaddress(ips, mascaras):
+    """Referencia: una IPv4Network por fila"""
+    filas = []
+    for ip, mascara in zip(ips, mascaras):
+        red = ipaddress.IPv4Network(f"{ip}/{mascara}", strict=False)
+        filas.append((str(red.network_address), str(red.network_address + 1),
+                      str(red.broadcast_address - 1), str(red.broadcast_address),
+                      str(red.hostmask), red.num_addresses - 2))
+    return filas
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = np.random.default_rng(0)
+    enteros = rng.integers(0, 1 << 32, filas, dtype=np.uint64).astype(np.uint32)
+    prefijos = rng.integers(8, 31, filas)
+
+    columnas, t_numerico = medir(calcular, enteros, prefijos)
+    print(f"{filas} pares (IP, prefijo):")
+    print(f"  Columnas numéricas:  {t_numerico:.3f} s ({columnas['Válida'].mean():.0%} válidas)")
+
+    # Textos de entrada: IPs distintas y máscaras punteadas que se repiten
+    muestra = min(filas, MUESTRA_IPADDRESS)
+    ips = ipv4_a_texto(enteros[:muestra])
+    mascaras = MASCARAS_TEXTO[prefijos[:muestra]]
+    _, t_texto = medir(calcular, ips, mascaras)
+    _, t_bloques = medir(lambda: sum(len(b['Prefijo']) for b in bloques_calculo(ips, mascaras)))
+    _, t_referencia = medir(con_ipaddress, ips, mascaras)
+    escala = filas / muestra
+    print(f"Desde texto (medido con {muestra} filas, extrapolado a {filas}):")
+    print(f"  Columnas numéricas:  {t_texto * escala:.3f} s")
+    print(f"  Columnas en texto:   {t_bloques * escala:.3f} s")
+    print(f"  ipaddress:           {t_referencia * escala:.3f} s  ->  {t_referencia / t_bloques:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
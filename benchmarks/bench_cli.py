@@ -0,0 +1,78 @@
+"""
+Mide el arranque de la línea de comandos (python -m herramientas_red): --help
+y trabajos chicos de cada comando, cada uno en un proceso nuevo (el mejor de
+varios intentos), y muchas tablas procesadas con un proceso por tabla contra
+un solo batch.
+
+Uso: python benchmarks/bench_cli.py [tablas]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+INTENTOS = 5
+
+TABLA = """Dispositivo,Interfaz,Tipo
+R1,G0/0,Router
+R1,G0/1,Router
+R1,S0/0/0,Router
+S1,VLAN 1,Switch
+S2,VLAN 1,Switch
+PC1,NIC,PC
+PC2,NIC,PC
+"""
+
+
+def ejecutar(argumentos, carpeta):
+    """Segundos de un proceso nuevo con los argumentos dados"""
+    entorno = dict(os.environ, PYTHONPATH=os.path.abspath(RAIZ))
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'herramientas_red', *argumentos], cwd=carpeta, env=entorno,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - inicio
+
+
+def medir(argumentos, carpeta):
+    return min(ejecutar(argumentos, carpeta) for _ in range(INTENTOS))
+
+
+def main():
+    tablas = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as carpeta:
+        with open(os.path.join(carpeta, 'tabla.csv'), 'w', encoding='utf-8') as archivo:
+            archivo.write(TABLA)
+        ejecutar(['assign', 'tabla.csv', '-o', 'asignada.json'], carpeta)
+
+        print("Un proceso por comando (mejor de {}):".format(INTENTOS))
+        for nombre, argumentos in [
+            ('--help', ['--help']),
+            ('subnet /24 en /26', ['subnet', '192.168.0.0/24', '26']),
+            ('subnet /48 en /56', ['subnet', '2001:db8::/48', '56']),
+            ('assign 7 filas', ['assign', 'tabla.csv']),
+            ('generate 3 equipos', ['generate', 'asignada.json']),
+            ('export a .xlsx', ['export', 'asignada.json', '-o', 'tabla.xlsx']),
+        ]:
+            print(f"  {nombre:<20} {1000 * medir(argumentos, carpeta):6.0f} ms")
+
+        lineas = []
+        for numero in range(tablas):
+            lineas.append(f"assign tabla.csv --red 10.{numero}.0.0/24 -o asignada{numero}.json")
+            lineas.append(f"generate asignada{numero}.json -o configuraciones{numero}.txt")
+        with open(os.path.join(carpeta, 'trabajos.txt'), 'w', encoding='utf-8') as archivo:
+            archivo.write('\n'.join(lineas) + '\n')
+
+        inicio = time.perf_counter()
+        for linea in lineas:
+            ejecutar(linea.split(), carpeta)
+        separados = time.perf_counter() - inicio
+        lote = ejecutar(['batch', 'trabajos.txt'], carpeta)
+        print(f"{tablas} tablas (assign + generate):")
+        print(f"  Un proceso por comando {separados:6.2f} s")
+        print(f"  Un solo batch          {lote:6.2f} s ({separados / lote:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Mide la matriz de conectividad por clases: routers en cadena, cada uno con
+varias LAN /24 llenas de hosts, y algunos hosts con la IP, la máscara o el
+gateway mal puestos. Se compara la cantidad de clases con los pares de hosts
+que habría que revisar uno por uno.
+
+Uso: python benchmarks/bench_conectividad.py [hosts] [subredes]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.conectividad import OK, Conectividad
+
+LAN_POR_ROUTER = 4
+
+
+def tabla(hosts, subredes):
+    """Columnas (ips, máscaras, gateways, dispositivos) de la topología de prueba"""
+    ips, mascaras, gateways, dispositivos = [], [], [], []
+    routers = -(-subredes // LAN_POR_ROUTER)
+    for router in range(routers):
+        # Enlace serie con el router siguiente (10.255.x.0/30)
+        for lado in (router - 1, router):
+            if 0 <= lado < routers - 1:
+                ips.append(f"10.255.{lado // 64}.{(lado % 64) * 4 + 1 + (lado != router)}")
+                mascaras.append('255.255.255.252')
+                gateways.append('N/D')
+                dispositivos.append(f"R{router + 1}")
+    for subred in range(subredes):
+        ips.append(f"10.{subred // 256}.{subred % 256}.1")
+        mascaras.append('255.255.255.0')
+        gateways.append('N/D')
+        dispositivos.append(f"R{subred // LAN_POR_ROUTER + 1}")
+    rng = np.random.default_rng(0)
+    for host in range(hosts):
+        subred = host % subredes
+        ips.append(f"10.{subred // 256}.{subred % 256}.{2 + (host // subredes) % 250}")
+        mascaras.append('255.255.255.0')
+        gateways.append(f"10.{subred // 256}.{subred % 256}.1")
+        dispositivos.append(f"PC{host + 1}")
+    # Un 1 % de hosts mal configurados
+    primero = len(ips) - hosts
+    for posicion in rng.choice(hosts, hosts // 100, replace=False) + primero:
+        cambio = rng.integers(3)
+        if cambio == 0:
+            ips[posicion] = '172.16.0.' + ips[posicion].rsplit('.', 1)[1]
+        elif cambio == 1:
+            mascaras[posicion] = '255.255.0.0'
+        else:
+            gateways[posicion] = ''
+    return ips, mascaras, gateways, dispositivos
+
+
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    subredes = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    columnas = tabla(hosts, subredes)
+
+    inicio = time.perf_counter()
+    conectividad = Conectividad(*columnas)
+    t_clases = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    matriz = conectividad.matriz()
+    t_matriz = time.perf_counter() - inicio
+
+    # Pares de hosts que funcionan, contados con los tamaños de las clases
+    tamanos = conectividad.tamano_clase.astype(np.int64)
+    pares = int((np.outer(tamanos, tamanos) * (matriz == OK)).sum())
+    print(f"Interfaces: {len(columnas[0])}, subredes: {subredes}, clases: {len(conectividad)}")
+    print(f"Clases: {t_clases:.3f} s, matriz {len(conectividad)}x{len(conectividad)}: {t_matriz:.3f} s")
+    print(f"Pares de interfaces: {tamanos.sum() ** 2:,} ({pares / tamanos.sum() ** 2:.1%} con éxito)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Mide la generación de configuraciones IOS para muchos dispositivos: routers
+con tres interfaces (IPv4 e IPv6) y switches con su SVI, escritos en un solo
+archivo o uno por dispositivo (en un proceso y en el pool). El tiempo se mide
+sin tracemalloc y el pico de memoria del proceso principal en otra pasada.
+
+Uso: python benchmarks/bench_configuracion.py [dispositivos]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.configuracion import escribir_archivo_configuraciones, escribir_configuraciones
+from herramientas_red.registros import TablaDirecciones
+
+COLUMNAS = ["Dispositivo", "Interfaz", "Dirección IP", "Máscara de subred",
+            "Puerta de enlace predeterminada", "Dirección IPv6", "Prefijo", "Link-local"]
+
+
+def filas(dispositivos):
+    """Mitad routers (G0/0, G0/1, S0/0/0) y mitad switches, en subredes /24 de 10.0.0.0/8"""
+    for numero in range(dispositivos):
+        subred = f"10.{numero >> 8 & 0xFF}.{numero & 0xFF}"
+        if numero % 2 == 0:
+            for interfaz, host in (("G0/0", 1), ("G0/1", 129), ("S0/0/0", 253)):
+                yield {"Dispositivo": f"R{numero}", "Interfaz": interfaz, "Dirección IP": f"{subred}.{host}",
+                       "Máscara de subred": "255.255.255.128", "Puerta de enlace predeterminada": "N/A",
+                       "Dirección IPv6": f"2001:db8:{numero:x}:{host:x}::1", "Prefijo": "/64",
+                       "Link-local": "fe80::1"}
+        else:
+            yield {"Dispositivo": f"S{numero}", "Interfaz": "VLAN 1", "Dirección IP": f"{subred}.2",
+                   "Máscara de subred": "255.255.255.0", "Puerta de enlace predeterminada": f"{subred}.1"}
+
+
+def ejecutar(tabla, procesos):
+    """(configuraciones, segundos) sin contar el borrado de la carpeta temporal"""
+    with tempfile.TemporaryDirectory() as carpeta:
+        inicio = time.perf_counter()
+        if procesos == 0:
+            escritos = escribir_archivo_configuraciones(tabla, os.path.join(carpeta, 'configuraciones.txt'))
+        else:
+            escritos = escribir_configuraciones(tabla, carpeta, procesos=procesos)
+        return escritos, time.perf_counter() - inicio
+
+
+def medir(tabla, procesos):
+    escritos, segundos = ejecutar(tabla, procesos)
+    tracemalloc.start()
+    ejecutar(tabla, procesos)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return escritos, segundos, pico
+
+
+def main():
+    dispositivos = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    tabla = TablaDirecciones(COLUMNAS, filas(dispositivos))
+    resultados = []
+    for nombre, procesos in [('Un archivo', 0), ('Archivo por equipo', 1),
+                             (f'Pool ({os.cpu_count()} procesos)', 2 if os.cpu_count() == 1 else None)]:
+        resultados.append((nombre, *medir(tabla, procesos)))
+    print(f"{dispositivos} dispositivos, {len(tabla)} interfaces")
+    for nombre, escritos, segundos, pico in resultados:
+        print(f"  {nombre:<22} {escritos} configuraciones en {segundos:.2f} s, pico {pico / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
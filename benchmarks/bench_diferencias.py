@@ -0,0 +1,85 @@
+"""
+Mide comparar con dos inventarios que difieren en unas mil filas (cambiadas,
+agregadas y eliminadas): tiempo y pico de memoria (tracemalloc, en otra
+corrida) de las filas en streaming con 100k y 1M filas, para ver que el
+tiempo crece lineal y la memoria no; y comparar_libros sobre dos .xlsx
+exportados, donde manda la lectura con openpyxl.
+
+Uso: python benchmarks/bench_diferencias.py [filas ...] [--libro filas]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.diferencias import comparar, comparar_libros
+from herramientas_red.exportacion import exportar_filas
+from herramientas_red.packet_tracer import COLUMNAS
+
+# Cada cuántas filas hay una diferencia de cada tipo, para unas mil en total
+DIFERENCIAS = 1000
+
+
+def fila(numero):
+    return (f"PC{numero}", "NIC", f"10.{numero >> 16 & 0xFF}.{numero >> 8 & 0xFF}.{numero & 0xFF}",
+            "255.0.0.0", "10.0.0.1")
+
+
+def inventarios(filas):
+    """Generadores de las filas anteriores y nuevas"""
+    cada = max(1, 3 * filas // DIFERENCIAS)
+
+    def nuevas():
+        for numero in range(filas):
+            if numero % cada == 1:
+                continue
+            valores = fila(numero)
+            yield valores[:4] + ("10.0.0.254",) if numero % cada == 0 else valores
+        for numero in range(filas, filas + filas // cada):
+            yield fila(numero)
+
+    return (fila(numero) for numero in range(filas)), nuevas()
+
+
+def medir(filas):
+    anteriores, nuevas = inventarios(filas)
+    inicio = time.perf_counter()
+    diferencias = comparar(anteriores, nuevas, COLUMNAS)
+    segundos = time.perf_counter() - inicio
+
+    anteriores, nuevas = inventarios(filas)
+    tracemalloc.start()
+    comparar(anteriores, nuevas, COLUMNAS)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, pico, diferencias.resumen()
+
+
+def main():
+    argumentos = sys.argv[1:]
+    filas_libro = 100_000
+    if '--libro' in argumentos:
+        posicion = argumentos.index('--libro')
+        filas_libro = int(argumentos[posicion + 1])
+        del argumentos[posicion:posicion + 2]
+    tamanos = [int(arg) for arg in argumentos] or [100_000, 1_000_000]
+
+    print(f"{'Filas':>10} {'Comparar (s)':>13} {'filas/s':>11} {'Pico (MB)':>10}  Diferencias")
+    for filas in tamanos:
+        segundos, pico, resumen = medir(filas)
+        print(f"{filas:>10} {segundos:>13.2f} {2 * filas / segundos:>11,.0f} {pico / (1 << 20):>10.1f}  {resumen}")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        libros = [os.path.join(carpeta, nombre) for nombre in ('anterior.xlsx', 'nuevo.xlsx')]
+        for libro, filas in zip(libros, inventarios(filas_libro)):
+            exportar_filas(filas, COLUMNAS, libro)
+        inicio = time.perf_counter()
+        resumen = comparar_libros(*libros).resumen()
+        print(f"Dos .xlsx de {filas_libro} filas: {time.perf_counter() - inicio:.2f} s  {resumen}")
+
+
+if __name__ == '__main__':
+    main()
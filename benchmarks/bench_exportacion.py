@@ -0,0 +1,60 @@
+"""
+Compara los backends de exportación instalados escribiendo la tabla de
+dispositivos (texto con estilos) y una tabla de subredes generada por bloques.
+
+Uso: python benchmarks/bench_exportacion.py [filas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.exportacion import BACKENDS, Hoja, Seccion, backend_disponible, exportar
+from herramientas_red.subredes import COLUMNAS_SUBREDES, bloques_subredes
+
+ENCABEZADOS = ['Dispositivo', 'Interfaz', 'Dirección IP', 'Máscara de subred', 'Gateway predeterminado']
+EXTENSIONES = {'xlsx': '.xlsx', 'csv': '.csv', 'parquet': '.parquet'}
+
+
+def filas_dispositivos(filas):
+    for i in range(filas):
+        yield (f'PC{i}', 'NIC', f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}',
+               '255.0.0.0', '10.0.0.1')
+
+
+def hoja_dispositivos(filas):
+    return Hoja('Dispositivos', [Seccion.desde_filas(
+        filas_dispositivos(filas), ENCABEZADOS, estilo_encabezado='encabezado_azul',
+        estilos=['izquierda'] + ['centro'] * 4
+    )], anchos=[20, 15, 18, 20, 25])
+
+
+def hoja_subredes(filas):
+    # Un /8 partido en subredes del tamaño justo para `filas` subredes
+    nuevo_prefijo = min(32, 8 + max(filas - 1, 1).bit_length())
+    bloques = bloques_subredes('10.0.0.0', 8, nuevo_prefijo)
+    return Hoja('Subredes', [Seccion.desde_bloques(bloques, COLUMNAS_SUBREDES)])
+
+
+def medir(backend, hoja, carpeta):
+    archivo = os.path.join(carpeta, f'{backend}{EXTENSIONES[BACKENDS[backend]["formato"]]}')
+    inicio = time.perf_counter()
+    exportar(archivo, [hoja], backend)
+    return time.perf_counter() - inicio
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    backends = [nombre for nombre in BACKENDS if backend_disponible(nombre)]
+    print(f"Filas por tabla: {filas}")
+    print(f"{'Backend':<12}{'Dispositivos':>14}{'Subredes':>12}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for backend in backends:
+            t_dispositivos = medir(backend, hoja_dispositivos(filas), carpeta)
+            t_subredes = medir(backend, hoja_subredes(filas), carpeta)
+            print(f"{backend:<12}{t_dispositivos:>12.2f} s{t_subredes:>10.2f} s")
+
+
+if __name__ == '__main__':
+    main()
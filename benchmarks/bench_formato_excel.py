@@ -0,0 +1,79 @@
+"""
+Compara el formato celda a celda que usaba formatear_excel (un Alignment nuevo
+por celda y fill/font/border asignados uno a uno) contra EscritorTablas sobre
+una hoja write-only con estilos compartidos.
+
+Uso: python benchmarks/bench_formato_excel.py [filas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.tablas_excel import EscritorTablas
+
+ENCABEZADOS = ['Dispositivo', 'Interfaz', 'Dirección IP', 'Máscara de subred', 'Gateway predeterminado']
+
+
+def filas_dispositivos(filas):
+    for i in range(filas):
+        yield (f'PC{i}', 'NIC', f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}',
+               '255.0.0.0', '10.0.0.1')
+
+
+def celda_a_celda(filas, archivo):
+    """Referencia: el formato anterior de formatear_excel"""
+    wb = Workbook()
+    ws = wb.active
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                    top=Side(style='thin'), bottom=Side(style='thin'))
+    for col, header in enumerate(ENCABEZADOS, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center')
+    for row_idx, row_data in enumerate(filas_dispositivos(filas), 2):
+        for col_idx, value in enumerate(row_data, 1):
+            cell = ws.cell(row=row_idx, column=col_idx, value=value)
+            cell.border = border
+            if col_idx == 1:
+                cell.alignment = Alignment(horizontal='left')
+            else:
+                cell.alignment = Alignment(horizontal='center')
+    wb.save(archivo)
+
+
+def con_estilos_compartidos(filas, archivo):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Dispositivos')
+    escritor = EscritorTablas(wb, ws)
+    escritor.fila(ENCABEZADOS, 'encabezado_azul')
+    escritor.filas(filas_dispositivos(filas), ['izquierda'] + ['centro'] * 4)
+    wb.save(archivo)
+
+
+def medir(funcion, filas, archivo):
+    inicio = time.perf_counter()
+    funcion(filas, archivo)
+    return time.perf_counter() - inicio
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as carpeta:
+        t_anterior = medir(celda_a_celda, filas, os.path.join(carpeta, 'anterior.xlsx'))
+        t_nuevo = medir(con_estilos_compartidos, filas, os.path.join(carpeta, 'nuevo.xlsx'))
+    print(f"Filas de dispositivos: {filas}")
+    print(f"Celda a celda:          {t_anterior:.2f} s")
+    print(f"Estilos compartidos:    {t_nuevo:.2f} s ({t_anterior / t_nuevo:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
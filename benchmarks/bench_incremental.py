@@ -0,0 +1,71 @@
+"""
+Mide las exportaciones incrementales de NetworkTablesGenerator con un
+inventario grande: la primera exportación, un gateway cambiado, dispositivos
+agregados y una exportación sin cambios, a Excel y a CSV, contra reescribir
+todo (backend rapido y exportación CSV completa).
+
+Uso: python benchmarks/bench_incremental.py [filas]
+"""
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.exportacion import exportar
+
+spec = importlib.util.spec_from_file_location('generador', os.path.join(RAIZ, 'LabCCNAMod10', 'packet-tacler10.3.4.py'))
+generador = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generador)
+
+
+def dispositivos(cantidad, desde=0):
+    for numero in range(desde, desde + cantidad):
+        yield (f"PC{numero}", "NIC", f"10.{numero >> 16 & 0xFF}.{numero >> 8 & 0xFF}.{numero & 0xFF}",
+               "255.255.0.0", f"10.{numero >> 16 & 0xFF}.0.1")
+
+
+def medir(funcion, *argumentos, **opciones):
+    """Segundos de una llamada, sin los mensajes que imprime"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        funcion(*argumentos, **opciones)
+        return time.perf_counter() - inicio
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    generator = generador.NetworkTablesGenerator()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.add_devices(dispositivos(filas))
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        excel = os.path.join(carpeta, 'tablas_red.xlsx')
+        prefijo = os.path.join(carpeta, 'tabla_red')
+        completo_excel = medir(generator.export_to_excel, os.path.join(carpeta, 'completo.xlsx'), backend='rapido')
+        completo_csv = medir(exportar, os.path.join(carpeta, 'completo.csv'), generator._hojas()[:1], 'csv')
+
+        pasos = [('Primera exportación', None)]
+        pasos.append(('Un gateway cambiado', lambda: generator.update_gateways({"PC1234": "10.0.0.1"})))
+        pasos.append(('100 dispositivos nuevos', lambda: generator.add_devices(dispositivos(100, filas))))
+        pasos.append(('Pruebas completadas', generator.fill_tests))
+        pasos.append(('Sin cambios', None))
+
+        print(f"{len(generator.address_data)} filas; reescribir todo: Excel {completo_excel:.2f} s, "
+              f"CSV {completo_csv:.2f} s")
+        print(f"  {'':<24} {'Excel':>9} {'CSV':>9}")
+        for nombre, cambio in pasos:
+            if cambio is not None:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    cambio()
+            segundos_excel = medir(generator.export_to_excel, excel)
+            segundos_csv = medir(generator.export_to_csv, prefijo)
+            print(f"  {nombre:<24} {1000 * segundos_excel:7.0f} ms {1000 * segundos_csv:6.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
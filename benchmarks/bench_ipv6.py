@@ -0,0 +1,77 @@
+"""
+Compara la enumeración de subredes IPv6 por pares de uint64 contra iterar
+ipaddress.IPv6Network.subnets(): dividir un prefijo en /64 y dar las
+direcciones en texto comprimido. También mide la lectura de texto y EUI-64.
+
+Uso: python benchmarks/bench_ipv6.py [bits de subred]   (20 -> 1M de /64)
+"""
+import ipaddress
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.direcciones import eui64, ipv6_a_texto, texto_a_ipv6
+from herramientas_red.subredes import bloques_subredes
+
+RED_BASE = '2001:db8::'
+# ipaddress se mide sobre una muestra y se extrapola: el total tarda minutos
+MUESTRA_IPADDRESS = 100_000
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def con_pares(prefijo_original, nuevo_prefijo):
+    """Tabla completa (red, primera, última en texto) por bloques"""
+    return sum(len(bloque['Dirección de red'])
+               for bloque in bloques_subredes(RED_BASE, prefijo_original, nuevo_prefijo))
+
+
+def con_ipaddress(prefijo_original, nuevo_prefijo, cantidad):
+    """Referencia: un IPv6Network por subred y str() de cada dirección"""
+    red = ipaddress.IPv6Network(f"{RED_BASE}/{prefijo_original}")
+    filas = 0
+    for subred in itertools.islice(red.subnets(new_prefix=nuevo_prefijo), cantidad):
+        str(subred.network_address), str(subred.network_address + 1), str(subred.broadcast_address)
+        filas += 1
+    return filas
+
+
+def main():
+    bits = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    nuevo_prefijo = 64
+    prefijo_original = nuevo_prefijo - bits
+    total = 1 << bits
+
+    filas, t_pares = medir(con_pares, prefijo_original, nuevo_prefijo)
+    muestra = min(total, MUESTRA_IPADDRESS)
+    _, t_muestra = medir(con_ipaddress, prefijo_original, nuevo_prefijo, muestra)
+    t_ipaddress = t_muestra * total / muestra
+    print(f"/{prefijo_original} -> /{nuevo_prefijo}: {filas} subredes, 3 direcciones en texto por subred")
+    print(f"  Pares uint64: {t_pares:.3f} s")
+    print(f"  ipaddress:    {t_ipaddress:.3f} s (estimado con {muestra} subredes)"
+          f"  ->  {t_ipaddress / t_pares:.1f}x")
+
+    rng = np.random.default_rng(0)
+    altos = np.uint64(0x20010DB8 << 32) | rng.integers(0, 1 << 32, total, dtype=np.uint64)
+    bajos = rng.integers(0, 1 << 16, total, dtype=np.uint64)
+    textos, t_formato = medir(ipv6_a_texto, altos, bajos)
+    (leidos_altos, leidos_bajos, _), t_lectura = medir(texto_a_ipv6, textos)
+    assert (leidos_altos == altos).all() and (leidos_bajos == bajos).all(), "La lectura no coincide"
+    _, t_eui64 = medir(eui64, rng.integers(0, 1 << 48, total, dtype=np.uint64))
+    print(f"{total} direcciones:")
+    print(f"  Formato comprimido: {t_formato:.3f} s")
+    print(f"  Lectura de texto:   {t_lectura:.3f} s")
+    print(f"  EUI-64:             {t_eui64:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Mide el motor OSPF sobre una topología multiárea generada: áreas de 100
+routers en anillo con cuerdas y una LAN por router, dos ABR por área y el
+backbone en anillo entre los ABR. Compara la convergencia completa con los
+cambios incrementales de costo, caídas y restauraciones de enlaces, dentro
+de un área y en el backbone.
+
+Uso: python benchmarks/bench_ospf.py [routers]
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.direcciones import ipv4_a_texto
+from herramientas_red.ospf import RedOSPF
+
+ROUTERS_POR_AREA = 100
+CAMBIOS = 200
+
+
+def topologia(routers, semilla=0):
+    """Columnas (ips, máscaras, dispositivos, interfaces, costos, áreas, tipos) y los enlaces (router, interfaz)"""
+    azar = random.Random(semilla)
+    filas, enlaces = [], {'area': [], 'backbone': []}
+    siguiente_enlace = [0x0A000000]
+    numero_interfaz = {}
+
+    def interfaz(router, prefijo):
+        numero_interfaz[router] = numero_interfaz.get(router, 0) + 1
+        return f"{prefijo}0/{numero_interfaz[router]}"
+
+    def enlace(uno, otro, area, tipo):
+        red = siguiente_enlace[0]
+        siguiente_enlace[0] += 4
+        for router, host in ((uno, 1), (otro, 2)):
+            nombre = interfaz(router, 'S' if tipo == 'backbone' else 'G')
+            filas.append((red + host, 30, router, nombre, azar.randint(1, 20), area))
+            enlaces[tipo].append((router, nombre))
+
+    areas = max(1, routers // ROUTERS_POR_AREA)
+    for area in range(1, areas + 1):
+        nombres = [f"R{area}_{k}" for k in range(routers // areas)]
+        for k, nombre in enumerate(nombres):
+            lan = 0xAC100000 + (len(filas) << 8)
+            filas.append((lan + 1, 24, nombre, 'G0/0', 1, area))
+            enlace(nombre, nombres[(k + 1) % len(nombres)], area, 'area')
+            if k % 10 == 0:
+                enlace(nombre, nombres[(k + len(nombres) // 2) % len(nombres)], area, 'area')
+    abr = [f"R{area}_{k}" for area in range(1, areas + 1) for k in (0, 1)]
+    for k, nombre in enumerate(abr):
+        enlace(nombre, abr[(k + 1) % len(abr)], 0, 'backbone')
+
+    ips, prefijos, dispositivos, interfaces, costos, areas_fila = zip(*filas)
+    ips = ipv4_a_texto(np.array(ips, dtype=np.uint32)).tolist()
+    mascaras = [f"/{prefijo}" for prefijo in prefijos]
+    columnas = (ips, mascaras, list(dispositivos), list(interfaces), list(costos), list(areas_fila),
+                ['Router'] * len(ips))
+    return columnas, enlaces
+
+
+def cambios(red, enlaces, cantidad, semilla=1):
+    """Tiempo medio (ms) y árboles corregidos por cambio"""
+    azar = random.Random(semilla)
+    caidos = []
+    tiempos, arboles = [], 0
+    for _ in range(cantidad):
+        inicio = time.perf_counter()
+        opcion = azar.random()
+        if caidos and opcion < 0.2:
+            arboles += red.activar(*caidos.pop())
+        elif opcion < 0.4:
+            router, interfaz = azar.choice(enlaces)
+            arboles += red.desactivar(router, interfaz)
+            caidos.append((router, interfaz))
+        else:
+            arboles += red.cambiar_costo(*azar.choice(enlaces), azar.randint(1, 20))
+        tiempos.append(time.perf_counter() - inicio)
+    return 1000 * sum(tiempos) / cantidad, arboles / cantidad
+
+
+def main():
+    routers = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    columnas, enlaces = topologia(routers)
+    inicio = time.perf_counter()
+    red = RedOSPF(*columnas)
+    convergencia = time.perf_counter() - inicio
+    print(f"{len(red.routers)} routers, {len(red.nombre)} interfaces, {len(red.redes)} subredes, "
+          f"{len(red.areas)} áreas, {len(red.abr)} ABR")
+    print(f"  Convergencia completa:  {convergencia:.2f} s")
+    inicio = time.perf_counter()
+    tabla = red.tabla_rutas(red.routers[0])
+    print(f"  Tabla de un router:     {1000 * (time.perf_counter() - inicio):.1f} ms ({len(tabla)} rutas)")
+    for nombre, tipo in (('dentro de un área', 'area'), ('en el backbone', 'backbone')):
+        milisegundos, arboles = cambios(red, enlaces[tipo], CAMBIOS)
+        print(f"  Cambio {nombre + ':':<18} {milisegundos:.1f} ms ({arboles:.0f} árboles corregidos)")
+
+
+if __name__ == '__main__':
+    main()
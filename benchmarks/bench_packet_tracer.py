@@ -0,0 +1,40 @@
+"""
+Mide la lectura de todos los .pkt/.pka del repositorio: primera pasada con
+la caché vacía (descifrado, descompresión y XML en un pool de procesos) y
+segunda pasada, que solo calcula los hashes.
+
+Uso: python benchmarks/bench_packet_tracer.py [carpeta] [procesos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.packet_tracer import buscar_archivos, leer_arbol
+
+
+def main():
+    carpeta = sys.argv[1] if len(sys.argv) > 1 else RAIZ
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    archivos = buscar_archivos(carpeta)
+    tamano = sum(os.path.getsize(ruta) for ruta in archivos) / 1e6
+
+    with tempfile.TemporaryDirectory() as cache:
+        inicio = time.perf_counter()
+        resultados, errores = leer_arbol(carpeta, procesos=procesos, carpeta_cache=cache)
+        t_frio = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        leer_arbol(carpeta, procesos=procesos, carpeta_cache=cache)
+        t_caliente = time.perf_counter() - inicio
+
+    print(f"Archivos: {len(archivos)} ({tamano:.1f} MB), procesos: {procesos or os.cpu_count()}")
+    print(f"Interfaces extraídas: {sum(len(filas) for filas in resultados.values())}, errores: {len(errores)}")
+    print(f"Caché vacía:   {t_frio:.2f} s")
+    print(f"Caché llena:   {t_caliente:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Mide la extracción de las tablas de direccionamiento de todas las guías en
+PDF del repositorio: primera pasada con la caché vacía (pdfplumber en un
+pool de procesos) y segunda pasada, que solo calcula los hashes.
+
+Uso: python benchmarks/bench_pdf_tablas.py [carpeta] [procesos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.packet_tracer import buscar_archivos
+from herramientas_red.pdf_tablas import EXTENSIONES, leer_arbol
+
+
+def main():
+    carpeta = sys.argv[1] if len(sys.argv) > 1 else RAIZ
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    archivos = buscar_archivos(carpeta, EXTENSIONES)
+    tamano = sum(os.path.getsize(ruta) for ruta in archivos) / 1e6
+
+    with tempfile.TemporaryDirectory() as cache:
+        inicio = time.perf_counter()
+        resultados, errores = leer_arbol(carpeta, procesos=procesos, carpeta_cache=cache)
+        t_frio = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        leer_arbol(carpeta, procesos=procesos, carpeta_cache=cache)
+        t_caliente = time.perf_counter() - inicio
+
+    con_tabla = sum(1 for filas in resultados.values() if filas)
+    print(f"Guías: {len(archivos)} ({tamano:.1f} MB), procesos: {procesos or os.cpu_count()}")
+    print(f"Con tabla: {con_tabla}, interfaces: {sum(len(filas) for filas in resultados.values())}, errores: {len(errores)}")
+    print(f"Caché vacía:   {t_frio:.2f} s")
+    print(f"Caché llena:   {t_caliente:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Mide por etapas (herramientas_red.medicion) los dos flujos completos de los
+laboratorios con 1k, 100k y 1M filas y avisa de regresiones contra una línea
+base de esta máquina:
+
+- lab175: crear_tabla_red -> repetir -> asignar_ips_automaticamente -> exportar_a_excel
+- subredes: generar_tabla_subredes_completa de 10.0.0.0/8 (bloques_subredes -> exportar)
+
+Cada tamaño se corre dos veces: una sin tracemalloc para los tiempos (el
+mejor de varios intentos) y otra con tracemalloc para el pico de memoria.
+Una etapa es regresión si tarda o usa más que la línea base en más de la
+tolerancia y además por encima de un mínimo absoluto (el ruido de las etapas
+cortas). Sale con 1 si hubo alguna.
+
+Los tiempos solo se comparan en la misma máquina, así que la línea base no
+está en el repositorio: la primera corrida la guarda en
+benchmarks/linea_base_pipelines.json (o en --linea-base) y las siguientes se
+comparan con ella; --guardar la reemplaza. Si la línea base es de otra
+máquina o de otra versión de Python se avisa y no se compara.
+
+Uso: python benchmarks/bench_pipelines.py [--filas N ...] [--guardar] [--tolerancia 0.25]
+                                          [--sin-memoria] [--reporte reporte.json]
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red import medicion
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linea_base_pipelines.json')
+TAMANOS = [1_000, 100_000, 1_000_000]
+# Intentos de la corrida de tiempos; con un millón de filas alcanza con uno
+INTENTOS = 3
+MINIMO_SEGUNDOS = 0.1
+MINIMO_MEMORIA = 1 << 20
+
+
+def cargar(nombre, archivo):
+    spec = importlib.util.spec_from_file_location(nombre, os.path.join(RAIZ, 'LabCCNAMod11', archivo))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+lab175 = cargar('lab175', 'lab175.py')
+subredipv4 = cargar('subredipv4', 'subredipv4.py')
+
+
+def flujo_lab175(filas, carpeta):
+    base = lab175.crear_tabla_red()
+    with medicion.etapa('repetir_tabla', filas=filas):
+        repeticiones = -(-filas // len(base))
+        df = pd.concat([base] * repeticiones, ignore_index=True).iloc[:filas].copy()
+    df = lab175.asignar_ips_automaticamente(df, '10.0.0.0/8')
+    lab175.exportar_a_excel(df, os.path.join(carpeta, 'configuracion_red.xlsx'))
+
+
+def flujo_subredes(filas, carpeta):
+    # La potencia de dos que cubre las filas pedidas: 1k -> /18, 100k -> /25, 1M -> /28
+    nuevo_prefijo = 8 + (filas - 1).bit_length()
+    subredipv4.generar_tabla_subredes_completa('10.0.0.0', 8, nuevo_prefijo,
+                                               os.path.join(carpeta, 'subredes_completas.xlsx'))
+
+
+FLUJOS = {'lab175': flujo_lab175, 'subredes': flujo_subredes}
+
+
+def correr(flujo, filas, memoria):
+    """Totales por etapa de una corrida del flujo"""
+    medicion.activar(memoria=memoria)
+    try:
+        with tempfile.TemporaryDirectory() as carpeta, contextlib.redirect_stdout(io.StringIO()):
+            flujo(filas, carpeta)
+    finally:
+        reporte = medicion.desactivar()
+    return reporte['totales']
+
+
+def medir(flujo, filas, con_memoria):
+    """Por etapa: segundos y filas/s del mejor intento y pico de memoria"""
+    intentos = INTENTOS if filas < 1_000_000 else 1
+    corridas = [correr(flujo, filas, False) for _ in range(intentos)]
+    etapas = {}
+    for nombre in corridas[0]:
+        mejor = min((corrida[nombre] for corrida in corridas), key=lambda total: total['segundos'])
+        etapas[nombre] = {'segundos': mejor['segundos'], 'filas': mejor['filas'],
+                          'filas_por_segundo': mejor['filas_por_segundo'], 'memoria_pico': None}
+    if con_memoria:
+        for nombre, total in correr(flujo, filas, True).items():
+            if nombre in etapas:
+                etapas[nombre]['memoria_pico'] = total['memoria_pico']
+    return etapas
+
+
+def regresiones(actual, base, tolerancia):
+    """Lista de (etapa, medida, antes, ahora) que empeoraron más de lo tolerado"""
+    peores = []
+    for nombre, medidas in actual.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        for clave, minimo in (('segundos', MINIMO_SEGUNDOS), ('memoria_pico', MINIMO_MEMORIA)):
+            antes, ahora = anterior.get(clave), medidas.get(clave)
+            if antes is None or ahora is None:
+                continue
+            if ahora > antes * (1 + tolerancia) and ahora - antes > minimo:
+                peores.append((nombre, clave, antes, ahora))
+    return peores
+
+
+def entorno():
+    return {'python': platform.python_version(), 'maquina': platform.machine(), 'equipo': platform.node(),
+            'procesador': platform.processor()}
+
+
+def formatear(clave, valor):
+    return f"{valor:.3f} s" if clave == 'segundos' else f"{valor / (1 << 20):.1f} MB"
+
+
+def mostrar(nombre_flujo, filas, etapas, peores):
+    print(f"{nombre_flujo} con {filas} filas:")
+    print(f"  {'Etapa':<34} {'s':>8} {'filas/s':>12} {'pico MB':>9}")
+    marcadas = {(etapa, clave) for etapa, clave, _, _ in peores}
+    for nombre, medidas in etapas.items():
+        pico = medidas['memoria_pico']
+        marca = ' <- regresión' if any((nombre, clave) in marcadas for clave in ('segundos', 'memoria_pico')) else ''
+        print(f"  {nombre:<34} {medidas['segundos']:8.3f} {medidas['filas_por_segundo'] or 0:12,.0f} "
+              f"{pico / (1 << 20) if pico is not None else float('nan'):9.1f}{marca}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=TAMANOS)
+    parser.add_argument('--flujos', nargs='+', choices=FLUJOS, default=list(FLUJOS))
+    parser.add_argument('--guardar', action='store_true', help="guarda los resultados como línea base")
+    parser.add_argument('--linea-base', default=LINEA_BASE)
+    parser.add_argument('--tolerancia', type=float, default=0.25)
+    parser.add_argument('--sin-memoria', action='store_true', help="no corre la pasada con tracemalloc")
+    parser.add_argument('--reporte', help="escribe los resultados en este JSON")
+    args = parser.parse_args()
+
+    base = {}
+    # Sin línea base, esta corrida pasa a serlo
+    guardar = args.guardar or not os.path.exists(args.linea_base)
+    if not guardar:
+        with open(args.linea_base, encoding='utf-8') as archivo:
+            datos_base = json.load(archivo)
+        base = datos_base['resultados']
+        distinto = {clave: valor for clave, valor in entorno().items() if datos_base.get(clave) != valor}
+        if distinto:
+            detalle = ', '.join(f"{clave} {datos_base.get(clave)} -> {valor}" for clave, valor in distinto.items())
+            print(f"❌ La línea base es de otro entorno ({detalle}): no se compara; "
+                  f"córrelo con --guardar para rehacerla")
+            base = {}
+
+    resultados, total_peores = {}, []
+    for nombre_flujo in args.flujos:
+        for filas in args.filas:
+            etapas = medir(FLUJOS[nombre_flujo], filas, not args.sin_memoria)
+            resultados.setdefault(nombre_flujo, {})[str(filas)] = etapas
+            peores = regresiones(etapas, base.get(nombre_flujo, {}).get(str(filas), {}), args.tolerancia)
+            mostrar(nombre_flujo, filas, etapas, peores)
+            total_peores += [(nombre_flujo, filas, *peor) for peor in peores]
+
+    datos = {**entorno(), 'resultados': resultados}
+    for archivo in filter(None, [args.reporte, args.linea_base if guardar else None]):
+        with open(archivo, 'w', encoding='utf-8') as salida:
+            json.dump(datos, salida, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados guardados en {archivo}")
+
+    if guardar and not args.guardar:
+        print(f"Sin línea base en {args.linea_base}: esta corrida quedó como línea base de esta máquina")
+    for nombre_flujo, filas, etapa, clave, antes, ahora in total_peores:
+        print(f"❌ {nombre_flujo} {filas} filas, {etapa}: {formatear(clave, antes)} -> "
+              f"{formatear(clave, ahora)} (+{100 * (ahora / antes - 1):.0f}%)")
+    if base and not total_peores:
+        print(f"✅ Sin regresiones (tolerancia {100 * args.tolerancia:.0f}%)")
+    return 1 if total_peores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Memoria de una tabla de direcciones grande según cómo se guarda: lista de
+dicts (address_data), DataFrame (crear_tabla_red), TablaColumnar y
+TablaDirecciones. Se mide con tracemalloc lo que queda asignado después de
+armarla y el pico durante el armado. pandas 3 guarda los textos en Arrow,
+fuera de tracemalloc: para el DataFrame se suma memory_usage(deep=True).
+
+Uso: python benchmarks/bench_registros.py [interfaces]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.registros import TablaDirecciones
+from herramientas_red.tablas import TablaColumnar
+
+COLUMNAS = ["Dispositivo", "Interfaz", "Dirección IP", "Máscara de subred", "Puerta de enlace predeterminada"]
+
+
+def filas(cantidad):
+    """Interfaces de routers y PCs repartidas en subredes /24 de 10.0.0.0/8"""
+    for numero in range(cantidad):
+        red, host = divmod(numero, 200)
+        subred = f"10.{red >> 8 & 0xFF}.{red & 0xFF}"
+        if host == 0:
+            yield {"Dispositivo": f"R{red}", "Interfaz": "G0/0", "Dirección IP": f"{subred}.1",
+                   "Máscara de subred": "255.255.255.0", "Puerta de enlace predeterminada": "N/A"}
+        else:
+            yield {"Dispositivo": f"PC{numero}", "Interfaz": "NIC", "Dirección IP": f"{subred}.{host + 9}",
+                   "Máscara de subred": "255.255.255.0", "Puerta de enlace predeterminada": f"{subred}.1"}
+
+
+def lista_de_dicts(cantidad):
+    return list(filas(cantidad))
+
+
+def dataframe(cantidad):
+    return pd.DataFrame(filas(cantidad), columns=COLUMNAS)
+
+
+def tabla_columnar(cantidad):
+    return TablaColumnar(COLUMNAS, filas(cantidad))
+
+
+def tabla_direcciones(cantidad):
+    return TablaDirecciones(COLUMNAS, filas(cantidad))
+
+
+def medir(funcion, cantidad):
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    tabla = funcion(cantidad)
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if isinstance(tabla, pd.DataFrame):
+        actual += int(tabla.memory_usage(deep=True).sum())
+    del tabla
+    return actual, pico, segundos
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{cantidad} interfaces")
+    print(f"{'Modelo':<20} {'Memoria (MB)':>13} {'Pico (MB)':>10} {'Bytes/fila':>11} {'Armado (s)':>11}")
+    referencia = None
+    for nombre, funcion in [('Lista de dicts', lista_de_dicts), ('DataFrame', dataframe),
+                            ('TablaColumnar', tabla_columnar), ('TablaDirecciones', tabla_direcciones)]:
+        actual, pico, segundos = medir(funcion, cantidad)
+        referencia = referencia or actual
+        print(f"{nombre:<20} {actual / 1e6:>13.1f} {pico / 1e6:>10.1f} {actual / cantidad:>11.1f} {segundos:>11.2f}"
+              f"  ({referencia / actual:.1f}x menos que la lista de dicts)")
+
+
+if __name__ == '__main__':
+    main()
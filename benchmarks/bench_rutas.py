@@ -0,0 +1,59 @@
+"""
+Mide el trie de rutas: armado desde interfaces de router (enteros y texto)
+y búsqueda del prefijo más largo para un lote de direcciones, en IPv4 e IPv6.
+
+Uso: python benchmarks/bench_rutas.py [interfaces] [búsquedas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.direcciones import MASCARAS, ipv4_a_texto
+from herramientas_red.rutas import TablaRutas, TrieRutas
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    interfaces = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    busquedas = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    rng = np.random.default_rng(0)
+
+    # Interfaces .1 de subredes /16 a /30 repartidas en 10.0.0.0/8
+    prefijos = rng.integers(16, 31, interfaces)
+    redes = (np.uint32(10 << 24) | rng.integers(0, 1 << 24, interfaces, dtype=np.uint32)) & MASCARAS[prefijos]
+    ips = redes + np.uint32(1)
+    direcciones = np.uint32(10 << 24) | rng.integers(0, 1 << 24, busquedas, dtype=np.uint32)
+
+    trie, t_armado = medir(TrieRutas, ips, prefijos, 4)
+    encontradas, t_busqueda = medir(trie.buscar, direcciones)
+    print(f"IPv4: {interfaces} rutas, {trie.nodos} nodos")
+    print(f"  Armado (enteros): {t_armado:.3f} s")
+    print(f"  {busquedas} búsquedas: {t_busqueda:.3f} s ({(encontradas >= 0).mean():.0%} con ruta)")
+
+    textos_ip = ipv4_a_texto(ips)
+    textos_mascara = ipv4_a_texto(MASCARAS[prefijos])
+    _, t_texto = medir(TablaRutas, textos_ip, textos_mascara)
+    print(f"  Armado desde texto: {t_texto:.3f} s")
+
+    # IPv6: /64 dentro de un /48, con direcciones en las mismas subredes
+    altos = np.uint64(0x20010DB8ACAD0000) | rng.integers(0, 1 << 16, interfaces, dtype=np.uint64)
+    bajos = np.ones(interfaces, dtype=np.uint64)
+    elegidas = rng.integers(0, interfaces, busquedas)
+    trie6, t_armado = medir(TrieRutas, (altos, bajos), np.full(interfaces, 64), 6)
+    encontradas, t_busqueda = medir(trie6.buscar, (altos[elegidas], rng.integers(0, 1 << 63, busquedas, dtype=np.uint64)))
+    print(f"IPv6: {interfaces} rutas, {trie6.nodos} nodos")
+    print(f"  Armado (enteros): {t_armado:.3f} s")
+    print(f"  {busquedas} búsquedas: {t_busqueda:.3f} s ({(encontradas >= 0).mean():.0%} con ruta)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Mide el simulador de eventos: routers en estrella con LAN /24 llenas de hosts
+y pings entre hosts al azar (la mitad en la misma LAN), repartidos en el
+tiempo simulado. Muestra por tipo de evento la cantidad, el tiempo de CPU y
+el tiempo simulado.
+
+Uso: python benchmarks/bench_simulacion.py [hosts] [subredes] [pings]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.simulacion import Simulador
+
+LAN_POR_ROUTER = 4
+
+
+def tabla(hosts, subredes):
+    """Columnas (ips, máscaras, gateways, dispositivos) de la topología de prueba"""
+    ips, mascaras, gateways, dispositivos = [], [], [], []
+    routers = -(-subredes // LAN_POR_ROUTER)
+    # Cada router con un enlace serie (10.255.x.0/30) al router central
+    for router in range(routers):
+        for nombre, extremo in (('Core', 1), (f"R{router + 1}", 2)):
+            ips.append(f"10.255.{router // 64}.{(router % 64) * 4 + extremo}")
+            mascaras.append('255.255.255.252')
+            gateways.append('N/D')
+            dispositivos.append(nombre)
+    for subred in range(subredes):
+        ips.append(f"10.{subred // 256}.{subred % 256}.1")
+        mascaras.append('255.255.255.0')
+        gateways.append('N/D')
+        dispositivos.append(f"R{subred // LAN_POR_ROUTER + 1}")
+    for host in range(hosts):
+        subred = host % subredes
+        ips.append(f"10.{subred // 256}.{subred % 256}.{2 + (host // subredes) % 250}")
+        mascaras.append('255.255.255.0')
+        gateways.append(f"10.{subred // 256}.{subred % 256}.1")
+        dispositivos.append(f"PC{host + 1}")
+    return ips, mascaras, gateways, dispositivos
+
+
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    subredes = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    pings = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+
+    inicio = time.perf_counter()
+    simulador = Simulador(*tabla(hosts, subredes))
+    t_armado = time.perf_counter() - inicio
+
+    rng = np.random.default_rng(0)
+    origenes = rng.integers(0, hosts, pings)
+    # La mitad de los destinos en la misma LAN que el origen
+    destinos = np.where(rng.random(pings) < 0.5, (origenes + subredes) % hosts, rng.integers(0, hosts, pings))
+    for numero, (origen, destino) in enumerate(zip(origenes.tolist(), destinos.tolist())):
+        simulador.enviar(f"PC{origen + 1}", f"PC{destino + 1}", tiempo=numero * 0.001)
+
+    inicio = time.perf_counter()
+    simulador.ejecutar()
+    t_simulacion = time.perf_counter() - inicio
+
+    exitos = sum(1 for flujo in simulador.flujos if flujo[4])
+    eventos = sum(simulador.cantidad)
+    print(f"Interfaces: {len(simulador.ip)}, routers: {len(simulador.router)}, armado: {t_armado:.2f} s")
+    print(f"Pings: {pings} ({exitos} con respuesta), paquetes IP: {simulador.paquetes}, eventos: {eventos}")
+    print(f"Simulación: {t_simulacion:.1f} s ({eventos / t_simulacion:,.0f} eventos/s), "
+          f"tiempo simulado: {simulador.tiempo:.1f} s")
+    print(f"{'Evento':<20} {'Cantidad':>10} {'CPU (s)':>9} {'Simulado (s)':>13}")
+    for fila in simulador.estadisticas():
+        print(f"{fila['Evento']:<20} {fila['Cantidad']:>10} {fila['CPU (s)']:>9.2f} {fila['Tiempo simulado (s)']:>13.2f}")
+    if simulador.descartes:
+        print("Descartes:", dict(simulador.descartes.most_common(5)))
+
+
+if __name__ == '__main__':
+    main()
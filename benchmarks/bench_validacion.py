@@ -0,0 +1,57 @@
+"""
+Mide validar_tabla sobre la tabla de lab175 repetida y asignada con
+asignar_ips_automaticamente, con algunos conflictos agregados (IP repetida,
+dirección de red, gateway de otra subred y máscara no contigua).
+
+Uso: python benchmarks/bench_validacion.py [filas ...]
+"""
+import importlib.util
+import os
+import sys
+import time
+from collections import Counter
+
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+from herramientas_red.validacion import validar_tabla
+
+spec = importlib.util.spec_from_file_location('lab175', os.path.join(RAIZ, 'LabCCNAMod11', 'lab175.py'))
+lab175 = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(lab175)
+
+# Cada cuántas filas se mete un conflicto de cada tipo
+CADA = 10_000
+
+
+def tabla_de(filas):
+    """Repite la tabla de crear_tabla_red, asigna direcciones y agrega conflictos"""
+    base = lab175.crear_tabla_red()
+    repeticiones = -(-filas // len(base))
+    df = pd.concat([base] * repeticiones, ignore_index=True).iloc[:filas].copy()
+    df = lab175.asignar_ips_automaticamente(df, '10.0.0.0/8')
+    con_ip = df.index[df['Dirección IP'] != ''].to_numpy()
+    ips = df['Dirección IP'].to_numpy()
+    df.loc[con_ip[1::CADA], 'Dirección IP'] = ips[con_ip[0::CADA]][:len(con_ip[1::CADA])]
+    df.loc[con_ip[2::CADA], 'Dirección IP'] = '10.0.0.0'
+    df.loc[con_ip[3::CADA], 'Gateway predeterminado'] = '172.16.0.1'
+    df.loc[con_ip[4::CADA], 'Máscara de subred'] = '255.0.255.0'
+    return df
+
+
+def main():
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'Filas':>10} {'Validar (s)':>12} {'Conflictos':>11}")
+    for filas in tamanos:
+        df = tabla_de(filas)
+        inicio = time.perf_counter()
+        conflictos = validar_tabla(df)
+        tiempo = time.perf_counter() - inicio
+        print(f"{filas:>10} {tiempo:>12.3f} {len(conflictos):>11}")
+    for tipo, cantidad in sorted(Counter(c['Tipo'] for c in conflictos).items()):
+        print(f"  {tipo}: {cantidad}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Mide planificar_vlsm con muchos requisitos aleatorios sobre un /8: la
+asignación buddy y la generación de la tabla de subredes en texto.
+
+Uso: python benchmarks/bench_vlsm.py [requisitos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.vlsm import planificar_vlsm
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Entre 1 y 199 hosts: en promedio entran en un /8 con holgura
+    hosts = np.random.default_rng(0).integers(1, 200, cantidad).tolist()
+
+    inicio = time.perf_counter()
+    plan = planificar_vlsm('10.0.0.0/8', hosts)
+    t_plan = time.perf_counter() - inicio
+    filas = sum(len(bloque['Subred']) for bloque in plan.bloques())
+    t_tabla = time.perf_counter() - inicio - t_plan
+
+    print(f"Requisitos: {cantidad}")
+    print(f"Asignación buddy:   {t_plan:.3f} s")
+    print(f"Tabla en texto:     {t_tabla:.3f} s ({filas} filas)")
+    for clave, valor in plan.fragmentacion().items():
+        print(f"  {clave}: {valor}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Herramientas compartidas para los scripts de los laboratorios CCNA
+"""
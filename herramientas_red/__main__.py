@@ -0,0 +1,8 @@
+"""
+Punto de entrada de `python -m herramientas_red` (ver herramientas_red.cli)
+"""
+import sys
+
+from herramientas_red.cli import main
+
+sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Asignación de direcciones IP por aritmética entera sobre la dirección de red.
+
+Nunca se materializa la lista de hosts: el N-ésimo host se calcula sumando
+sobre `network_address`, así que la memoria no depende del prefijo.
+
+NumPy se importa solo en las funciones por lotes: AsignadorHosts y
+asignar_por_reservas no lo cargan, y la línea de comandos las usa para
+las tablas chicas.
+"""
+import ipaddress
+
+# Reservas usadas por lab175: los routers toman las primeras IPs, los
+# switches van desplazados +10 y las PCs +20, todos con un contador compartido.
+# Las interfaces seriales salen de otra red (10.0.0.x /30) con el mismo contador.
+RESERVAS_LAB175 = [
+    {'Tipo': 'Router', 'Interfaces': ('G0/0', 'G0/1'), 'Desplazamiento': 0, 'Avanza': True, 'Gateway': False},
+    {'Tipo': 'Router', 'Interfaces': ('S0/0/0',), 'Desplazamiento': 0, 'Avanza': True, 'Gateway': False,
+     'Base': '10.0.0.0', 'Máscara': '255.255.255.252'},
+    {'Tipo': 'Switch', 'Interfaces': None, 'Desplazamiento': 10, 'Avanza': False, 'Gateway': True},
+    {'Tipo': 'PC', 'Interfaces': None, 'Desplazamiento': 20, 'Avanza': True, 'Gateway': True},
+]
+
+
+class AsignadorHosts:
+    """Calcula el N-ésimo host de una red sin generar la lista de hosts"""
+
+    def __init__(self, red):
+        self.red = ipaddress.ip_network(red, strict=False)
+        self._clase = type(self.red.network_address)
+        red_int = int(self.red.network_address)
+        total = self.red.num_addresses
+
+        # Mismo criterio que ipaddress.hosts(): /31, /32, /127 y /128 usan todas
+        # las direcciones; IPv4 excluye red y broadcast, IPv6 solo la de red
+        if self.red.prefixlen >= self.red.max_prefixlen - 1:
+            self.primero = red_int
+            self.cantidad = total
+        elif self.red.version == 4:
+            self.primero = red_int + 1
+            self.cantidad = total - 2
+        else:
+            self.primero = red_int + 1
+            self.cantidad = total - 1
+
+    @property
+    def mascara(self):
+        return str(self.red.netmask)
+
+    def entero(self, n):
+        """Devuelve el host N como entero (admite índices negativos como una lista)"""
+        if n < 0:
+            n += self.cantidad
+        if n < 0 or n >= self.cantidad:
+            raise IndexError(f"La red {self.red} no tiene un host en la posición {n}")
+        return self.primero + n
+
+    def host(self, n):
+        """Devuelve el host N como texto"""
+        return str(self._clase(self.entero(n)))
+
+    def __getitem__(self, n):
+        return self._clase(self.entero(n))
+
+
+def indice_reserva(tipo, interfaz, reservas=RESERVAS_LAB175):
+    """Devuelve la posición de la primera reserva que aplica, o -1"""
+    for i, reserva in enumerate(reservas):
+        if reserva['Tipo'] != tipo:
+            continue
+        patrones = reserva['Interfaces']
+        if patrones is None or any(patron in interfaz for patron in patrones):
+            return i
+    return -1
+
+
+def buscar_reserva(tipo, interfaz, reservas=RESERVAS_LAB175):
+    """Devuelve la primera reserva que aplica a un tipo/interfaz, o None"""
+    i = indice_reserva(tipo, interfaz, reservas)
+    return reservas[i] if i >= 0 else None
+
+
+def asignar_por_reservas(filas, asignador, reservas=RESERVAS_LAB175):
+    """
+    Recorre pares (tipo, interfaz) y produce (ip, mascara, gateway) por fila,
+    o None si ninguna reserva aplica. El gateway es None cuando no se asigna.
+    """
+    contador = 0
+    for tipo, interfaz in filas:
+        reserva = buscar_reserva(tipo, interfaz, reservas)
+        if reserva is None:
+            yield None
+            continue
+
+        posicion = contador + reserva['Desplazamiento']
+        if 'Base' in reserva:
+            ip = str(ipaddress.ip_address(int(ipaddress.ip_address(reserva['Base'])) + posicion))
+            mascara = reserva['Máscara']
+        else:
+            ip = asignador.host(posicion)
+            mascara = asignador.mascara
+
+        gateway = asignador.host(0) if reserva['Gateway'] else None
+        if reserva['Avanza']:
+            contador += 1
+        yield ip, mascara, gateway
+
+
+def asignar_vectorizado(tipos, interfaces, asignador, reservas=RESERVAS_LAB175):
+    """
+    Versión por lotes de asignar_por_reservas. Agrupa las filas por
+    (tipo, interfaz), calcula el contador compartido con una suma acumulada y
+    convierte todas las IPs a texto en una sola pasada.
+
+    Devuelve tres arreglos (ips, mascaras, gateways) con None donde no se asigna.
+    En IPv6 las direcciones se suman como pares de uint64.
+    """
+    import numpy as np
+
+    from herramientas_red.direcciones import ipv4_a_texto, ipv6_a_texto, par_ipv6, sumar_ipv6
+
+    # La reserva se busca una vez por par (tipo, interfaz) distinto, no por fila
+    pares = {}
+    codigos = np.fromiter((pares.setdefault(par, len(pares)) for par in zip(tipos, interfaces)),
+                          dtype=np.int64)
+    por_par = np.array([indice_reserva(tipo, interfaz, reservas) for tipo, interfaz in pares],
+                       dtype=np.int64)
+    reserva = por_par[codigos] if len(codigos) else codigos
+
+    # Tablas por reserva con una entrada extra al final para "sin reserva":
+    # el índice -1 cae justo en esa entrada
+    desplazamiento = np.array([r['Desplazamiento'] for r in reservas] + [0], dtype=np.int64)
+    avanza = np.array([r['Avanza'] for r in reservas] + [False])
+    con_gateway = np.array([r['Gateway'] for r in reservas] + [False])
+    con_base = np.array(['Base' in r for r in reservas] + [False])
+    base = np.array([int(ipaddress.ip_address(r['Base'])) if 'Base' in r else 0 for r in reservas] + [0],
+                    dtype=np.int64)
+    mascara = np.array([r.get('Máscara', asignador.mascara) for r in reservas] + [None], dtype=object)
+
+    asignada = reserva >= 0
+    avanza_fila = avanza[reserva].astype(np.int64)
+    # Valor del contador compartido antes de procesar cada fila
+    contador = np.cumsum(avanza_fila) - avanza_fila
+    posicion = contador + desplazamiento[reserva]
+
+    base_fila = con_base[reserva]
+    del_pool = asignada & ~base_fila
+    if del_pool.any() and posicion[del_pool].max() >= asignador.cantidad:
+        raise IndexError(f"La red {asignador.red} no tiene suficientes hosts para la tabla")
+    ips = np.full(len(reserva), None, dtype=object)
+    if asignador.red.version == 4:
+        enteros = np.where(base_fila, base[reserva] + posicion, asignador.primero + posicion)
+        ips[asignada] = ipv4_a_texto(enteros[asignada])
+    else:
+        # Las reservas con 'Base' (enlaces seriales) siguen siendo IPv4
+        ips[base_fila] = ipv4_a_texto((base[reserva] + posicion)[base_fila])
+        ips[del_pool] = ipv6_a_texto(*sumar_ipv6(*par_ipv6(asignador.primero), 0, posicion[del_pool]))
+    gateways = np.full(len(reserva), None, dtype=object)
+    gateway_fila = con_gateway[reserva]
+    if gateway_fila.any():
+        gateways[gateway_fila] = asignador.host(0)
+    return ips, mascara[reserva], gateways
+
+
+def asignar_eui64(red, macs):
+    """
+    Direcciones IPv6 de configuración automática (SLAAC) con identificador
+    EUI-64: el /64 de la red más la MAC de cada interfaz. Devuelve un arreglo
+    de textos con None donde la MAC no es válida.
+    """
+    import numpy as np
+
+    from herramientas_red.direcciones import eui64, ipv6_a_texto, par_ipv6, texto_a_mac
+
+    red = ipaddress.IPv6Network(red, strict=False)
+    if red.prefixlen > 64:
+        raise ValueError(f"EUI-64 necesita un prefijo /64 o más corto, no /{red.prefixlen}")
+    enteros, validas = texto_a_mac(macs)
+    altos, _ = par_ipv6(int(red.network_address))
+    direcciones = np.full(len(enteros), None, dtype=object)
+    direcciones[validas] = ipv6_a_texto(np.full(int(validas.sum()), altos), eui64(enteros[validas]))
+    return direcciones
@@ -0,0 +1,96 @@
+"""
+Caché en disco de resultados por contenido de archivo.
+
+La clave es el SHA-256 del archivo más el nombre y la versión del
+extractor, así que mover o renombrar un archivo no invalida nada y cambiar
+el extractor (subiendo su versión) descarta los resultados viejos. Cada
+entrada es un JSON aparte, escrito de forma atómica.
+"""
+import hashlib
+import json
+import os
+
+TAM_LECTURA = 1 << 20
+
+
+def carpeta_por_defecto():
+    """$HERRAMIENTAS_RED_CACHE, o herramientas_red dentro de $XDG_CACHE_HOME (~/.cache)"""
+    if os.environ.get('HERRAMIENTAS_RED_CACHE'):
+        return os.environ['HERRAMIENTAS_RED_CACHE']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'herramientas_red')
+
+
+def hash_archivo(ruta):
+    resumen = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAM_LECTURA), b''):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+class CacheContenido:
+    """Resultados JSON de un extractor, guardados por hash de contenido"""
+
+    def __init__(self, espacio, version, carpeta=None):
+        self.carpeta = os.path.join(carpeta or carpeta_por_defecto(), f"{espacio}-v{version}")
+
+    def _ruta(self, clave):
+        return os.path.join(self.carpeta, clave[:2], f"{clave}.json")
+
+    def obtener(self, clave):
+        """Devuelve el valor guardado o None si no hay (o está dañado)"""
+        try:
+            with open(self._ruta(clave), encoding='utf-8') as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return None
+
+    def guardar(self, clave, valor):
+        ruta = self._ruta(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(valor, archivo, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+
+def procesar_archivos(rutas, funcion, cache, procesos=None):
+    """
+    Aplica `funcion(ruta)` a cada archivo que no esté en la caché, en un
+    pool de procesos, y devuelve (resultados, errores): dicts ruta -> valor
+    y ruta -> mensaje. `funcion` debe ser importable (nivel de módulo).
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    resultados, errores, pendientes = {}, {}, {}
+    for ruta in rutas:
+        clave = hash_archivo(ruta)
+        valor = cache.obtener(clave) if cache is not None else None
+        if valor is None:
+            pendientes[ruta] = clave
+        else:
+            resultados[ruta] = valor
+
+    def registrar(ruta, calcular):
+        try:
+            valor = calcular()
+        except Exception as e:
+            errores[ruta] = f"{type(e).__name__}: {e}"
+            return
+        resultados[ruta] = valor
+        if cache is not None:
+            cache.guardar(pendientes[ruta], valor)
+
+    if len(pendientes) <= 1 or procesos == 1:
+        # Con un solo archivo no vale la pena levantar procesos
+        for ruta in pendientes:
+            registrar(ruta, lambda: funcion(ruta))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = {pool.submit(funcion, ruta): ruta for ruta in pendientes}
+            for futuro in as_completed(futuros):
+                registrar(futuros[futuro], futuro.result)
+
+    # Mismo orden que las rutas recibidas
+    return {ruta: resultados[ruta] for ruta in rutas if ruta in resultados}, errores
@@ -0,0 +1,153 @@
+"""
+Calculadora de subredes IPv4 por lotes: de pares (IP, máscara) a red,
+broadcast, primera y última IP utilizable, cantidad de hosts, wildcard y
+máscara en binario.
+
+Todo lo que depende solo del prefijo sale de tablas de 33 entradas (una por
+prefijo /0../32), así que cada fila cuesta un par de operaciones de bits y
+búsquedas en tabla. Las columnas se pueden pedir numéricas (calcular) o en
+texto por bloques para los exportadores (bloques_calculo).
+"""
+import numpy as np
+
+from herramientas_red.direcciones import MASCARAS, ipv4_a_texto, mascara_a_prefijo, texto_a_ipv4
+
+COLUMNAS_CALCULO = [
+    'Dirección IP', 'Prefijo', 'Máscara de subred', 'Wildcard', 'Máscara en binario',
+    'Dirección de red', 'Primera IP utilizable', 'Última IP utilizable', 'Dirección broadcast',
+    'Hosts utilizables'
+]
+
+# Con la máscara original se agregan las respuestas de los ejercicios de subneteo
+COLUMNAS_EJERCICIO = ['Bits de subred', 'Subredes creadas', 'Bits de host']
+
+# Filas por bloque al generar columnas de texto
+TAM_BLOQUE = 1 << 18
+
+_PREFIJOS = np.arange(33)
+PREFIJOS_TEXTO = np.array([f'/{p}' for p in range(33)], dtype=object)
+WILDCARDS = ~MASCARAS
+MASCARAS_TEXTO = ipv4_a_texto(MASCARAS)
+WILDCARDS_TEXTO = ipv4_a_texto(WILDCARDS)
+MASCARAS_BINARIO = np.array(
+    ['.'.join(f'{int(m):032b}'[i:i + 8] for i in range(0, 32, 8)) for m in MASCARAS], dtype=object
+)
+# Mismo criterio que ipaddress.hosts(): /31 y /32 usan todas sus direcciones
+HOSTS = np.where(_PREFIJOS < 31, (1 << (32 - _PREFIJOS)) - 2, 1 << (32 - _PREFIJOS)).astype(np.int64)
+_DESDE = (_PREFIJOS < 31).astype(np.uint32)
+
+
+def _factorizar(valores):
+    # Las máscaras se repiten mucho: se convierten solo las distintas
+    distintos = {}
+    codigos = np.fromiter((distintos.setdefault(valor, len(distintos)) for valor in valores),
+                          dtype=np.int64, count=len(valores))
+    return codigos, list(distintos)
+
+
+def _ips(ips):
+    """Enteros uint32 y válidos; acepta textos o enteros"""
+    ips = np.asarray(ips)
+    if ips.dtype.kind in 'iu':
+        validas = (ips >= 0) & (ips <= 0xFFFFFFFF)
+        return np.where(validas, ips, 0).astype(np.uint32), validas
+    return texto_a_ipv4(ips)
+
+
+def _prefijos(mascaras, filas):
+    """Prefijos (int64) y válidos; acepta un valor para todas las filas, enteros o textos"""
+    if isinstance(mascaras, (str, int, np.integer)):
+        prefijos, validos = _prefijos([mascaras], 1)
+        return np.full(filas, prefijos[0]), np.full(filas, validos[0])
+    tipo = getattr(mascaras, 'dtype', None)
+    if tipo is not None and tipo.kind in 'iu':
+        validos = (mascaras >= 0) & (mascaras <= 32)
+        return np.where(validos, mascaras, 0).astype(np.int64), np.asarray(validos)
+    codigos, distintas = _factorizar(list(mascaras))
+    prefijos, validos = mascara_a_prefijo([str(m) if isinstance(m, (int, np.integer)) else m for m in distintas])
+    return prefijos[codigos], validos[codigos]
+
+
+def calcular(ips, mascaras, originales=None):
+    """
+    Columnas numéricas de la calculadora para cada par (IP, máscara). Las
+    máscaras pueden ser textos ('255.255.255.192', '/26'), prefijos enteros
+    o un solo valor para todas las filas. Devuelve un dict con 'Dirección IP',
+    'Prefijo' y las direcciones como uint32, 'Hosts utilizables' y 'Válida';
+    con las máscaras originales agrega las columnas de COLUMNAS_EJERCICIO.
+    """
+    enteros, validas = _ips(ips)
+    prefijos, con_mascara = _prefijos(mascaras, len(enteros))
+    validas = validas & con_mascara
+    red = enteros & MASCARAS[prefijos]
+    broadcast = red | WILDCARDS[prefijos]
+    columnas = {
+        'Dirección IP': enteros,
+        'Prefijo': prefijos.astype(np.uint8),
+        'Dirección de red': red,
+        'Primera IP utilizable': red + _DESDE[prefijos],
+        'Última IP utilizable': broadcast - _DESDE[prefijos],
+        'Dirección broadcast': broadcast,
+        'Hosts utilizables': HOSTS[prefijos],
+        'Válida': validas,
+    }
+    if originales is not None:
+        originales, con_original = _prefijos(originales, len(enteros))
+        bits = prefijos - originales
+        columnas['Válida'] = validas = validas & con_original & (bits >= 0)
+        columnas['Bits de subred'] = np.where(validas, bits, 0)
+        columnas['Subredes creadas'] = np.where(validas, np.left_shift(1, np.maximum(bits, 0)), 0)
+        columnas['Bits de host'] = 32 - prefijos
+    return columnas
+
+
+def texto_calculo(columnas):
+    """
+    Pasa a texto las columnas de calcular, en el orden de COLUMNAS_CALCULO
+    (y COLUMNAS_EJERCICIO si están). Las filas no válidas quedan en 'N/D'.
+    """
+    prefijos = columnas['Prefijo'].astype(np.int64)
+    texto = {
+        'Dirección IP': ipv4_a_texto(columnas['Dirección IP']),
+        'Prefijo': PREFIJOS_TEXTO[prefijos],
+        'Máscara de subred': MASCARAS_TEXTO[prefijos],
+        'Wildcard': WILDCARDS_TEXTO[prefijos],
+        'Máscara en binario': MASCARAS_BINARIO[prefijos],
+    }
+    for nombre in COLUMNAS_CALCULO[5:9]:
+        texto[nombre] = ipv4_a_texto(columnas[nombre])
+    for nombre in ['Hosts utilizables'] + COLUMNAS_EJERCICIO:
+        if nombre in columnas:
+            texto[nombre] = columnas[nombre]
+
+    invalidas = ~columnas['Válida']
+    if invalidas.any():
+        for nombre, valores in texto.items():
+            texto[nombre] = valores = valores.astype(object)
+            valores[invalidas] = 'N/D'
+    return texto
+
+
+def bloques_calculo(ips, mascaras, originales=None, tam_bloque=TAM_BLOQUE):
+    """
+    Genera bloques de texto de la calculadora (dicts columna -> arreglo),
+    listos para Seccion.desde_bloques o un DataFrame
+    """
+    enteros, validas = _ips(ips)
+    prefijos, con_mascara = _prefijos(mascaras, len(enteros))
+    if originales is not None:
+        originales, con_original = _prefijos(originales, len(enteros))
+    for inicio in range(0, len(enteros), tam_bloque):
+        tramo = slice(inicio, inicio + tam_bloque)
+        columnas = calcular(enteros[tramo], prefijos[tramo],
+                            None if originales is None else originales[tramo])
+        # Las IPs y máscaras ya se convirtieron: se marcan las que no eran válidas
+        columnas['Válida'] &= validas[tramo] & con_mascara[tramo]
+        if originales is not None:
+            columnas['Válida'] &= con_original[tramo]
+        yield texto_calculo(columnas)
+
+
+def fila_mascara(prefijo):
+    """('/26', '11111111.11111111.11111111.11000000', '255.255.255.192')"""
+    return PREFIJOS_TEXTO[prefijo], MASCARAS_BINARIO[prefijo], MASCARAS_TEXTO[prefijo]
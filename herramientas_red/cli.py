@@ -0,0 +1,319 @@
+"""
+Línea de comandos para usar las herramientas desde scripts y cron, sin menús:
+
+    python -m herramientas_red subnet 192.168.0.0/24 26 -o subredes.csv
+    python -m herramientas_red assign tabla.csv --red 192.168.1.0/24
+    python -m herramientas_red generate tabla.json -o configuraciones/
+    python -m herramientas_red export tabla.csv -o tabla.xlsx
+    python -m herramientas_red diff anterior.xlsx nuevo.xlsx -o cambios.csv
+    python -m herramientas_red batch trabajos.txt
+
+Las tablas se leen en JSON (lista de objetos) o CSV con encabezado, de un
+archivo o de la entrada estándar (-), y se escriben igual a un archivo o a la
+salida estándar; .xlsx y .parquet van por el subsistema de exportación.
+
+Al arrancar solo se importa la biblioteca estándar: NumPy, pandas y los
+escritores de Excel se importan dentro del comando que los usa, así que
+--help, subnet con pocas subredes y assign con tablas chicas no los cargan.
+batch lee un comando por línea y los ejecuta todos en este proceso, pagando
+las importaciones una sola vez. --medir escribe un reporte JSON con el tiempo,
+las filas y el pico de memoria de cada etapa (ver medicion).
+"""
+import argparse
+import csv
+import json
+import os
+import shlex
+import sys
+from functools import lru_cache
+from itertools import chain
+
+from herramientas_red import medicion
+
+# Formatos de tabla que se leen y escriben sin el subsistema de exportación
+FORMATOS_TEXTO = ('json', 'csv')
+
+# Hasta cuántas filas assign usa asignar_por_reservas (sin NumPy)
+MAX_FILAS_SIN_NUMPY = 20_000
+
+COLUMNAS_ASIGNADAS = ('Dirección IP', 'Máscara de subred', 'Gateway predeterminado')
+
+
+def _formato(archivo, formato=None):
+    """Formato de una tabla: el pedido, el de la extensión o None si no se sabe"""
+    if formato:
+        return formato
+    if archivo in (None, '-'):
+        return None
+    extension = os.path.splitext(archivo)[1].lower().lstrip('.')
+    return extension or None
+
+
+def leer_tabla(entrada='-', formato=None):
+    """
+    Lee una tabla JSON o CSV de un archivo o de la entrada estándar ('-') y
+    devuelve (columnas, filas) con las filas como tuplas. Sin formato ni
+    extensión se reconoce por el primer carácter.
+    """
+    if entrada == '-':
+        texto = sys.stdin.read()
+    else:
+        with open(entrada, encoding='utf-8-sig', newline='') as archivo:
+            texto = archivo.read()
+    formato = _formato(entrada, formato) or ('json' if texto.lstrip()[:1] in ('[', '{') else 'csv')
+
+    if formato == 'csv':
+        lector = csv.reader(texto.splitlines())
+        columnas = next(lector, [])
+        return columnas, [tuple(fila) + ('',) * (len(columnas) - len(fila)) for fila in lector if fila]
+    if formato != 'json':
+        raise ValueError(f"Formato de entrada no soportado: '{formato}' (usa json o csv)")
+
+    datos = json.loads(texto)
+    if isinstance(datos, dict):
+        datos = [datos]
+    if not all(isinstance(fila, dict) for fila in datos):
+        raise ValueError(f"{entrada}: el JSON debe ser una lista de objetos")
+    # Columnas en el orden en que aparecen
+    columnas = list(dict.fromkeys(columna for fila in datos for columna in fila))
+    return columnas, [tuple(fila.get(columna) for columna in columnas) for fila in datos]
+
+
+def escribir_tabla(columnas, filas, salida=None, formato=None, nombre_hoja='Sheet1'):
+    """
+    Escribe las filas (tuplas) a medida que llegan, en JSON o CSV, a un
+    archivo o a la salida estándar (None o '-'); la extensión del archivo
+    manda sobre el formato. Otras extensiones se exportan con exportacion. Devuelve cuántas filas se escribieron.
+    """
+    formato = _formato(salida) or formato or 'json'
+    if formato not in FORMATOS_TEXTO:
+        from herramientas_red.exportacion import exportar_filas
+
+        return exportar_filas(filas, columnas, salida, nombre_hoja=nombre_hoja)
+
+    # La primera fila se pide antes de abrir la salida: si el generador
+    # falla (una red inválida) no queda nada escrito a medias
+    filas = iter(filas)
+    primera = next(filas, None)
+    filas = chain((primera,), filas) if primera is not None else ()
+    archivo = sys.stdout if salida in (None, '-') else open(salida, 'w', encoding='utf-8', newline='')
+    escritas = 0
+    with medicion.etapa('escribir_tabla', formato=formato) as medida:
+        try:
+            if formato == 'csv':
+                escritor = csv.writer(archivo, lineterminator='\n')
+                escritor.writerow(columnas)
+                for fila in filas:
+                    escritor.writerow(['' if valor is None else valor for valor in fila])
+                    escritas += 1
+            else:
+                archivo.write('[')
+                for fila in filas:
+                    archivo.write(',\n ' if escritas else '\n ')
+                    archivo.write(json.dumps(dict(zip(columnas, fila)), ensure_ascii=False))
+                    escritas += 1
+                archivo.write('\n]\n' if escritas else ']\n')
+        finally:
+            if archivo is not sys.stdout:
+                archivo.close()
+        medida.filas = escritas
+    return escritas
+
+
+def _red_y_prefijo(texto):
+    red, _, prefijo = texto.partition('/')
+    if not prefijo.isdigit():
+        raise ValueError(f"La red '{texto}' debe tener prefijo, por ejemplo 192.168.0.0/24")
+    return red, int(prefijo)
+
+
+def comando_subnet(args):
+    """Tabla de subredes de igual tamaño de una red"""
+    from herramientas_red.subredes import COLUMNAS_SUBREDES, iterar_subredes
+
+    red, prefijo = _red_y_prefijo(args.red)
+    filas = iterar_subredes(red, prefijo, args.nuevo_prefijo, primera=args.primera, cantidad=args.cantidad)
+    escribir_tabla(COLUMNAS_SUBREDES, filas, args.salida, args.formato, nombre_hoja='Subredes')
+
+
+def comando_assign(args):
+    """Asigna IPs, máscaras y gateways con las reservas de lab175"""
+    from herramientas_red.asignacion import AsignadorHosts, asignar_por_reservas, asignar_vectorizado
+
+    columnas, filas = leer_tabla(args.entrada, args.formato_entrada)
+    faltan = [columna for columna in ('Tipo', 'Interfaz') if columna not in columnas]
+    if faltan:
+        raise ValueError(f"{args.entrada}: faltan las columnas {', '.join(faltan)}")
+    tipos = [fila[columnas.index('Tipo')] for fila in filas]
+    interfaces = [fila[columnas.index('Interfaz')] for fila in filas]
+
+    asignador = AsignadorHosts(args.red)
+    if len(filas) <= MAX_FILAS_SIN_NUMPY:
+        asignadas = [(None, None, None) if asignada is None else asignada
+                     for asignada in asignar_por_reservas(zip(tipos, interfaces), asignador)]
+    else:
+        asignadas = zip(*(valores.tolist() for valores in asignar_vectorizado(tipos, interfaces, asignador)))
+
+    # Las filas sin reserva conservan sus valores
+    columnas = columnas + [columna for columna in COLUMNAS_ASIGNADAS if columna not in columnas]
+    posiciones = [columnas.index(columna) for columna in COLUMNAS_ASIGNADAS]
+    salida = []
+    for fila, valores in zip(filas, asignadas):
+        fila = list(fila) + [''] * (len(columnas) - len(fila))
+        for posicion, valor in zip(posiciones, valores):
+            if valor is not None:
+                fila[posicion] = valor
+        salida.append(tuple(fila))
+    escribir_tabla(columnas, salida, args.salida, args.formato or _formato(args.entrada, args.formato_entrada),
+                   nombre_hoja='Direccionamiento')
+
+
+def comando_generate(args):
+    """Configuraciones IOS por dispositivo"""
+    from herramientas_red.configuracion import (configuraciones, escribir_archivo_configuraciones,
+                                                escribir_configuraciones)
+    from herramientas_red.registros import TablaDirecciones
+
+    columnas, filas = leer_tabla(args.entrada, args.formato_entrada)
+    tabla = TablaDirecciones(columnas, filas)
+    if args.salida in (None, '-'):
+        for _, texto in configuraciones(tabla):
+            sys.stdout.write(texto)
+            sys.stdout.write('\n')
+    elif args.salida.endswith(('/', os.sep)) or os.path.isdir(args.salida):
+        escritos = escribir_configuraciones(tabla, args.salida, procesos=args.procesos)
+        print(f"✅ {escritos} configuraciones escritas en {args.salida}")
+    else:
+        escritos = escribir_archivo_configuraciones(tabla, args.salida)
+        print(f"✅ {escritos} configuraciones escritas en {args.salida}")
+
+
+def comando_export(args):
+    """Convierte una tabla JSON o CSV a .xlsx, .csv o .parquet"""
+    columnas, filas = leer_tabla(args.entrada, args.formato_entrada)
+    escritas = escribir_tabla(columnas, filas, args.salida, args.formato, nombre_hoja=args.hoja)
+    if args.salida != '-':
+        print(f"✅ {escritas} filas exportadas a {args.salida}")
+
+
+def comando_diff(args):
+    """Compara dos libros exportados por sus columnas clave y escribe una fila por diferencia"""
+    from herramientas_red.diferencias import comparar_libros
+
+    claves = [clave.strip() for clave in args.claves.split(',') if clave.strip()]
+    diferencias = comparar_libros(args.anterior, args.nuevo, claves=claves, hoja=args.hoja)
+    escribir_tabla(diferencias.encabezados(), diferencias.filas(), args.salida, args.formato)
+    resumen = diferencias.resumen()
+    print(f"✅ {resumen['agregadas']} filas agregadas, {resumen['eliminadas']} eliminadas "
+          f"y {resumen['cambiadas']} cambiadas", file=sys.stderr)
+
+
+def comando_batch(args):
+    """Ejecuta un comando por línea; las líneas vacías y las que empiezan con # se saltean"""
+    errores = 0
+    for entrada in args.archivos:
+        archivo = sys.stdin if entrada == '-' else open(entrada, encoding='utf-8')
+        try:
+            for numero, linea in enumerate(archivo, 1):
+                argumentos = shlex.split(linea, comments=True)
+                if not argumentos:
+                    continue
+                if argumentos[0] in ('batch', 'lote'):
+                    print(f"❌ {entrada}:{numero}: batch no se puede anidar", file=sys.stderr)
+                    errores += 1
+                elif main(argumentos) != 0:
+                    print(f"❌ {entrada}:{numero}: falló '{linea.strip()}'", file=sys.stderr)
+                    errores += 1
+        finally:
+            if archivo is not sys.stdin:
+                archivo.close()
+    return 1 if errores else 0
+
+
+@lru_cache(maxsize=None)
+def _parser():
+    # Se arma una vez por proceso: batch lo reusa en cada línea
+    parser = argparse.ArgumentParser(
+        prog='python -m herramientas_red',
+        description="Herramientas de direccionamiento de los laboratorios CCNA, sin menús."
+    )
+    parser.add_argument('--medir', metavar='REPORTE',
+                        help="mide cada etapa y escribe el reporte JSON en este archivo")
+    comandos = parser.add_subparsers(dest='comando', required=True, metavar='comando')
+
+    def tabla_de_entrada(sub):
+        sub.add_argument('entrada', nargs='?', default='-', help="tabla JSON o CSV (- o nada: entrada estándar)")
+        sub.add_argument('--formato-entrada', choices=FORMATOS_TEXTO, help="si la extensión no lo indica")
+
+    def tabla_de_salida(sub, requerida=False):
+        sub.add_argument('-o', '--salida', required=requerida,
+                         help="archivo .json, .csv, .xlsx o .parquet (por defecto la salida estándar)")
+        sub.add_argument('--formato', choices=FORMATOS_TEXTO, help="formato de la salida estándar")
+
+    sub = comandos.add_parser('subnet', aliases=['subredes'], help="divide una red en subredes de igual tamaño")
+    sub.add_argument('red', help="red base con prefijo, por ejemplo 192.168.0.0/24 o 2001:db8::/48")
+    sub.add_argument('nuevo_prefijo', type=int, help="prefijo de las subredes")
+    sub.add_argument('--primera', type=int, default=0, help="índice de la primera subred (desde 0)")
+    sub.add_argument('--cantidad', type=int, help="cuántas subredes (por defecto todas)")
+    tabla_de_salida(sub)
+    sub.set_defaults(funcion=comando_subnet)
+
+    sub = comandos.add_parser('assign', aliases=['asignar'], help="asigna IPs con las reservas de lab175")
+    tabla_de_entrada(sub)
+    sub.add_argument('--red', default='192.168.1.0/24', help="red de los hosts (por defecto 192.168.1.0/24)")
+    tabla_de_salida(sub)
+    sub.set_defaults(funcion=comando_assign)
+
+    sub = comandos.add_parser('generate', aliases=['generar'], help="genera configuraciones IOS")
+    tabla_de_entrada(sub)
+    sub.add_argument('-o', '--salida', help="archivo único, o carpeta (terminada en /) con uno por dispositivo")
+    sub.add_argument('--procesos', type=int, help="procesos al escribir un archivo por dispositivo")
+    sub.set_defaults(funcion=comando_generate)
+
+    sub = comandos.add_parser('export', aliases=['exportar'], help="convierte una tabla a .xlsx, .csv o .parquet")
+    tabla_de_entrada(sub)
+    tabla_de_salida(sub, requerida=True)
+    sub.add_argument('--hoja', default='Sheet1', help="nombre de la hoja en Excel")
+    sub.set_defaults(funcion=comando_export)
+
+    sub = comandos.add_parser('diff', aliases=['comparar'], help="compara dos tablas .xlsx exportadas")
+    sub.add_argument('anterior', help="libro .xlsx anterior")
+    sub.add_argument('nuevo', help="libro .xlsx nuevo")
+    sub.add_argument('--claves', default='Dispositivo,Interfaz', help="columnas clave separadas por comas")
+    sub.add_argument('--hoja', help="leer solo esta hoja (por defecto, las que tienen la tabla)")
+    tabla_de_salida(sub)
+    sub.set_defaults(funcion=comando_diff)
+
+    sub = comandos.add_parser('batch', aliases=['lote'], help="ejecuta muchos comandos en un solo proceso")
+    sub.add_argument('archivos', nargs='*', default=['-'], help="archivos con un comando por línea (- o nada: entrada estándar)")
+    sub.set_defaults(funcion=comando_batch)
+    return parser
+
+
+def main(argv=None):
+    """Ejecuta un comando y devuelve el código de salida"""
+    try:
+        args = _parser().parse_args(argv)
+    except SystemExit as salida:
+        # argparse sale con 0 en --help y con 2 en un error de uso
+        return salida.code or 0
+    if not args.medir or medicion.activa():
+        return _ejecutar(args)
+    medicion.activar()
+    try:
+        return _ejecutar(args)
+    finally:
+        medicion.escribir_reporte(args.medir, medicion.desactivar())
+
+
+def _ejecutar(args):
+    try:
+        with medicion.etapa(args.comando):
+            return args.funcion(args) or 0
+    except (OSError, ValueError, IndexError, KeyError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
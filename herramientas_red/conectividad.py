@@ -0,0 +1,205 @@
+"""
+Alcance entre las interfaces de una tabla de direcciones IPv4, sin simular
+paquetes.
+
+Cada interfaz se ubica en un segmento: el de la interfaz de router que es
+su gateway o, si el gateway no es de ningún router, el de la subred de
+router que contiene su IP (prefijo más largo). Sin router, el segmento es
+su propia subred. Los routers que comparten un segmento quedan conectados,
+así que dos segmentos se alcanzan si sus routers están en la misma
+componente.
+
+Dos interfaces del mismo segmento y con el mismo problema (ninguno, IP fuera
+del segmento, máscara distinta, gateway mal puesto) se comportan igual
+frente a cualquier otra, así que la matriz se calcula entre esas clases:
+miles de hosts cuestan lo que sus pocos cientos de subredes.
+"""
+import numpy as np
+
+from herramientas_red.direcciones import MASCARAS, ipv4_a_texto, mascara_a_prefijo, texto_a_ipv4
+from herramientas_red.rutas import TrieRutas
+from herramientas_red.validacion import filas_router, rellenar_dispositivos
+
+# Problema de cada interfaz, en orden de prioridad al informar
+SIN_PROBLEMA, PROBLEMA_IP, PROBLEMA_MASCARA, PROBLEMA_GATEWAY = 0, 1, 2, 3
+
+# Resultado de una prueba entre clases: 0 es éxito y el resto se informa
+# en este orden (primero lo que falla en el origen)
+OK, IP_ORIGEN, MASCARA_ORIGEN, IP_DESTINO, MASCARA_DESTINO, GATEWAY_ORIGEN, GATEWAY_DESTINO, SIN_RUTA = range(8)
+RESULTADOS = ['Sí', 'IP origen', 'Máscara origen', 'IP destino', 'Máscara destino',
+              'Gateway origen', 'Gateway destino', 'Sin ruta']
+
+
+def _claves(redes, prefijos):
+    # Un segmento es (red, prefijo) en un solo entero
+    return (np.asarray(redes, dtype=np.uint64) << np.uint64(6)) | np.asarray(prefijos, dtype=np.uint64)
+
+
+def _componentes(routers, segmentos, cantidad):
+    """Componente de cada segmento según los routers que lo tocan (-1 si ninguno)"""
+    padre = list(range(cantidad))
+
+    def raiz(nodo):
+        while padre[nodo] != nodo:
+            padre[nodo] = padre[padre[nodo]]
+            nodo = padre[nodo]
+        return nodo
+
+    primero = {}
+    for router, segmento in zip(routers, segmentos):
+        # Todos los segmentos de un router quedan unidos al primero que se vio
+        otro = primero.setdefault(router, segmento)
+        padre[raiz(segmento)] = raiz(otro)
+    con_router = np.zeros(cantidad, dtype=bool)
+    con_router[list(segmentos)] = True
+    return np.array([raiz(s) if con_router[s] else -1 for s in range(cantidad)], dtype=np.int64)
+
+
+class Conectividad:
+    """Clases de interfaces equivalentes y alcance entre ellas"""
+
+    def __init__(self, ips, mascaras, gateways, dispositivos, interfaces=None, tipos=None):
+        self.dispositivos = rellenar_dispositivos(dispositivos)
+        self.interfaces = None if interfaces is None else list(interfaces)
+        gateways = [str(gateway or '').strip() for gateway in gateways]
+        filas = len(self.dispositivos)
+        ips, con_ip = texto_a_ipv4(list(ips))
+        prefijos, con_mascara = mascara_a_prefijo(list(mascaras))
+        gateway, con_gateway = texto_a_ipv4(gateways)
+        es_router = np.zeros(filas, dtype=bool)
+        es_router[filas_router(self.dispositivos, gateways, tipos)] = True
+        self.ips = ips
+
+        # Segmentos de los routers y trie para ubicar al resto
+        routers = np.flatnonzero(es_router & con_ip & con_mascara)
+        redes = ips & MASCARAS[prefijos]
+        clave_router = _claves(redes[routers], prefijos[routers])
+        trie = TrieRutas(ips[routers], prefijos[routers])
+
+        hosts = np.flatnonzero(~es_router & con_ip)
+        clave = _claves(redes, np.where(con_mascara, prefijos, 32))
+        # Sin routers el trie no tiene rutas y todo queda en -1
+        dueno_gateway = trie.buscar(gateway[hosts])
+        ip_dueno = np.append(ips[routers], np.uint32(0))[dueno_gateway]
+        exacto = con_gateway[hosts] & (dueno_gateway >= 0) & (ip_dueno == gateway[hosts])
+        dueno = np.where(exacto, dueno_gateway, trie.buscar(ips[hosts]))
+        clave[hosts] = np.where(dueno >= 0, np.append(clave_router, np.uint64(0))[dueno], clave[hosts])
+
+        con_ip_fila = np.flatnonzero(con_ip)
+        self.filas = con_ip_fila
+        unicas, segmento = np.unique(clave[con_ip_fila], return_inverse=True)
+        self.segmentos = unicas
+        self.segmento = np.full(filas, -1, dtype=np.int64)
+        self.segmento[con_ip_fila] = segmento
+        prefijo_segmento = (unicas & np.uint64(63)).astype(np.int64)
+        red_segmento = (unicas >> np.uint64(6)).astype(np.uint32)
+
+        # Problemas de cada interfaz con IP
+        problema = np.zeros(filas, dtype=np.int64)
+        s = self.segmento[hosts]
+        afuera = (ips[hosts] & MASCARAS[prefijo_segmento[s]]) != red_segmento[s]
+        otra_mascara = ~con_mascara[hosts] | (prefijos[hosts] != prefijo_segmento[s])
+        con_router = np.isin(s, np.searchsorted(unicas, clave_router))
+        problema[hosts] = np.select(
+            [afuera, otra_mascara, con_router & ~exacto],
+            [PROBLEMA_IP, PROBLEMA_MASCARA, PROBLEMA_GATEWAY], SIN_PROBLEMA,
+        )
+        # Una IP repetida es problema de todas las filas que la tienen
+        valores, cuantas = np.unique(ips[con_ip_fila], return_counts=True)
+        repetida = np.isin(ips[con_ip_fila], valores[cuantas > 1])
+        problema[con_ip_fila[repetida]] = PROBLEMA_IP
+        self.problema = problema
+
+        segmentos_router = np.searchsorted(unicas, clave_router)
+        self.componente = _componentes([self.dispositivos[f] for f in routers.tolist()],
+                                       segmentos_router.tolist(), len(unicas))
+
+        # Clases: (segmento, problema)
+        codigo = self.segmento[con_ip_fila] * 4 + problema[con_ip_fila]
+        clases, clase = np.unique(codigo, return_inverse=True)
+        self.clase = np.full(filas, -1, dtype=np.int64)
+        self.clase[con_ip_fila] = clase
+        self.segmento_clase = clases // 4
+        self.problema_clase = clases % 4
+        self.tamano_clase = np.bincount(clase, minlength=len(clases))
+        self._por_dispositivo = None
+        self.gateway_segmento = {}
+        for fila, segmento_fila in zip(routers.tolist(), segmentos_router.tolist()):
+            self.gateway_segmento.setdefault(segmento_fila, fila)
+
+    def __len__(self):
+        return len(self.segmento_clase)
+
+    def texto_segmento(self, segmento):
+        clave = int(self.segmentos[segmento])
+        return f"{ipv4_a_texto([clave >> 6])[0]}/{clave & 63}"
+
+    def codigos(self, origenes, destinos):
+        """Resultado (OK, IP_ORIGEN...) entre clases; acepta arreglos que se combinan por broadcasting"""
+        origenes, destinos = np.asarray(origenes), np.asarray(destinos)
+        p_origen, p_destino = self.problema_clase[origenes], self.problema_clase[destinos]
+        s_origen, s_destino = self.segmento_clase[origenes], self.segmento_clase[destinos]
+        c_origen, c_destino = self.componente[s_origen], self.componente[s_destino]
+        mismo = s_origen == s_destino
+        return np.select(
+            [p_origen == PROBLEMA_IP, p_origen == PROBLEMA_MASCARA,
+             p_destino == PROBLEMA_IP, p_destino == PROBLEMA_MASCARA, mismo,
+             p_origen == PROBLEMA_GATEWAY, p_destino == PROBLEMA_GATEWAY,
+             (c_origen < 0) | (c_origen != c_destino)],
+            [IP_ORIGEN, MASCARA_ORIGEN, IP_DESTINO, MASCARA_DESTINO, OK,
+             GATEWAY_ORIGEN, GATEWAY_DESTINO, SIN_RUTA], OK,
+        )
+
+    def matriz(self):
+        """Resultados entre todas las clases (len(self) x len(self))"""
+        clases = np.arange(len(self))
+        return self.codigos(clases[:, None], clases[None, :])
+
+    def _filas_de(self, dispositivo):
+        if self._por_dispositivo is None:
+            self._por_dispositivo = {}
+            for fila in self.filas.tolist():
+                self._por_dispositivo.setdefault(self.dispositivos[fila], []).append(fila)
+        return self._por_dispositivo.get(str(dispositivo).strip(), [])
+
+    def _nombre(self, fila):
+        return self.dispositivos[fila] or f"Fila {fila + 1}"
+
+    def explicar(self, codigo, origen, destino):
+        """(problema, solución) en texto para el resultado entre dos filas"""
+        if codigo in (IP_ORIGEN, IP_DESTINO, MASCARA_ORIGEN, MASCARA_DESTINO, GATEWAY_ORIGEN, GATEWAY_DESTINO):
+            fila = origen if codigo in (IP_ORIGEN, MASCARA_ORIGEN, GATEWAY_ORIGEN) else destino
+            nombre = self._nombre(fila)
+            if codigo in (IP_ORIGEN, IP_DESTINO):
+                return f"Dirección IP en {nombre}", f"Cambiar la dirección IP de {nombre}"
+            if codigo in (MASCARA_ORIGEN, MASCARA_DESTINO):
+                return f"Máscara de subred en {nombre}", f"Corregir la máscara de {nombre}"
+            router = self.gateway_segmento.get(int(self.segmento[fila]))
+            correcto = f" ({ipv4_a_texto([self.ips[router]])[0]})" if router is not None else ''
+            return f"Gateway en {nombre}", f"Configurar el gateway{correcto} en {nombre}"
+        if codigo == SIN_RUTA:
+            a = self.texto_segmento(self.segmento[origen])
+            b = self.texto_segmento(self.segmento[destino])
+            return f"Sin ruta entre {a} y {b}", "Conectar los routers de ambas redes o agregar la ruta"
+        return "", ""
+
+    def probar(self, origen, destino):
+        """
+        Resultado de una prueba entre dos dispositivos: (éxito, problema,
+        solución). Alcanza con que responda alguna de las interfaces del destino.
+        """
+        filas_origen, filas_destino = self._filas_de(origen), self._filas_de(destino)
+        if not filas_origen or not filas_destino:
+            nombre = origen if not filas_origen else destino
+            return False, f"{nombre} no tiene dirección IPv4 en la tabla", f"Asignar una dirección IP a {nombre}"
+        codigos = self.codigos(self.clase[filas_origen][:, None], self.clase[filas_destino][None, :])
+        mejor = np.unravel_index(np.argmin(codigos), codigos.shape)
+        codigo = int(codigos[mejor])
+        problema, solucion = self.explicar(codigo, filas_origen[mejor[0]], filas_destino[mejor[1]])
+        return codigo == OK, problema, solucion
+
+    def etiqueta_clase(self, clase):
+        """'192.168.10.0/24 (12)' o con el problema de la clase"""
+        texto = f"{self.texto_segmento(self.segmento_clase[clase])} ({self.tamano_clase[clase]})"
+        problema = ('', ' IP mal', ' máscara mal', ' gateway mal')[self.problema_clase[clase]]
+        return texto + problema
@@ -0,0 +1,275 @@
+"""
+Configuraciones IOS por dispositivo a partir de las tablas de direcciones
+(address_data, crear_tabla_red, TablaColumnar o TablaDirecciones): hostname,
+interfaces con ip address / ipv6 address y ip default-gateway en los switches.
+
+Las plantillas son textos con campos {campo}; se compilan una vez (por
+proceso) a formato % con nombres. Las filas se convierten y validan por
+columnas, los dispositivos se agrupan en lotes y cada lote se escribe a
+disco en un pool de procesos con pocos lotes en vuelo, así que la memoria
+no crece con la cantidad de dispositivos.
+"""
+import os
+import re
+from functools import lru_cache
+from itertools import chain
+from string import Formatter
+
+import numpy as np
+
+from herramientas_red.calculadora import MASCARAS_TEXTO
+from herramientas_red.direcciones import mascara_a_prefijo, texto_a_ipv4, texto_a_ipv6
+from herramientas_red.tablas import TablaColumnar
+from herramientas_red.validacion import COLUMNAS_GATEWAY, TIPOS_ROUTER, filas_router, rellenar_dispositivos
+
+# Partes de la configuración; se puede reemplazar cualquiera
+PLANTILLAS = {
+    'inicio': 'hostname {dispositivo}\n!\n',
+    'ipv6_routing': 'ipv6 unicast-routing\n!\n',
+    'interfaz': 'interface {interfaz}\n',
+    'ipv4': ' ip address {ip} {mascara}\n',
+    'ipv6': ' ipv6 address {ipv6}\n',
+    'link_local': ' ipv6 address {link_local} link-local\n',
+    'fin_interfaz': ' no shutdown\n!\n',
+    'gateway': 'ip default-gateway {gateway}\n!\n',
+    'fin': 'end\n',
+}
+
+CAMPOS = ('dispositivo', 'interfaz', 'ip', 'mascara', 'ipv6', 'link_local', 'gateway')
+
+TIPOS_SWITCH = ('Switch',)
+# Sin columna de tipo, un dispositivo es switch si se llama como los switches o tiene una SVI
+_NOMBRE_SWITCH = re.compile(r'^S\d+$|switch', re.IGNORECASE)
+_SVI = re.compile(r'^\s*vlan', re.IGNORECASE)
+
+# Dispositivos por lote enviado a cada proceso
+TAM_LOTE = 2000
+_NOMBRE_ARCHIVO = re.compile(r'[^\w.-]')
+
+
+@lru_cache(maxsize=None)
+def compilar_plantilla(plantilla):
+    """'interface {interfaz}\\n' -> 'interface %(interfaz)s\\n'; rechaza campos desconocidos"""
+    partes = []
+    for literal, campo, formato, conversion in Formatter().parse(plantilla):
+        partes.append(literal.replace('%', '%%'))
+        if campo is None:
+            continue
+        if campo not in CAMPOS or formato or conversion:
+            raise ValueError(f"Campo no soportado en la plantilla: {{{campo}}}")
+        partes.append(f'%({campo})s')
+    return ''.join(partes)
+
+
+def _compiladas(plantillas):
+    return {parte: compilar_plantilla(texto) for parte, texto in {**PLANTILLAS, **(plantillas or {})}.items()}
+
+
+def renderizar(compiladas, dispositivo, tipo, interfaces, gateway=''):
+    """
+    Texto de configuración de un dispositivo. interfaces son tuplas
+    (interfaz, ip, mascara, ipv6, link_local) con '' donde no hay dato.
+    """
+    valores = {campo: '' for campo in CAMPOS}
+    valores.update(dispositivo=dispositivo, gateway=gateway)
+    partes = [compiladas['inicio'] % valores]
+    if tipo == 'Router' and any(interfaz[3] or interfaz[4] for interfaz in interfaces):
+        partes.append(compiladas['ipv6_routing'] % valores)
+    for valores['interfaz'], valores['ip'], valores['mascara'], valores['ipv6'], valores['link_local'] in interfaces:
+        partes.append(compiladas['interfaz'] % valores)
+        if valores['ip']:
+            partes.append(compiladas['ipv4'] % valores)
+        if valores['ipv6']:
+            partes.append(compiladas['ipv6'] % valores)
+        if valores['link_local']:
+            partes.append(compiladas['link_local'] % valores)
+        partes.append(compiladas['fin_interfaz'] % valores)
+    if tipo == 'Switch' and gateway:
+        partes.append(compiladas['gateway'] % valores)
+    partes.append(compiladas['fin'] % valores)
+    return ''.join(partes)
+
+
+def _columna(tabla, nombre):
+    # DataFrame, TablaColumnar o TablaDirecciones
+    if hasattr(tabla, 'columna'):
+        return tabla.columna(nombre) if nombre in tabla.columnas else None
+    return tabla[nombre].tolist() if nombre in tabla.columns else None
+
+
+def _textos(valores):
+    return np.char.strip(np.array(['' if v is None else str(v) for v in valores], dtype=object).astype(str))
+
+
+def _ipv4(valores):
+    """Textos IPv4 válidos; '' en el resto ('N/A', DHCP, vacías)"""
+    textos = _textos(valores)
+    _, validas = texto_a_ipv4(textos)
+    return np.where(validas, textos, '').astype(object)
+
+
+def _ipv6(valores, prefijos=None):
+    """'2001:db8::1/64' para las IPv6 válidas (el prefijo sale de la dirección o de su columna)"""
+    textos = _textos(valores)
+    direcciones = np.array([texto.partition('/')[0] for texto in textos.tolist()], dtype=object)
+    _, _, validas = texto_a_ipv6(direcciones)
+    propios = np.array(['/' in texto for texto in textos.tolist()], dtype=bool)
+    if prefijos is None:
+        return np.where(validas & propios, textos, '').astype(object)
+    numeros, con_prefijo = mascara_a_prefijo(_textos(prefijos), maximo=128)
+    con_prefijo &= ~propios
+    completas = direcciones + '/' + numeros.astype(str).astype(object)
+    return np.where(validas & propios, textos, np.where(validas & con_prefijo, completas, '')).astype(object)
+
+
+def _link_local(valores):
+    textos = _textos(valores)
+    altos, _, validas = texto_a_ipv6(textos)
+    # fe80::/10
+    return np.where(validas & ((altos >> np.uint64(54)) == 0x3FA), textos, '').astype(object)
+
+
+def _tipos(dispositivos, interfaces, gateways, tipos):
+    """'Router', 'Switch' o '' (hosts, que no llevan configuración IOS) por fila"""
+    salida = np.full(len(dispositivos), '', dtype=object)
+    if tipos is not None:
+        tipos = [str(tipo or '') for tipo in tipos]
+        salida[[tipo in TIPOS_ROUTER for tipo in tipos]] = 'Router'
+        salida[[tipo in TIPOS_SWITCH for tipo in tipos]] = 'Switch'
+        return salida
+    switches = {nombre for nombre, interfaz in zip(dispositivos, interfaces)
+                if _NOMBRE_SWITCH.search(nombre) or _SVI.match(interfaz)}
+    salida[[nombre in switches for nombre in dispositivos]] = 'Switch'
+    salida[filas_router(dispositivos, gateways)] = 'Router'
+    return salida
+
+
+def lotes_dispositivos(tabla, tam_lote=TAM_LOTE):
+    """
+    Genera lotes de dispositivos configurables: listas de (dispositivo, tipo,
+    interfaces, gateway), con las interfaces en el orden de la tabla
+    """
+    if isinstance(tabla, (list, tuple)):
+        tabla = TablaColumnar(list(dict.fromkeys(c for fila in tabla for c in fila)), tabla)
+    dispositivos = rellenar_dispositivos(_columna(tabla, 'Dispositivo') or [])
+    filas = len(dispositivos)
+    if not filas:
+        return
+
+    def columna(nombre):
+        valores = _columna(tabla, nombre)
+        return [''] * filas if valores is None else valores
+
+    interfaces = [str(i or '').strip() for i in columna('Interfaz')]
+    gateways = next((g for g in (_columna(tabla, nombre) for nombre in COLUMNAS_GATEWAY) if g is not None), None)
+    tipos = _tipos(dispositivos, interfaces, gateways, _columna(tabla, 'Tipo'))
+
+    ips = _ipv4(columna('Dirección IP'))
+    prefijos, validos = mascara_a_prefijo(_textos(columna('Máscara de subred')))
+    con_ipv4 = (ips != '') & validos
+    ips = np.where(con_ipv4, ips, '')
+    mascaras = np.where(con_ipv4, MASCARAS_TEXTO[np.minimum(prefijos, 32)], '')
+    ipv6 = _ipv6(columna('Dirección IPv6'), _columna(tabla, 'Prefijo'))
+    link_local = _link_local(columna('Link-local'))
+    gateways = _ipv4(gateways if gateways is not None else [''] * filas)
+
+    # Filas de cada dispositivo, en el orden en que aparece cada uno
+    codigos = {}
+    numeros = np.fromiter((codigos.setdefault(nombre, len(codigos)) for nombre in dispositivos),
+                          dtype=np.int64, count=filas)
+    orden = np.argsort(numeros, kind='stable')
+    cortes = np.flatnonzero(np.diff(numeros[orden])) + 1
+    inicios = np.concatenate(([0], cortes)).tolist()
+    fines = np.concatenate((cortes, [filas])).tolist()
+    orden = orden.tolist()
+
+    lote = []
+    for inicio, fin in zip(inicios, fines):
+        posiciones = orden[inicio:fin]
+        primera = posiciones[0]
+        if not tipos[primera]:
+            continue
+        lote.append((
+            dispositivos[primera], tipos[primera],
+            [(interfaces[p], ips[p], mascaras[p], ipv6[p], link_local[p]) for p in posiciones],
+            next((gateways[p] for p in posiciones if gateways[p]), ''),
+        ))
+        if len(lote) >= tam_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def configuraciones(tabla, plantillas=None):
+    """Genera (dispositivo, texto de configuración) de a un dispositivo"""
+    compiladas = _compiladas(plantillas)
+    for lote in lotes_dispositivos(tabla):
+        for dispositivo, tipo, interfaces, gateway in lote:
+            yield dispositivo, renderizar(compiladas, dispositivo, tipo, interfaces, gateway)
+
+
+def escribir_archivo_configuraciones(tabla, archivo='configuraciones.txt', plantillas=None):
+    """
+    Escribe todas las configuraciones en un solo archivo, una detrás de la
+    otra, a medida que se generan. Devuelve cuántas se escribieron.
+    """
+    escritos = 0
+    with open(archivo, 'w', encoding='utf-8') as salida:
+        for _, texto in configuraciones(tabla, plantillas):
+            salida.write(texto)
+            salida.write('\n')
+            escritos += 1
+    return escritos
+
+
+def nombre_archivo(dispositivo, extension='.txt'):
+    return _NOMBRE_ARCHIVO.sub('_', dispositivo) + extension
+
+
+def _escribir_lote(carpeta, extension, plantillas, lote):
+    # Se ejecuta en los procesos del pool: las plantillas se compilan una vez por proceso
+    compiladas = _compiladas(plantillas)
+    for dispositivo, tipo, interfaces, gateway in lote:
+        texto = renderizar(compiladas, dispositivo, tipo, interfaces, gateway)
+        with open(os.path.join(carpeta, nombre_archivo(dispositivo, extension)), 'w', encoding='utf-8') as archivo:
+            archivo.write(texto)
+    return len(lote)
+
+
+def escribir_configuraciones(tabla, carpeta='configuraciones', plantillas=None, procesos=None,
+                             extension='.txt', tam_lote=TAM_LOTE):
+    """
+    Escribe un archivo de configuración por router o switch de la tabla y
+    devuelve cuántos se escribieron; ValueError si no hay ninguno. Con un
+    solo procesador, procesos=1 o un solo lote se escribe en este proceso.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    # Valida las plantillas antes de repartir el trabajo
+    _compiladas(plantillas)
+    lotes = lotes_dispositivos(tabla, tam_lote)
+    primero = next(lotes, None)
+    if primero is None:
+        raise ValueError("La tabla no tiene routers ni switches para configurar")
+    os.makedirs(carpeta, exist_ok=True)
+    segundo = next(lotes, None)
+
+    escritos = 0
+    procesos = procesos or os.cpu_count() or 1
+    if segundo is None or procesos == 1:
+        for lote in chain((primero,), filter(None, (segundo,)), lotes):
+            escritos += _escribir_lote(carpeta, extension, plantillas, lote)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            # Pocos lotes en vuelo: el resto se arma a medida que terminan
+            en_vuelo = {pool.submit(_escribir_lote, carpeta, extension, plantillas, lote)
+                        for lote in (primero, segundo)}
+            maximo = 2 * procesos
+            for lote in lotes:
+                if len(en_vuelo) >= maximo:
+                    listos, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    escritos += sum(futuro.result() for futuro in listos)
+                en_vuelo.add(pool.submit(_escribir_lote, carpeta, extension, plantillas, lote))
+            escritos += sum(futuro.result() for futuro in wait(en_vuelo).done)
+    return escritos
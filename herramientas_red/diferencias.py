@@ -0,0 +1,378 @@
+"""
+Lectura de libros exportados y diferencias entre tablas por (Dispositivo, Interfaz).
+
+leer_libro recorre un .xlsx con openpyxl en modo read-only, fila por fila:
+busca el encabezado (puede haber títulos arriba), sigue en las hojas
+siguientes con el mismo encabezado (las que exportacion abre al llegar al
+límite de filas) y completa el dispositivo vacío de las filas siguientes,
+como en las tablas de los labs. Los números que Excel guardó como número
+vuelven como texto.
+
+comparar es un hash join por la clave: las filas anteriores se guardan en un
+dict por clave y cada fila nueva se busca ahí. Si las anteriores pasan de
+MAX_FILAS_MEMORIA, las dos tablas se reparten primero por hash de la clave
+en PARTICIONES archivos temporales y se compara partición por partición, así
+que el tiempo es lineal y la memoria depende del tamaño de una partición y
+de la cantidad de diferencias, no del de las tablas. Una clave repetida se
+empareja por orden de aparición.
+
+fusionar y fusionar_dataframe aplican las diferencias a la tabla con la que
+se calcularon (TablaColumnar, TablaDirecciones o el DataFrame de lab175).
+
+openpyxl es opcional: solo se importa al leer un libro.
+"""
+import pickle
+import tempfile
+from itertools import chain, islice
+from operator import itemgetter
+
+from herramientas_red.validacion import COLUMNAS_GATEWAY
+
+CLAVES = ('Dispositivo', 'Interfaz')
+
+# Filas anteriores que se comparan en memoria antes de repartir en particiones
+MAX_FILAS_MEMORIA = 100_000
+PARTICIONES = 64
+# Filas que junta cada partición antes de escribirse al archivo temporal
+FILAS_BUFFER = 256
+# Filas en las que se busca el encabezado de cada hoja
+MAX_FILAS_ENCABEZADO = 20
+
+# Nombres con los que distintos scripts exportan la misma columna
+SINONIMOS = {nombre: [otro for otro in COLUMNAS_GATEWAY if otro != nombre] for nombre in COLUMNAS_GATEWAY}
+
+
+def _openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("Para leer libros de Excel instala openpyxl: pip install openpyxl")
+    return openpyxl
+
+
+def texto(valor):
+    """Valor de celda como texto: vacío para None (o NaN) y sin '.0' en los números enteros"""
+    if valor is None or valor != valor:
+        return ''
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _textos(valores):
+    return tuple(valor if type(valor) is str else texto(valor) for valor in valores)
+
+
+def _buscar_encabezado(ws, claves):
+    """(número de fila, nombres) del primer encabezado con todas las claves, o None"""
+    for numero, fila in enumerate(ws.iter_rows(max_row=MAX_FILAS_ENCABEZADO, values_only=True), 1):
+        nombres = [texto(valor).strip() for valor in fila]
+        if all(clave in nombres for clave in claves):
+            while nombres and not nombres[-1]:
+                nombres.pop()
+            return numero, nombres
+    return None
+
+
+def _indices(nombres, columnas):
+    """Columnas pedidas que están en el encabezado (o con un sinónimo) y su posición"""
+    salida, indices = [], []
+    for columna in columnas:
+        for nombre in [columna] + SINONIMOS.get(columna, []):
+            if nombre in nombres:
+                salida.append(columna)
+                indices.append(nombres.index(nombre))
+                break
+    return salida, indices
+
+
+def leer_libro(archivo, columnas=None, claves=CLAVES, hoja=None):
+    """
+    Devuelve (columnas, filas) de la tabla de un libro: las filas son tuplas
+    de textos y se leen a medida que se piden. Con `columnas` solo se leen
+    esas (las que el libro tenga, en ese orden); con `hoja`, solo esa hoja.
+    """
+    wb = _openpyxl().load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        hojas = [wb[hoja]] if hoja is not None else wb.worksheets
+        tablas = []
+        for ws in hojas:
+            encontrado = _buscar_encabezado(ws, claves)
+            if encontrado is None:
+                continue
+            numero, nombres = encontrado
+            if tablas and nombres != tablas[0][2]:
+                continue
+            tablas.append((ws, numero, nombres))
+        if not tablas:
+            raise ValueError(f"{archivo}: no hay una tabla con las columnas {', '.join(claves)}")
+        nombres = tablas[0][2]
+        salida, indices = _indices(nombres, columnas if columnas is not None else nombres)
+        faltan = [clave for clave in claves if clave not in salida]
+        if faltan:
+            raise ValueError(f"Las columnas pedidas no incluyen la clave: {', '.join(faltan)}")
+    except BaseException:
+        wb.close()
+        raise
+    return salida, _filas_libro(wb, tablas, indices, [salida.index(clave) for clave in claves])
+
+
+def _filas_libro(wb, tablas, indices, en_clave):
+    ancho = max(indices) + 1
+    primera = en_clave[0]
+    try:
+        for ws, numero, nombres in tablas:
+            anterior = ''
+            for fila in ws.iter_rows(min_row=numero + 1, values_only=True):
+                if len(fila) < ancho:
+                    fila = fila + (None,) * (ancho - len(fila))
+                valores = [texto(fila[indice]) for indice in indices]
+                clave = [valores[indice] for indice in en_clave]
+                if not any(clave):
+                    continue
+                # Las tablas de los labs dejan vacío el dispositivo en sus filas siguientes
+                if not clave[0]:
+                    valores[primera] = anterior
+                anterior = valores[primera]
+                # Encabezado repetido (otra sección con las mismas columnas)
+                if all(valores[i] == nombres[indices[i]] for i in en_clave):
+                    continue
+                yield tuple(valores)
+    finally:
+        wb.close()
+
+
+def filas_tabla(tabla, columnas):
+    """Filas de una TablaColumnar o TablaDirecciones como tuplas de textos"""
+    return map(_textos, zip(*(tabla.columna(columna) for columna in columnas)))
+
+
+def filas_dataframe(df, columnas):
+    """Filas de un DataFrame como tuplas de textos, en el orden de sus posiciones"""
+    return map(_textos, zip(*(df[columna].tolist() for columna in columnas)))
+
+
+class Diferencias:
+    """
+    Filas agregadas, eliminadas y cambiadas de una tabla a otra. Cada fila
+    lleva su posición: la nueva en agregadas, la anterior en eliminadas y
+    las dos en cambiadas (anterior, nueva, fila anterior, fila nueva).
+    """
+
+    def __init__(self, columnas, claves=CLAVES):
+        self.columnas = list(columnas)
+        self.claves = tuple(claves)
+        self.agregadas = []
+        self.eliminadas = []
+        self.cambiadas = []
+
+    def __len__(self):
+        return len(self.agregadas) + len(self.eliminadas) + len(self.cambiadas)
+
+    def resumen(self):
+        return {'agregadas': len(self.agregadas), 'eliminadas': len(self.eliminadas),
+                'cambiadas': len(self.cambiadas)}
+
+    def columnas_cambiadas(self, anterior, nueva):
+        return [columna for columna, antes, ahora in zip(self.columnas, anterior, nueva) if antes != ahora]
+
+    def _clave(self, fila):
+        return ' '.join(fila[self.columnas.index(clave)] for clave in self.claves)
+
+    def encabezados(self):
+        return ['Cambio'] + self.columnas + ['Columnas cambiadas']
+
+    def filas(self):
+        """Una fila por diferencia (con los valores nuevos, o los anteriores si se eliminó), para exportar"""
+        for _, _, anterior, nueva in self.cambiadas:
+            yield ('cambiada', *nueva, ', '.join(self.columnas_cambiadas(anterior, nueva)))
+        for _, fila in self.agregadas:
+            yield ('agregada', *fila, '')
+        for _, fila in self.eliminadas:
+            yield ('eliminada', *fila, '')
+
+    def describir(self, maximo=20):
+        """Líneas de texto con las primeras `maximo` diferencias de cada tipo"""
+        lineas = []
+        for _, _, anterior, nueva in self.cambiadas[:maximo]:
+            cambios = ', '.join(f"{columna}: '{antes}' -> '{ahora}'"
+                                for columna, antes, ahora in zip(self.columnas, anterior, nueva) if antes != ahora)
+            lineas.append(f"  ~ {self._clave(nueva)}: {cambios}")
+        lineas += [f"  + {self._clave(fila)}" for _, fila in self.agregadas[:maximo]]
+        lineas += [f"  - {self._clave(fila)}" for _, fila in self.eliminadas[:maximo]]
+        restantes = sum(max(0, len(lista) - maximo) for lista in (self.cambiadas, self.agregadas, self.eliminadas))
+        if restantes:
+            lineas.append(f"  ... y {restantes} más")
+        return lineas
+
+
+def _comparar_particion(anteriores, nuevas, clave, diferencias):
+    previas = {}
+    for numero, fila in anteriores:
+        previas.setdefault(clave(fila), []).append((numero, fila))
+    for numero, fila in nuevas:
+        llave = clave(fila)
+        candidatas = previas.get(llave)
+        if not candidatas:
+            diferencias.agregadas.append((numero, fila))
+            continue
+        numero_anterior, anterior = candidatas.pop(0)
+        if not candidatas:
+            del previas[llave]
+        if anterior != fila:
+            diferencias.cambiadas.append((numero_anterior, numero, anterior, fila))
+    for candidatas in previas.values():
+        diferencias.eliminadas.extend(candidatas)
+
+
+class _Particiones:
+    """Filas numeradas repartidas por hash de la clave en archivos temporales"""
+
+    def __init__(self, cantidad, clave):
+        self.clave = clave
+        self.archivos = [tempfile.TemporaryFile() for _ in range(cantidad)]
+        self.buffers = [[] for _ in range(cantidad)]
+
+    def agregar(self, numeradas):
+        cantidad = len(self.archivos)
+        for numero, fila in numeradas:
+            particion = hash(self.clave(fila)) % cantidad
+            buffer = self.buffers[particion]
+            buffer.append((numero, fila))
+            if len(buffer) >= FILAS_BUFFER:
+                pickle.dump(buffer, self.archivos[particion], pickle.HIGHEST_PROTOCOL)
+                buffer.clear()
+
+    def leer(self, particion):
+        archivo = self.archivos[particion]
+        if self.buffers[particion]:
+            pickle.dump(self.buffers[particion], archivo, pickle.HIGHEST_PROTOCOL)
+            self.buffers[particion] = []
+        archivo.seek(0)
+        while True:
+            try:
+                yield from pickle.load(archivo)
+            except EOFError:
+                return
+
+    def cerrar(self):
+        for archivo in self.archivos:
+            archivo.close()
+
+
+def comparar(anteriores, nuevas, columnas, claves=CLAVES, max_filas_memoria=MAX_FILAS_MEMORIA,
+             particiones=PARTICIONES):
+    """
+    Compara dos secuencias de filas (tuplas en el orden de `columnas`) por
+    las columnas clave y devuelve las Diferencias, ordenadas por posición
+    """
+    columnas = list(columnas)
+    clave = itemgetter(*(columnas.index(nombre) for nombre in claves))
+    diferencias = Diferencias(columnas, claves)
+    anteriores = enumerate(anteriores)
+    primeras = list(islice(anteriores, max_filas_memoria + 1))
+
+    if len(primeras) <= max_filas_memoria:
+        _comparar_particion(primeras, enumerate(nuevas), clave, diferencias)
+    else:
+        repartidas = [_Particiones(particiones, clave), _Particiones(particiones, clave)]
+        try:
+            repartidas[0].agregar(chain(primeras, anteriores))
+            del primeras
+            repartidas[1].agregar(enumerate(nuevas))
+            for particion in range(particiones):
+                _comparar_particion(repartidas[0].leer(particion), repartidas[1].leer(particion),
+                                    clave, diferencias)
+        finally:
+            for repartida in repartidas:
+                repartida.cerrar()
+
+    diferencias.agregadas.sort(key=itemgetter(0))
+    diferencias.eliminadas.sort(key=itemgetter(0))
+    diferencias.cambiadas.sort(key=itemgetter(1))
+    return diferencias
+
+
+def _proyectar(filas, desde, hacia):
+    """Filas con las columnas `desde` reducidas a las columnas `hacia`"""
+    indices = [list(desde).index(columna) for columna in hacia]
+    if indices == list(range(len(desde))):
+        return filas
+    return (tuple(fila[indice] for indice in indices) for fila in filas)
+
+
+def comparar_libros(anterior, nuevo, columnas=None, claves=CLAVES, hoja=None, **opciones):
+    """Diferencias entre dos libros exportados, en las columnas que tienen los dos"""
+    columnas_anteriores, filas_anteriores = leer_libro(anterior, columnas, claves, hoja)
+    columnas_nuevas, filas_nuevas = leer_libro(nuevo, columnas_anteriores, claves, hoja)
+    return comparar(_proyectar(filas_anteriores, columnas_anteriores, columnas_nuevas), filas_nuevas,
+                    columnas_nuevas, claves, **opciones)
+
+
+def comparar_con_libro(columnas, filas, archivo, claves=CLAVES, hoja=None, **opciones):
+    """
+    Diferencias entre una tabla viva (sus columnas y filas de textos, ver
+    filas_tabla y filas_dataframe) y un libro, en las columnas que tienen los dos
+    """
+    columnas_libro, filas_libro = leer_libro(archivo, columnas, claves, hoja)
+    return comparar(_proyectar(filas, columnas, columnas_libro), filas_libro, columnas_libro, claves, **opciones)
+
+
+def _cambios_por_columna(diferencias):
+    """columna -> (posiciones anteriores, valores nuevos) de las filas cambiadas"""
+    cambios = {}
+    for posicion, _, anterior, nueva in diferencias.cambiadas:
+        for columna, antes, ahora in zip(diferencias.columnas, anterior, nueva):
+            if antes != ahora:
+                posiciones, valores = cambios.setdefault(columna, ([], []))
+                posiciones.append(posicion)
+                valores.append(ahora)
+    return cambios
+
+
+def fusionar(tabla, diferencias, eliminar=True):
+    """
+    Aplica a una TablaColumnar o TablaDirecciones las diferencias calculadas
+    con ella como tabla anterior: asigna los valores cambiados (quedan en
+    `modificadas`), agrega las filas nuevas al final y, con eliminar, quita
+    las eliminadas. Como las tablas solo crecen, quitar filas arma una tabla
+    nueva con los mismos índices; devuelve la tabla resultante.
+    """
+    for columna, (posiciones, valores) in _cambios_por_columna(diferencias).items():
+        for posicion, valor in zip(posiciones, valores):
+            tabla.asignar(posicion, columna, valor)
+    tabla.extend(dict(zip(diferencias.columnas, fila)) for _, fila in diferencias.agregadas)
+    if not eliminar or not diferencias.eliminadas:
+        return tabla
+
+    quitar = {posicion for posicion, _ in diferencias.eliminadas}
+    nueva = type(tabla)(tabla.columnas, (fila for posicion, fila in enumerate(tabla) if posicion not in quitar),
+                        vacio=tabla.vacio)
+    for columnas in tabla._indices:
+        nueva.indexar(*columnas)
+    return nueva
+
+
+def fusionar_dataframe(df, diferencias, eliminar=True, vacio=''):
+    """
+    Igual que fusionar pero sobre un DataFrame (las posiciones son las de
+    filas_dataframe). Devuelve un DataFrame nuevo; las columnas que el libro
+    no tenía quedan con `vacio` en las filas agregadas.
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = df.copy()
+    for columna, (posiciones, valores) in _cambios_por_columna(diferencias).items():
+        datos = df[columna].to_numpy(dtype=object, copy=True)
+        datos[posiciones] = valores
+        df[columna] = datos
+    if eliminar and diferencias.eliminadas:
+        conservar = np.ones(len(df), dtype=bool)
+        conservar[[posicion for posicion, _ in diferencias.eliminadas]] = False
+        df = df[conservar]
+    df = df.reset_index(drop=True)
+    if diferencias.agregadas:
+        agregadas = pd.DataFrame([fila for _, fila in diferencias.agregadas], columns=diferencias.columnas)
+        df = pd.concat([df, agregadas.reindex(columns=df.columns, fill_value=vacio)], ignore_index=True)
+    return df
@@ -0,0 +1,298 @@
+"""
+Conversión vectorizada entre direcciones IPv4 enteras (uint32) y texto, y
+entre direcciones IPv6 y pares de uint64 (altos, bajos).
+
+Las IPv6 no caben en un tipo de NumPy, así que cada dirección son dos
+palabras de 64 bits; la suma y el corrimiento se hacen con acarreo entre
+ellas. Así un millón de subredes cuesta lo mismo que un millón de IPv4.
+"""
+import ipaddress
+import re
+
+import numpy as np
+
+# Texto de cada par de octetos ("a.b", y "a.b." para la mitad alta), para
+# armar una dirección con dos búsquedas en tabla y una sola concatenación
+_PARES_OCTETOS = np.array([f"{i >> 8}.{i & 0xFF}" for i in range(1 << 16)], dtype=object)
+_PARES_OCTETOS_PUNTO = _PARES_OCTETOS + '.'
+
+
+def ipv4_a_texto(enteros):
+    """
+    Convierte un arreglo de enteros a direcciones en notación decimal punteada
+    """
+    enteros = np.asarray(enteros, dtype=np.uint32)
+    return _PARES_OCTETOS_PUNTO[enteros >> 16] + _PARES_OCTETOS[enteros & 0xFFFF]
+
+
+# Máscara de cada prefijo /0../32; está ordenada, así que buscar una máscara
+# con searchsorted da directamente su prefijo
+MASCARAS = np.array([(0xFFFFFFFF << (32 - p)) & 0xFFFFFFFF for p in range(33)], dtype=np.uint32)
+
+# "255.255.255.255" ocupa 15 caracteres; uno más para detectar textos largos
+_ANCHO_TEXTO = 16
+
+# Valor mínimo de un octeto según su cantidad de dígitos (sin ceros a la izquierda)
+_MINIMO_OCTETO = np.array([0, 0, 10, 100, 1000], dtype=np.uint16)
+_MULTIPLICADOR = np.array([1, 10], dtype=np.uint16)
+
+
+def texto_a_ipv4(textos):
+    """
+    Convierte textos en notación decimal punteada a enteros. Devuelve
+    (enteros uint32, válidos): los textos que no son una IPv4 ('N/D', '',
+    IPv6, None...) quedan en 0 con válidos en False. Se rechazan los ceros
+    a la izquierda, igual que ipaddress.
+    """
+    # None, NaN o números se convierten en texto que no es una IPv4; lo que
+    # pase de 16 caracteres se corta y queda inválido por el último carácter
+    textos = np.char.strip(np.asarray(textos, dtype=object).astype(f'U{_ANCHO_TEXTO}'))
+    codigos = textos.view(np.uint32).reshape(len(textos), _ANCHO_TEXTO)
+    validos = (codigos < 128).all(axis=1) & (codigos[:, -1] == 0)
+    # Un carácter por fila de la transpuesta: se recorren 16 columnas
+    # contiguas sin importar cuántas direcciones haya
+    caracteres = np.ascontiguousarray(codigos.astype(np.uint8).T)
+
+    filas = len(textos)
+    valor = np.zeros(filas, dtype=np.uint32)
+    octeto = np.zeros(filas, dtype=np.uint16)
+    digitos = np.zeros(filas, dtype=np.uint8)
+    octetos = np.zeros(filas, dtype=np.uint8)
+    puntos = np.zeros(filas, dtype=np.uint8)
+    for caracter in caracteres:
+        cifra = caracter - np.uint8(48)
+        es_digito = cifra < 10
+        es_punto = caracter == 46
+        validos &= es_digito | es_punto | (caracter == 0)
+        # Con más de 3 dígitos el octeto puede desbordar, pero ya es inválido por largo
+        octeto = octeto * _MULTIPLICADOR[es_digito.view(np.uint8)] + cifra * es_digito
+        digitos += es_digito
+        puntos += es_punto
+        # Un octeto termina en un punto o al final del texto
+        fin = es_punto | ((caracter == 0) & (digitos > 0))
+        if not fin.any():
+            continue
+        largo = np.minimum(digitos, 4)
+        bien = (digitos >= 1) & (digitos <= 3) & (octeto <= 255) & (octeto >= _MINIMO_OCTETO[largo])
+        validos &= ~fin | bien
+        valor = np.where(fin, (valor << np.uint32(8)) | (octeto & 0xFF).astype(np.uint32), valor)
+        octetos += fin
+        octeto[fin] = 0
+        digitos[fin] = 0
+    validos &= (octetos == 4) & (puntos == 3)
+    return np.where(validos, valor, 0).astype(np.uint32), validos
+
+
+def mascara_a_prefijo(textos, maximo=32):
+    """
+    Prefijo de cada máscara ('255.255.255.0', '/24' o '24'). Devuelve
+    (prefijos int64, válidos); las máscaras no contiguas no son válidas.
+    Con maximo=128 se aceptan prefijos IPv6 ('/64').
+    """
+    textos = np.char.strip(np.asarray(textos, dtype=object).astype(str))
+    enteros, punteadas = texto_a_ipv4(textos)
+    prefijos = np.searchsorted(MASCARAS, enteros).astype(np.int64)
+    validos = punteadas & (MASCARAS[np.minimum(prefijos, 32)] == enteros)
+    # Las que vienen como prefijo son pocas y cortas: se convierten una por una
+    for posicion in np.flatnonzero(~punteadas):
+        texto = textos[posicion].lstrip('/')
+        if texto.isdigit() and int(texto) <= maximo:
+            prefijos[posicion] = int(texto)
+            validos[posicion] = True
+    return np.where(validos, prefijos, 0), validos
+
+
+# Grupos IPv6 en hexadecimal sin ceros a la izquierda, solos y con el ':' previo
+_GRUPOS_HEX = np.array([format(i, 'x') for i in range(1 << 16)], dtype=object)
+_GRUPOS_HEX_DOS = ':' + _GRUPOS_HEX
+
+# "ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff" ocupa 39 caracteres
+_ANCHO_IPV6 = 40
+
+# Valor de cada carácter hexadecimal; 255 para el resto
+_VALOR_HEX = np.full(256, 255, dtype=np.uint8)
+for _caracter in '0123456789abcdef':
+    _VALOR_HEX[ord(_caracter)] = _VALOR_HEX[ord(_caracter.upper())] = int(_caracter, 16)
+
+_UNOS_64 = (1 << 64) - 1
+
+
+def par_ipv6(valor):
+    """Entero de 128 bits -> (altos, bajos) como uint64"""
+    valor = int(valor)
+    return np.uint64(valor >> 64), np.uint64(valor & _UNOS_64)
+
+
+def sumar_ipv6(altos, bajos, otros_altos, otros_bajos):
+    """Suma de dos pares (altos, bajos) con acarreo; se combinan por broadcasting"""
+    altos, bajos = np.asarray(altos, dtype=np.uint64), np.asarray(bajos, dtype=np.uint64)
+    suma = bajos + np.asarray(otros_bajos, dtype=np.uint64)
+    # Al desbordar, la suma queda por debajo de un sumando
+    acarreo = (suma < bajos).astype(np.uint64)
+    return altos + np.asarray(otros_altos, dtype=np.uint64) + acarreo, suma
+
+
+def desplazar_ipv6(valores, bits):
+    """Enteros uint64 corridos `bits` lugares a la izquierda, como pares (altos, bajos)"""
+    valores = np.asarray(valores, dtype=np.uint64)
+    cero = np.zeros_like(valores)
+    if bits >= 64:
+        return (valores << np.uint64(bits - 64) if bits < 128 else cero), cero
+    # Un corrimiento de 64 no está definido: con bits == 0 no sube nada
+    altos = valores >> np.uint64(64 - bits) if bits else cero
+    return altos, valores << np.uint64(bits)
+
+
+def ipv6_a_texto(altos, bajos):
+    """
+    Convierte pares (altos, bajos) a texto IPv6 comprimido según RFC 5952:
+    hexadecimal en minúsculas, sin ceros a la izquierda y con '::' en la
+    racha de grupos en cero más larga (la primera si empatan; un solo grupo
+    no se comprime). Las IPv4 embebidas quedan en hexadecimal.
+    """
+    palabras = np.stack([np.asarray(altos, dtype=np.uint64), np.asarray(bajos, dtype=np.uint64)], axis=1)
+    filas = len(palabras)
+    grupos = palabras.astype('>u8').view('>u2').reshape(filas, 8).astype(np.uint16)
+
+    # Largo de la racha de ceros que termina en cada grupo; argmax da la primera más larga
+    rachas = np.zeros((filas, 8), dtype=np.int8)
+    racha = np.zeros(filas, dtype=np.int8)
+    for columna in range(8):
+        racha = (racha + 1) * (grupos[:, columna] == 0)
+        rachas[:, columna] = racha
+    fin = rachas.argmax(axis=1)
+    largo = rachas[np.arange(filas), fin]
+    largo[largo < 2] = 0
+    inicio = np.where(largo > 0, fin - largo + 1, 8)
+
+    # Hay pocas formas distintas (dónde empieza y cuánto mide el '::'):
+    # cada una se arma sobre todas sus filas a la vez
+    textos = np.empty(filas, dtype=object)
+    formas, forma = np.unique(inicio * 9 + largo, return_inverse=True)
+    for numero, codigo in enumerate(formas.tolist()):
+        posiciones = np.flatnonzero(forma == numero)
+        desde, cuantos = divmod(codigo, 9)
+        g = grupos[posiciones]
+        izquierda = list(range(desde))
+        derecha = list(range(desde + cuantos, 8)) if cuantos else []
+        texto = _GRUPOS_HEX[g[:, izquierda[0]]] if izquierda else np.full(len(posiciones), '', dtype=object)
+        for columna in izquierda[1:]:
+            texto = texto + _GRUPOS_HEX_DOS[g[:, columna]]
+        if cuantos:
+            texto = texto + '::'
+            if derecha:
+                texto = texto + _GRUPOS_HEX[g[:, derecha[0]]]
+                for columna in derecha[1:]:
+                    texto = texto + _GRUPOS_HEX_DOS[g[:, columna]]
+        textos[posiciones] = texto
+    return textos
+
+
+def texto_a_ipv6(textos):
+    """
+    Convierte textos IPv6 a pares de enteros. Devuelve (altos uint64, bajos
+    uint64, válidos); lo que no es una IPv6 queda en 0 con válidos en False.
+    Se recorren los caracteres como columnas, igual que en texto_a_ipv4;
+    solo las pocas direcciones con una IPv4 embebida ('::ffff:10.0.0.1')
+    pasan por ipaddress.
+    """
+    # El índice de zona ('fe80::1%G0/0') no es parte de la dirección
+    textos = np.asarray(textos, dtype=object).astype(str)
+    textos = np.char.partition(np.char.strip(textos), '%')[:, 0] if len(textos) else textos
+    anchos = textos.astype(f'U{_ANCHO_IPV6}')
+    filas = len(anchos)
+    codigos = anchos.view(np.uint32).reshape(filas, _ANCHO_IPV6)
+    ascii_ = (codigos < 128).all(axis=1)
+    validos = ascii_ & (codigos[:, -1] == 0)
+    caracteres = np.ascontiguousarray(codigos.astype(np.uint8).T)
+
+    # Grupos en el orden en que aparecen; la columna extra junta los que sobran
+    grupos = np.zeros((filas, 9), dtype=np.uint16)
+    todas = np.arange(filas)
+    grupo = np.zeros(filas, dtype=np.uint32)
+    digitos = np.zeros(filas, dtype=np.uint8)
+    cantidad = np.zeros(filas, dtype=np.int64)
+    # Grupos antes del '::' (-1 si no hay)
+    antes = np.full(filas, -1, dtype=np.int64)
+    dos_previo = np.zeros(filas, dtype=bool)
+    doble_previo = np.zeros(filas, dtype=bool)
+    terminado = np.zeros(filas, dtype=bool)
+    con_punto = np.zeros(filas, dtype=bool)
+    for posicion, caracter in enumerate(caracteres):
+        valor = _VALOR_HEX[caracter]
+        es_hex = valor < 16
+        es_dos = caracter == 58
+        fin = (caracter == 0) & ~terminado
+        con_punto |= caracter == 46
+        validos &= es_hex | es_dos | (caracter == 0)
+        # Más de 4 dígitos puede desbordar, pero ya es inválido por largo
+        grupo = np.where(es_hex, (grupo << np.uint32(4)) | valor, grupo)
+        digitos += es_hex
+        cierra = (es_dos | fin) & (digitos > 0)
+        if cierra.any():
+            validos &= ~cierra | (digitos <= 4)
+            grupos[todas[cierra], np.minimum(cantidad[cierra], 8)] = grupo[cierra]
+            cantidad += cierra
+            grupo[cierra] = 0
+            digitos[cierra] = 0
+        doble = es_dos & dos_previo
+        validos &= ~(doble & (antes >= 0))
+        antes = np.where(doble, cantidad, antes)
+        if posicion == 1:
+            # Solo se puede empezar con ':' si es un '::'
+            validos &= ~(dos_previo & ~es_dos)
+        # Tampoco terminar con un ':' suelto
+        validos &= ~(fin & dos_previo & ~doble_previo)
+        dos_previo, doble_previo = es_dos, doble
+        terminado |= caracter == 0
+    validos &= np.where(antes >= 0, cantidad <= 7, cantidad == 8)
+
+    # Los grupos después del '::' se corren al final
+    comprimida = antes >= 0
+    faltan = np.where(comprimida, 8 - cantidad, 0)[:, None]
+    antes = np.where(comprimida, antes, 8)[:, None]
+    columnas = np.arange(8)
+    fuente = np.where(columnas < antes, columnas, columnas - faltan)
+    toma = (columnas < antes) | (columnas >= antes + faltan)
+    valores = np.take_along_axis(grupos, np.clip(fuente, 0, 8), axis=1) * toma
+    palabras = np.ascontiguousarray(valores.astype('>u2')).view('>u8').astype(np.uint64)
+    altos = np.where(validos, palabras[:, 0], 0).astype(np.uint64)
+    bajos = np.where(validos, palabras[:, 1], 0).astype(np.uint64)
+
+    for posicion in np.flatnonzero(con_punto & ascii_).tolist():
+        try:
+            valor = int(ipaddress.IPv6Address(str(textos[posicion])))
+        except ValueError:
+            continue
+        altos[posicion], bajos[posicion] = par_ipv6(valor)
+        validos[posicion] = True
+    return altos, bajos, validos
+
+
+_SEPARADORES_MAC = re.compile(r'[.:\-]')
+
+
+def texto_a_mac(textos):
+    """
+    Convierte MACs ('0001.4296.ab12', '00:01:42:96:AB:12', '00-01-...') a
+    enteros de 48 bits. Devuelve (enteros uint64, válidos).
+    """
+    textos = list(textos)
+    enteros = np.zeros(len(textos), dtype=np.uint64)
+    validos = np.zeros(len(textos), dtype=bool)
+    for posicion, texto in enumerate(textos):
+        limpio = _SEPARADORES_MAC.sub('', str(texto).strip())
+        if len(limpio) == 12 and all(c in '0123456789abcdefABCDEF' for c in limpio):
+            enteros[posicion] = int(limpio, 16)
+            validos[posicion] = True
+    return enteros, validos
+
+
+def eui64(macs):
+    """
+    Identificador de interfaz EUI-64 (los 64 bits bajos de la IPv6) de cada
+    MAC entera: FFFE en el medio e invertido el bit universal/local
+    """
+    macs = np.asarray(macs, dtype=np.uint64)
+    identificador = ((macs >> np.uint64(24)) << np.uint64(40)) | np.uint64(0xFFFE << 24) | (macs & np.uint64(0xFFFFFF))
+    return identificador ^ np.uint64(1 << 57)
@@ -0,0 +1,20 @@
+"""
+Estilos de celda con nombre, independientes del backend de exportación.
+
+Cada backend (xlsx_rapido, xlsxwriter, openpyxl) traduce estas propiedades a
+su propio formato; CSV y Parquet las ignoran.
+"""
+
+ESTILOS = {
+    # Encabezado por defecto de las tablas exportadas
+    'encabezado': {'negrita': True, 'borde': True, 'horizontal': 'center'},
+    # Encabezado de formatear_excel (subredipv4)
+    'encabezado_azul': {'negrita': True, 'color': 'FFFFFF', 'relleno': '4472C4', 'borde': True,
+                        'horizontal': 'center'},
+    # Encabezado de NetworkTablesGenerator (packet-tacler10.3.4)
+    'encabezado_verde': {'negrita': True, 'ajustar': True, 'vertical': 'top', 'relleno': 'D7E4BC',
+                         'borde': True},
+    'titulo': {'relleno': 'D9E1F2', 'borde': True},
+    'centro': {'borde': True, 'horizontal': 'center'},
+    'izquierda': {'borde': True, 'horizontal': 'left'},
+}
@@ -0,0 +1,465 @@
+"""
+Subsistema de exportación compartido por los scripts de los laboratorios.
+
+Una exportación es una lista de Hojas; cada Hoja tiene Secciones (una tabla
+con encabezado opcional, o filas sueltas como un título) que llegan por
+bloques de columnas, así que nunca se arma la tabla completa en memoria.
+Los backends disponibles se eligen por formato, en orden de preferencia:
+
+- xlsx: xlsxwriter (constant_memory), openpyxl (write-only) y, solo si se pide,
+  rapido (XML armado con NumPy, ver xlsx_rapido)
+- csv: módulo csv
+- parquet: pyarrow
+"""
+import csv
+import importlib.util
+import os
+from itertools import islice
+
+from herramientas_red.medicion import etapa
+
+# Límite de filas de una hoja de Excel (incluye el encabezado)
+MAX_FILAS_EXCEL = 1_048_576
+
+# Filas por bloque al agrupar filas sueltas o partir un DataFrame
+TAM_LOTE = 1 << 16
+
+FORMATOS = {'.xlsx': 'xlsx', '.csv': 'csv', '.parquet': 'parquet'}
+
+
+def formato_de_archivo(archivo):
+    """Deduce el formato de salida a partir de la extensión del archivo"""
+    extension = os.path.splitext(archivo)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Extensión no soportada: '{extension}' (usa .xlsx, .csv o .parquet)")
+    return FORMATOS[extension]
+
+
+def calcular_anchos(df, maximo=50):
+    """
+    Calcula el ancho de cada columna a partir del DataFrame: el texto más
+    largo entre encabezado y valores, más 2, sin pasar de `maximo`
+    """
+    anchos = []
+    for columna in df.columns:
+        valores = df[columna]
+        # Las celdas vacías (NaN) se escriben sin valor y no suman ancho
+        largos = valores.where(valores.notna(), '').astype(str).str.len()
+        mas_largo = max(len(str(columna)), int(largos.max()) if len(largos) else 0)
+        anchos.append(min(mas_largo + 2, maximo))
+    return anchos
+
+
+def agrupar_filas(filas, tam_lote=TAM_LOTE):
+    """Convierte un iterable de filas (tuplas) en bloques (listas de columnas)"""
+    filas = iter(filas)
+    while True:
+        lote = list(islice(filas, tam_lote))
+        if not lote:
+            return
+        yield [list(valores) for valores in zip(*lote)]
+
+
+class Seccion:
+    """
+    Tabla dentro de una hoja: encabezado opcional y bloques de datos, cada uno
+    una lista de columnas. `estilos` es None, un nombre de estilo o uno por columna.
+    """
+
+    def __init__(self, bloques, encabezados=None, estilo_encabezado='encabezado', estilos=None,
+                 espacio_antes=0):
+        self.bloques = bloques
+        self.encabezados = list(encabezados) if encabezados is not None else None
+        self.estilo_encabezado = estilo_encabezado
+        self.estilos = estilos
+        self.espacio_antes = espacio_antes
+
+    @classmethod
+    def desde_dataframe(cls, df, tam_lote=TAM_LOTE, **opciones):
+        columnas = [df[columna].to_numpy() for columna in df.columns]
+        bloques = ([valores[inicio:inicio + tam_lote] for valores in columnas]
+                   for inicio in range(0, len(df), tam_lote))
+        return cls(bloques, encabezados=[str(columna) for columna in df.columns], **opciones)
+
+    @classmethod
+    def desde_filas(cls, filas, encabezados=None, **opciones):
+        return cls(agrupar_filas(filas), encabezados=encabezados, **opciones)
+
+    @classmethod
+    def desde_bloques(cls, bloques, columnas, **opciones):
+        """Bloques como dicts columna -> arreglo (p. ej. bloques_subredes)"""
+        return cls(([bloque[columna] for columna in columnas] for bloque in bloques),
+                   encabezados=columnas, **opciones)
+
+    def estilos_columnas(self, cantidad):
+        if self.estilos is None or isinstance(self.estilos, str):
+            return [self.estilos] * cantidad
+        return list(self.estilos)
+
+
+class Hoja:
+    """Hoja de salida: nombre, secciones en orden y anchos de columna opcionales"""
+
+    def __init__(self, nombre, secciones, anchos=None):
+        self.nombre = nombre
+        self.secciones = list(secciones)
+        self.anchos = anchos
+
+    @classmethod
+    def desde_dataframe(cls, nombre, df, anchos=None, estilo_encabezado=None):
+        return cls(nombre, [Seccion.desde_dataframe(df, estilo_encabezado=estilo_encabezado)], anchos)
+
+
+def _nombre_hoja(nombre, numero):
+    # Las hojas adicionales se numeran; Excel limita los nombres a 31 caracteres
+    if numero == 1:
+        return nombre[:31]
+    sufijo = f"_{numero}"
+    return nombre[:31 - len(sufijo)] + sufijo
+
+
+def _archivo_por_hoja(archivo, nombre, numero):
+    # CSV y Parquet guardan una hoja por archivo: la primera usa el nombre pedido
+    if numero == 1:
+        return archivo
+    base, extension = os.path.splitext(archivo)
+    return f"{base}_{nombre}{extension}"
+
+
+def _como_lista(valores):
+    return valores.tolist() if hasattr(valores, 'tolist') else list(valores)
+
+
+class _EscritorRapido:
+    def __init__(self, archivo):
+        from herramientas_red.xlsx_rapido import LibroRapido
+        self._libro = LibroRapido(archivo)
+
+    def nueva_hoja(self, nombre, anchos):
+        self._libro.nueva_hoja(nombre, anchos)
+
+    def fila(self, valores, estilos, encabezado=False):
+        self._libro.fila(valores, estilos)
+
+    def bloque(self, columnas, estilos):
+        self._libro.bloque(columnas, estilos if any(estilos) else None)
+
+    def cerrar(self):
+        self._libro.cerrar()
+
+
+class _EscritorXlsxwriter:
+    def __init__(self, archivo):
+        import xlsxwriter
+        from herramientas_red.estilos import ESTILOS
+
+        # constant_memory vuelca cada fila a disco en cuanto se pasa a la siguiente
+        self._libro = xlsxwriter.Workbook(archivo, {'constant_memory': True})
+        self._formatos = {}
+        for nombre, propiedades in ESTILOS.items():
+            formato = {}
+            if propiedades.get('negrita'):
+                formato['bold'] = True
+            if propiedades.get('color'):
+                formato['font_color'] = f"#{propiedades['color']}"
+            if propiedades.get('relleno'):
+                formato['fg_color'] = f"#{propiedades['relleno']}"
+            if propiedades.get('borde'):
+                formato['border'] = 1
+            if propiedades.get('horizontal'):
+                formato['align'] = propiedades['horizontal']
+            if propiedades.get('vertical'):
+                formato['valign'] = propiedades['vertical']
+            if propiedades.get('ajustar'):
+                formato['text_wrap'] = True
+            self._formatos[nombre] = self._libro.add_format(formato)
+        self._hoja = None
+        self._fila = 0
+
+    def nueva_hoja(self, nombre, anchos):
+        self._hoja = self._libro.add_worksheet(nombre)
+        for columna, ancho in enumerate(anchos or []):
+            self._hoja.set_column(columna, columna, ancho)
+        self._fila = 0
+
+    def _escribir(self, fila, valores, formatos):
+        escribir = self._hoja.write
+        for columna, (valor, formato) in enumerate(zip(valores, formatos)):
+            if valor is None or valor != valor or valor == '':
+                # Vacío o NaN: solo se escribe si lleva formato
+                if formato is not None:
+                    self._hoja.write_blank(fila, columna, None, formato)
+            else:
+                escribir(fila, columna, valor, formato)
+
+    def fila(self, valores, estilos, encabezado=False):
+        if estilos is None or isinstance(estilos, str):
+            estilos = [estilos] * len(valores)
+        self._escribir(self._fila, valores, [self._formatos.get(estilo) for estilo in estilos])
+        self._fila += 1
+
+    def bloque(self, columnas, estilos):
+        formatos = [self._formatos.get(estilo) for estilo in estilos]
+        for valores in zip(*(_como_lista(columna) for columna in columnas)):
+            self._escribir(self._fila, valores, formatos)
+            self._fila += 1
+
+    def cerrar(self):
+        if self._hoja is None:
+            self._libro.add_worksheet()
+        self._libro.close()
+
+
+class _EscritorOpenpyxl:
+    def __init__(self, archivo):
+        from openpyxl import Workbook
+
+        # Modo write-only: las filas se serializan al agregarse
+        self._archivo = archivo
+        self._libro = Workbook(write_only=True)
+        self._escritor = None
+
+    def nueva_hoja(self, nombre, anchos):
+        from openpyxl.utils import get_column_letter
+        from herramientas_red.tablas_excel import EscritorTablas
+
+        ws = self._libro.create_sheet(nombre)
+        # En write-only los anchos deben fijarse antes de escribir filas
+        for numero, ancho in enumerate(anchos or [], 1):
+            ws.column_dimensions[get_column_letter(numero)].width = ancho
+        self._escritor = EscritorTablas(self._libro, ws)
+
+    def fila(self, valores, estilos, encabezado=False):
+        if not valores:
+            self._escritor.en_blanco()
+        else:
+            self._escritor.fila(list(valores), estilos)
+
+    def bloque(self, columnas, estilos):
+        filas = zip(*(_como_lista(columna) for columna in columnas))
+        self._escritor.filas(filas, estilos if any(estilos) else None)
+
+    def cerrar(self):
+        if self._escritor is None:
+            self._libro.create_sheet()
+        self._libro.save(self._archivo)
+
+
+class _EscritorCsv:
+    def __init__(self, archivo):
+        self._archivo = archivo
+        self._hojas = 0
+        self._salida = None
+        self._writer = None
+
+    def nueva_hoja(self, nombre, anchos):
+        self._cerrar_hoja()
+        self._hojas += 1
+        ruta = _archivo_por_hoja(self._archivo, nombre, self._hojas)
+        self._salida = open(ruta, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._salida)
+
+    def fila(self, valores, estilos, encabezado=False):
+        self._writer.writerow(valores)
+
+    def bloque(self, columnas, estilos):
+        self._writer.writerows(zip(*(_como_lista(columna) for columna in columnas)))
+
+    def _cerrar_hoja(self):
+        if self._salida is not None:
+            self._salida.close()
+            self._salida = None
+
+    def cerrar(self):
+        if self._hojas == 0:
+            self.nueva_hoja('Sheet1', None)
+        self._cerrar_hoja()
+
+
+class _EscritorParquet:
+    """Una tabla por hoja: el encabezado da los nombres de columna y las filas sueltas se omiten"""
+
+    def __init__(self, archivo):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Para exportar a Parquet instala pyarrow: pip install pyarrow")
+        self._archivo = archivo
+        self._hojas = 0
+        self._ruta = None
+        self._columnas = None
+        self._writer = None
+
+    def nueva_hoja(self, nombre, anchos):
+        self._cerrar_hoja()
+        self._hojas += 1
+        self._ruta = _archivo_por_hoja(self._archivo, nombre, self._hojas)
+        self._columnas = None
+
+    def fila(self, valores, estilos, encabezado=False):
+        if not encabezado:
+            return
+        if self._columnas is not None:
+            raise ValueError("Parquet admite una sola tabla por hoja")
+        self._columnas = [str(valor) for valor in valores]
+
+    def bloque(self, columnas, estilos):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        def arreglo(valores):
+            try:
+                return pa.array(valores)
+            except (OverflowError, pa.ArrowInvalid):
+                # Enteros de más de 64 bits (p. ej. hosts de IPv6) se guardan como texto
+                return pa.array([str(valor) for valor in _como_lista(valores)])
+
+        nombres = self._columnas or [f"columna_{i}" for i in range(1, len(columnas) + 1)]
+        tabla = pa.table({nombre: arreglo(valores) for nombre, valores in zip(nombres, columnas)})
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._ruta, tabla.schema)
+        elif tabla.schema != self._writer.schema:
+            tabla = tabla.cast(self._writer.schema)
+        self._writer.write_table(tabla)
+
+    def _cerrar_hoja(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        elif self._ruta is not None:
+            # Hoja sin filas: se guarda solo el esquema
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            pq.write_table(pa.table({columna: pa.array([], pa.string()) for columna in self._columnas or []}),
+                           self._ruta)
+
+    def cerrar(self):
+        if self._hojas == 0:
+            self.nueva_hoja('Sheet1', None)
+        self._cerrar_hoja()
+
+
+# Backends en orden de preferencia con los módulos que necesitan; los opcionales
+# no se eligen solos, solo cuando se piden por nombre
+BACKENDS = {
+    'xlsxwriter': {'formato': 'xlsx', 'modulos': ('xlsxwriter',), 'clase': _EscritorXlsxwriter},
+    'openpyxl': {'formato': 'xlsx', 'modulos': ('openpyxl',), 'clase': _EscritorOpenpyxl},
+    'rapido': {'formato': 'xlsx', 'modulos': ('numpy', 'pandas'), 'clase': _EscritorRapido, 'opcional': True},
+    'csv': {'formato': 'csv', 'modulos': (), 'clase': _EscritorCsv},
+    'parquet': {'formato': 'parquet', 'modulos': ('pyarrow',), 'clase': _EscritorParquet},
+}
+
+
+def backend_disponible(nombre):
+    return all(importlib.util.find_spec(modulo) is not None for modulo in BACKENDS[nombre]['modulos'])
+
+
+def elegir_backend(formato):
+    """Devuelve el primer backend instalado para un formato, sin contar los opcionales"""
+    for nombre, backend in BACKENDS.items():
+        if backend['formato'] == formato and not backend.get('opcional') and backend_disponible(nombre):
+            return nombre
+    raise ImportError(f"No hay ningún backend instalado para exportar a '{formato}'")
+
+
+def exportar(archivo, hojas, backend=None, max_filas_hoja=MAX_FILAS_EXCEL):
+    """
+    Escribe las hojas con el backend indicado (o el preferido entre los
+    instalados para la extensión del archivo) y devuelve el número de filas de datos.
+    En Excel se abre una hoja nueva, repitiendo el encabezado, al llegar al
+    límite de filas por hoja. El backend tiene que escribir el formato de la
+    extensión del archivo.
+    """
+    formato = formato_de_archivo(archivo)
+    if backend is None:
+        backend = elegir_backend(formato)
+    elif backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: '{backend}' (usa {', '.join(BACKENDS)})")
+    elif BACKENDS[backend]['formato'] != formato:
+        raise ValueError(f"El backend '{backend}' escribe {BACKENDS[backend]['formato']}, "
+                         f"pero '{os.path.basename(str(archivo))}' es un archivo {formato}")
+    limite = max_filas_hoja if formato == 'xlsx' else None
+    if limite is not None and limite < 2:
+        raise ValueError("max_filas_hoja debe ser al menos 2 (el encabezado y una fila de datos)")
+    with etapa('exportar', archivo=os.path.basename(str(archivo)), backend=backend) as medida:
+        total = _escribir_hojas(BACKENDS[backend]['clase'](archivo), hojas, limite)
+        medida.filas = total
+    return total
+
+
+def _previas(escritor, seccion, espacio, encabezado):
+    # Filas vacías y encabezado de una sección; devuelve cuántas filas escribió
+    for _ in range(espacio):
+        escritor.fila([], None)
+    if encabezado:
+        escritor.fila(seccion.encabezados, seccion.estilo_encabezado, encabezado=True)
+    return espacio + encabezado
+
+
+def _escribir_hojas(escritor, hojas, limite):
+    total = 0
+    try:
+        for hoja in hojas:
+            numero = 1
+            escritor.nueva_hoja(_nombre_hoja(hoja.nombre, numero), hoja.anchos)
+            filas_hoja = 0
+
+            for seccion in hoja.secciones:
+                # El espacio y el encabezado quedan pendientes hasta saber en qué
+                # hoja caen los primeros datos de la sección, y se cuentan en el límite
+                con_encabezado = int(seccion.encabezados is not None)
+                espacio, encabezado = seccion.espacio_antes, con_encabezado
+
+                for columnas in seccion.bloques:
+                    filas = len(columnas[0]) if columnas else 0
+                    estilos = seccion.estilos_columnas(len(columnas))
+                    inicio = 0
+                    while inicio < filas:
+                        if limite and filas_hoja + espacio + encabezado >= limite:
+                            numero += 1
+                            escritor.nueva_hoja(_nombre_hoja(hoja.nombre, numero), hoja.anchos)
+                            filas_hoja = 0
+                            # En la hoja nueva se repite el encabezado, sin el espacio
+                            espacio, encabezado = 0, con_encabezado
+                        filas_hoja += _previas(escritor, seccion, espacio, encabezado)
+                        espacio = encabezado = 0
+                        cantidad = filas - inicio if not limite else min(filas - inicio, limite - filas_hoja)
+                        if inicio == 0 and cantidad == filas:
+                            escritor.bloque(columnas, estilos)
+                        else:
+                            escritor.bloque([valores[inicio:inicio + cantidad] for valores in columnas], estilos)
+                        inicio += cantidad
+                        filas_hoja += cantidad
+                        total += cantidad
+
+                if espacio or encabezado:
+                    # Sección sin datos: el espacio que no entra se omite y el
+                    # encabezado que no entra va en una hoja nueva
+                    if limite and filas_hoja + encabezado > limite:
+                        numero += 1
+                        escritor.nueva_hoja(_nombre_hoja(hoja.nombre, numero), hoja.anchos)
+                        filas_hoja, espacio = 0, 0
+                    elif limite:
+                        espacio = min(espacio, limite - filas_hoja - encabezado)
+                    filas_hoja += _previas(escritor, seccion, espacio, encabezado)
+    finally:
+        escritor.cerrar()
+    return total
+
+
+def exportar_bloques(bloques, columnas, archivo, formato=None, nombre_hoja='Sheet1',
+                     max_filas_hoja=MAX_FILAS_EXCEL, backend=None):
+    """Exporta una sola tabla dada como bloques dict columna -> arreglo"""
+    if backend is None and formato is not None:
+        backend = elegir_backend(formato)
+    hoja = Hoja(nombre_hoja, [Seccion.desde_bloques(bloques, columnas)])
+    return exportar(archivo, [hoja], backend, max_filas_hoja)
+
+
+def exportar_filas(filas, columnas, archivo, formato=None, nombre_hoja='Sheet1',
+                   max_filas_hoja=MAX_FILAS_EXCEL, backend=None):
+    """Igual que exportar_bloques pero a partir de filas sueltas (tuplas)"""
+    if backend is None and formato is not None:
+        backend = elegir_backend(formato)
+    hoja = Hoja(nombre_hoja, [Seccion.desde_filas(filas, columnas)])
+    return exportar(archivo, [hoja], backend, max_filas_hoja)
@@ -0,0 +1,365 @@
+"""
+Exportación incremental de tablas (TablaColumnar o TablaDirecciones) a rutas
+fijas. Las tablas solo crecen al final y anotan en `modificadas` cada posición
+asignada, así que lo que cambió desde la última exportación son las filas
+nuevas y las posiciones anotadas después de una marca: exportar cuesta según
+el cambio y no según la tabla.
+
+- CSV: se guarda el byte donde empieza cada fila. Si solo hay filas nuevas se
+  agregan al final; si hay modificadas, el archivo se corta donde empieza la
+  primera y se reescribe desde ahí, así que el CSV siempre tiene la tabla
+  actual. Las modificadas se anotan además con sus valores en
+  <archivo>.cambios.csv, como historial. Si alguien tocó los archivos, el CSV
+  se reescribe completo y el registro empieza de nuevo.
+- Excel: un .xlsx es un zip con el XML completo de cada hoja, así que se
+  reescribe entero, pero cada hoja se guarda comprimida por bloques de filas
+  independientes (deflate con vaciado completo). Un cambio rearma y comprime
+  solo sus bloques, las hojas sin cambios no se tocan y el zip se arma
+  copiando los bytes ya comprimidos. Si nada cambió no se escribe. Cada
+  exportación anota en <archivo>.cambios.csv las filas agregadas y
+  modificadas de cada hoja.
+"""
+import codecs
+import csv
+import os
+import struct
+import time
+import zlib
+from array import array
+from datetime import datetime
+
+from herramientas_red.exportacion import MAX_FILAS_EXCEL, TAM_LOTE, Hoja, Seccion, exportar
+from herramientas_red.xlsx_rapido import (FIN_HOJA, hoja_de_estilos, inicio_hoja, nombre_hoja, partes_libro,
+                                          xml_bloque, xml_fila)
+
+# Filas por bloque comprimido de una hoja de Excel
+FILAS_BLOQUE = 4096
+
+COLUMNAS_REGISTRO_EXCEL = ['Exportación', 'Hoja', 'Cambio', 'Fila']
+
+# Método de compresión deflate en el formato zip
+_DEFLATE = 8
+
+# Polinomio de CRC-32 con los bits invertidos, como en zlib
+_POLINOMIO = 0xEDB88320
+
+
+def _multiplicar(a, b):
+    # Producto de dos polinomios módulo el de CRC-32 (multmodp de zlib)
+    bit = 1 << 31
+    producto = 0
+    while True:
+        if a & bit:
+            producto ^= b
+            if a & (bit - 1) == 0:
+                return producto
+        bit >>= 1
+        b = (b >> 1) ^ _POLINOMIO if b & 1 else b >> 1
+
+
+# x^(2^n) módulo el polinomio, para n = 0..31
+_POTENCIAS = [1 << 30]
+for _ in range(31):
+    _POTENCIAS.append(_multiplicar(_POTENCIAS[-1], _POTENCIAS[-1]))
+
+
+def combinar_crc32(crc1, crc2, largo2):
+    """CRC-32 de dos datos seguidos a partir del CRC de cada uno y el largo del segundo (crc32_combine)"""
+    # x^(8 * largo2): el primer CRC se corre tantos bits como tiene el segundo dato
+    potencia, bits, numero = 1 << 31, largo2, 3
+    while bits:
+        if bits & 1:
+            potencia = _multiplicar(_POTENCIAS[numero & 31], potencia)
+        bits >>= 1
+        numero += 1
+    return _multiplicar(potencia, crc1) ^ crc2
+
+
+def _comprimir(texto, final=False):
+    """
+    (bytes deflate, crc, largo) de un texto. Sin `final` termina con un vaciado
+    completo: se puede concatenar con otros segmentos y reemplazar por separado.
+    """
+    datos = texto.encode()
+    compresor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    comprimido = compresor.compress(datos) + compresor.flush(zlib.Z_FINISH if final else zlib.Z_FULL_FLUSH)
+    return comprimido, zlib.crc32(datos), len(datos)
+
+
+def _entrada(nombre, segmentos):
+    """Entrada de zip (nombre, partes, crc, tamaño) con los segmentos en orden"""
+    crc, tamano = 0, 0
+    for _, crc_segmento, largo in segmentos:
+        crc = combinar_crc32(crc, crc_segmento, largo)
+        tamano += largo
+    return nombre, [comprimido for comprimido, _, _ in segmentos], crc, tamano
+
+
+def escribir_zip(archivo, entradas):
+    """
+    Escribe un zip con entradas ya comprimidas en deflate, dadas como
+    (nombre, partes, crc, tamaño). Se escribe a un temporal que reemplaza al
+    archivo al terminar, así que nunca queda un archivo a medias.
+    """
+    momento = time.localtime()
+    fecha = (momento.tm_year - 1980) << 9 | momento.tm_mon << 5 | momento.tm_mday
+    hora = momento.tm_hour << 11 | momento.tm_min << 5 | momento.tm_sec // 2
+    centrales = []
+    temporal = archivo + '.tmp'
+    with open(temporal, 'wb') as salida:
+        for nombre, partes, crc, tamano in entradas:
+            comprimido = sum(map(len, partes))
+            if max(comprimido, tamano, salida.tell()) >= 1 << 32:
+                raise ValueError(f"{nombre} no entra en un zip sin ZIP64")
+            nombre = nombre.encode()
+            campos = (20, 0, _DEFLATE, hora, fecha, crc, comprimido, tamano, len(nombre))
+            centrales.append((campos, salida.tell(), nombre))
+            salida.write(struct.pack('<IHHHHHIIIHH', 0x04034B50, *campos, 0) + nombre)
+            for parte in partes:
+                salida.write(parte)
+        inicio = salida.tell()
+        for campos, posicion, nombre in centrales:
+            salida.write(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014B50, 20, *campos, 0, 0, 0, 0, 0, posicion)
+                         + nombre)
+        salida.write(struct.pack('<IHHHHIIH', 0x06054B50, 0, 0, len(centrales), len(centrales),
+                                 salida.tell() - inicio, inicio, 0))
+    os.replace(temporal, archivo)
+
+
+def archivo_cambios(archivo):
+    """Ruta del registro de cambios de un archivo exportado"""
+    return f"{archivo}.cambios.csv"
+
+
+def _anotar(registro, columnas, filas):
+    # El encabezado se escribe solo si el registro es nuevo o está vacío
+    nuevo = not os.path.exists(registro) or os.path.getsize(registro) == 0
+    with open(registro, 'a', newline='', encoding='utf-8-sig' if nuevo else 'utf-8') as salida:
+        escritor = csv.writer(salida)
+        if nuevo:
+            escritor.writerow(columnas)
+        escritor.writerows(filas)
+
+
+def _firma(archivo):
+    # Tamaño y fecha de modificación, o None si no existe
+    try:
+        estado = os.stat(archivo)
+    except FileNotFoundError:
+        return None
+    return estado.st_size, estado.st_mtime_ns
+
+
+def _modificadas(tabla, marca, filas):
+    """Posiciones distintas asignadas desde la marca, entre las `filas` ya exportadas"""
+    return sorted({posicion for posicion in tabla.modificadas[marca:] if posicion < filas})
+
+
+def _columnas(tabla, inicio, fin, completas=None):
+    """Columnas de las filas inicio..fin-1, de las columnas completas si ya se pidieron"""
+    if completas is not None:
+        return [valores[inicio:fin] for valores in completas]
+    return [[tabla.valor(posicion, columna) for posicion in range(inicio, fin)] for columna in tabla.columnas]
+
+
+class _Lineas(list):
+    # Destino de csv.writer que guarda cada línea por separado
+    write = list.append
+
+
+def _lineas_csv(filas):
+    """Líneas de texto que csv.writer escribe para las filas"""
+    lineas = _Lineas()
+    csv.writer(lineas).writerows(filas)
+    return lineas
+
+
+def _hoja_completa(nombre, tabla, anchos=None, estilo_encabezado='encabezado'):
+    columnas = [tabla.columna(columna) for columna in tabla.columnas]
+    return Hoja(nombre, [Seccion([columnas], encabezados=tabla.columnas, estilo_encabezado=estilo_encabezado)],
+                anchos)
+
+
+class CsvIncremental:
+    """Una tabla en un CSV de ruta fija, con su registro de filas modificadas"""
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.registro = archivo_cambios(archivo)
+        self._tabla = None
+        self._filas = 0
+        self._marca = 0
+        # Byte donde empieza cada fila de datos y donde termina el archivo
+        self._inicios = array('q')
+        self._fin = 0
+        self._firmas = None
+
+    def _firmas_actuales(self):
+        return _firma(self.archivo), _firma(self.registro)
+
+    def _escribir(self, tabla, desde):
+        """
+        Escribe las filas de `desde` en adelante: corta el CSV donde empieza esa
+        fila (o lo crea con el encabezado si `desde` es 0) y anota dónde empieza
+        cada fila escrita
+        """
+        total = len(tabla)
+        posicion = 0 if desde == 0 else self._inicios[desde] if desde < self._filas else self._fin
+        del self._inicios[desde:]
+        # Con muchas filas por escribir conviene pedir las columnas completas una vez
+        completas = None
+        if (total - desde) * 8 > total:
+            completas = [tabla.columna(columna) for columna in tabla.columnas]
+        with open(self.archivo, 'wb' if desde == 0 else 'r+b') as salida:
+            salida.seek(posicion)
+            salida.truncate()
+            if desde == 0:
+                encabezado = codecs.BOM_UTF8 + ''.join(_lineas_csv([tabla.columnas])).encode()
+                salida.write(encabezado)
+                posicion = len(encabezado)
+            for inicio in range(desde, total, TAM_LOTE):
+                lineas = _lineas_csv(zip(*_columnas(tabla, inicio, min(total, inicio + TAM_LOTE), completas)))
+                texto = ''.join(lineas)
+                datos = texto.encode()
+                # Sin caracteres fuera de ASCII cada carácter ocupa un byte
+                largos = map(len, lineas) if len(datos) == len(texto) else (len(linea.encode()) for linea in lineas)
+                for largo in largos:
+                    self._inicios.append(posicion)
+                    posicion += largo
+                salida.write(datos)
+        self._fin = posicion
+
+    def exportar(self, tabla):
+        """
+        Escribe lo que cambió desde la última exportación y devuelve
+        (agregadas, modificadas), o None si el CSV se reescribió completo
+        """
+        if (self._tabla is not tabla or len(tabla) < self._filas
+                or self._firmas != self._firmas_actuales()):
+            self._escribir(tabla, 0)
+            with open(self.registro, 'w', newline='', encoding='utf-8-sig') as salida:
+                csv.writer(salida).writerow(['Exportación', 'Fila'] + tabla.columnas)
+            resultado = None
+        else:
+            modificadas = _modificadas(tabla, self._marca, self._filas)
+            agregadas = len(tabla) - self._filas
+            if modificadas or agregadas:
+                self._escribir(tabla, modificadas[0] if modificadas else self._filas)
+            if modificadas:
+                fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                _anotar(self.registro, ['Exportación', 'Fila'] + tabla.columnas,
+                        ([fecha, posicion + 1] + [tabla.valor(posicion, columna) for columna in tabla.columnas]
+                         for posicion in modificadas))
+            resultado = (agregadas, len(modificadas))
+
+        self._tabla, self._filas, self._marca = tabla, len(tabla), len(tabla.modificadas)
+        self._firmas = self._firmas_actuales()
+        return resultado
+
+
+class _HojaComprimida:
+    """XML de una hoja como segmentos deflate: inicio con el encabezado, un bloque cada FILAS_BLOQUE filas y fin"""
+
+    def __init__(self, tabla, anchos, estilo_encabezado, indices):
+        self.tabla = tabla
+        self.anchos = anchos
+        self._indices = indices
+        self._inicio = _comprimir(inicio_hoja(anchos) + xml_fila(tabla.columnas, estilo_encabezado, 1, indices))
+        self._fin = _comprimir(FIN_HOJA, final=True)
+        self._bloques = []
+        self._filas = 0
+        self._marca = 0
+
+    def es_de(self, tabla, anchos):
+        return self.tabla is tabla and self.anchos == anchos and len(tabla) >= self._filas
+
+    def actualizar(self):
+        """Rearma los bloques con filas nuevas o modificadas; devuelve (posiciones agregadas, modificadas)"""
+        tabla, total = self.tabla, len(self.tabla)
+        modificadas = _modificadas(tabla, self._marca, self._filas)
+        sucios = {posicion // FILAS_BLOQUE for posicion in modificadas}
+        sucios.update(range(self._filas // FILAS_BLOQUE, -(-total // FILAS_BLOQUE)))
+        # Con muchos bloques sucios conviene pedir las columnas completas una vez
+        completas = None
+        if len(sucios) * FILAS_BLOQUE * 8 > total:
+            completas = [tabla.columna(columna) for columna in tabla.columnas]
+        for numero in sorted(sucios):
+            inicio = numero * FILAS_BLOQUE
+            columnas = _columnas(tabla, inicio, min(total, inicio + FILAS_BLOQUE), completas)
+            # La fila 1 es el encabezado
+            segmento = _comprimir(xml_bloque(columnas, None, inicio + 2, self._indices))
+            if numero < len(self._bloques):
+                self._bloques[numero] = segmento
+            else:
+                self._bloques.append(segmento)
+        agregadas = range(self._filas, total)
+        self._filas, self._marca = total, len(tabla.modificadas)
+        return agregadas, modificadas
+
+    def entrada(self, nombre):
+        return _entrada(nombre, [self._inicio, *self._bloques, self._fin])
+
+
+class ExcelIncremental:
+    """Libro .xlsx de ruta fija que se reescribe a partir de sus hojas ya comprimidas"""
+
+    def __init__(self, archivo, estilo_encabezado='encabezado'):
+        self.archivo = archivo
+        self.registro = archivo_cambios(archivo)
+        self.estilo_encabezado = estilo_encabezado
+        self._estilos_xml, self._indices = hoja_de_estilos()
+        self._hojas = {}
+        self._firma = None
+
+    def _anotar(self, cambios):
+        fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        filas = []
+        for hoja, cambio in cambios.items():
+            if cambio is None:
+                filas.append([fecha, hoja, 'reescrita', ''])
+                continue
+            agregadas, modificadas = cambio
+            filas.extend([fecha, hoja, 'modificada', posicion + 1] for posicion in modificadas)
+            filas.extend([fecha, hoja, 'agregada', posicion + 1] for posicion in agregadas)
+        _anotar(self.registro, COLUMNAS_REGISTRO_EXCEL, filas)
+
+    def exportar(self, hojas):
+        """
+        Escribe las hojas, dadas como (nombre, tabla, anchos). Devuelve
+        {hoja: (posiciones agregadas, modificadas)} de las hojas que cambiaron,
+        con None en las que se armaron de cero, o None si no hizo falta escribir.
+        """
+        usados = set()
+        hojas = [(nombre_hoja(nombre, usados), tabla, anchos) for nombre, tabla, anchos in hojas]
+        if any(len(tabla) >= MAX_FILAS_EXCEL for _, tabla, _ in hojas):
+            # No entra en una hoja: la exportación completa la reparte en varias
+            exportar(self.archivo, [_hoja_completa(*hoja, self.estilo_encabezado) for hoja in hojas], 'rapido')
+            self._hojas, self._firma = {}, None
+            cambios = dict.fromkeys(nombre for nombre, _, _ in hojas)
+            self._anotar(cambios)
+            return cambios
+
+        anteriores, self._hojas = self._hojas, {}
+        cambios = {}
+        for nombre, tabla, anchos in hojas:
+            hoja = anteriores.get(nombre)
+            if hoja is None or not hoja.es_de(tabla, anchos):
+                hoja = _HojaComprimida(tabla, anchos, self.estilo_encabezado, self._indices)
+                hoja.actualizar()
+                cambios[nombre] = None
+            else:
+                agregadas, modificadas = hoja.actualizar()
+                if agregadas or modificadas:
+                    cambios[nombre] = (agregadas, modificadas)
+            self._hojas[nombre] = hoja
+
+        if not cambios and list(anteriores) == list(self._hojas) and self._firma == _firma(self.archivo):
+            return None
+        entradas = [hoja.entrada(f'xl/worksheets/sheet{numero}.xml')
+                    for numero, hoja in enumerate(self._hojas.values(), 1)]
+        entradas += [_entrada(nombre, [_comprimir(xml, final=True)])
+                     for nombre, xml in partes_libro(list(self._hojas), self._estilos_xml)]
+        escribir_zip(self.archivo, entradas)
+        self._firma = _firma(self.archivo)
+        self._anotar(cambios)
+        return cambios
@@ -0,0 +1,258 @@
+"""
+Medición de etapas de los scripts: tiempo, filas, filas por segundo y pico de
+memoria (tracemalloc) de cada etapa, con un reporte JSON al final.
+
+Está apagada salvo que se defina HERRAMIENTAS_RED_MEDICION con la ruta del
+reporte (o que se llame a activar(), como hace la opción --medir de la línea
+de comandos). Apagada, etapa() devuelve siempre el mismo objeto vacío y
+bloques() devuelve el iterable sin tocarlo, así que medir no cuesta nada.
+
+tracemalloc hace varias veces más lento el código medido: para tiempos y
+filas por segundo fieles se define HERRAMIENTAS_RED_MEDICION_MEMORIA=0 (o
+activar(memoria=False)) y el pico de memoria se mide en otra corrida.
+
+    with medicion.etapa('asignar', filas=len(df)):
+        ...
+    with medicion.etapa('exportar') as medida:
+        medida.filas = exportar(...)
+
+Las etapas se pueden anidar: el pico de memoria de cada una es lo máximo que
+se usó por encima de lo que había al empezar, incluidas las internas.
+tracemalloc, platform y datetime se importan al activar la medición, para no
+sumarle tiempo de arranque a la línea de comandos.
+"""
+import atexit
+import json
+import os
+import sys
+import time
+
+VARIABLE = 'HERRAMIENTAS_RED_MEDICION'
+VARIABLE_MEMORIA = 'HERRAMIENTAS_RED_MEDICION_MEMORIA'
+
+# Estado de la medición en curso, o None si está apagada
+_estado = None
+
+
+class _EtapaNula:
+    """Lo que devuelve etapa() con la medición apagada: acepta filas y datos y no hace nada"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+    def __setattr__(self, nombre, valor):
+        pass
+
+
+_NULA = _EtapaNula()
+
+
+class _Medicion:
+    def __init__(self, archivo, memoria):
+        import tracemalloc
+        from datetime import datetime
+
+        self.archivo = archivo
+        self.memoria = memoria
+        self.inicio = time.perf_counter()
+        self.fecha = datetime.now().isoformat(timespec='seconds')
+        self.etapas = []
+        self.pila = []
+        # Si tracemalloc ya estaba andando, no se apaga al terminar
+        self.propio = memoria and not tracemalloc.is_tracing()
+        if self.propio:
+            tracemalloc.start()
+
+
+class _Etapa:
+    def __init__(self, nombre, filas, datos):
+        self.nombre = nombre
+        self.filas = filas
+        self.datos = datos
+
+    def __enter__(self):
+        estado = _estado
+        if estado.memoria:
+            import tracemalloc
+            actual, pico = tracemalloc.get_traced_memory()
+            # El pico de la etapa de afuera se guarda antes de reiniciarlo
+            if estado.pila:
+                padre = estado.pila[-1]
+                padre.pico = max(padre.pico, pico)
+            tracemalloc.reset_peak()
+            self.base = self.pico = actual
+        self.padre = estado.pila[-1].nombre if estado.pila else None
+        estado.pila.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        segundos = time.perf_counter() - self.inicio
+        estado = _estado
+        estado.pila.pop()
+        pico = None
+        if estado.memoria:
+            import tracemalloc
+            self.pico = max(self.pico, tracemalloc.get_traced_memory()[1])
+            pico = self.pico - self.base
+            if estado.pila:
+                padre = estado.pila[-1]
+                padre.pico = max(padre.pico, self.pico)
+        estado.etapas.append(_registro(self.nombre, self.padre, self.inicio - estado.inicio, segundos,
+                                       self.filas, pico, self.datos, error=excepcion[0] is not None))
+        return False
+
+
+def _registro(nombre, padre, inicio, segundos, filas, pico, datos, error=False):
+    registro = {
+        'etapa': nombre,
+        'padre': padre,
+        'inicio': round(inicio, 6),
+        'segundos': round(segundos, 6),
+        'filas': filas,
+        'filas_por_segundo': round(filas / segundos, 1) if filas and segundos > 0 else None,
+        'memoria_pico': pico,
+    }
+    if error:
+        registro['error'] = True
+    registro.update(datos)
+    return registro
+
+
+def activa():
+    return _estado is not None
+
+
+def activar(archivo=None, memoria=None):
+    """
+    Empieza a medir. Con `archivo` el reporte se escribe ahí al salir del
+    programa; sin él se pide con reporte() o escribir_reporte(). La memoria
+    se mide salvo memoria=False o HERRAMIENTAS_RED_MEDICION_MEMORIA=0.
+    """
+    global _estado
+    if memoria is None:
+        memoria = os.environ.get(VARIABLE_MEMORIA, '1') != '0'
+    desactivar()
+    _estado = _Medicion(archivo, memoria)
+    if archivo:
+        atexit.register(_al_salir, _estado)
+
+
+def desactivar():
+    """Deja de medir y devuelve el reporte de lo medido (None si no estaba activa)"""
+    global _estado
+    estado, _estado = _estado, None
+    if estado is None:
+        return None
+    if estado.propio:
+        import tracemalloc
+        tracemalloc.stop()
+    return _reporte(estado)
+
+
+def etapa(nombre, filas=None, **datos):
+    """Context manager que mide una etapa; `filas` y los datos se pueden completar adentro"""
+    if _estado is None:
+        return _NULA
+    return _Etapa(nombre, filas, datos)
+
+
+def _largo(bloque):
+    # Filas de un bloque: dict columna -> arreglo, lista de columnas o una fila suelta
+    if isinstance(bloque, dict):
+        return len(next(iter(bloque.values()), ()))
+    if isinstance(bloque, list) and bloque and hasattr(bloque[0], '__len__'):
+        return len(bloque[0])
+    return 1
+
+
+def bloques(nombre, iterable):
+    """
+    Mide el tiempo que tarda en producirse cada bloque de un generador y
+    cuenta sus filas, sin el tiempo de quien los consume. Sin memoria: el
+    generador se intercala con otra etapa.
+    """
+    if _estado is None:
+        return iterable
+    # La etapa de afuera es la de quien pide los bloques, no la de quien los consume
+    padre = _estado.pila[-1].nombre if _estado.pila else None
+    return _bloques(_estado, nombre, padre, iterable)
+
+
+def _bloques(estado, nombre, padre, iterable):
+    comienzo = time.perf_counter()
+    segundos, filas = 0.0, 0
+    iterador = iter(iterable)
+    try:
+        while True:
+            inicio = time.perf_counter()
+            try:
+                bloque = next(iterador)
+            except StopIteration:
+                return
+            finally:
+                segundos += time.perf_counter() - inicio
+            filas += _largo(bloque)
+            yield bloque
+    finally:
+        if _estado is estado:
+            estado.etapas.append(_registro(nombre, padre, comienzo - estado.inicio, segundos, filas, None,
+                                           {'generador': True}))
+
+
+def _totales(etapas):
+    """Suma por nombre de etapa: llamadas, segundos, filas y el mayor pico"""
+    totales = {}
+    for registro in etapas:
+        total = totales.setdefault(registro['etapa'], {'llamadas': 0, 'segundos': 0.0, 'filas': 0,
+                                                       'memoria_pico': None})
+        total['llamadas'] += 1
+        total['segundos'] = round(total['segundos'] + registro['segundos'], 6)
+        total['filas'] += registro['filas'] or 0
+        if registro['memoria_pico'] is not None:
+            total['memoria_pico'] = max(total['memoria_pico'] or 0, registro['memoria_pico'])
+    for total in totales.values():
+        total['filas_por_segundo'] = (round(total['filas'] / total['segundos'], 1)
+                                      if total['filas'] and total['segundos'] > 0 else None)
+    return totales
+
+
+def _reporte(estado):
+    import platform
+
+    return {
+        'fecha': estado.fecha,
+        'argv': sys.argv,
+        'python': platform.python_version(),
+        'memoria': estado.memoria,
+        'segundos': round(time.perf_counter() - estado.inicio, 6),
+        'etapas': estado.etapas,
+        'totales': _totales(estado.etapas),
+    }
+
+
+def reporte():
+    """Reporte de lo medido hasta ahora (None si la medición está apagada)"""
+    return _reporte(_estado) if _estado is not None else None
+
+
+def escribir_reporte(archivo, datos=None):
+    """Escribe el reporte (el actual si no se da otro) como JSON"""
+    datos = datos if datos is not None else reporte()
+    with open(archivo, 'w', encoding='utf-8') as salida:
+        json.dump(datos, salida, ensure_ascii=False, indent=2)
+    return archivo
+
+
+def _al_salir(estado):
+    # Solo si sigue siendo la medición activa: activar() de nuevo la reemplaza
+    if _estado is estado:
+        escribir_reporte(estado.archivo, _reporte(estado))
+        print(f"✅ Reporte de medición guardado en {estado.archivo}", file=sys.stderr)
+
+
+if os.environ.get(VARIABLE):
+    activar(os.environ[VARIABLE])
@@ -0,0 +1,434 @@
+"""
+Motor de estado de enlace al estilo OSPF armado con las interfaces de router
+de una tabla de direcciones.
+
+Cada área es un grafo con un nodo por router y uno por subred (como las LSA
+de router y de red): router -> subred cuesta lo que la interfaz y subred ->
+router cuesta 0. Por cada router y cada una de sus áreas se calcula un árbol
+SPF (Dijkstra con heap); de cada árbol se guardan la distancia, el padre, la
+interfaz de salida y el siguiente salto de cada nodo, en matrices del área
+con una fila por router.
+
+Las rutas entre áreas salen de los ABR (routers con interfaces en más de un
+área): cada uno aporta su costo a las subredes de sus áreas y el backbone
+(área 0) las reparte a los demás, como las LSA de resumen.
+
+Al cambiar el costo de una interfaz o darla de baja solo se corrigen los
+árboles de su área que usaban ese enlace (si empeoró) o que pueden mejorar
+con él (si mejoró), y en cada uno solo la parte que cambia. Los costos
+totales de los ABR se arman al pedir una tabla y se corrigen con los cambios.
+"""
+import heapq
+import re
+
+import numpy as np
+
+from herramientas_red.direcciones import MASCARAS, ipv4_a_texto, mascara_a_prefijo, texto_a_ipv4
+from herramientas_red.validacion import COLUMNAS_GATEWAY, filas_router, rellenar_dispositivos
+
+BACKBONE = 0
+# Distancia de los nodos que no se alcanzan; las sumas de costos no llegan a desbordar un int32
+INFINITO = 1 << 30
+
+# Costo por nombre de interfaz, con el ancho de banda de referencia de 100 Mb/s
+COSTOS_INTERFAZ = [
+    (re.compile(r'^s(e(rial)?)?\s*\d', re.IGNORECASE), 64),
+    (re.compile(r'^e(th(ernet)?)?\s*\d', re.IGNORECASE), 10),
+]
+COSTO_POR_DEFECTO = 1
+
+COLUMNAS_RUTAS = ['Código', 'Red', 'Costo', 'Siguiente salto', 'Interfaz']
+
+
+def costo_interfaz(nombre):
+    """Costo OSPF por defecto de una interfaz ('S0/0/0' -> 64, 'G0/0' -> 1)"""
+    for patron, costo in COSTOS_INTERFAZ:
+        if patron.match(nombre):
+            return costo
+    return COSTO_POR_DEFECTO
+
+
+class _Area:
+    """
+    Grafo de un área y los árboles SPF de sus routers. Los nodos locales son
+    primero los routers (0..nr-1) y después las subredes.
+    """
+
+    def __init__(self, numero, interfaces, router_de, red_de, costos):
+        self.numero = numero
+        self.costos = costos
+        self.routers = list(dict.fromkeys(router_de[i] for i in interfaces))
+        self.nodos = {router: local for local, router in enumerate(self.routers)}
+        self.nr = len(self.routers)
+        redes = list(dict.fromkeys(red_de[i] for i in interfaces))
+        local_red = {red: self.nr + posicion for posicion, red in enumerate(redes)}
+        self.redes = np.array(redes, dtype=np.int64)
+        self.n = self.nr + len(redes)
+
+        # vecinos[nodo]: (nodo vecino, interfaz que los une)
+        self.vecinos = [[] for _ in range(self.n)]
+        self.extremos = {}
+        for i in interfaces:
+            router, red = self.nodos[router_de[i]], local_red[red_de[i]]
+            self.vecinos[router].append((red, i))
+            self.vecinos[red].append((router, i))
+            self.extremos[i] = (router, red)
+
+        forma = (self.nr, self.n)
+        self.distancia = np.full(forma, INFINITO, dtype=np.int32)
+        self.padre = np.full(forma, -1, dtype=np.int32)
+        # Interfaz del router raíz por la que sale y del vecino que es el siguiente salto
+        self.salida = np.full(forma, -1, dtype=np.int32)
+        self.salto = np.full(forma, -1, dtype=np.int32)
+
+    def _propagar(self, raiz, cola, distancia, padre, salida, salto):
+        """Dijkstra desde los nodos de la cola; solo toca los nodos que mejoran"""
+        nr, costos, vecinos = self.nr, self.costos, self.vecinos
+        while cola:
+            actual, nodo = heapq.heappop(cola)
+            if actual > distancia[nodo]:
+                continue
+            if nodo < nr:
+                # Router -> subred: cuesta lo que la interfaz
+                for vecino, interfaz in vecinos[nodo]:
+                    costo = costos[interfaz]
+                    if costo is None or actual + costo >= distancia[vecino]:
+                        continue
+                    distancia[vecino] = actual + costo
+                    padre[vecino] = nodo
+                    salida[vecino] = interfaz if nodo == raiz else salida[nodo]
+                    salto[vecino] = salto[nodo]
+                    heapq.heappush(cola, (actual + costo, vecino))
+            else:
+                # Subred -> router: sin costo; si la subred es de la raíz, el vecino es el siguiente salto
+                for vecino, interfaz in vecinos[nodo]:
+                    if costos[interfaz] is None or actual >= distancia[vecino]:
+                        continue
+                    distancia[vecino] = actual
+                    padre[vecino] = nodo
+                    salida[vecino] = salida[nodo]
+                    salto[vecino] = interfaz if padre[nodo] == raiz else salto[nodo]
+                    heapq.heappush(cola, (actual, vecino))
+
+    def _guardar(self, raiz, distancia, padre, salida, salto):
+        self.distancia[raiz] = distancia
+        self.padre[raiz] = padre
+        self.salida[raiz] = salida
+        self.salto[raiz] = salto
+
+    def spf(self, raiz):
+        """Dijkstra completo desde un router; guarda el árbol en su fila de las matrices"""
+        distancia = [INFINITO] * self.n
+        arbol = [distancia, [-1] * self.n, [-1] * self.n, [-1] * self.n]
+        distancia[raiz] = 0
+        self._propagar(raiz, [(0, raiz)], *arbol)
+        self._guardar(raiz, *arbol)
+
+    def _llegar(self, raiz, nodo, desde, interfaz, arbol):
+        """Candidato a `nodo` desde el nodo vecino `desde`; devuelve la distancia si mejora"""
+        distancia, padre, salida, salto = arbol
+        costo = self.costos[interfaz]
+        if costo is None or distancia[desde] >= INFINITO:
+            return None
+        nueva = distancia[desde] + (costo if desde < self.nr else 0)
+        if nueva >= distancia[nodo]:
+            return None
+        distancia[nodo], padre[nodo] = nueva, desde
+        if desde < self.nr:
+            salida[nodo] = interfaz if desde == raiz else salida[desde]
+            salto[nodo] = salto[desde]
+        else:
+            salida[nodo] = salida[desde]
+            salto[nodo] = interfaz if padre[desde] == raiz else salto[desde]
+        return nueva
+
+    def actualizar(self, raiz, interfaz, anterior, nuevo):
+        """
+        Corrige el árbol de un router después de cambiar el costo de una
+        interfaz (ya aplicado en costos), sin recorrer toda el área: si el
+        enlace mejoró se propaga desde su extremo; si empeoró o cayó se
+        rearma solo el subárbol que colgaba de él.
+        """
+        router, red = self.extremos[interfaz]
+        arbol = [self.distancia[raiz].tolist(), self.padre[raiz].tolist(),
+                 self.salida[raiz].tolist(), self.salto[raiz].tolist()]
+        distancia, padre, salida, salto = arbol
+        cola = []
+        if nuevo is not None and (anterior is None or nuevo < anterior):
+            for nodo, desde in ((red, router), (router, red)):
+                nueva = self._llegar(raiz, nodo, desde, interfaz, arbol)
+                if nueva is not None:
+                    cola.append((nueva, nodo))
+        else:
+            tope = red if padre[red] == router else router
+            hijos = [[] for _ in range(self.n)]
+            for nodo, arriba in enumerate(padre):
+                if arriba >= 0:
+                    hijos[arriba].append(nodo)
+            subarbol, pendientes = [], [tope]
+            while pendientes:
+                nodo = pendientes.pop()
+                subarbol.append(nodo)
+                pendientes.extend(hijos[nodo])
+            for nodo in subarbol:
+                distancia[nodo], padre[nodo], salida[nodo], salto[nodo] = INFINITO, -1, -1, -1
+            # Cada nodo del subárbol arranca desde sus vecinos que quedaron fuera
+            for nodo in subarbol:
+                for vecino, enlace in self.vecinos[nodo]:
+                    self._llegar(raiz, nodo, vecino, enlace, arbol)
+            cola = [(distancia[nodo], nodo) for nodo in subarbol if distancia[nodo] < INFINITO]
+            heapq.heapify(cola)
+        self._propagar(raiz, cola, *arbol)
+        self._guardar(raiz, *arbol)
+
+    def convergir(self):
+        for raiz in range(self.nr):
+            self.spf(raiz)
+
+    def afectados(self, interfaz, anterior, nuevo):
+        """Routers cuyo árbol puede cambiar al pasar el costo de la interfaz de `anterior` a `nuevo`"""
+        router, red = self.extremos[interfaz]
+        distancia = self.distancia.astype(np.int64)
+        if nuevo is None or (anterior is not None and nuevo > anterior):
+            # Empeoró: solo los árboles que usaban el enlace (al caer, en los dos sentidos)
+            usan = self.padre[:, red] == router
+            if nuevo is None:
+                usan |= self.padre[:, router] == red
+            return np.flatnonzero(usan)
+        # Mejoró: los árboles en los que el enlace acorta algún camino
+        mejoran = distancia[:, router] + nuevo < distancia[:, red]
+        if anterior is None:
+            mejoran |= distancia[:, red] < distancia[:, router]
+        return np.flatnonzero(mejoran)
+
+
+class RedOSPF:
+    """
+    Dominio OSPF de las interfaces de router con IPv4 de una tabla. `costos`
+    y `areas` son columnas opcionales (vacío: costo por tipo de interfaz y
+    área 0).
+    """
+
+    def __init__(self, ips, mascaras, dispositivos, interfaces=None, costos=None, areas=None,
+                 tipos=None, gateways=None):
+        dispositivos = rellenar_dispositivos(dispositivos)
+        ips, mascaras = list(ips), list(mascaras)
+        enteros, validas = texto_a_ipv4(ips)
+        prefijos, con_mascara = mascara_a_prefijo(mascaras)
+        es_router = np.zeros(len(dispositivos), dtype=bool)
+        es_router[filas_router(dispositivos, gateways, tipos)] = True
+
+        # Interfaces de router con dirección y máscara; cada subred es (área, red, prefijo)
+        self.routers, self.ids = [], {}
+        self.router_de, self.nombre, self.ip, self.area_de, self.red_de = [], [], [], [], []
+        self.costos, self.costos_iniciales = [], []
+        self.redes, self.ids_redes = [], {}
+        self.interfaz_de = {}
+        self.interfaces_de = []
+        filas = np.flatnonzero(es_router & validas & con_mascara).tolist()
+        for fila in filas:
+            nombre = str(interfaces[fila]).strip() if interfaces is not None else f"if{fila}"
+            area = int(areas[fila]) if areas is not None and str(areas[fila]).strip() else BACKBONE
+            costo = int(costos[fila]) if costos is not None and str(costos[fila]).strip() else costo_interfaz(nombre)
+            prefijo = int(prefijos[fila])
+            red = (area, int(enteros[fila]) & int(MASCARAS[prefijo]), prefijo)
+            router = self.ids.setdefault(dispositivos[fila], len(self.routers))
+            if router == len(self.routers):
+                self.routers.append(dispositivos[fila])
+                self.interfaces_de.append([])
+            self.interfaces_de[router].append(len(self.router_de))
+            self.interfaz_de[(dispositivos[fila], nombre)] = len(self.router_de)
+            self.router_de.append(router)
+            self.nombre.append(nombre)
+            self.ip.append(int(enteros[fila]))
+            self.area_de.append(area)
+            self.red_de.append(self.ids_redes.setdefault(red, len(self.redes)))
+            if self.red_de[-1] == len(self.redes):
+                self.redes.append(red)
+            self.costos.append(costo)
+            self.costos_iniciales.append(costo)
+
+        por_area = {}
+        for interfaz, area in enumerate(self.area_de):
+            por_area.setdefault(area, []).append(interfaz)
+        self.areas = {area: _Area(area, interfaces_area, self.router_de, self.red_de, self.costos)
+                      for area, interfaces_area in sorted(por_area.items())}
+        self.areas_de = [[] for _ in self.routers]
+        for area in self.areas.values():
+            for router in area.routers:
+                self.areas_de[router].append(area)
+
+        # ABR: routers en más de un área; solo los del backbone reparten resúmenes
+        self.abr = [router for router, areas_router in enumerate(self.areas_de) if len(areas_router) > 1]
+        backbone = self.areas.get(BACKBONE)
+        self._abr0 = np.array([k for k, router in enumerate(self.abr)
+                               if backbone is not None and router in backbone.nodos], dtype=np.int64)
+        self._costo_abr = np.full((len(self.abr), len(self.redes)), INFINITO, dtype=np.int64)
+        # Costo total de cada ABR del backbone, armado al pedir una tabla
+        self._totales = {}
+        self.convergir()
+
+    @classmethod
+    def desde_tabla(cls, tabla):
+        """Desde un DataFrame, TablaColumnar o TablaDirecciones (columnas 'Costo' y 'Área' opcionales)"""
+        def columna(nombre):
+            if hasattr(tabla, 'columna'):
+                return tabla.columna(nombre) if nombre in tabla.columnas else None
+            return tabla[nombre].tolist() if nombre in tabla.columns else None
+
+        gateways = next((g for g in (columna(nombre) for nombre in COLUMNAS_GATEWAY) if g is not None), None)
+        return cls(columna('Dirección IP'), columna('Máscara de subred'), columna('Dispositivo'),
+                   columna('Interfaz'), columna('Costo'), columna('Área'), columna('Tipo'), gateways)
+
+    def convergir(self):
+        """Calcula todos los árboles SPF y los costos de los ABR a las subredes de sus áreas"""
+        for area in self.areas.values():
+            area.convergir()
+            self._costos_abr(area)
+        self._totales.clear()
+
+    def _costos_abr(self, area):
+        for k, router in enumerate(self.abr):
+            if router in area.nodos:
+                self._costo_abr[k, area.redes] = area.distancia[area.nodos[router], area.nr:]
+
+    def _total(self, posicion, columnas=slice(None)):
+        """
+        Costo del ABR del backbone `posicion` (en _abr0) a cada subred,
+        pasando por otro ABR del backbone si conviene
+        """
+        backbone = self.areas[BACKBONE]
+        locales = [backbone.nodos[self.abr[k]] for k in self._abr0.tolist()]
+        hasta_abr = backbone.distancia[locales[posicion], locales].astype(np.int64)
+        if isinstance(columnas, slice):
+            costos = self._costo_abr[self._abr0, columnas]
+        else:
+            costos = self._costo_abr[np.ix_(self._abr0, columnas)]
+        total = (hasta_abr[:, None] + costos).min(axis=0)
+        return np.minimum(total, INFINITO)
+
+    def _total_abr(self, posicion):
+        if posicion not in self._totales:
+            self._totales[posicion] = self._total(posicion)
+        return self._totales[posicion]
+
+    def _interfaz(self, router, interfaz):
+        clave = (router, interfaz)
+        if clave not in self.interfaz_de:
+            raise ValueError(f"{router} no tiene la interfaz {interfaz} en el dominio OSPF")
+        return self.interfaz_de[clave]
+
+    def cambiar_costo(self, router, interfaz, costo):
+        """
+        Cambia el costo de una interfaz (None la da de baja) y corrige solo
+        los árboles afectados. Devuelve cuántos árboles se corrigieron.
+        """
+        posicion = self._interfaz(router, interfaz)
+        anterior = self.costos[posicion]
+        if costo == anterior:
+            return 0
+        area = self.areas[self.area_de[posicion]]
+        afectados = area.afectados(posicion, anterior, costo).tolist()
+        self.costos[posicion] = costo
+        for raiz in afectados:
+            area.actualizar(raiz, posicion, anterior, costo)
+        if any(len(self.areas_de[area.routers[raiz]]) > 1 for raiz in afectados):
+            # Cambió el árbol de un ABR: si es del backbone cambian todos los totales;
+            # si es de otra área, solo las columnas de sus subredes
+            self._costos_abr(area)
+            if area.numero == BACKBONE:
+                self._totales.clear()
+            else:
+                for posicion_abr, total in self._totales.items():
+                    total[area.redes] = self._total(posicion_abr, area.redes)
+        return len(afectados)
+
+    def desactivar(self, router, interfaz):
+        """Da de baja una interfaz (caída del enlace)"""
+        return self.cambiar_costo(router, interfaz, None)
+
+    def activar(self, router, interfaz, costo=None):
+        """Vuelve a levantar una interfaz, con su costo inicial si no se indica otro"""
+        posicion = self._interfaz(router, interfaz)
+        return self.cambiar_costo(router, interfaz, self.costos_iniciales[posicion] if costo is None else costo)
+
+    def _rutas(self, router):
+        """(costo, interfaz de salida, siguiente salto, entre áreas, conectada) por subred, para un router"""
+        cantidad = len(self.redes)
+        costo = np.full(cantidad, INFINITO, dtype=np.int64)
+        salida = np.full(cantidad, -1, dtype=np.int64)
+        salto = np.full(cantidad, -1, dtype=np.int64)
+        propias = np.zeros(cantidad, dtype=bool)
+        for area in self.areas_de[router]:
+            fila = area.nodos[router]
+            costo[area.redes] = area.distancia[fila, area.nr:]
+            salida[area.redes] = area.salida[fila, area.nr:]
+            salto[area.redes] = area.salto[fila, area.nr:]
+            propias[area.redes] = True
+
+        # Entre áreas: por el ABR que deja el menor costo total
+        candidatos = []
+        for area in self.areas_de[router]:
+            fila = area.nodos[router]
+            if area.numero == BACKBONE:
+                abr, hacia = self._abr0, self._costo_abr[self._abr0]
+            else:
+                dentro = [posicion for posicion, k in enumerate(self._abr0.tolist()) if self.abr[k] in area.nodos]
+                abr, hacia = self._abr0[dentro], [self._total_abr(posicion) for posicion in dentro]
+            for k, costos_abr in zip(abr.tolist(), hacia):
+                local = area.nodos[self.abr[k]]
+                candidatos.append((int(area.distancia[fila, local]) + costos_abr,
+                                   area.salida[fila, local], area.salto[fila, local]))
+        entre_areas = np.zeros(cantidad, dtype=bool)
+        if candidatos:
+            totales = np.array([total for total, _, _ in candidatos])
+            mejor = np.argmin(totales, axis=0)
+            mejor_costo = totales[mejor, np.arange(cantidad)]
+            entre_areas = ~propias & (mejor_costo < INFINITO)
+            costo[entre_areas] = mejor_costo[entre_areas]
+            salida[entre_areas] = np.array([s for _, s, _ in candidatos])[mejor[entre_areas]]
+            salto[entre_areas] = np.array([s for _, _, s in candidatos])[mejor[entre_areas]]
+
+        # Las conectadas van siempre por su interfaz, aunque el SPF encuentre un camino más corto
+        conectadas = np.zeros(cantidad, dtype=bool)
+        for interfaz in self.interfaces_de[router]:
+            red = self.red_de[interfaz]
+            if self.costos[interfaz] is not None and (not conectadas[red] or self.costos[interfaz] < costo[red]):
+                conectadas[red] = True
+                costo[red], salida[red], salto[red] = self.costos[interfaz], interfaz, -1
+        return costo, salida, salto, entre_areas, conectadas
+
+    def costo(self, router, red):
+        """Costo desde un router a una subred ('192.168.1.0/24'), o None si no la alcanza"""
+        direccion, _, prefijo = red.partition('/')
+        entero, valida = texto_a_ipv4([direccion])
+        costos = self._rutas(self.ids[router])[0]
+        posiciones = [posicion for posicion, (_, inicio, largo) in enumerate(self.redes)
+                      if valida[0] and inicio == int(entero[0]) and str(largo) == prefijo]
+        mejor = min((int(costos[posicion]) for posicion in posiciones), default=INFINITO)
+        return None if mejor >= INFINITO else mejor
+
+    def tabla_rutas(self, router):
+        """
+        Tabla de enrutamiento de un router como lista de dicts (COLUMNAS_RUTAS):
+        C conectadas, O dentro del área, O IA entre áreas
+        """
+        if router not in self.ids:
+            raise ValueError(f"{router} no es un router del dominio OSPF")
+        costo, salida, salto, entre_areas, conectadas = self._rutas(self.ids[router])
+        inicios = np.array([inicio for _, inicio, _ in self.redes], dtype=np.uint32)
+        largos = np.array([largo for _, _, largo in self.redes], dtype=np.int64)
+        codigos = np.where(conectadas, 'C', np.where(entre_areas, 'O IA', 'O'))
+
+        alcanzadas = np.flatnonzero(costo < INFINITO)
+        alcanzadas = alcanzadas[np.lexsort((largos[alcanzadas], inicios[alcanzadas], ~conectadas[alcanzadas]))]
+        redes = ipv4_a_texto(inicios[alcanzadas]).tolist()
+        ips = np.array(self.ip, dtype=np.uint32)
+        saltos = ipv4_a_texto(ips[np.maximum(salto[alcanzadas], 0)]).tolist()
+        return [{
+            'Código': str(codigos[posicion]),
+            'Red': f"{red}/{largos[posicion]}",
+            'Costo': int(costo[posicion]),
+            'Siguiente salto': '' if salto[posicion] < 0 else siguiente,
+            'Interfaz': self.nombre[salida[posicion]] if salida[posicion] >= 0 else '',
+        } for posicion, red, siguiente in zip(alcanzadas.tolist(), redes, saltos)]
@@ -0,0 +1,257 @@
+"""
+Lectura de archivos de Packet Tracer (.pkt/.pka) sin abrir Packet Tracer.
+
+Formato actual (PT 7 y posteriores):
+1. Se invierte el archivo y cada byte i se combina (XOR) con (largo - i * largo)
+2. Twofish en modo EAX con clave y nonce fijos
+3. Cada byte i se combina (XOR) con (largo - i)
+4. 4 bytes big-endian con el tamaño del XML, seguidos del XML comprimido con zlib
+
+Los archivos viejos solo tienen los pasos 3 y 4. El XML se descomprime y se
+recorre por partes (XMLPullParser): cada <DEVICE> se convierte en filas y se
+descarta, y la lectura termina al cerrarse la red pedida.
+"""
+import os
+import re
+import zlib
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from herramientas_red.cache import CacheContenido, procesar_archivos
+from herramientas_red.twofish import descifrar_eax
+
+CLAVE = bytes([137]) * 16
+NONCE = bytes([16]) * 16
+
+# Sube al cambiar lo que se extrae, para no reutilizar resultados viejos de la caché
+VERSION_EXTRACTOR = 1
+
+EXTENSIONES = ('.pkt', '.pka')
+
+COLUMNAS = ["Dispositivo", "Interfaz", "Dirección IP", "Máscara de subred", "Puerta de enlace predeterminada"]
+
+# En un .pka hay tres redes, en este orden
+REDES_ACTIVIDAD = {'usuario': 0, 'inicial': 1, 'respuesta': 2}
+
+# Caracteres de control que XML 1.0 no admite (aparecen en algunos atributos)
+_ILEGALES = bytes(list(range(0, 9)) + [11, 12] + list(range(14, 32)))
+
+TAM_TROZO = 1 << 20
+
+_IP = re.compile(r'^\s*ip address (\d+\.\d+\.\d+\.\d+) (\d+\.\d+\.\d+\.\d+)')
+_IPV6 = re.compile(r'^\s*ipv6 address ([0-9A-Fa-f:]+)/(\d+)\s*$')
+_GATEWAY = re.compile(r'^\s*ip default-gateway (\d+\.\d+\.\d+\.\d+)')
+
+# Dispositivos que se configuran por CLI; el resto (PC, servidores...) por puertos
+_CON_CLI = ('Router', 'Switch', 'MultiLayerSwitch')
+
+
+def _xor_posicion(datos):
+    # Paso 3: byte i XOR (largo - i)
+    largo = len(datos)
+    clave = (np.uint64(largo) - np.arange(largo, dtype=np.uint64)) & np.uint64(0xFF)
+    return np.frombuffer(datos, dtype=np.uint8) ^ clave.astype(np.uint8)
+
+
+def desofuscar(datos, verificar=False):
+    """Devuelve el XML comprimido (con el tamaño al frente) de un archivo de Packet Tracer"""
+    largo = len(datos)
+    posiciones = np.arange(largo, dtype=np.uint64)
+    clave = (np.uint64(largo) - posiciones * np.uint64(largo)) & np.uint64(0xFF)
+    paso1 = (np.frombuffer(datos, dtype=np.uint8)[::-1] ^ clave.astype(np.uint8)).tobytes()
+    paso2 = descifrar_eax(CLAVE, NONCE, paso1, verificar=verificar)
+    return _xor_posicion(paso2).tobytes()
+
+
+def _comprimido(datos, verificar=False):
+    # Formato actual; si zlib no reconoce el resultado, se prueba el formato viejo
+    for candidato in (lambda: desofuscar(datos, verificar), lambda: _xor_posicion(datos).tobytes()):
+        comprimido = candidato()
+        try:
+            # Basta con descomprimir el comienzo para ver si es XML
+            if zlib.decompressobj().decompress(comprimido[4:], 16).lstrip().startswith(b'<'):
+                return comprimido
+        except zlib.error:
+            pass
+    raise ValueError("No es un archivo de Packet Tracer reconocible")
+
+
+def trozos_xml(datos, verificar=False):
+    """Genera el XML descomprimido por trozos de TAM_TROZO bytes, ya sin caracteres ilegales"""
+    comprimido = _comprimido(datos, verificar)
+    descompresor = zlib.decompressobj()
+    pendiente = comprimido[4:]
+    while pendiente:
+        trozo = descompresor.decompress(pendiente, TAM_TROZO)
+        pendiente = descompresor.unconsumed_tail
+        if trozo:
+            yield trozo.translate(None, _ILEGALES)
+    resto = descompresor.flush()
+    if resto:
+        yield resto.translate(None, _ILEGALES)
+
+
+def decodificar(datos, verificar=False):
+    """XML completo de un archivo de Packet Tracer (bytes)"""
+    return b''.join(trozos_xml(datos, verificar))
+
+
+def _texto(elemento, ruta):
+    valor = elemento.findtext(ruta)
+    return valor.strip() if valor else ''
+
+
+def _filas_cli(nombre, motor, gateway_defecto):
+    # Interfaces y direcciones a partir de la running-config
+    lineas = [linea.text or '' for linea in motor.iterfind('RUNNINGCONFIG/LINE')]
+    gateway = gateway_defecto
+    for linea in lineas:
+        coincidencia = _GATEWAY.match(linea)
+        if coincidencia:
+            gateway = coincidencia.group(1)
+    interfaz = None
+    for linea in lineas:
+        if linea.startswith('interface '):
+            interfaz = linea.split(None, 1)[1].strip()
+            continue
+        if not linea.startswith(' '):
+            interfaz = None
+            continue
+        if interfaz is None:
+            continue
+        coincidencia = _IP.match(linea)
+        if coincidencia:
+            yield [nombre, interfaz, coincidencia.group(1), coincidencia.group(2), gateway]
+            continue
+        coincidencia = _IPV6.match(linea)
+        if coincidencia:
+            yield [nombre, interfaz, coincidencia.group(1), f"/{coincidencia.group(2)}", gateway]
+
+
+def _filas_puertos(nombre, motor):
+    # Equipos finales: cada puerto con IP, con el gateway del puerto o del equipo
+    gateway = _texto(motor, 'GATEWAY')
+    gateway_v6 = _texto(motor, 'GATEWAYV6')
+    for puerto in motor.iter('PORT'):
+        interfaz = 'Wireless' if 'Wireless' in _texto(puerto, 'TYPE') else 'NIC'
+        ip = _texto(puerto, 'IP')
+        if ip:
+            yield [nombre, interfaz, ip, _texto(puerto, 'SUBNET'), _texto(puerto, 'PORT_GATEWAY') or gateway]
+        for direccion in puerto.iterfind('IPV6_ADDRESSES/IPV6_ADDRESS'):
+            yield [nombre, interfaz, _texto(direccion, 'ADDRESS'), f"/{_texto(direccion, 'PREFIX')}",
+                   _texto(puerto, 'IPV6_PORT_GATEWAY') or gateway_v6]
+
+
+def filas_dispositivo(dispositivo):
+    """Filas de la tabla de direcciones para un elemento <DEVICE>"""
+    motor = dispositivo.find('ENGINE')
+    if motor is None:
+        return []
+    nombre = _texto(motor, 'NAME')
+    tipo = _texto(motor, 'TYPE')
+    if tipo in _CON_CLI:
+        return list(_filas_cli(nombre, motor, 'N/D' if tipo == 'Router' else ''))
+    return list(_filas_puertos(nombre, motor))
+
+
+def extraer_redes(trozos, redes=tuple(REDES_ACTIVIDAD)):
+    """
+    Recorre el XML por partes y devuelve {red: filas} con las filas (listas
+    en el orden de COLUMNAS) de cada red pedida. Un .pkt tiene una sola red,
+    que se devuelve con cada nombre pedido; en un .pka las redes son
+    'usuario', 'inicial' y 'respuesta'.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    objetivos = {REDES_ACTIVIDAD[red] for red in redes}
+    filas = {}
+    profundidad = 0
+    actividad = False
+    red_actual = -1
+    # Profundidad de la <NETWORK> y del <DEVICE> abiertos (None si no hay)
+    nivel_red = None
+    nivel_dispositivo = None
+
+    for trozo in trozos:
+        parser.feed(trozo)
+        for evento, elemento in parser.read_events():
+            if evento == 'start':
+                profundidad += 1
+                if profundidad == 1:
+                    actividad = elemento.tag == 'PACKETTRACER5_ACTIVITY'
+                elif profundidad == 2 and elemento.tag == 'PACKETTRACER5':
+                    red_actual += 1
+                elif (nivel_red is None and elemento.tag == 'NETWORK' and red_actual not in filas
+                      and (red_actual in objetivos or not actividad)):
+                    nivel_red = profundidad
+                    filas[red_actual] = []
+                elif nivel_red is not None and nivel_dispositivo is None and elemento.tag == 'DEVICE':
+                    nivel_dispositivo = profundidad
+                continue
+
+            if profundidad == nivel_dispositivo:
+                filas[red_actual].extend(filas_dispositivo(elemento))
+                nivel_dispositivo = None
+                elemento.clear()
+            elif profundidad == nivel_red:
+                nivel_red = None
+                # Ya se leyeron las redes pedidas: el resto del archivo no hace falta
+                if not actividad or objetivos <= filas.keys():
+                    return _por_nombre(filas, redes, actividad)
+            elif nivel_dispositivo is None:
+                elemento.clear()
+            profundidad -= 1
+    return _por_nombre(filas, redes, actividad)
+
+
+def _por_nombre(filas, redes, actividad):
+    if not actividad:
+        unica = next(iter(filas.values()), [])
+        return {red: unica for red in redes}
+    return {red: filas.get(REDES_ACTIVIDAD[red], []) for red in redes}
+
+
+def extraer_direcciones(trozos, red='respuesta'):
+    """Filas de una sola red (ver extraer_redes)"""
+    return extraer_redes(trozos, (red,))[red]
+
+
+def leer_archivo(ruta, red='respuesta', verificar=False):
+    """Filas de direcciones de un archivo .pkt/.pka"""
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+    return extraer_direcciones(trozos_xml(datos, verificar), red)
+
+
+def _leer_para_cache(ruta):
+    # Nivel de módulo para poder enviarse a los procesos del pool; guarda las tres redes
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+    return extraer_redes(trozos_xml(datos))
+
+
+def buscar_archivos(carpeta, extensiones=EXTENSIONES):
+    """Rutas de los archivos con esas extensiones bajo una carpeta, ordenadas"""
+    rutas = []
+    for raiz, carpetas, archivos in os.walk(carpeta):
+        carpetas[:] = [c for c in carpetas if not c.startswith('.')]
+        rutas.extend(os.path.join(raiz, nombre) for nombre in archivos if nombre.lower().endswith(extensiones))
+    return sorted(rutas)
+
+
+def leer_arbol(carpeta, red='respuesta', procesos=None, usar_cache=True, carpeta_cache=None):
+    """
+    Lee todos los .pkt/.pka bajo una carpeta en paralelo. Devuelve
+    (resultados, errores): ruta -> filas y ruta -> mensaje. Los resultados se
+    guardan por hash de contenido, así que los archivos sin cambios no se vuelven a leer.
+    """
+    rutas = buscar_archivos(carpeta) if os.path.isdir(carpeta) else [carpeta]
+    cache = CacheContenido('packet_tracer', VERSION_EXTRACTOR, carpeta_cache) if usar_cache else None
+    redes, errores = procesar_archivos(rutas, _leer_para_cache, cache, procesos)
+    resultados = {ruta: valor[red] for ruta, valor in redes.items()}
+    return resultados, errores
+
+
+def filas_como_dicts(filas):
+    """Convierte filas (listas en el orden de COLUMNAS) a dicts"""
+    return [dict(zip(COLUMNAS, fila)) for fila in filas]
@@ -0,0 +1,252 @@
+"""
+Extracción de la tabla de direccionamiento de las guías de laboratorio en PDF.
+
+Las tablas de Cisco vienen con celdas combinadas: la grilla que arma
+pdfplumber no coincide fila a fila con las columnas visibles y los
+encabezados suelen ocupar dos filas ("Gateway" / "predeterminado"). Por eso
+cada celda se asigna a la columna del encabezado más cercana en x, las
+celdas combinadas hacia abajo se repiten en las filas que cubren y las
+direcciones "IP /prefijo" o "IP máscara" se separan. El resultado usa
+las mismas columnas que packet_tracer.COLUMNAS.
+
+pdfplumber es opcional: solo se importa al leer un PDF.
+"""
+import os
+import re
+
+from herramientas_red.cache import CacheContenido, procesar_archivos
+from herramientas_red.packet_tracer import COLUMNAS, buscar_archivos
+
+# Sube al cambiar lo que se extrae, para no reutilizar resultados viejos de la caché
+VERSION_EXTRACTOR = 1
+
+EXTENSIONES = ('.pdf',)
+
+_MASCARA = re.compile(r'^(.*?)\s+(\d{1,3}(?:\.\d{1,3}){3})$')
+_PREFIJO = re.compile(r'^(.*?)\s*/\s*(\d{1,3})$')
+_DIGITO = re.compile(r'\d')
+
+
+def _pdfplumber():
+    try:
+        import pdfplumber
+    except ImportError:
+        raise ImportError("Para leer las guías en PDF instala pdfplumber: pip install pdfplumber")
+    return pdfplumber
+
+
+def _campo(encabezado):
+    """Columna de COLUMNAS (o 'link-local') que corresponde al texto de un encabezado"""
+    texto = encabezado.lower()
+    if 'link' in texto:
+        return 'link-local'
+    if 'gateway' in texto or 'puerta' in texto:
+        return COLUMNAS[4]
+    if 'scara' in texto or 'longitud' in texto:
+        return COLUMNAS[3]
+    if 'direcci' in texto or 'address' in texto:
+        return None if 'mac' in texto else COLUMNAS[2]
+    if 'prefijo' in texto or 'prefix' in texto:
+        return COLUMNAS[3]
+    if 'dispositivo' in texto or 'device' in texto:
+        return COLUMNAS[0]
+    if 'interfaz' in texto or 'interface' in texto:
+        return COLUMNAS[1]
+    return None
+
+
+def _limpiar(celda):
+    # Las celdas combinadas hacia abajo repiten el texto en cada fila que cubren
+    # ('R1\nR1\nR1', 'Servidor\ncorporativo\nServidor\ncorporativo')
+    if not celda:
+        return ''
+    lineas = [' '.join(linea.split()) for linea in celda.split('\n')]
+    lineas = [linea for linea in lineas if linea]
+    minusculas = [linea.lower() for linea in lineas]
+    for periodo in range(1, len(lineas)):
+        if len(lineas) % periodo == 0 and minusculas == minusculas[:periodo] * (len(lineas) // periodo):
+            lineas = lineas[:periodo]
+            break
+    return ' '.join(lineas)
+
+
+def separar_direccion(texto):
+    """'192.168.0.1 /24' -> ('192.168.0.1', '/24'); también 'IP máscara' e IPv6 con espacios"""
+    mascara = ''
+    coincidencia = _MASCARA.match(texto)
+    if coincidencia and coincidencia.group(1):
+        texto, mascara = coincidencia.groups()
+    else:
+        coincidencia = _PREFIJO.match(texto)
+        if coincidencia and coincidencia.group(1):
+            texto, mascara = coincidencia.group(1), f"/{coincidencia.group(2)}"
+    if ':' in texto:
+        # El texto del PDF mete espacios dentro de las IPv6 ('2001:db 8:1: :1')
+        texto = texto.replace(' ', '')
+    return texto.strip(), mascara
+
+
+def _normalizar_mascara(texto):
+    return f"/{texto}" if texto.isdigit() else texto.replace(' ', '')
+
+
+def _celdas(tabla):
+    """Por cada fila de una tabla de pdfplumber: (bbox de la fila, [(texto, bbox) o None])"""
+    return [
+        (fila.bbox, [None if bbox is None else (_limpiar(texto), bbox) for texto, bbox in zip(textos, fila.cells)])
+        for textos, fila in zip(tabla.extract(), tabla.rows)
+    ]
+
+
+def _encabezado(filas):
+    """Posición de la fila de encabezado y cantidad de filas que ocupa, o None"""
+    for posicion, (_, celdas) in enumerate(filas):
+        campos = [_campo(celda[0]) if celda else None for celda in celdas]
+        if COLUMNAS[0] in campos and COLUMNAS[1] in campos:
+            break
+    else:
+        return None
+    interfaz = campos.index(COLUMNAS[1])
+    alto = 1
+    # Las filas siguientes sin números y sin dispositivo son continuación del encabezado
+    for _, celdas in filas[posicion + 1:]:
+        textos = [celda[0] if celda else '' for celda in celdas]
+        if any(_DIGITO.search(texto) for texto in textos):
+            break
+        if any(texto and _campo(texto) != COLUMNAS[0] for texto in textos[:interfaz]):
+            break
+        alto += 1
+    return posicion, alto
+
+
+def _etiquetas(encabezado):
+    """
+    [(centro x, campo)] de las columnas del encabezado. Un campo que ya
+    apareció con otro texto ('Interfaz del dispositivo' después de
+    'Dispositivo') queda como columna sin campo, para que no le robe datos.
+    """
+    textos = {}
+    for _, celdas in encabezado:
+        for posicion, celda in enumerate(celdas):
+            if celda and celda[0]:
+                texto, bbox = textos.get(posicion, ('', celda[1]))
+                textos[posicion] = ((texto + ' ' + celda[0]).strip(), bbox)
+    etiquetas = []
+    vistos = {}
+    for posicion in sorted(textos):
+        texto, bbox = textos[posicion]
+        campo = _campo(texto)
+        if campo is not None and vistos.setdefault(campo, texto) != texto:
+            campo = None
+        etiquetas.append(((bbox[0] + bbox[2]) / 2, campo))
+    return etiquetas
+
+
+def _campo_celda(etiquetas, bbox):
+    centro = (bbox[0] + bbox[2]) / 2
+    return min(etiquetas, key=lambda etiqueta: abs(etiqueta[0] - centro))[1]
+
+
+def _empieza_con_datos(filas):
+    # Una continuación arranca con una fila de datos (interfaz o dirección), no con otro encabezado
+    return bool(filas) and any(celda and _DIGITO.search(celda[0]) for celda in filas[0][1])
+
+
+def filas_tabla(tabla, encabezado=None):
+    """
+    Filas (listas en el orden de COLUMNAS) de una tabla de pdfplumber.
+    Devuelve (filas, encabezado); encabezado es None si la tabla no es de
+    direccionamiento. Se puede pasar el encabezado de la página anterior
+    para tablas que continúan sin repetirlo.
+    """
+    filas = _celdas(tabla)
+    ancho = len(filas[0][1]) if filas else 0
+    ubicacion = _encabezado(filas)
+    if ubicacion is not None:
+        posicion, alto = ubicacion
+        encabezado = (ancho, _etiquetas(filas[posicion:posicion + alto]))
+        filas = filas[posicion + alto:]
+    elif encabezado is None or encabezado[0] != ancho or not _empieza_con_datos(filas):
+        return [], None
+    etiquetas = encabezado[1]
+    if COLUMNAS[2] not in {campo for _, campo in etiquetas}:
+        return [], None
+
+    resultado = []
+    # Celdas con texto ya vistas: (campo, texto, borde inferior). Las que
+    # bajan más allá de su fila cubren también las siguientes
+    vistas = []
+    for bbox_fila, celdas in filas:
+        arriba = bbox_fila[1]
+        vistas = [celda for celda in vistas if celda[2] > arriba + 1]
+        propias = {}
+        for celda in celdas:
+            if celda is None:
+                continue
+            texto, bbox = celda
+            campo = _campo_celda(etiquetas, bbox)
+            propias.setdefault(campo, []).append(texto)
+            vistas.append((campo, texto, bbox[3]))
+        valores = {campo: ' '.join(t for t in textos if t) for campo, textos in propias.items()}
+        for campo, texto, _ in vistas:
+            valores.setdefault(campo, texto)
+
+        # Filas sin dirección propia son restos del dibujo de las celdas combinadas
+        if COLUMNAS[2] not in propias and 'link-local' not in propias:
+            continue
+        base = [valores.get(COLUMNAS[0], ''), valores.get(COLUMNAS[1], '')]
+        gateway = valores.get(COLUMNAS[4], '')
+        if COLUMNAS[2] in propias:
+            direccion, mascara = separar_direccion(valores[COLUMNAS[2]])
+            mascara = mascara or _normalizar_mascara(valores.get(COLUMNAS[3], ''))
+            resultado.append(base + [direccion, mascara, gateway])
+        if valores.get('link-local') and 'link-local' in propias:
+            resultado.append(base + [separar_direccion(valores['link-local'])[0], '', gateway])
+    return resultado, encabezado
+
+
+def extraer_tablas(pdf):
+    """
+    Filas de la tabla de direccionamiento de un PDF abierto con pdfplumber.
+    Se deja de leer cuando la tabla termina: el resto de la guía son
+    instrucciones y cada página cuesta lo mismo de interpretar.
+    """
+    filas = []
+    encabezado = None
+    for pagina in pdf.pages:
+        # Buscar en los caracteres sueltos evita armar el texto de la página
+        if encabezado is None and 'Dispositivo' not in ''.join(c['text'] for c in pagina.chars):
+            pagina.close()
+            continue
+        continua = False
+        tablas = pagina.find_tables()
+        for numero, tabla in enumerate(tablas):
+            # Solo la primera tabla de la página puede continuar la de la anterior
+            nuevas, encabezado = filas_tabla(tabla, encabezado if numero == 0 else None)
+            filas.extend(nuevas)
+            # Una tabla que llega al pie de la página puede seguir en la próxima
+            continua = encabezado is not None and tabla.bbox[3] > pagina.height * 0.85
+        pagina.close()
+        if filas and not continua:
+            break
+        if not continua:
+            encabezado = None
+    return filas
+
+
+def leer_pdf(ruta):
+    """Filas de la tabla de direccionamiento de una guía en PDF"""
+    with _pdfplumber().open(ruta) as pdf:
+        return extraer_tablas(pdf)
+
+
+def leer_arbol(carpeta, procesos=None, usar_cache=True, carpeta_cache=None):
+    """
+    Lee todos los PDF bajo una carpeta en paralelo. Devuelve (resultados,
+    errores): ruta -> filas y ruta -> mensaje. Los resultados se guardan por
+    hash de contenido, así que los PDF sin cambios no se vuelven a leer.
+    """
+    _pdfplumber()
+    rutas = buscar_archivos(carpeta, EXTENSIONES) if os.path.isdir(carpeta) else [carpeta]
+    cache = CacheContenido('pdf_tablas', VERSION_EXTRACTOR, carpeta_cache) if usar_cache else None
+    return procesar_archivos(rutas, leer_pdf, cache, procesos)
@@ -0,0 +1,424 @@
+"""
+Tabla de direcciones compacta: las mismas filas que las tablas de los labs
+(dicts con 'Dispositivo', 'Dirección IP', 'Máscara de subred'...), guardadas
+en arreglos tipados.
+
+- Las direcciones IPv4 se guardan como uint32 y las máscaras como prefijo
+  uint8. Lo que no es una dirección ('', 'N/A', una IPv6, '/24') va a una
+  tabla de textos y la fila guarda su código, así que la tabla devuelve
+  exactamente el texto que recibió.
+- Dispositivos, interfaces, tipos y cualquier otra columna de texto se
+  internan partidos en texto y número final ('PC', 1234): la parte de texto
+  se repite mucho y se guarda una vez, y el número va en un int32. Así
+  tampoco ocupan lugar un millón de nombres distintos ('PC1'...'PC999999').
+
+Una fila de la tabla de direcciones ocupa unos 40 bytes en lugar de un dict
+con cinco textos. Los textos, dicts y DataFrames se arman solo al pedirlos
+(en los bordes), con la misma interfaz que TablaColumnar. Los índices son
+arreglos ordenados: las filas agregadas se ordenan solas y se intercalan al
+buscar, y una asignación rearma los índices que ordenan por esa columna.
+Como en TablaColumnar, las posiciones asignadas se anotan en `modificadas`.
+"""
+import sys
+from array import array
+from itertools import islice
+
+import numpy as np
+
+from herramientas_red.calculadora import MASCARAS_TEXTO
+from herramientas_red.direcciones import MASCARAS, ipv4_a_texto, texto_a_ipv4
+from herramientas_red.validacion import COLUMNAS_GATEWAY
+
+COLUMNAS_IPV4 = ('Dirección IP',) + COLUMNAS_GATEWAY
+COLUMNAS_MASCARA = ('Máscara de subred',)
+
+# Filas que se convierten juntas al agregar
+TAM_LOTE = 1 << 16
+# Hasta cuántos valores se convierten de a uno: convertir en bloque tiene un
+# costo fijo que, al agregar o asignar una fila, es casi todo el tiempo
+MAX_VALORES_ESCALAR = 8
+# Filas agregadas que un índice guarda en un dict antes de intercalarlas en
+# sus arreglos ordenados (intercalar copia los arreglos enteros)
+MAX_FILAS_COLA = 4096
+
+_DIGITOS = '0123456789'
+
+
+def _partir_nombre(valor):
+    """('PC', 1234) para 'PC1234'; (valor, -1) si no termina en un número que se pueda guardar"""
+    if isinstance(valor, str):
+        texto = valor.rstrip(_DIGITOS)
+        numero = valor[len(texto):]
+        # Sin ceros a la izquierda y que entre en un int32, para volver al mismo texto
+        if numero and len(numero) <= 9 and (numero[0] != '0' or numero == '0'):
+            return texto, int(numero)
+    return valor, -1
+
+
+class _Textos:
+    """Textos internados: cada texto distinto se guarda una vez y se nombra por su código"""
+
+    def __init__(self):
+        self.textos = []
+        self.codigos = {}
+        self._arreglo = None
+
+    def codigo(self, texto):
+        codigo = self.codigos.get(texto)
+        if codigo is None:
+            codigo = self.codigos[texto] = len(self.textos)
+            self.textos.append(texto)
+            self._arreglo = None
+        return codigo
+
+    def arreglo(self):
+        """Los textos como arreglo de objetos, para convertir códigos en bloque"""
+        if self._arreglo is None:
+            # Con un None al final NumPy no intenta armar un arreglo 2D si hay tuplas
+            self._arreglo = np.array(self.textos + [None], dtype=object)[:-1]
+        return self._arreglo
+
+    def memoria(self):
+        return (sys.getsizeof(self.textos) + sys.getsizeof(self.codigos)
+                + sum(sys.getsizeof(texto) for texto in self.textos))
+
+
+class _ColumnaNombres:
+    """Columna de textos internados como (código de la parte de texto, número final o -1)"""
+
+    def __init__(self):
+        self.partes = _Textos()
+        self.codigos = array('i')
+        self.numeros = array('i')
+
+    def _partir(self, valor):
+        texto, numero = _partir_nombre(valor)
+        return self.partes.codigo(texto), numero
+
+    def extend(self, valores):
+        # Los valores repetidos ('NIC', 'G0/0') se parten una sola vez por lote
+        partes = {valor: self._partir(valor) for valor in dict.fromkeys(valores)}
+        self.codigos.extend([partes[valor][0] for valor in valores])
+        self.numeros.extend([partes[valor][1] for valor in valores])
+
+    def asignar(self, posicion, valor):
+        self.codigos[posicion], self.numeros[posicion] = self._partir(valor)
+
+    def texto(self, posicion):
+        texto, numero = self.partes.textos[self.codigos[posicion]], self.numeros[posicion]
+        return texto if numero < 0 else f"{texto}{numero}"
+
+    def textos(self):
+        if not self.codigos:
+            return []
+        textos = self.partes.arreglo()[np.frombuffer(self.codigos, dtype=np.int32)]
+        numeros = np.frombuffer(self.numeros, dtype=np.int32)
+        con_numero = numeros >= 0
+        if con_numero.any():
+            textos[con_numero] = textos[con_numero] + numeros[con_numero].astype(str).astype(object)
+        return textos.tolist()
+
+    def claves(self, desde=0):
+        codigos = np.frombuffer(self.codigos, dtype=np.int32)[desde:].astype(np.int64)
+        return (codigos << 32) | (np.frombuffer(self.numeros, dtype=np.int32)[desde:].astype(np.int64) + 1)
+
+    def clave(self, posicion):
+        return (self.codigos[posicion] << 32) | (self.numeros[posicion] + 1)
+
+    def clave_de(self, valor):
+        """Clave de un valor, o None si no está en ninguna fila"""
+        texto, numero = _partir_nombre(valor)
+        codigo = self.partes.codigos.get(texto)
+        return None if codigo is None else (codigo << 32) | (numero + 1)
+
+    def memoria(self):
+        return sys.getsizeof(self.codigos) + sys.getsizeof(self.numeros) + self.partes.memoria()
+
+
+def _ipv4_exactas(valores):
+    """(enteros uint32, exactas): exactas si el texto es el mismo que se armaría con el entero"""
+    enteros, validas = texto_a_ipv4(valores)
+    exactas = validas.copy()
+    exactas[validas] = ipv4_a_texto(enteros[validas]) == np.asarray(valores, dtype=object)[validas]
+    return enteros, exactas
+
+
+def _ipv4_exacta(valor):
+    """_ipv4_exactas de un solo valor: (entero, exacta)"""
+    partes = valor.split('.') if isinstance(valor, str) else ()
+    if len(partes) != 4:
+        return 0, False
+    entero = 0
+    for parte in partes:
+        if not (0 < len(parte) <= 3 and parte.isascii() and parte.isdigit()):
+            return 0, False
+        if (parte[0] == '0' and len(parte) > 1) or int(parte) > 255:
+            return 0, False
+        entero = (entero << 8) | int(parte)
+    return entero, True
+
+
+_PREFIJOS_MASCARA = {texto: prefijo for prefijo, texto in enumerate(MASCARAS_TEXTO.tolist())}
+
+
+def _mascara_exacta(valor):
+    """_mascaras_exactas de un solo valor: (prefijo, exacta)"""
+    prefijo = _PREFIJOS_MASCARA.get(valor) if isinstance(valor, str) else None
+    return (0, False) if prefijo is None else (prefijo, True)
+
+
+def _mascaras_exactas(valores):
+    """(prefijos uint8, exactas) para máscaras en notación decimal punteada"""
+    enteros, validas = texto_a_ipv4(valores)
+    prefijos = np.minimum(np.searchsorted(MASCARAS, enteros), 32)
+    exactas = validas & (MASCARAS[prefijos] == enteros)
+    exactas[exactas] = MASCARAS_TEXTO[prefijos[exactas]] == np.asarray(valores, dtype=object)[exactas]
+    return prefijos.astype(np.uint8), exactas
+
+
+class _ColumnaDirecciones:
+    """
+    Columna numérica (tipo de array: 'I' para IPv4, 'B' para prefijos) con
+    los textos que no son una dirección aparte; otros[fila] es -1 si el
+    valor es numérico o el código del texto
+    """
+
+    def __init__(self, tipo, convertir, convertir_uno, a_texto):
+        self.dtype = np.uint32 if tipo == 'I' else np.uint8
+        self.convertir = convertir
+        self.convertir_uno = convertir_uno
+        self.a_texto = a_texto
+        self.valores = array(tipo)
+        self.otros = array('i')
+        self.textos_otros = _Textos()
+
+    def extend(self, valores):
+        valores = list(valores)
+        if len(valores) <= MAX_VALORES_ESCALAR:
+            for valor in valores:
+                numero, exacto = self.convertir_uno(valor)
+                self.valores.append(numero)
+                self.otros.append(-1 if exacto else self.textos_otros.codigo(valor))
+            return
+        numeros, exactos = self.convertir(valores)
+        otros = np.full(len(valores), -1, dtype=np.int32)
+        for posicion in np.flatnonzero(~exactos).tolist():
+            otros[posicion] = self.textos_otros.codigo(valores[posicion])
+        self.valores.frombytes(np.where(exactos, numeros, 0).astype(self.dtype).tobytes())
+        self.otros.frombytes(otros.tobytes())
+
+    def asignar(self, posicion, valor):
+        numero, exacto = self.convertir_uno(valor)
+        self.valores[posicion] = numero
+        self.otros[posicion] = -1 if exacto else self.textos_otros.codigo(valor)
+
+    def texto(self, posicion):
+        otro = self.otros[posicion]
+        if otro >= 0:
+            return self.textos_otros.textos[otro]
+        return self.a_texto(np.array([self.valores[posicion]], dtype=self.dtype))[0]
+
+    def textos(self):
+        if not self.valores:
+            return []
+        textos = self.a_texto(np.frombuffer(self.valores, dtype=self.dtype))
+        otros = np.frombuffer(self.otros, dtype=np.int32)
+        con_otro = otros >= 0
+        if con_otro.any():
+            textos[con_otro] = self.textos_otros.arreglo()[otros[con_otro]]
+        return textos.tolist()
+
+    def numeros(self):
+        """(valores, válidos) como arreglos NumPy (copias)"""
+        return (np.frombuffer(self.valores, dtype=self.dtype).copy(),
+                np.frombuffer(self.otros, dtype=np.int32) < 0)
+
+    # Clave de índice: el valor, o un negativo para los textos aparte
+    def claves(self, desde=0):
+        otros = np.frombuffer(self.otros, dtype=np.int32)[desde:].astype(np.int64)
+        return np.where(otros >= 0, -otros - 1, np.frombuffer(self.valores, dtype=self.dtype)[desde:].astype(np.int64))
+
+    def clave(self, posicion):
+        otro = self.otros[posicion]
+        return -otro - 1 if otro >= 0 else int(self.valores[posicion])
+
+    def clave_de(self, valor):
+        """Clave de un valor, o None si no está en ninguna fila"""
+        numero, exacto = self.convertir_uno(valor)
+        if exacto:
+            return numero
+        otro = self.textos_otros.codigos.get(valor)
+        return None if otro is None else -otro - 1
+
+    def memoria(self):
+        return sys.getsizeof(self.valores) + sys.getsizeof(self.otros) + self.textos_otros.memoria()
+
+
+def _nueva_columna(nombre):
+    if nombre in COLUMNAS_IPV4:
+        return _ColumnaDirecciones('I', _ipv4_exactas, _ipv4_exacta, ipv4_a_texto)
+    if nombre in COLUMNAS_MASCARA:
+        return _ColumnaDirecciones('B', _mascaras_exactas, _mascara_exacta, lambda prefijos: MASCARAS_TEXTO[prefijos])
+    return _ColumnaNombres()
+
+
+class TablaDirecciones:
+    """
+    Tabla de direcciones en arreglos tipados, con la interfaz de
+    TablaColumnar (append, extend, columna, asignar, buscar, a_dataframe)
+    """
+
+    def __init__(self, columnas, filas=(), vacio=""):
+        self.columnas = list(columnas)
+        self.vacio = vacio
+        self._datos = {columna: _nueva_columna(columna) for columna in self.columnas}
+        self._largo = 0
+        self._df = None
+        # (columnas...) -> (posiciones ordenadas por la primera columna, sus
+        # claves, dict clave -> posiciones de las filas agregadas después,
+        # filas indexadas), o None si hay que rearmarlo
+        self._indices = {}
+        # Posiciones asignadas, en orden (con repeticiones)
+        self.modificadas = array('q')
+        self.extend(filas)
+
+    @classmethod
+    def desde_dataframe(cls, df, vacio=""):
+        tabla = cls(df.columns, vacio=vacio)
+        for inicio in range(0, len(df), TAM_LOTE):
+            lote = df.iloc[inicio:inicio + TAM_LOTE]
+            tabla._extender_columnas([lote[columna].tolist() for columna in tabla.columnas])
+        return tabla
+
+    def __len__(self):
+        return self._largo
+
+    def __iter__(self):
+        for valores in zip(*(self.columna(columna) for columna in self.columnas)):
+            yield dict(zip(self.columnas, valores))
+
+    def _normalizar(self, fila):
+        # Acepta dicts con las columnas de la tabla o secuencias en el mismo orden
+        if isinstance(fila, dict):
+            return [fila.get(columna, self.vacio) for columna in self.columnas]
+        valores = list(fila)
+        if len(valores) > len(self.columnas):
+            raise ValueError(f"La fila tiene {len(valores)} valores y la tabla {len(self.columnas)} columnas")
+        return valores + [self.vacio] * (len(self.columnas) - len(valores))
+
+    def _extender_columnas(self, listas):
+        agregadas = len(listas[0]) if listas else 0
+        if not agregadas:
+            return 0
+        for columna, valores in zip(self.columnas, listas):
+            self._datos[columna].extend(valores)
+        self._largo += agregadas
+        self._df = None
+        return agregadas
+
+    def append(self, fila):
+        """Agrega una fila y devuelve su posición"""
+        self.extend([fila])
+        return self._largo - 1
+
+    def extend(self, filas):
+        """
+        Agrega varias filas y devuelve cuántas se agregaron. Las direcciones
+        se convierten por lotes, así que no se guardan todas las filas en texto.
+        """
+        filas = iter(filas)
+        agregadas = 0
+        while True:
+            lote = list(islice(filas, TAM_LOTE))
+            if not lote:
+                return agregadas
+            if all(isinstance(fila, dict) for fila in lote):
+                # Los dicts se leen directo por columna
+                listas = [[fila.get(columna, self.vacio) for fila in lote] for columna in self.columnas]
+            else:
+                listas = [list(valores) for valores in zip(*map(self._normalizar, lote))]
+            agregadas += self._extender_columnas(listas)
+
+    def fila(self, posicion):
+        return {columna: self._datos[columna].texto(posicion) for columna in self.columnas}
+
+    def columna(self, columna):
+        """Lista de textos de una columna (se arma en cada llamada)"""
+        return self._datos[columna].textos()
+
+    def numeros(self, columna):
+        """(uint32 o prefijos uint8, válidos) de una columna de direcciones o máscaras"""
+        return self._datos[columna].numeros()
+
+    def valor(self, posicion, columna):
+        return self._datos[columna].texto(posicion)
+
+    def asignar(self, posicion, columna, valor):
+        if self._datos[columna].texto(posicion) != valor:
+            self.modificadas.append(posicion)
+        self._datos[columna].asignar(posicion, valor)
+        # Solo se rearman los índices que ordenan por esa columna
+        for columnas in self._indices:
+            if columnas[0] == columna:
+                self._indices[columnas] = None
+        self._df = None
+
+    def indexar(self, *columnas):
+        """Registra un índice sobre una o varias columnas (se arma al buscar)"""
+        self._indices.setdefault(columnas, None)
+
+    def _indice(self, columnas):
+        indice = self._indices.get(columnas)
+        if indice is None:
+            claves = self._datos[columnas[0]].claves()
+            orden = np.argsort(claves, kind='stable')
+            indice = self._indices[columnas] = (orden, claves[orden], {}, self._largo)
+        elif indice[3] < self._largo:
+            orden, ordenadas, cola, hasta = indice
+            datos = self._datos[columnas[0]]
+            desde = len(orden)
+            if self._largo - desde <= MAX_FILAS_COLA:
+                # Pocas filas nuevas: van al dict, sin copiar los arreglos
+                for posicion in range(hasta, self._largo):
+                    cola.setdefault(datos.clave(posicion), []).append(posicion)
+                indice = self._indices[columnas] = (orden, ordenadas, cola, self._largo)
+            else:
+                # Se ordenan solo las filas nuevas (también las del dict) y se
+                # intercalan después de las claves iguales, que tienen posiciones menores
+                claves = datos.claves(desde)
+                nuevas = np.argsort(claves, kind='stable')
+                claves = claves[nuevas]
+                lugares = np.searchsorted(ordenadas, claves, side='right')
+                indice = self._indices[columnas] = (np.insert(orden, lugares, nuevas + desde),
+                                                    np.insert(ordenadas, lugares, claves), {}, self._largo)
+        return indice
+
+    def buscar(self, columnas, clave):
+        """
+        Devuelve las posiciones cuyas columnas valen clave (un valor si es una
+        sola columna, una tupla si son varias). El índice se crea si hace falta.
+        """
+        columnas = tuple(columnas)
+        self.indexar(*columnas)
+        valores = (clave,) if len(columnas) == 1 else tuple(clave)
+        claves = [self._datos[columna].clave_de(valor) for columna, valor in zip(columnas, valores)]
+        if any(clave is None for clave in claves):
+            return []
+        orden, ordenadas, cola, _ = self._indice(columnas)
+        desde, hasta = np.searchsorted(ordenadas, claves[0], 'left'), np.searchsorted(ordenadas, claves[0], 'right')
+        # Las demás columnas se comparan solo en las pocas filas de la primera clave
+        return [posicion for posicion in orden[desde:hasta].tolist() + cola.get(claves[0], [])
+                if all(self._datos[columna].clave(posicion) == otra
+                       for columna, otra in zip(columnas[1:], claves[1:]))]
+
+    def a_dataframe(self):
+        """Arma el DataFrame (solo si la tabla cambió desde la última vez)"""
+        if self._df is None:
+            import pandas as pd
+            self._df = pd.DataFrame({columna: self.columna(columna) for columna in self.columnas},
+                                    columns=self.columnas)
+        return self._df
+
+    def memoria(self):
+        """Bytes que ocupan los arreglos y los textos internados (sin índices ni DataFrame)"""
+        return sum(columna.memoria() for columna in self._datos.values())
@@ -0,0 +1,216 @@
+"""
+Búsqueda del prefijo más largo (longest prefix match) sobre subredes IPv4 o IPv6.
+
+El trie es binario y se guarda en arreglos planos: el hijo `b` del nodo `n`
+está en hijos[2 * n + b] (0 si no hay, porque la raíz nunca es hijo) y
+ruta[n] es la ruta que termina en ese nodo, o -1. Se arma por niveles: con
+las redes ordenadas, los prefijos de un mismo largo que son iguales quedan
+contiguos, así que cada nivel se resuelve con operaciones vectorizadas
+sobre todas las rutas. Una búsqueda baja a lo sumo 32 (IPv4) o 128 (IPv6)
+niveles; buscar muchas direcciones baja con todas a la vez.
+
+Las direcciones se guardan como palabras uint64 alineadas a la izquierda:
+una para IPv4 (la dirección en los 32 bits altos) y dos para IPv6.
+"""
+import ipaddress
+
+import numpy as np
+
+from herramientas_red.direcciones import mascara_a_prefijo, texto_a_ipv4, texto_a_ipv6
+
+ANCHOS = {4: 32, 6: 128}
+
+
+def _palabras(direcciones, version):
+    # IPv4: arreglo de enteros; IPv6: par (altos, bajos)
+    if version == 4:
+        return [np.asarray(direcciones, dtype=np.uint64) << np.uint64(32)]
+    altos, bajos = direcciones
+    return [np.asarray(altos, dtype=np.uint64), np.asarray(bajos, dtype=np.uint64)]
+
+
+def _mascara_palabra(prefijos, numero):
+    """Máscara de la palabra `numero` para cada prefijo"""
+    bits = np.clip(prefijos - 64 * numero, 0, 64).astype(np.uint64)
+    # Un corrimiento de 64 no está definido: se arma con dos de 32
+    unos = np.uint64(0xFFFFFFFFFFFFFFFF)
+    return ~((unos >> (bits >> np.uint64(1))) >> (bits - (bits >> np.uint64(1))))
+
+
+def _clave(palabras, largo):
+    """Primeros `largo` bits de cada dirección, como una tupla de arreglos"""
+    clave = []
+    for numero, palabra in enumerate(palabras):
+        bits = min(max(largo - 64 * numero, 0), 64)
+        if bits:
+            clave.append(palabra >> np.uint64(64 - bits))
+    return clave
+
+
+def _bit(palabras, nivel):
+    """Bit número `nivel` (desde el más significativo) de cada dirección"""
+    return ((palabras[nivel // 64] >> np.uint64(63 - nivel % 64)) & np.uint64(1)).astype(np.int64)
+
+
+class TrieRutas:
+    """Trie binario de rutas (red, prefijo) para buscar el prefijo más largo"""
+
+    def __init__(self, redes, prefijos, version=4):
+        self.version = version
+        self.ancho = ANCHOS[version]
+        prefijos = np.asarray(prefijos, dtype=np.int64)
+        if len(prefijos) and (prefijos.min() < 0 or prefijos.max() > self.ancho):
+            raise ValueError(f"Los prefijos IPv{version} van de 0 a {self.ancho}")
+        palabras = [palabra & _mascara_palabra(prefijos, numero)
+                    for numero, palabra in enumerate(_palabras(redes, version))]
+        # Por red y, a igual red, por posición: la primera ruta repetida gana
+        orden = np.lexsort([np.arange(len(prefijos))] + palabras[::-1])
+        palabras = [palabra[orden] for palabra in palabras]
+        prefijos = prefijos[orden]
+        rutas_total = len(prefijos)
+
+        padres, bits, nodos = [], [], []
+        terminales, rutas = [], []
+        # Rutas que siguen bajando (sus redes, prefijos y posiciones originales)
+        # y el nodo donde está cada una
+        nodo = np.zeros(len(prefijos), dtype=np.int64)
+        total = 1
+        for largo in range(0, self.ancho + 1):
+            termina = prefijos == largo
+            if termina.any():
+                terminales.append(nodo[termina])
+                rutas.append(orden[termina])
+                sigue = ~termina
+                palabras = [palabra[sigue] for palabra in palabras]
+                prefijos, orden, nodo = prefijos[sigue], orden[sigue], nodo[sigue]
+            if not len(prefijos) or largo == self.ancho:
+                break
+            # Nodos del nivel siguiente: prefijos de largo + 1 distintos
+            clave = _clave(palabras, largo + 1)
+            nuevo = np.ones(len(prefijos), dtype=bool)
+            nuevo[1:] = np.logical_or.reduce([parte[1:] != parte[:-1] for parte in clave])
+            hijos = total + np.cumsum(nuevo) - 1
+            padres.append(nodo[nuevo])
+            bits.append((clave[-1][nuevo] & np.uint64(1)).astype(np.int64))
+            nodos.append(hijos[nuevo])
+            total += int(nuevo.sum())
+            nodo = hijos
+        self.profundidad = largo
+
+        self.hijos = np.zeros(2 * total, dtype=np.int64)
+        if padres:
+            self.hijos[2 * np.concatenate(padres) + np.concatenate(bits)] = np.concatenate(nodos)
+        # Con rutas repetidas terminan varias en el mismo nodo: queda la de menor posición
+        self.ruta = np.full(total, np.iinfo(np.int64).max, dtype=np.int64)
+        if terminales:
+            np.minimum.at(self.ruta, np.concatenate(terminales), np.concatenate(rutas))
+        self.ruta[self.ruta == np.iinfo(np.int64).max] = -1
+        self.rutas = rutas_total
+
+    def __len__(self):
+        return self.rutas
+
+    @property
+    def nodos(self):
+        return len(self.ruta)
+
+    def buscar(self, direcciones):
+        """
+        Posición de la ruta con el prefijo más largo que contiene cada
+        dirección, o -1. IPv4: arreglo de enteros; IPv6: par (altos, bajos).
+        """
+        palabras = _palabras(direcciones, self.version)
+        resultado = np.full(len(palabras[0]), self.ruta[0], dtype=np.int64)
+        # Se baja solo con las direcciones que todavía tienen camino
+        posiciones = np.arange(len(resultado))
+        nodo = np.zeros(len(resultado), dtype=np.int64)
+        for nivel in range(self.profundidad):
+            nodo = self.hijos[2 * nodo + _bit(palabras, nivel)]
+            sigue = nodo > 0
+            if not sigue.all():
+                posiciones, nodo = posiciones[sigue], nodo[sigue]
+                palabras = [palabra[sigue] for palabra in palabras]
+                if not len(nodo):
+                    break
+            ruta = self.ruta[nodo]
+            con_ruta = ruta >= 0
+            resultado[posiciones[con_ruta]] = ruta[con_ruta]
+        return resultado
+
+    def buscar_una(self, direccion):
+        """Igual que buscar para una sola dirección (entero, o par (altos, bajos) en IPv6)"""
+        if self.version == 4:
+            valor, ancho = int(direccion), 32
+        else:
+            valor, ancho = (int(direccion[0]) << 64) | int(direccion[1]), 128
+        mejor = int(self.ruta[0])
+        nodo = 0
+        for nivel in range(self.profundidad):
+            nodo = int(self.hijos[2 * nodo + ((valor >> (ancho - 1 - nivel)) & 1)])
+            if not nodo:
+                break
+            if self.ruta[nodo] >= 0:
+                mejor = int(self.ruta[nodo])
+        return mejor
+
+
+class TablaRutas:
+    """
+    Rutas conectadas de un conjunto de interfaces: cada fila con IP y máscara
+    aporta su subred. Las búsquedas devuelven la posición de la fila dueña de
+    la subred más específica que contiene la dirección.
+    """
+
+    def __init__(self, ips, mascaras, filas=None):
+        ips = list(ips)
+        mascaras = list(mascaras)
+        filas = np.arange(len(ips)) if filas is None else np.asarray(filas, dtype=np.int64)
+        ips = [ips[fila] for fila in filas.tolist()]
+        # Las máscaras se repiten mucho: se convierten solo las distintas
+        distintas = {}
+        codigos = np.fromiter((distintas.setdefault(mascaras[fila], len(distintas)) for fila in filas.tolist()),
+                              dtype=np.int64, count=len(filas))
+
+        enteros, es_v4 = texto_a_ipv4(ips)
+        prefijos, con_mascara = mascara_a_prefijo(list(distintas))
+        usar = es_v4 & con_mascara[codigos]
+        self.filas_v4 = filas[usar]
+        self.v4 = TrieRutas(enteros[usar], prefijos[codigos[usar]], 4)
+
+        # IPv6 solo entre las que no son IPv4
+        resto = np.flatnonzero(~es_v4)
+        altos, bajos, es_v6 = texto_a_ipv6([ips[posicion] for posicion in resto])
+        prefijos, con_mascara = mascara_a_prefijo(list(distintas), maximo=128)
+        usar = es_v6 & con_mascara[codigos[resto]]
+        self.filas_v6 = filas[resto[usar]]
+        self.v6 = TrieRutas((altos[usar], bajos[usar]), prefijos[codigos[resto[usar]]], 6)
+
+    def __len__(self):
+        return len(self.v4) + len(self.v6)
+
+    def buscar(self, direcciones):
+        """Fila dueña de la ruta de cada dirección (texto IPv4 o IPv6), o -1"""
+        direcciones = list(direcciones)
+        resultado = np.full(len(direcciones), -1, dtype=np.int64)
+        enteros, es_v4 = texto_a_ipv4(direcciones)
+        if len(self.v4):
+            ruta = self.v4.buscar(enteros[es_v4])
+            resultado[es_v4] = np.where(ruta >= 0, self.filas_v4[np.maximum(ruta, 0)], -1)
+        resto = np.flatnonzero(~es_v4)
+        if len(self.v6) and len(resto):
+            altos, bajos, es_v6 = texto_a_ipv6([direcciones[posicion] for posicion in resto])
+            ruta = self.v6.buscar((altos[es_v6], bajos[es_v6]))
+            resultado[resto[es_v6]] = np.where(ruta >= 0, self.filas_v6[np.maximum(ruta, 0)], -1)
+        return resultado
+
+    def buscar_una(self, direccion):
+        """Igual que buscar para una sola dirección (texto), sin armar arreglos"""
+        try:
+            ip = ipaddress.ip_address(str(direccion).strip().partition('%')[0])
+        except ValueError:
+            return -1
+        if ip.version == 4:
+            ruta = self.v4.buscar_una(int(ip))
+            return int(self.filas_v4[ruta]) if ruta >= 0 else -1
+        ruta = self.v6.buscar_una((int(ip) >> 64, int(ip) & 0xFFFFFFFFFFFFFFFF))
+        return int(self.filas_v6[ruta]) if ruta >= 0 else -1
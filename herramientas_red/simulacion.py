@@ -0,0 +1,361 @@
+"""
+Simulador de eventos discretos de ARP, ICMP, TCP y UDP sobre una tabla de
+direcciones IPv4.
+
+Cada interfaz queda en un segmento (ver conectividad.Conectividad) y cada
+segmento es un switch con su tabla MAC. Los hosts y routers tienen una
+caché ARP por interfaz; los routers reenvían con sus redes conectadas y con
+rutas hacia el resto de los segmentos alcanzables, calculadas por el camino
+con menos saltos (como si el protocolo de enrutamiento ya hubiera
+convergido).
+
+Los eventos se guardan en un heap como tuplas (tiempo, secuencia, tipo,
+programado, datos...) y cada tipo tiene su función; por tipo se cuentan los
+eventos, el tiempo de CPU que llevaron y el tiempo simulado que esperaron.
+"""
+import heapq
+import time
+from collections import Counter
+
+import numpy as np
+
+from herramientas_red.conectividad import Conectividad
+from herramientas_red.direcciones import MASCARAS, ipv4_a_texto, mascara_a_prefijo, texto_a_ipv4
+from herramientas_red.validacion import filas_router
+
+# Tiempos simulados, en segundos
+RETARDO_ENLACE = 0.0001
+RETARDO_SWITCH = 0.00001
+ESPERA_ARP = 1.0
+INTENTOS_ARP = 3
+DURACION_ARP = 300.0
+TTL = 64
+
+BROADCAST = 0xFFFFFFFFFFFF
+
+# Enteros de Python: en el bucle de eventos los escalares de NumPy son lentos
+_MASCARAS = MASCARAS.tolist()
+
+# Tipos de trama y de evento
+ARP, IP = 0, 1
+SOLICITUD_ARP, RESPUESTA_ARP = 1, 2
+EV_INICIO, EV_SWITCH, EV_RECIBIR, EV_ESPERA_ARP = range(4)
+NOMBRES_EVENTOS = ['Inicio de flujo', 'Trama en switch', 'Trama en interfaz', 'Espera ARP']
+
+# Protocolos de los paquetes IP
+ECO, RESPUESTA_ECO, TCP_SYN, TCP_SYN_ACK, TCP_ACK, UDP = range(6)
+PROTOCOLOS = {'icmp': ECO, 'tcp': TCP_SYN, 'udp': UDP}
+
+
+def texto_mac(mac):
+    """MAC en el formato de Cisco ('0000.0000.0001')"""
+    texto = f"{mac:012x}"
+    return f"{texto[:4]}.{texto[4:8]}.{texto[8:]}"
+
+
+class Simulador:
+    """Red armada desde las columnas de una tabla de direcciones"""
+
+    def __init__(self, ips, mascaras, gateways, dispositivos, interfaces=None, tipos=None):
+        gateways = [str(gateway or '').strip() for gateway in gateways]
+        conectividad = Conectividad(ips, mascaras, gateways, dispositivos, interfaces, tipos)
+        enteros, _ = texto_a_ipv4(list(ips))
+        prefijos, con_mascara = mascara_a_prefijo(list(mascaras))
+        gateway, _ = texto_a_ipv4(gateways)
+        es_router = np.zeros(len(enteros), dtype=bool)
+        es_router[filas_router(conectividad.dispositivos, gateways, tipos)] = True
+
+        # Interfaces simuladas: las filas con IPv4; la MAC es la posición + 1
+        filas = conectividad.filas
+        self.fila = filas.tolist()
+        self.ip = enteros[filas].tolist()
+        self.prefijo = np.where(con_mascara[filas], prefijos[filas], 32).tolist()
+        self.mascara = [_MASCARAS[prefijo] for prefijo in self.prefijo]
+        self.red = [ip & mascara for ip, mascara in zip(self.ip, self.mascara)]
+        self.gateway = gateway[filas].tolist()
+        self.segmento = conectividad.segmento[filas].tolist()
+        self.mac = list(range(1, len(filas) + 1))
+        self.nombres = conectividad.dispositivos
+        self.interfaz = [str(interfaces[fila]) if interfaces is not None else '' for fila in self.fila]
+        self.segmentos = conectividad
+
+        # Dispositivos: sus interfaces y si reenvían
+        self.dispositivo = []
+        self.interfaces_de = {}
+        for posicion, fila in enumerate(self.fila):
+            nombre = self.nombres[fila]
+            self.dispositivo.append(nombre)
+            self.interfaces_de.setdefault(nombre, []).append(posicion)
+        self.router = {nombre for fila, nombre in zip(self.fila, self.dispositivo) if es_router[fila]}
+        self.ips_de = {nombre: {self.ip[i] for i in posiciones} for nombre, posiciones in self.interfaces_de.items()}
+
+        # Switches: miembros y tabla MAC de cada segmento
+        self.miembros = {}
+        for posicion, segmento in enumerate(self.segmento):
+            self.miembros.setdefault(segmento, []).append(posicion)
+        self.tabla_mac = {segmento: {} for segmento in self.miembros}
+        self.rutas = self._calcular_rutas()
+
+        self.arp = [{} for _ in self.ip]
+        self.pendientes = {}
+        self.cola = []
+        self.secuencia = 0
+        self.tiempo = 0.0
+        self.flujos = []
+        self.paquetes = 0
+        self.descartes = Counter()
+        self.cantidad = [0] * len(NOMBRES_EVENTOS)
+        self.cpu = [0.0] * len(NOMBRES_EVENTOS)
+        self.simulado = [0.0] * len(NOMBRES_EVENTOS)
+
+    def _calcular_rutas(self):
+        """
+        Por router: {prefijo: {red: (interfaz de salida, siguiente salto o None)}},
+        con el camino de menos saltos a cada segmento que tenga router
+        """
+        routers_en = {}
+        for posicion, nombre in enumerate(self.dispositivo):
+            if nombre in self.router:
+                routers_en.setdefault(self.segmento[posicion], []).append(posicion)
+        rutas = {}
+        for router in self.router:
+            propias = self.interfaces_de[router]
+            salida = {self.segmento[i]: (i, None) for i in propias}
+            frontera = list(salida)
+            while frontera:
+                siguiente = []
+                for segmento in frontera:
+                    interfaz, salto = salida[segmento]
+                    for vecina in routers_en.get(segmento, ()):
+                        otro = self.dispositivo[vecina]
+                        if otro == router:
+                            continue
+                        for i in self.interfaces_de[otro]:
+                            if self.segmento[i] not in salida:
+                                salida[self.segmento[i]] = (interfaz, salto if salto is not None else self.ip[vecina])
+                                siguiente.append(self.segmento[i])
+                frontera = siguiente
+            tabla = {}
+            for segmento, destino in salida.items():
+                clave = int(self.segmentos.segmentos[segmento])
+                tabla.setdefault(clave & 63, {})[clave >> 6] = destino
+            rutas[router] = dict(sorted(tabla.items(), reverse=True))
+        return rutas
+
+    # Cola de eventos
+
+    def _programar(self, tiempo, tipo, *datos):
+        self.secuencia += 1
+        heapq.heappush(self.cola, (tiempo, self.secuencia, tipo, self.tiempo) + datos)
+
+    def ejecutar(self, hasta=None):
+        """Procesa eventos hasta vaciar la cola (o hasta el tiempo simulado dado)"""
+        manejadores = (self._inicio, self._en_switch, self._recibir, self._espera_arp)
+        cola, cantidad, cpu, simulado = self.cola, self.cantidad, self.cpu, self.simulado
+        reloj = time.perf_counter
+        while cola:
+            if hasta is not None and cola[0][0] > hasta:
+                break
+            evento = heapq.heappop(cola)
+            tipo = evento[2]
+            self.tiempo = evento[0]
+            inicio = reloj()
+            manejadores[tipo](*evento[4:])
+            cpu[tipo] += reloj() - inicio
+            cantidad[tipo] += 1
+            simulado[tipo] += evento[0] - evento[3]
+        return self
+
+    # Flujos
+
+    def _interfaz_hacia(self, nombre, destino=None):
+        interfaces = self.interfaces_de.get(nombre)
+        if not interfaces:
+            raise ValueError(f"{nombre} no tiene dirección IPv4 en la tabla")
+        if destino is not None:
+            for i in interfaces:
+                if destino & self.mascara[i] == self.red[i]:
+                    return i
+        return next((i for i in interfaces if self.gateway[i]), interfaces[0])
+
+    def _ip_destino(self, origen, destino):
+        # Nombre de dispositivo o IP en texto; de un router se usa la
+        # interfaz del segmento del origen, si tiene
+        if destino in self.interfaces_de:
+            interfaces = self.interfaces_de[destino]
+            segmentos = {self.segmento[i] for i in self.interfaces_de[origen]}
+            return self.ip[next((i for i in interfaces if self.segmento[i] in segmentos), interfaces[0])]
+        entero, valido = texto_a_ipv4([destino])
+        if not valido[0]:
+            raise ValueError(f"{destino} no es un dispositivo ni una IPv4")
+        return int(entero[0])
+
+    def enviar(self, origen, destino, protocolo='icmp', tiempo=None):
+        """Programa un flujo (ping, conexión TCP o datagrama UDP) y devuelve su número"""
+        if origen not in self.interfaces_de:
+            raise ValueError(f"{origen} no tiene dirección IPv4 en la tabla")
+        ip_destino = self._ip_destino(origen, destino)
+        flujo = len(self.flujos)
+        # [origen, destino, protocolo, inicio, éxito, detalle, fin]
+        self.flujos.append([origen, ip_destino, PROTOCOLOS[protocolo], None, None, '', None])
+        self._programar(self.tiempo if tiempo is None else tiempo, EV_INICIO, origen, flujo)
+        return flujo
+
+    def _inicio(self, origen, flujo):
+        datos = self.flujos[flujo]
+        datos[3] = self.tiempo
+        interfaz = self._interfaz_hacia(origen, datos[1])
+        self._enviar_paquete(origen, (self.ip[interfaz], datos[1], datos[2], TTL, flujo))
+
+    def _terminar(self, flujo, exito, detalle=''):
+        datos = self.flujos[flujo]
+        if datos[4] is None:
+            datos[4], datos[5], datos[6] = exito, detalle, self.tiempo
+
+    def _descartar(self, paquete, motivo):
+        self.descartes[motivo] += 1
+        self._terminar(paquete[4], False, motivo)
+
+    def resultado(self, flujo):
+        """(éxito, detalle, duración simulada) de un flujo; éxito es None si no terminó"""
+        _, _, _, inicio, exito, detalle, fin = self.flujos[flujo]
+        return exito, detalle, (fin - inicio) if fin is not None else None
+
+    # Capa 3
+
+    def _enviar_paquete(self, nombre, paquete):
+        """Elige interfaz de salida y siguiente salto, como host o como router"""
+        self.paquetes += 1
+        destino = paquete[1]
+        if destino in self.ips_de[nombre]:
+            # A sí mismo: no sale de la pila
+            self._entregar(nombre, paquete)
+            return
+        if nombre in self.router:
+            for prefijo, redes in self.rutas[nombre].items():
+                ruta = redes.get(destino & _MASCARAS[prefijo])
+                if ruta is not None:
+                    interfaz, salto = ruta
+                    self._enviar_ip(interfaz, destino if salto is None else salto, paquete)
+                    return
+            self._descartar(paquete, f"Sin ruta en {nombre}")
+            return
+        interfaz = self._interfaz_hacia(nombre, destino)
+        if destino & self.mascara[interfaz] == self.red[interfaz]:
+            self._enviar_ip(interfaz, destino, paquete)
+        elif self.gateway[interfaz]:
+            self._enviar_ip(interfaz, self.gateway[interfaz], paquete)
+        else:
+            self._descartar(paquete, f"{nombre} no tiene gateway")
+
+    def _enviar_ip(self, interfaz, salto, paquete):
+        entrada = self.arp[interfaz].get(salto)
+        if entrada is not None and entrada[1] > self.tiempo:
+            self._a_switch(interfaz, (self.mac[interfaz], entrada[0], IP, paquete))
+            return
+        clave = (interfaz, salto)
+        if clave in self.pendientes:
+            self.pendientes[clave].append(paquete)
+            return
+        self.pendientes[clave] = [paquete]
+        self._solicitar_arp(interfaz, salto, 1)
+
+    def _solicitar_arp(self, interfaz, ip, intento):
+        solicitud = (SOLICITUD_ARP, self.ip[interfaz], self.mac[interfaz], ip)
+        self._a_switch(interfaz, (self.mac[interfaz], BROADCAST, ARP, solicitud))
+        self._programar(self.tiempo + ESPERA_ARP, EV_ESPERA_ARP, interfaz, ip, intento)
+
+    def _espera_arp(self, interfaz, ip, intento):
+        if (interfaz, ip) not in self.pendientes:
+            return
+        if intento < INTENTOS_ARP:
+            self._solicitar_arp(interfaz, ip, intento + 1)
+            return
+        for paquete in self.pendientes.pop((interfaz, ip)):
+            self._descartar(paquete, f"ARP sin respuesta para {ipv4_a_texto([ip])[0]}")
+
+    # Capa 2
+
+    def _a_switch(self, interfaz, trama):
+        self._programar(self.tiempo + RETARDO_ENLACE, EV_SWITCH, self.segmento[interfaz], interfaz, trama)
+
+    def _en_switch(self, segmento, entrada, trama):
+        tabla = self.tabla_mac[segmento]
+        tabla[trama[0]] = entrada
+        llegada = self.tiempo + RETARDO_SWITCH + RETARDO_ENLACE
+        puerto = tabla.get(trama[1]) if trama[1] != BROADCAST else None
+        if puerto is not None:
+            if puerto != entrada:
+                self._programar(llegada, EV_RECIBIR, puerto, trama)
+            return
+        # Broadcast o MAC desconocida: a todos los puertos menos el de entrada
+        for puerto in self.miembros[segmento]:
+            if puerto != entrada:
+                self._programar(llegada, EV_RECIBIR, puerto, trama)
+
+    def _recibir(self, interfaz, trama):
+        if trama[1] != BROADCAST and trama[1] != self.mac[interfaz]:
+            return
+        if trama[2] == ARP:
+            self._recibir_arp(interfaz, trama[3])
+            return
+        paquete = trama[3]
+        nombre = self.dispositivo[interfaz]
+        if paquete[1] in self.ips_de[nombre]:
+            self._entregar(nombre, paquete)
+        elif nombre in self.router:
+            if paquete[3] <= 1:
+                self._descartar(paquete, f"TTL agotado en {nombre}")
+                return
+            self._enviar_paquete(nombre, paquete[:3] + (paquete[3] - 1,) + paquete[4:])
+        else:
+            self._descartar(paquete, f"{nombre} recibió un paquete para otra IP")
+
+    def _recibir_arp(self, interfaz, arp):
+        operacion, ip_emisor, mac_emisor, ip_objetivo = arp
+        propia = ip_objetivo == self.ip[interfaz]
+        cache = self.arp[interfaz]
+        # Se aprende del emisor si la solicitud es para esta interfaz o si ya se lo conocía
+        if propia or ip_emisor in cache:
+            cache[ip_emisor] = (mac_emisor, self.tiempo + DURACION_ARP)
+        if operacion == SOLICITUD_ARP and propia:
+            respuesta = (RESPUESTA_ARP, self.ip[interfaz], self.mac[interfaz], ip_emisor)
+            self._a_switch(interfaz, (self.mac[interfaz], mac_emisor, ARP, respuesta))
+        elif operacion == RESPUESTA_ARP:
+            for paquete in self.pendientes.pop((interfaz, ip_emisor), ()):
+                self._a_switch(interfaz, (self.mac[interfaz], mac_emisor, IP, paquete))
+
+    def _entregar(self, nombre, paquete):
+        origen, destino, protocolo, _, flujo = paquete
+        if protocolo == ECO:
+            self._enviar_paquete(nombre, (destino, origen, RESPUESTA_ECO, TTL, flujo))
+        elif protocolo == TCP_SYN:
+            self._enviar_paquete(nombre, (destino, origen, TCP_SYN_ACK, TTL, flujo))
+        elif protocolo == TCP_SYN_ACK:
+            self._enviar_paquete(nombre, (destino, origen, TCP_ACK, TTL, flujo))
+        else:
+            # Respuesta de eco, ACK del saludo de TCP o datagrama UDP
+            self._terminar(flujo, True)
+
+    # Consultas
+
+    def tabla_arp(self, nombre):
+        """Entradas vigentes de la caché ARP de un dispositivo: (interfaz, IP, MAC)"""
+        entradas = []
+        for i in self.interfaces_de.get(nombre, ()):
+            for ip, (mac, vence) in sorted(self.arp[i].items()):
+                if vence > self.tiempo:
+                    entradas.append((self.interfaz[i], ipv4_a_texto([ip])[0], texto_mac(mac)))
+        return entradas
+
+    def tabla_switch(self, nombre):
+        """Tabla MAC del switch del segmento de un dispositivo: (MAC, dispositivo del puerto)"""
+        segmento = self.segmento[self.interfaces_de[nombre][0]]
+        return [(texto_mac(mac), self.dispositivo[puerto]) for mac, puerto in sorted(self.tabla_mac[segmento].items())]
+
+    def estadisticas(self):
+        """Por tipo de evento: cantidad, CPU y tiempo simulado de espera (lista de dicts)"""
+        return [
+            {'Evento': nombre, 'Cantidad': cantidad, 'CPU (s)': cpu, 'Tiempo simulado (s)': simulado}
+            for nombre, cantidad, cpu, simulado in zip(NOMBRES_EVENTOS, self.cantidad, self.cpu, self.simulado)
+        ]
@@ -0,0 +1,156 @@
+"""
+Enumeración de subredes por aritmética entera, para cualquier par de prefijos.
+
+Las subredes se generan por bloques como columnas NumPy: uint32 en IPv4 y
+pares (altos, bajos) de uint64 en IPv6, así que dividir un /48 en sus 65536
+/64 cuesta lo mismo que una división IPv4 de ese tamaño. Ninguna función
+guarda todas las filas. Los tramos chicos se recorren con ipaddress, sin
+importar NumPy.
+"""
+import ipaddress
+
+COLUMNAS_SUBREDES = [
+    'Subred', 'Dirección de red', 'Prefijo', 'Primera IP utilizable',
+    'Última IP utilizable', 'Dirección broadcast', 'Hosts utilizables'
+]
+
+# Filas por bloque al generar columnas
+TAM_BLOQUE = 1 << 18
+
+# Hasta cuántas subredes iterar_subredes las calcula sin NumPy
+MAX_SIN_NUMPY = 1 << 12
+
+
+class PlanSubredes:
+    """Parámetros de la división de una red base en subredes de igual tamaño"""
+
+    def __init__(self, red_base, prefijo_original, nuevo_prefijo):
+        self.red = ipaddress.ip_network(f"{red_base}/{prefijo_original}", strict=False)
+        bits = self.red.max_prefixlen
+        if not prefijo_original <= nuevo_prefijo <= bits:
+            raise ValueError(
+                f"El nuevo prefijo /{nuevo_prefijo} debe estar entre /{prefijo_original} y /{bits}"
+            )
+
+        self.version = self.red.version
+        self.nuevo_prefijo = nuevo_prefijo
+        self.base = int(self.red.network_address)
+        self.num_subredes = 1 << (nuevo_prefijo - prefijo_original)
+        self.salto = 1 << (bits - nuevo_prefijo)
+
+        # Primera/última utilizable como desplazamiento dentro de cada subred,
+        # con el mismo criterio que ipaddress.hosts()
+        if nuevo_prefijo >= bits - 1:
+            self.desde, self.hasta = 0, self.salto - 1
+        elif self.version == 4:
+            self.desde, self.hasta = 1, self.salto - 2
+        else:
+            self.desde, self.hasta = 1, self.salto - 1
+        self.hosts_por_subred = self.hasta - self.desde + 1
+
+
+def _rango(plan, primera, cantidad):
+    """Subredes de la `primera` a la `primera + cantidad - 1` (todas las que quedan si cantidad es None)"""
+    if not 0 <= primera <= plan.num_subredes:
+        raise ValueError(f"La red {plan.red} tiene {plan.num_subredes} subredes /{plan.nuevo_prefijo}")
+    ultima = plan.num_subredes if cantidad is None else min(primera + cantidad, plan.num_subredes)
+    return primera, ultima
+
+
+def columnas_subredes(red_base="192.168.0.0", prefijo_original=24, nuevo_prefijo=26, tam_bloque=TAM_BLOQUE,
+                      primera=0, cantidad=None):
+    """
+    Genera bloques de columnas numéricas: uint32 en IPv4 y pares (altos,
+    bajos) de uint64 en IPv6, que no tiene dirección broadcast. `primera` y
+    `cantidad` eligen un tramo de subredes consecutivas (índices desde 0).
+    """
+    import numpy as np
+
+    from herramientas_red.direcciones import desplazar_ipv6, par_ipv6, sumar_ipv6
+
+    plan = PlanSubredes(red_base, prefijo_original, nuevo_prefijo)
+    primera, ultima = _rango(plan, primera, cantidad)
+
+    if plan.version == 4:
+        for inicio in range(primera, ultima, tam_bloque):
+            indices = np.arange(inicio, min(inicio + tam_bloque, ultima), dtype=np.uint64)
+            red = (plan.base + indices * plan.salto).astype(np.uint32)
+            yield {
+                'Subred': (indices + 1).astype(np.int64),
+                'Dirección de red': red,
+                'Primera IP utilizable': red + np.uint32(plan.desde),
+                'Última IP utilizable': red + np.uint32(plan.hasta),
+                'Dirección broadcast': red + np.uint32(plan.salto - 1),
+            }
+        return
+
+    # IPv6: la primera subred del bloque se calcula con enteros de Python y el
+    # resto sumándole desplazamientos chicos; desde es 0 o 1 y hasta son todos
+    # los bits de host, así que basta con un OR sobre la palabra baja o alta
+    bits = 128 - plan.nuevo_prefijo
+    host_altos, host_bajos = par_ipv6(plan.hasta)
+    for inicio in range(primera, ultima, tam_bloque):
+        filas = min(tam_bloque, ultima - inicio)
+        altos, bajos = sumar_ipv6(*par_ipv6(plan.base + inicio * plan.salto),
+                                  *desplazar_ipv6(np.arange(filas, dtype=np.uint64), bits))
+        yield {
+            'Subred': np.arange(inicio + 1, inicio + filas + 1, dtype=np.int64),
+            'Dirección de red': (altos, bajos),
+            'Primera IP utilizable': (altos, bajos | np.uint64(plan.desde)),
+            'Última IP utilizable': (altos | host_altos, bajos | host_bajos),
+        }
+
+
+def bloques_subredes(red_base="192.168.0.0", prefijo_original=24, nuevo_prefijo=26, tam_bloque=TAM_BLOQUE,
+                     primera=0, cantidad=None):
+    """
+    Genera bloques de la tabla de subredes con las columnas de COLUMNAS_SUBREDES
+    ya en texto, listos para un DataFrame o para escribirse fila a fila
+    """
+    import numpy as np
+
+    from herramientas_red.direcciones import ipv4_a_texto, ipv6_a_texto
+
+    plan = PlanSubredes(red_base, prefijo_original, nuevo_prefijo)
+    prefijo = f'/{nuevo_prefijo}'
+    a_texto = ipv4_a_texto if plan.version == 4 else (lambda par: ipv6_a_texto(*par))
+
+    for columnas in columnas_subredes(red_base, prefijo_original, nuevo_prefijo, tam_bloque, primera, cantidad):
+        filas = len(columnas['Subred'])
+        yield {
+            'Subred': columnas['Subred'],
+            'Dirección de red': a_texto(columnas['Dirección de red']),
+            'Prefijo': np.full(filas, prefijo, dtype=object),
+            'Primera IP utilizable': a_texto(columnas['Primera IP utilizable']),
+            'Última IP utilizable': a_texto(columnas['Última IP utilizable']),
+            'Dirección broadcast': (a_texto(columnas['Dirección broadcast']) if plan.version == 4
+                                    else np.full(filas, 'N/D', dtype=object)),
+            # En IPv6 los hosts por subred no caben en int64
+            'Hosts utilizables': np.full(filas, plan.hosts_por_subred,
+                                         dtype=np.int64 if plan.version == 4 else object),
+        }
+
+
+def _filas_enteras(plan, primera, ultima):
+    # Mismas filas que bloques_subredes, con enteros de Python
+    clase = ipaddress.IPv4Address if plan.version == 4 else ipaddress.IPv6Address
+    prefijo = f'/{plan.nuevo_prefijo}'
+    for indice in range(primera, ultima):
+        red = plan.base + indice * plan.salto
+        broadcast = str(clase(red + plan.salto - 1)) if plan.version == 4 else 'N/D'
+        yield (indice + 1, str(clase(red)), prefijo, str(clase(red + plan.desde)),
+               str(clase(red + plan.hasta)), broadcast, plan.hosts_por_subred)
+
+
+def iterar_subredes(red_base="192.168.0.0", prefijo_original=24, nuevo_prefijo=26, tam_bloque=TAM_BLOQUE,
+                    primera=0, cantidad=None):
+    """
+    Genera la tabla de subredes fila a fila como tuplas en el orden de COLUMNAS_SUBREDES
+    """
+    plan = PlanSubredes(red_base, prefijo_original, nuevo_prefijo)
+    inicio, ultima = _rango(plan, primera, cantidad)
+    if ultima - inicio <= MAX_SIN_NUMPY:
+        yield from _filas_enteras(plan, inicio, ultima)
+        return
+    for bloque in bloques_subredes(red_base, prefijo_original, nuevo_prefijo, tam_bloque, primera, cantidad):
+        yield from zip(*(bloque[columna].tolist() for columna in COLUMNAS_SUBREDES))
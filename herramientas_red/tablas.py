@@ -0,0 +1,230 @@
+"""
+Tabla guardada por columnas: agregar filas es O(1) amortizado y el
+DataFrame solo se arma cuando se pide, y se reutiliza mientras no cambie.
+Los índices hash por una o varias columnas se mantienen al agregar y asignar.
+Las filas solo se agregan al final y cada asignación que cambia un valor
+anota su posición en `modificadas`, así que lo que cambió desde un momento
+dado se conoce sin comparar tablas (ver herramientas_red.incremental).
+
+FilasVista presenta una tabla como la lista de dicts que usaban los scripts:
+leer, asignar y agregar pasan directo a la tabla.
+"""
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+
+
+class TablaColumnar:
+    """Lista de columnas con el mismo largo, una por nombre de columna"""
+
+    def __init__(self, columnas, filas=(), vacio=""):
+        self.columnas = list(columnas)
+        self.vacio = vacio
+        self._datos = {columna: [] for columna in self.columnas}
+        self._df = None
+        # (columnas...) -> {clave: [posiciones]}
+        self._indices = {}
+        # Posiciones asignadas, en orden (con repeticiones)
+        self.modificadas = array('q')
+        self.extend(filas)
+
+    def __len__(self):
+        return len(self._datos[self.columnas[0]])
+
+    def __iter__(self):
+        for valores in zip(*(self._datos[columna] for columna in self.columnas)):
+            yield dict(zip(self.columnas, valores))
+
+    def _normalizar(self, fila):
+        # Acepta dicts con las columnas de la tabla o secuencias en el mismo orden
+        if isinstance(fila, dict):
+            return [fila.get(columna, self.vacio) for columna in self.columnas]
+        valores = list(fila)
+        if len(valores) > len(self.columnas):
+            raise ValueError(f"La fila tiene {len(valores)} valores y la tabla {len(self.columnas)} columnas")
+        return valores + [self.vacio] * (len(self.columnas) - len(valores))
+
+    def append(self, fila):
+        """Agrega una fila y devuelve su posición"""
+        for columna, valor in zip(self.columnas, self._normalizar(fila)):
+            self._datos[columna].append(valor)
+        self._df = None
+        posicion = len(self) - 1
+        for columnas, indice in self._indices.items():
+            indice.setdefault(self._clave(posicion, columnas), []).append(posicion)
+        return posicion
+
+    def extend(self, filas):
+        """Agrega varias filas y devuelve cuántas se agregaron"""
+        listas = [self._datos[columna] for columna in self.columnas]
+        inicio = len(self)
+        for fila in filas:
+            for lista, valor in zip(listas, self._normalizar(fila)):
+                lista.append(valor)
+        agregadas = len(self) - inicio
+        if agregadas:
+            self._df = None
+            for columnas in self._indices:
+                self._indexar_desde(columnas, inicio)
+        return agregadas
+
+    def fila(self, posicion):
+        return {columna: self._datos[columna][posicion] for columna in self.columnas}
+
+    def columna(self, columna):
+        """Devuelve la lista de valores de una columna (no modificarla directamente)"""
+        return self._datos[columna]
+
+    def valor(self, posicion, columna):
+        return self._datos[columna][posicion]
+
+    def asignar(self, posicion, columna, valor):
+        if self._datos[columna][posicion] != valor:
+            self.modificadas.append(posicion)
+        # Si la columna es parte de un índice, la posición cambia de clave
+        afectados = [(columnas, indice) for columnas, indice in self._indices.items() if columna in columnas]
+        for columnas, indice in afectados:
+            clave = self._clave(posicion, columnas)
+            indice[clave].remove(posicion)
+            if not indice[clave]:
+                del indice[clave]
+        self._datos[columna][posicion] = valor
+        for columnas, indice in afectados:
+            indice.setdefault(self._clave(posicion, columnas), []).append(posicion)
+        self._df = None
+
+    def _clave(self, posicion, columnas):
+        if len(columnas) == 1:
+            return self._datos[columnas[0]][posicion]
+        return tuple(self._datos[columna][posicion] for columna in columnas)
+
+    def _indexar_desde(self, columnas, inicio):
+        indice = self._indices[columnas]
+        listas = [self._datos[columna][inicio:] for columna in columnas]
+        claves = listas[0] if len(columnas) == 1 else zip(*listas)
+        for posicion, clave in enumerate(claves, inicio):
+            indice.setdefault(clave, []).append(posicion)
+
+    def indexar(self, *columnas):
+        """Crea (si no existe) un índice hash sobre una o varias columnas"""
+        if columnas not in self._indices:
+            self._indices[columnas] = {}
+            self._indexar_desde(columnas, 0)
+
+    def buscar(self, columnas, clave):
+        """
+        Devuelve las posiciones cuyas columnas valen clave (un valor si es una
+        sola columna, una tupla si son varias). El índice se crea si hace falta.
+        """
+        columnas = tuple(columnas)
+        self.indexar(*columnas)
+        return list(self._indices[columnas].get(clave, ()))
+
+    def a_dataframe(self):
+        """Arma el DataFrame (solo si la tabla cambió desde la última vez)"""
+        if self._df is None:
+            import pandas as pd
+            self._df = pd.DataFrame(self._datos, columns=self.columnas)
+        return self._df
+
+
+class FilaVista(MutableMapping):
+    """Una fila de la tabla como dict: las columnas son fijas y asignar escribe en la tabla"""
+
+    def __init__(self, tabla, posicion, al_cambiar=None):
+        self._tabla = tabla
+        self._posicion = posicion
+        self._al_cambiar = al_cambiar
+
+    def __getitem__(self, columna):
+        if columna not in self._tabla.columnas:
+            raise KeyError(columna)
+        return self._tabla.valor(self._posicion, columna)
+
+    def __setitem__(self, columna, valor):
+        if columna not in self._tabla.columnas:
+            raise KeyError(f"La tabla no tiene la columna '{columna}'")
+        self._tabla.asignar(self._posicion, columna, valor)
+        if self._al_cambiar is not None:
+            self._al_cambiar()
+
+    def __delitem__(self, columna):
+        raise TypeError("Las columnas de la tabla son fijas")
+
+    def __iter__(self):
+        return iter(self._tabla.columnas)
+
+    def __len__(self):
+        return len(self._tabla.columnas)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class FilasVista(MutableSequence):
+    """
+    Filas de una tabla como lista de dicts vivos. Agregar y asignar pasan a la
+    tabla; insertar o borrar en el medio rearma la tabla con `reemplazar`.
+    `al_cambiar` se llama después de cada cambio.
+    """
+
+    def __init__(self, tabla, reemplazar, al_cambiar=None):
+        self._tabla = tabla
+        self._reemplazar = reemplazar
+        self._al_cambiar = al_cambiar
+
+    def __len__(self):
+        return len(self._tabla)
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self._tabla.fila(numero) for numero in range(*posicion.indices(len(self)))]
+        return FilaVista(self._tabla, range(len(self))[posicion], self._al_cambiar)
+
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield FilaVista(self._tabla, posicion, self._al_cambiar)
+
+    def _cambio(self):
+        if self._al_cambiar is not None:
+            self._al_cambiar()
+
+    def __setitem__(self, posicion, fila):
+        if isinstance(posicion, slice):
+            filas = [dict(fila) for fila in self._tabla]
+            filas[posicion] = [dict(nueva) for nueva in fila]
+            self._reemplazar(filas)
+            return
+        posicion = range(len(self))[posicion]
+        for columna in self._tabla.columnas:
+            self._tabla.asignar(posicion, columna, fila.get(columna, self._tabla.vacio))
+        self._cambio()
+
+    def __delitem__(self, posicion):
+        filas = [dict(fila) for fila in self._tabla]
+        del filas[posicion]
+        self._reemplazar(filas)
+
+    def insert(self, posicion, fila):
+        if posicion >= len(self):
+            self.append(fila)
+            return
+        filas = [dict(fila) for fila in self._tabla]
+        filas.insert(posicion, dict(fila))
+        self._reemplazar(filas)
+
+    def append(self, fila):
+        self._tabla.append(dict(fila))
+        self._cambio()
+
+    def extend(self, filas):
+        self._tabla.extend([dict(fila) for fila in filas])
+        self._cambio()
+
+    def clear(self):
+        self._reemplazar([])
+
+    def __eq__(self, otra):
+        return list(self) == list(otra) if isinstance(otra, (list, FilasVista)) else NotImplemented
+
+    def __repr__(self):
+        return repr([dict(fila) for fila in self])
@@ -0,0 +1,88 @@
+"""
+Filas con estilo sobre hojas write-only de openpyxl.
+
+Los estilos de herramientas_red.estilos se registran una sola vez por libro
+como NamedStyle; cada celda copia el arreglo de estilo de una celda plantilla
+en lugar de crear objetos Alignment/Border/Font propios.
+"""
+from copy import copy
+
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+from herramientas_red.estilos import ESTILOS
+
+
+def _estilo_con_nombre(nombre, propiedades):
+    # NamedStyle queda ligado al libro al registrarse, así que se crean por libro
+    estilo = NamedStyle(name=f"Tabla - {nombre}")
+    if propiedades.get('negrita') or propiedades.get('color'):
+        estilo.font = Font(color=propiedades.get('color'), bold=propiedades.get('negrita', False))
+    else:
+        estilo.font = copy(DEFAULT_FONT)
+    if propiedades.get('relleno'):
+        color = propiedades['relleno']
+        estilo.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    if propiedades.get('borde'):
+        lado = Side(style='thin')
+        estilo.border = Border(left=lado, right=lado, top=lado, bottom=lado)
+    if any(clave in propiedades for clave in ('horizontal', 'vertical', 'ajustar')):
+        estilo.alignment = Alignment(horizontal=propiedades.get('horizontal'),
+                                     vertical=propiedades.get('vertical'),
+                                     wrap_text=propiedades.get('ajustar'))
+    return estilo
+
+
+class EscritorTablas:
+    """Agrega filas con estilo a una hoja write-only, en orden"""
+
+    def __init__(self, wb, ws):
+        self.ws = ws
+        registrados = set(wb.named_styles)
+        self._plantillas = {}
+        for nombre, propiedades in ESTILOS.items():
+            estilo = _estilo_con_nombre(nombre, propiedades)
+            if estilo.name not in registrados:
+                wb.add_named_style(estilo)
+            plantilla = WriteOnlyCell(ws)
+            plantilla.style = estilo.name
+            self._plantillas[nombre] = plantilla._style
+
+    def celda(self, valor, estilo):
+        celda = WriteOnlyCell(self.ws, value=valor)
+        if estilo is not None:
+            celda._style = copy(self._plantillas[estilo])
+        return celda
+
+    def fila(self, valores, estilos=None):
+        """Agrega una fila; estilos es None, un nombre o uno por valor"""
+        if estilos is None or isinstance(estilos, str):
+            estilos = [estilos] * len(valores)
+        self.ws.append([self.celda(valor, estilo) for valor, estilo in zip(valores, estilos)])
+
+    def en_blanco(self, filas=1):
+        for _ in range(filas):
+            self.ws.append([])
+
+    def filas(self, filas, estilos=None):
+        """Agrega muchas filas (estilos: None o uno por columna) y devuelve cuántas fueron"""
+        ws = self.ws
+        total = 0
+        if estilos is None:
+            for valores in filas:
+                ws.append(valores)
+                total += 1
+            return total
+
+        plantillas = [self._plantillas[estilo] if estilo else None for estilo in estilos]
+        for valores in filas:
+            fila = []
+            for valor, plantilla in zip(valores, plantillas):
+                celda = WriteOnlyCell(ws, value=valor)
+                if plantilla is not None:
+                    celda._style = copy(plantilla)
+                fila.append(celda)
+            ws.append(fila)
+            total += 1
+        return total
@@ -0,0 +1,246 @@
+"""
+Cifrado Twofish (clave de 128 bits) y modo EAX, solo en el sentido de cifrado.
+
+Es lo que hace falta para leer archivos de Packet Tracer: en EAX el
+descifrado también usa únicamente el cifrado del bloque (CTR y OMAC), y como
+los bloques de CTR son independientes, se cifran todos a la vez con NumPy.
+"""
+import numpy as np
+
+# Tablas de 4 bits de las permutaciones q0 y q1 (especificación de Twofish, 4.3.5)
+_T_Q0 = (
+    (0x8, 0x1, 0x7, 0xD, 0x6, 0xF, 0x3, 0x2, 0x0, 0xB, 0x5, 0x9, 0xE, 0xC, 0xA, 0x4),
+    (0xE, 0xC, 0xB, 0x8, 0x1, 0x2, 0x3, 0x5, 0xF, 0x4, 0xA, 0x6, 0x7, 0x0, 0x9, 0xD),
+    (0xB, 0xA, 0x5, 0xE, 0x6, 0xD, 0x9, 0x0, 0xC, 0x8, 0xF, 0x3, 0x2, 0x4, 0x7, 0x1),
+    (0xD, 0x7, 0xF, 0x4, 0x1, 0x2, 0x6, 0xE, 0x9, 0xB, 0x3, 0x0, 0x8, 0x5, 0xC, 0xA),
+)
+_T_Q1 = (
+    (0x2, 0x8, 0xB, 0xD, 0xF, 0x7, 0x6, 0xE, 0x3, 0x1, 0x9, 0x4, 0x0, 0xA, 0xC, 0x5),
+    (0x1, 0xE, 0x2, 0xB, 0x4, 0xC, 0x3, 0x7, 0x6, 0xD, 0xA, 0x5, 0xF, 0x9, 0x0, 0x8),
+    (0x4, 0xC, 0x7, 0x5, 0x1, 0x6, 0x9, 0xA, 0x0, 0xE, 0xD, 0x8, 0x2, 0xB, 0x3, 0xF),
+    (0xB, 0x9, 0x5, 0x1, 0xC, 0x3, 0xD, 0xE, 0x6, 0x4, 0x7, 0xF, 0x2, 0x0, 0x8, 0xA),
+)
+
+_MDS = ((0x01, 0xEF, 0x5B, 0x5B), (0x5B, 0xEF, 0xEF, 0x01), (0xEF, 0x5B, 0x01, 0xEF), (0xEF, 0x01, 0xEF, 0x5B))
+_RS = (
+    (0x01, 0xA4, 0x55, 0x87, 0x5A, 0x58, 0xDB, 0x9E),
+    (0xA4, 0x56, 0x82, 0xF3, 0x1E, 0xC6, 0x68, 0xE5),
+    (0x02, 0xA1, 0xFC, 0xC1, 0x47, 0xAE, 0x3D, 0x19),
+    (0xA4, 0x55, 0x87, 0x5A, 0x58, 0xDB, 0x9E, 0x03),
+)
+
+_MASCARA = 0xFFFFFFFF
+
+
+def _ror4(x, n):
+    return ((x >> n) | (x << (4 - n))) & 0xF
+
+
+def _q(tablas, x):
+    a, b = x >> 4, x & 0xF
+    a, b = a ^ b, a ^ _ror4(b, 1) ^ ((a << 3) & 0xF)
+    a, b = tablas[0][a], tablas[1][b]
+    a, b = a ^ b, a ^ _ror4(b, 1) ^ ((a << 3) & 0xF)
+    a, b = tablas[2][a], tablas[3][b]
+    return (b << 4) | a
+
+
+_Q0 = [_q(_T_Q0, x) for x in range(256)]
+_Q1 = [_q(_T_Q1, x) for x in range(256)]
+
+
+def _gf_mult(a, b, polinomio):
+    resultado = 0
+    while b:
+        if b & 1:
+            resultado ^= a
+        a <<= 1
+        if a & 0x100:
+            a ^= polinomio
+        b >>= 1
+    return resultado
+
+
+def _rol(x, n):
+    return ((x << n) | (x >> (32 - n))) & _MASCARA
+
+
+def _bytes_palabra(palabra):
+    return [(palabra >> (8 * i)) & 0xFF for i in range(4)]
+
+
+def _mds_columna(columna, y):
+    # Aporte del byte y (posición `columna`) a la palabra que sale de MDS
+    return sum(_gf_mult(_MDS[fila][columna], y, 0x169) << (8 * fila) for fila in range(4))
+
+
+def _h_bytes(x, l0, l1):
+    """Las cuatro cadenas de permutaciones q de h para una clave de 128 bits"""
+    return (
+        _Q1[_Q0[_Q0[x] ^ l1[0]] ^ l0[0]],
+        _Q0[_Q0[_Q1[x] ^ l1[1]] ^ l0[1]],
+        _Q1[_Q1[_Q0[x] ^ l1[2]] ^ l0[2]],
+        _Q0[_Q1[_Q1[x] ^ l1[3]] ^ l0[3]],
+    )
+
+
+def _h(palabra, l0, l1):
+    x = _bytes_palabra(palabra)
+    y = [_h_bytes(x[i], l0, l1)[i] for i in range(4)]
+    resultado = 0
+    for columna in range(4):
+        resultado ^= _mds_columna(columna, y[columna])
+    return resultado
+
+
+class Twofish:
+    """Twofish de 128 bits con las S-box dependientes de la clave ya combinadas con MDS"""
+
+    def __init__(self, clave):
+        clave = bytes(clave)
+        if len(clave) != 16:
+            raise ValueError("Solo se admiten claves Twofish de 16 bytes")
+        m = [int.from_bytes(clave[4 * i:4 * i + 4], 'little') for i in range(4)]
+        pares, impares = (_bytes_palabra(m[0]), _bytes_palabra(m[2])), (_bytes_palabra(m[1]), _bytes_palabra(m[3]))
+
+        # Palabras S (código Reed-Solomon de cada mitad de la clave), en orden inverso
+        s = []
+        for i in range(2):
+            mitad = clave[8 * i:8 * i + 8]
+            s.append([
+                _gf_mult_fila(_RS[fila], mitad) for fila in range(4)
+            ])
+        s0, s1 = s[1], s[0]
+
+        # Subclaves K0..K39
+        rho = 0x01010101
+        subclaves = []
+        for i in range(20):
+            a = _h(2 * i * rho, *pares)
+            b = _rol(_h((2 * i + 1) * rho, *impares), 8)
+            subclaves.append((a + b) & _MASCARA)
+            subclaves.append(_rol((a + 2 * b) & _MASCARA, 9))
+        self.subclaves = np.array(subclaves, dtype=np.uint32)
+
+        # g(X) = T0[x0] ^ T1[x1] ^ T2[x2] ^ T3[x3]
+        tablas = np.zeros((4, 256), dtype=np.uint32)
+        for x in range(256):
+            y = _h_bytes(x, s0, s1)
+            for columna in range(4):
+                tablas[columna, x] = _mds_columna(columna, y[columna])
+        self._tablas = tablas
+        # Copias en listas de Python para cifrar bloques sueltos (CMAC es secuencial)
+        self._listas = [columna.tolist() for columna in tablas]
+        self._k = subclaves
+
+    def _g(self, x):
+        t = self._tablas
+        return t[0][x & 0xFF] ^ t[1][(x >> 8) & 0xFF] ^ t[2][(x >> 16) & 0xFF] ^ t[3][x >> 24]
+
+    def cifrar_bloques(self, bloques):
+        """Cifra un arreglo (n, 16) de uint8 y devuelve otro del mismo tamaño"""
+        palabras = np.ascontiguousarray(bloques, dtype=np.uint8).view('<u4').reshape(-1, 4)
+        k = self.subclaves
+        r0, r1, r2, r3 = (palabras[:, i] ^ k[i] for i in range(4))
+        uno, ocho, treinta_uno, veinticuatro = np.uint32(1), np.uint32(8), np.uint32(31), np.uint32(24)
+        for ronda in range(16):
+            t0 = self._g(r0)
+            t1 = self._g((r1 << ocho) | (r1 >> veinticuatro))
+            f0 = t0 + t1 + k[2 * ronda + 8]
+            f1 = t0 + (t1 << uno) + k[2 * ronda + 9]
+            r2 ^= f0
+            r2 = (r2 >> uno) | (r2 << treinta_uno)
+            r3 = ((r3 << uno) | (r3 >> treinta_uno)) ^ f1
+            r0, r1, r2, r3 = r2, r3, r0, r1
+        salida = np.stack([r2 ^ k[4], r3 ^ k[5], r0 ^ k[6], r1 ^ k[7]], axis=1).astype('<u4')
+        return salida.view(np.uint8).reshape(-1, 16)
+
+    def cifrar_entero(self, valor):
+        """Cifra un bloque dado como entero de 128 bits (bytes en orden little-endian)"""
+        t0_, t1_, t2_, t3_ = self._listas
+        k = self._k
+        r0 = (valor & _MASCARA) ^ k[0]
+        r1 = ((valor >> 32) & _MASCARA) ^ k[1]
+        r2 = ((valor >> 64) & _MASCARA) ^ k[2]
+        r3 = (valor >> 96) ^ k[3]
+        for ronda in range(8, 40, 2):
+            # g(R1 <<< 8) con las tablas desplazadas un byte
+            t0 = t0_[r0 & 0xFF] ^ t1_[(r0 >> 8) & 0xFF] ^ t2_[(r0 >> 16) & 0xFF] ^ t3_[r0 >> 24]
+            t1 = t0_[r1 >> 24] ^ t1_[r1 & 0xFF] ^ t2_[(r1 >> 8) & 0xFF] ^ t3_[(r1 >> 16) & 0xFF]
+            r2 ^= (t0 + t1 + k[ronda]) & _MASCARA
+            r2 = (r2 >> 1) | ((r2 << 31) & _MASCARA)
+            r3 = (((r3 << 1) & _MASCARA) | (r3 >> 31)) ^ ((t0 + 2 * t1 + k[ronda + 1]) & _MASCARA)
+            r0, r1, r2, r3 = r2, r3, r0, r1
+        return (r2 ^ k[4]) | ((r3 ^ k[5]) << 32) | ((r0 ^ k[6]) << 64) | ((r1 ^ k[7]) << 96)
+
+    def cifrar(self, bloque):
+        """Cifra un solo bloque de 16 bytes"""
+        return self.cifrar_entero(int.from_bytes(bloque, 'little')).to_bytes(16, 'little')
+
+
+def _gf_mult_fila(fila, datos):
+    resultado = 0
+    for coeficiente, byte in zip(fila, datos):
+        resultado ^= _gf_mult(coeficiente, byte, 0x14D)
+    return resultado
+
+
+def _duplicar(bloque):
+    # Multiplicación por x en GF(2^128), para las subclaves de CMAC
+    valor = int.from_bytes(bloque, 'big') << 1
+    if valor >> 128:
+        valor = (valor ^ 0x87) & ((1 << 128) - 1)
+    return valor.to_bytes(16, 'big')
+
+
+def _xor(a, b):
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def omac(cifrador, etiqueta, datos):
+    """OMAC_t de EAX: CMAC sobre el bloque [t] seguido de los datos"""
+    k1 = _duplicar(cifrador.cifrar(bytes(16)))
+    k2 = _duplicar(k1)
+    mensaje = etiqueta.to_bytes(16, 'big') + bytes(datos)
+    completos = (len(mensaje) - 1) // 16 * 16
+    ultimo = mensaje[completos:]
+    if len(ultimo) == 16:
+        ultimo = _xor(ultimo, k1)
+    else:
+        ultimo = _xor(ultimo + b'\x80' + bytes(15 - len(ultimo)), k2)
+    # CMAC es encadenado: cada bloque depende del anterior, así que va de a uno
+    cifrar = cifrador.cifrar_entero
+    estado = 0
+    for inicio in range(0, completos, 16):
+        estado = cifrar(estado ^ int.from_bytes(mensaje[inicio:inicio + 16], 'little'))
+    return cifrador.cifrar_entero(estado ^ int.from_bytes(ultimo, 'little')).to_bytes(16, 'little')
+
+
+def ctr(cifrador, contador, datos):
+    """Modo CTR con contador de 128 bits big-endian; todos los bloques se cifran juntos"""
+    datos = np.frombuffer(bytes(datos), dtype=np.uint8)
+    cantidad = (len(datos) + 15) // 16
+    inicio = int.from_bytes(contador, 'big')
+    alto, bajo = np.uint64(inicio >> 64), np.uint64(inicio & 0xFFFFFFFFFFFFFFFF)
+    pasos = np.arange(cantidad, dtype=np.uint64)
+    bajos = bajo + pasos
+    # Acarreo a la mitad alta cuando la baja da la vuelta
+    altos = alto + (bajos < bajo).astype(np.uint64)
+    contadores = np.stack([altos, bajos], axis=1).astype('>u8').view(np.uint8).reshape(-1, 16)
+    flujo = cifrador.cifrar_bloques(contadores).reshape(-1)[:len(datos)]
+    return (datos ^ flujo).tobytes()
+
+
+def descifrar_eax(clave, nonce, datos, tam_etiqueta=16, verificar=False, cabecera=b''):
+    """
+    Descifra datos EAX (texto cifrado seguido de la etiqueta). Con
+    verificar=True compara la etiqueta y lanza ValueError si no coincide.
+    """
+    cifrador = Twofish(clave)
+    cifrado, etiqueta = datos[:-tam_etiqueta], datos[-tam_etiqueta:]
+    n = omac(cifrador, 0, nonce)
+    if verificar:
+        esperada = _xor(_xor(n, omac(cifrador, 1, cabecera)), omac(cifrador, 2, cifrado))
+        if esperada[:tam_etiqueta] != bytes(etiqueta):
+            raise ValueError("La etiqueta EAX no coincide: el archivo está dañado o no es de Packet Tracer")
+    return ctr(cifrador, n, cifrado)
@@ -0,0 +1,443 @@
+"""
+Detección de conflictos de direccionamiento IPv4 sobre tablas de interfaces.
+
+Todas las direcciones y subredes se pasan a enteros y se ordenan una vez,
+así que cada verificación es un argsort o un searchsorted: O(n log n) en
+total. Las subredes se guardan como intervalos [inicio, fin] ordenados por
+inicio, junto con el máximo acumulado de los fines: un intervalo se solapa
+con alguno anterior si empieza antes de ese máximo. La subred declarada de
+cada dirección se busca en el trie de rutas (rutas.TrieRutas), que con
+subredes anidadas da la más específica.
+
+Las filas que no tienen una IPv4 válida (IPv6, 'N/D', vacías) se ignoran.
+validar_gateways revisa además, con el trie de rutas de los routers (IPv4 e
+IPv6), que cada gateway sea la IP de la interfaz de router de su subred.
+"""
+import ipaddress
+import re
+
+import numpy as np
+
+from herramientas_red.direcciones import MASCARAS, ipv4_a_texto, mascara_a_prefijo, texto_a_ipv4
+from herramientas_red.rutas import TablaRutas, TrieRutas
+
+COLUMNAS_CONFLICTOS = ['Tipo', 'Dirección', 'Filas', 'Detalle']
+
+# Nombres con que aparece la columna de gateway en las tablas de los labs
+COLUMNAS_GATEWAY = ('Gateway predeterminado', 'Puerta de enlace predeterminada')
+
+# Filas que se nombran por conflicto; una subred mal armada puede abarcar miles
+MAX_FILAS_CONFLICTO = 10
+
+# Sin columna de tipo, un dispositivo es router si se llama como los routers
+# de los labs o si alguna de sus interfaces dice que no lleva gateway
+TIPOS_ROUTER = ('Router', 'MultiLayerSwitch')
+_NOMBRE_ROUTER = re.compile(r'^R\d+$|router|^ISP$', re.IGNORECASE)
+_SIN_GATEWAY = {'N/A', 'N/D', 'No corresponde'}
+
+
+class IndiceIntervalos:
+    """Intervalos [inicio, fin] de direcciones IPv4 ordenados por inicio"""
+
+    def __init__(self, inicios, fines):
+        inicios = np.asarray(inicios, dtype=np.uint64)
+        fines = np.asarray(fines, dtype=np.uint64)
+        # A igual inicio, el más grande primero: así contiene a los siguientes
+        self.orden = np.lexsort((-fines.astype(np.int64), inicios))
+        self.inicios = inicios[self.orden]
+        self.fines = fines[self.orden]
+        # Máximo acumulado de los fines y qué intervalo lo alcanza, en un solo
+        # uint64: fin en los 32 bits altos, posición en los bajos
+        combinado = (self.fines << np.uint64(32)) | np.arange(len(self.fines), dtype=np.uint64)
+        acumulado = np.maximum.accumulate(combinado) if len(combinado) else combinado
+        self.fin_maximo = acumulado >> np.uint64(32)
+        self.dueno_maximo = (acumulado & np.uint64(0xFFFFFFFF)).astype(np.int64)
+
+    def __len__(self):
+        return len(self.inicios)
+
+    def solapamientos(self):
+        """
+        Pares (i, j) de posiciones originales donde el intervalo i empieza
+        dentro de j, que empieza antes. Cada intervalo se informa una vez, contra
+        el que más se extiende de los anteriores.
+        """
+        if len(self) < 2:
+            return np.empty((0, 2), dtype=np.int64)
+        solapa = self.inicios[1:] <= self.fin_maximo[:-1]
+        posiciones = np.flatnonzero(solapa) + 1
+        anteriores = self.dueno_maximo[posiciones - 1]
+        return np.column_stack((self.orden[posiciones], self.orden[anteriores]))
+
+    def tocan(self, inicios, fines):
+        """Para cada intervalo [inicio, fin] dado, si se solapa con alguno del índice"""
+        inicios = np.asarray(inicios, dtype=np.uint64)
+        fines = np.asarray(fines, dtype=np.uint64)
+        # El último intervalo que empieza antes del fin; entre él y los anteriores
+        # alguno llega al inicio si el máximo acumulado de los fines lo alcanza
+        anteriores = np.searchsorted(self.inicios, fines, side='right') - 1
+        return (anteriores >= 0) & (self.fin_maximo[np.maximum(anteriores, 0)] >= inicios)
+
+
+def _factorizar(valores):
+    # Máscaras y gateways se repiten mucho: se convierten solo los distintos
+    distintos = {}
+    codigos = np.fromiter((distintos.setdefault(valor, len(distintos)) for valor in valores),
+                          dtype=np.int64, count=len(valores))
+    return codigos, list(distintos)
+
+
+def _ipv4_factorizadas(valores):
+    codigos, distintos = _factorizar(valores)
+    enteros, validos = texto_a_ipv4(distintos)
+    return enteros[codigos], validos[codigos]
+
+
+def _prefijos_factorizados(valores):
+    codigos, distintos = _factorizar(valores)
+    prefijos, validos = mascara_a_prefijo(distintos)
+    return prefijos[codigos], validos[codigos]
+
+
+def _textos_subred(inicios, prefijos):
+    return [f"{red}/{prefijo}" for red, prefijo in zip(ipv4_a_texto(inicios), np.asarray(prefijos).tolist())]
+
+
+def rellenar_dispositivos(dispositivos):
+    """
+    Las tablas de los labs dejan vacío el dispositivo en sus filas
+    siguientes: cada fila toma el de la última fila que lo tiene
+    """
+    dispositivos = [str(d) if d else '' for d in dispositivos]
+    con_nombre = np.fromiter(map(bool, dispositivos), dtype=bool, count=len(dispositivos))
+    fila = np.maximum.accumulate(np.where(con_nombre, np.arange(len(dispositivos)), 0))
+    return [dispositivos[f] for f in fila.tolist()]
+
+
+class _Etiquetas:
+    """Nombre de cada fila para los mensajes ('R1 G0/0'), armado solo para las filas informadas"""
+
+    def __init__(self, dispositivos=None, interfaces=None):
+        self.dispositivos = None if dispositivos is None else rellenar_dispositivos(dispositivos)
+        self.interfaces = None if interfaces is None else [str(i) if i else '' for i in interfaces]
+
+    def __call__(self, posiciones, total=None):
+        total = len(posiciones) if total is None else total
+        nombres = []
+        for posicion in np.asarray(posiciones[:MAX_FILAS_CONFLICTO], dtype=np.int64).tolist():
+            dispositivo = self.dispositivos[posicion] if self.dispositivos is not None else ''
+            interfaz = self.interfaces[posicion] if self.interfaces is not None else ''
+            nombres.append(f"{dispositivo} {interfaz}".strip() or f"Fila {posicion + 1}")
+        if total > len(nombres):
+            nombres.append(f"y {total - len(nombres)} más")
+        return ', '.join(nombres)
+
+
+def _subredes_declaradas(subredes):
+    """(inicios, prefijos) de subredes dadas como 'red/prefijo' o como dict de columnas"""
+    if isinstance(subredes, dict):
+        redes = subredes.get('Dirección de subred', subredes.get('Dirección de red'))
+        prefijos = subredes['Prefijo']
+    else:
+        partes = [str(subred).partition('/') for subred in subredes]
+        redes = [parte[0] for parte in partes]
+        prefijos = [parte[2] for parte in partes]
+    inicios, redes_validas = texto_a_ipv4(redes)
+    prefijos, prefijos_validos = mascara_a_prefijo(prefijos)
+    if not (redes_validas & prefijos_validos).all():
+        posicion = int(np.flatnonzero(~(redes_validas & prefijos_validos))[0])
+        raise ValueError(f"Subred inválida en la posición {posicion + 1}: {redes[posicion]} {prefijos[posicion]}")
+    return inicios & MASCARAS[prefijos], prefijos
+
+
+def _tamanos(prefijos):
+    return np.uint64(1) << (32 - np.asarray(prefijos, dtype=np.int64)).astype(np.uint64)
+
+
+def validar(ips, mascaras, gateways=None, subredes=None, dispositivos=None, interfaces=None):
+    """
+    Busca conflictos en una tabla de interfaces dada por columnas. Devuelve
+    una lista de dicts con las columnas de COLUMNAS_CONFLICTOS:
+
+    - IP duplicada: la misma dirección en más de una fila
+    - Dirección reservada: la IP es la dirección de red o broadcast de su subred
+    - Máscara inválida: la máscara no es contigua o no se reconoce
+    - Subredes solapadas: dos interfaces con subredes distintas que se pisan
+      (máscaras inconsistentes) o dos subredes declaradas que se solapan
+    - Fuera de subred: la subred de la fila (IP/máscara) toca el espacio de las
+      subredes declaradas pero la IP no cae en ninguna; las filas de otras
+      redes (p. ej. las del ISP) no son parte del plan y no se revisan
+    - Máscara distinta: la IP cae en una subred declarada con otro prefijo
+    - Gateway fuera de subred: el gateway no está en la subred de la interfaz
+    - Gateway sin interfaz: ninguna fila de la tabla tiene la IP del gateway
+
+    `subredes` es opcional: 'red/prefijo' o el dict de crear_tabla_subredes.
+    """
+    etiquetas = _Etiquetas(dispositivos, interfaces)
+    conflictos = []
+
+    def agregar(tipo, direccion, posiciones, detalle='', total=None):
+        conflictos.append({'Tipo': tipo, 'Dirección': direccion, 'Filas': etiquetas(posiciones, total),
+                           'Detalle': detalle})
+
+    ips, con_ip = texto_a_ipv4(ips)
+    prefijos, con_mascara = _prefijos_factorizados(mascaras)
+    filas = np.flatnonzero(con_ip)
+    ips_validas = ips[filas]
+
+    # Máscaras que no se entienden en filas con IP (las vacías se ignoran)
+    sin_mascara = filas[~con_mascara[filas]]
+    for posicion in sin_mascara:
+        if str(mascaras[posicion] or '').strip():
+            agregar('Máscara inválida', str(mascaras[posicion]), [posicion])
+
+    # IP duplicadas: iguales quedan juntas al ordenar
+    orden = np.argsort(ips_validas, kind='stable')
+    ordenadas = ips_validas[orden]
+    limites = np.concatenate(([0], np.flatnonzero(ordenadas[1:] != ordenadas[:-1]) + 1, [len(ordenadas)]))
+    repetidas = np.flatnonzero(np.diff(limites) > 1)
+    for grupo, texto in zip(repetidas, ipv4_a_texto(ordenadas[limites[repetidas]])):
+        inicio, fin = limites[grupo], limites[grupo + 1]
+        agregar('IP duplicada', texto, filas[orden[inicio:fin]], f"{fin - inicio} interfaces")
+
+    # Subred de cada interfaz según su máscara
+    con_ambas = filas[con_mascara[filas]]
+    prefijo_fila = prefijos[con_ambas]
+    red_fila = ips[con_ambas] & MASCARAS[prefijo_fila]
+    ultima_fila = (red_fila.astype(np.uint64) + _tamanos(prefijo_fila) - np.uint64(1))
+
+    # /31 y /32 no tienen dirección de red ni broadcast
+    es_red = ips[con_ambas] == red_fila
+    reservadas = np.flatnonzero((prefijo_fila < 31) & (es_red | (ips[con_ambas] == ultima_fila)))
+    for posicion, texto, subred, de_red in zip(
+            reservadas, ipv4_a_texto(ips[con_ambas[reservadas]]),
+            _textos_subred(red_fila[reservadas], prefijo_fila[reservadas]), es_red[reservadas]):
+        agregar('Dirección reservada', texto, [con_ambas[posicion]],
+                f"Es la dirección de {'red' if de_red else 'broadcast'} de {subred}")
+
+    # Subredes distintas de las interfaces: las que se pisan sin ser iguales
+    # indican máscaras inconsistentes
+    if len(con_ambas):
+        claves = (red_fila.astype(np.uint64) << np.uint64(6)) | prefijo_fila.astype(np.uint64)
+        unicas, grupo_fila = np.unique(claves, return_inverse=True)
+        inicios_u = unicas >> np.uint64(6)
+        prefijos_u = (unicas & np.uint64(63)).astype(np.int64)
+        indice = IndiceIntervalos(inicios_u, inicios_u + _tamanos(prefijos_u) - np.uint64(1))
+        solapadas = indice.solapamientos()
+        if len(solapadas):
+            # Filas de cada subred, para nombrar las interfaces involucradas
+            por_grupo = np.argsort(grupo_fila, kind='stable')
+            cortes = np.searchsorted(grupo_fila[por_grupo], np.arange(len(unicas) + 1))
+            textos = _textos_subred(inicios_u, prefijos_u)
+            for i, j in solapadas:
+                texto_i, texto_j = textos[i], textos[j]
+                # Solo las primeras filas de cada subred: copiar grupos enteros sería cuadrático
+                posiciones = np.concatenate((por_grupo[cortes[i]:min(cortes[i + 1], cortes[i] + MAX_FILAS_CONFLICTO)],
+                                             por_grupo[cortes[j]:min(cortes[j + 1], cortes[j] + MAX_FILAS_CONFLICTO)]))
+                agregar('Subredes solapadas', texto_i, con_ambas[posiciones],
+                        f"{texto_i} se solapa con {texto_j} (máscaras inconsistentes)",
+                        cortes[i + 1] - cortes[i] + cortes[j + 1] - cortes[j])
+
+    # Subredes declaradas: solapamientos entre ellas y pertenencia de cada IP
+    if subredes is not None:
+        inicios_d, prefijos_d = _subredes_declaradas(subredes)
+        declaradas = IndiceIntervalos(inicios_d, inicios_d.astype(np.uint64) + _tamanos(prefijos_d) - np.uint64(1))
+        textos_d = _textos_subred(inicios_d, prefijos_d)
+        for i, j in declaradas.solapamientos():
+            agregar('Subredes solapadas', textos_d[i], [],
+                    f"Las subredes declaradas {textos_d[i]} y {textos_d[j]} se solapan")
+        # La subred de cada IP es la más específica que la contiene
+        trie_d = TrieRutas(inicios_d, prefijos_d, 4)
+        del_plan = con_ambas[declaradas.tocan(red_fila, ultima_fila)] if len(declaradas) else con_ambas[:0]
+        afuera = del_plan[trie_d.buscar(ips[del_plan]) < 0]
+        for posicion, texto in zip(afuera, ipv4_a_texto(ips[afuera])):
+            agregar('Fuera de subred', texto, [posicion], "No pertenece a ninguna subred declarada")
+        # Prefijo de cada fila con máscara frente al de su subred declarada
+        contenedora_ambas = trie_d.buscar(ips[con_ambas])
+        distinta = (contenedora_ambas >= 0) & (prefijos_d[np.maximum(contenedora_ambas, 0)] != prefijo_fila)
+        distintas = np.flatnonzero(distinta)
+        for posicion, texto, subred in zip(distintas, ipv4_a_texto(ips[con_ambas[distintas]]),
+                                          contenedora_ambas[distintas]):
+            agregar('Máscara distinta', texto, [con_ambas[posicion]],
+                    f"Tiene /{prefijo_fila[posicion]} y la subred declarada es {textos_d[subred]}")
+
+    # Gateways: en la subred de la interfaz y asignados a alguna interfaz
+    if gateways is not None and len(con_ambas):
+        gateway_fila, con_gateway = _ipv4_factorizadas(gateways)
+        gateway_fila, con_gateway = gateway_fila[con_ambas], con_gateway[con_ambas]
+        revisar = np.flatnonzero(con_gateway)
+        afuera = revisar[(gateway_fila[revisar] & MASCARAS[prefijo_fila[revisar]]) != red_fila[revisar]]
+        for posicion, texto, subred in zip(afuera, ipv4_a_texto(gateway_fila[afuera]),
+                                           _textos_subred(red_fila[afuera], prefijo_fila[afuera])):
+            agregar('Gateway fuera de subred', texto, [con_ambas[posicion]], f"La interfaz está en {subred}")
+        sin_interfaz = revisar[~np.isin(gateway_fila[revisar], ordenadas)]
+        # Un aviso por gateway, con todas las filas que lo usan
+        por_gateway = {}
+        for texto, posicion in zip(ipv4_a_texto(gateway_fila[sin_interfaz]), sin_interfaz):
+            por_gateway.setdefault(texto, []).append(con_ambas[posicion])
+        for texto, posiciones in por_gateway.items():
+            agregar('Gateway sin interfaz', texto, posiciones, "Ninguna interfaz de la tabla tiene esa IP")
+    return conflictos
+
+
+def es_router(dispositivo, gateway=''):
+    """Si una fila suelta es de router por su nombre o su gateway, como filas_router sin tipos"""
+    return bool(_NOMBRE_ROUTER.search(str(dispositivo or ''))) or str(gateway or '').strip() in _SIN_GATEWAY
+
+
+def filas_router(dispositivos, gateways=None, tipos=None):
+    """Posiciones de las interfaces de router (por tipo, o por nombre y gateway)"""
+    dispositivos = rellenar_dispositivos(dispositivos)
+    if tipos is not None:
+        return np.flatnonzero([tipo in TIPOS_ROUTER for tipo in tipos])
+    routers = {nombre for nombre in dispositivos if _NOMBRE_ROUTER.search(nombre)}
+    if gateways is not None:
+        routers.update(nombre for nombre, gateway in zip(dispositivos, gateways)
+                       if str(gateway or '').strip() in _SIN_GATEWAY)
+    return np.flatnonzero([nombre in routers for nombre in dispositivos])
+
+
+def _canonica(texto):
+    try:
+        return ipaddress.ip_address(str(texto).strip().partition('%')[0])
+    except ValueError:
+        return None
+
+
+def validar_gateways(ips, mascaras, gateways, dispositivos=None, interfaces=None, tipos=None):
+    """
+    Revisa los gateways contra las subredes de las interfaces de router, con
+    búsqueda del prefijo más largo. Devuelve dicts con COLUMNAS_CONFLICTOS:
+
+    - Gateway sin ruta: ninguna interfaz de router tiene una subred que lo contenga
+    - Gateway no es del router: cae en la subred de una interfaz de router
+      pero no es la IP de esa interfaz
+    - Gateway de otra subred: la IP del host la atiende una interfaz de
+      router y el gateway es de otra
+
+    Los gateways link-local de IPv6 (fe80::/10) no se revisan.
+    """
+    ips, mascaras, gateways = list(ips), list(mascaras), list(gateways)
+    if dispositivos is None:
+        dispositivos = [''] * len(ips)
+    etiquetas = _Etiquetas(dispositivos, interfaces)
+    routers = filas_router(dispositivos, gateways, tipos)
+    rutas = TablaRutas(ips, mascaras, routers)
+    conflictos = []
+
+    def agregar(tipo, direccion, posiciones, detalle=''):
+        conflictos.append({'Tipo': tipo, 'Dirección': direccion, 'Filas': etiquetas(posiciones), 'Detalle': detalle})
+
+    # Hosts con gateway: los gateways distintos son pocos, se buscan una vez
+    es_router = np.zeros(len(ips), dtype=bool)
+    es_router[routers] = True
+    por_gateway = {}
+    for posicion, gateway in enumerate(gateways):
+        if not es_router[posicion] and gateway:
+            por_gateway.setdefault(str(gateway).strip(), []).append(posicion)
+    canonicas = {gateway: _canonica(gateway) for gateway in por_gateway}
+    distintos = [gateway for gateway, ip in canonicas.items() if ip is not None and not ip.is_link_local]
+    duenos = rutas.buscar(distintos)
+
+    revisar, dueno_gateway = [], []
+    for gateway, dueno in zip(distintos, duenos.tolist()):
+        posiciones = por_gateway[gateway]
+        if dueno < 0:
+            agregar('Gateway sin ruta', gateway, posiciones,
+                    "Ninguna interfaz de router tiene una subred que lo contenga")
+        elif _canonica(ips[dueno]) != canonicas[gateway]:
+            agregar('Gateway no es del router', gateway, posiciones,
+                    f"La subred es de {etiquetas([dueno])} ({ips[dueno]})")
+        revisar.extend(posiciones)
+        dueno_gateway.extend([dueno] * len(posiciones))
+
+    # Interfaz de router que atiende la IP de cada host, frente a la del gateway
+    revisar = np.asarray(revisar, dtype=np.int64)
+    dueno_gateway = np.asarray(dueno_gateway, dtype=np.int64)
+    dueno_host = rutas.buscar([ips[posicion] for posicion in revisar])
+    otra = np.flatnonzero((dueno_host >= 0) & (dueno_gateway >= 0) & (dueno_host != dueno_gateway))
+    for posicion, host, dueno in zip(revisar[otra].tolist(), dueno_host[otra].tolist(), dueno_gateway[otra].tolist()):
+        agregar('Gateway de otra subred', str(gateways[posicion]).strip(), [posicion],
+                f"La IP está en la subred de {etiquetas([host])} ({ips[host]}) y el gateway en la de "
+                f"{etiquetas([dueno])}")
+    return conflictos
+
+
+def _columna(tabla, nombre):
+    # DataFrame o TablaColumnar
+    if hasattr(tabla, 'columna'):
+        return tabla.columna(nombre) if nombre in tabla.columnas else None
+    return tabla[nombre].tolist() if nombre in tabla.columns else None
+
+
+def _columna_gateway(tabla):
+    for nombre in COLUMNAS_GATEWAY:
+        gateways = _columna(tabla, nombre)
+        if gateways is not None:
+            return gateways
+    return None
+
+
+def validar_tabla(tabla, subredes=None, columna_ip='Dirección IP', columna_mascara='Máscara de subred'):
+    """Valida un DataFrame o TablaColumnar con las columnas de las tablas de los labs"""
+    return validar(
+        _columna(tabla, columna_ip), _columna(tabla, columna_mascara), _columna_gateway(tabla), subredes,
+        _columna(tabla, 'Dispositivo'), _columna(tabla, 'Interfaz'),
+    )
+
+
+def validar_gateways_tabla(tabla, columna_ip='Dirección IP', columna_mascara='Máscara de subred'):
+    """validar_gateways sobre un DataFrame o TablaColumnar (usa la columna 'Tipo' si existe)"""
+    gateways = _columna_gateway(tabla)
+    ips = _columna(tabla, columna_ip)
+    return validar_gateways(
+        ips, _columna(tabla, columna_mascara), gateways if gateways is not None else [''] * len(ips),
+        _columna(tabla, 'Dispositivo'), _columna(tabla, 'Interfaz'), _columna(tabla, 'Tipo'),
+    )
+
+
+class RutasRouters:
+    """
+    Rutas de las interfaces de router de una tabla, armadas una vez para
+    revisar el gateway de unas pocas filas (al cambiar el de un dispositivo)
+    con buscar_una en el trie, sin validar la tabla entera. Quien la guarda
+    la rearma cuando cambian las filas de router: las de un dispositivo de
+    `dispositivos` o una fila nueva con es_router.
+    """
+
+    def __init__(self, tabla, columna_ip='Dirección IP', columna_mascara='Máscara de subred'):
+        ips, mascaras = _columna(tabla, columna_ip), _columna(tabla, columna_mascara)
+        dispositivos = rellenar_dispositivos(_columna(tabla, 'Dispositivo') or [''] * len(ips))
+        interfaces = _columna(tabla, 'Interfaz')
+        filas = filas_router(dispositivos, _columna_gateway(tabla), _columna(tabla, 'Tipo')).tolist()
+        self.dispositivos = {dispositivos[fila] for fila in filas}
+        self.ips = [ips[fila] for fila in filas]
+        self.etiquetas = _Etiquetas([dispositivos[fila] for fila in filas],
+                                    None if interfaces is None else [interfaces[fila] for fila in filas])
+        self.rutas = TablaRutas(self.ips, [mascaras[fila] for fila in filas])
+
+    def revisar(self, gateway, ips, etiquetas):
+        """
+        Los conflictos de validar_gateways de un gateway, solo para los hosts
+        que lo usan con esas IP (y etiquetas para los mensajes)
+        """
+        gateway = str(gateway or '').strip()
+        canonica = _canonica(gateway)
+        if canonica is None or canonica.is_link_local:
+            return []
+        filas = ', '.join(etiquetas[:MAX_FILAS_CONFLICTO])
+        dueno = self.rutas.buscar_una(gateway)
+        if dueno < 0:
+            return [{'Tipo': 'Gateway sin ruta', 'Dirección': gateway, 'Filas': filas,
+                     'Detalle': "Ninguna interfaz de router tiene una subred que lo contenga"}]
+        conflictos = []
+        if _canonica(self.ips[dueno]) != canonica:
+            conflictos.append({'Tipo': 'Gateway no es del router', 'Dirección': gateway, 'Filas': filas,
+                               'Detalle': f"La subred es de {self.etiquetas([dueno])} ({self.ips[dueno]})"})
+        for ip, etiqueta in zip(ips, etiquetas):
+            host = self.rutas.buscar_una(ip)
+            if host >= 0 and host != dueno:
+                conflictos.append({'Tipo': 'Gateway de otra subred', 'Dirección': gateway, 'Filas': etiqueta,
+                                   'Detalle': f"La IP está en la subred de {self.etiquetas([host])} "
+                                              f"({self.ips[host]}) y el gateway en la de {self.etiquetas([dueno])}"})
+        return conflictos
@@ -0,0 +1,247 @@
+"""
+Planificación VLSM: asigna a cada requisito de hosts el bloque más chico que
+lo contiene, de mayor a menor, sobre un asignador buddy.
+
+El asignador guarda, por prefijo, un heap con los inicios de los bloques
+libres; asignar un /p toma el libre más bajo de ese tamaño o parte uno más
+grande, y liberar junta cada bloque con su "buddy" cuando los dos quedan
+libres. Al asignar de mayor a menor los bloques quedan contiguos y el espacio
+sobrante termina en pocos bloques grandes al final de la red.
+"""
+import heapq
+import ipaddress
+
+import numpy as np
+
+from herramientas_red.direcciones import ipv4_a_texto
+from herramientas_red.subredes import TAM_BLOQUE
+
+COLUMNAS_VLSM = [
+    'Subred', 'Hosts requeridos', 'Dirección de red', 'Prefijo', 'Máscara de subred',
+    'Primera IP utilizable', 'Última IP utilizable', 'Dirección broadcast', 'Hosts utilizables'
+]
+
+COLUMNAS_DISPOSITIVOS = ['Dispositivo', 'Interfaz', 'Dirección IP', 'Máscara de subred', 'Gateway predeterminado']
+
+
+class AsignadorBuddy:
+    """Bloques libres de una red IPv4, agrupados por prefijo"""
+
+    def __init__(self, red):
+        self.red = ipaddress.ip_network(red, strict=False)
+        if self.red.version != 4:
+            raise ValueError("El planificador VLSM trabaja con redes IPv4")
+        self.prefijo = self.red.prefixlen
+        # prefijo -> heap de inicios libres (el más bajo primero)
+        self._libres = [[] for _ in range(33)]
+        self._libres[self.prefijo].append(int(self.red.network_address))
+
+    def asignar(self, prefijo):
+        """Asigna un bloque /prefijo y devuelve su dirección inicial (entero), o None si no hay lugar"""
+        libres = self._libres
+        nivel = prefijo
+        while nivel >= self.prefijo and not libres[nivel]:
+            nivel -= 1
+        if nivel < self.prefijo:
+            return None
+        inicio = heapq.heappop(libres[nivel])
+        # Se parte el bloque a la mitad hasta llegar al tamaño pedido; la
+        # mitad alta de cada corte queda libre
+        while nivel < prefijo:
+            nivel += 1
+            heapq.heappush(libres[nivel], inicio + (1 << (32 - nivel)))
+        return inicio
+
+    def reservar(self, inicio, prefijo):
+        """Marca como usado un bloque concreto (p. ej. una subred ya configurada)"""
+        for nivel in range(prefijo, self.prefijo - 1, -1):
+            contenedor = inicio & ~((1 << (32 - nivel)) - 1)
+            if contenedor in self._libres[nivel]:
+                break
+        else:
+            raise ValueError(f"{ipaddress.IPv4Address(inicio)}/{prefijo} no está libre")
+        self._libres[nivel].remove(contenedor)
+        heapq.heapify(self._libres[nivel])
+        # Se parte el contenedor dejando libre la mitad que no incluye al bloque
+        while nivel < prefijo:
+            nivel += 1
+            mitad = 1 << (32 - nivel)
+            if inicio & mitad:
+                heapq.heappush(self._libres[nivel], contenedor)
+                contenedor += mitad
+            else:
+                heapq.heappush(self._libres[nivel], contenedor + mitad)
+
+    def liberar(self, inicio, prefijo):
+        """Devuelve un bloque y lo junta con su buddy mientras ambos estén libres"""
+        while prefijo > self.prefijo:
+            buddy = inicio ^ (1 << (32 - prefijo))
+            if buddy not in self._libres[prefijo]:
+                break
+            self._libres[prefijo].remove(buddy)
+            heapq.heapify(self._libres[prefijo])
+            inicio = min(inicio, buddy)
+            prefijo -= 1
+        heapq.heappush(self._libres[prefijo], inicio)
+
+    def libres(self):
+        """Lista de (inicio, prefijo) libres, ordenada por dirección"""
+        return sorted((inicio, prefijo) for prefijo, heap in enumerate(self._libres) for inicio in heap)
+
+
+def prefijos_para_hosts(hosts):
+    """Prefijo más largo cuyo bloque tiene hosts + red + broadcast direcciones"""
+    hosts = np.asarray(hosts, dtype=np.int64)
+    if len(hosts) and hosts.min() < 1:
+        raise ValueError("Cada requisito debe pedir al menos 1 host")
+    # El bloque necesita n = hosts + 2 direcciones: frexp(n - 1) = frexp(hosts + 1) da la
+    # cantidad de bits de n - 1, es decir ceil(log2(n)), sin los redondeos de log2
+    bits = np.frexp((hosts + 1).astype(np.float64))[1]
+    return 32 - bits
+
+
+def _normalizar_requisitos(requisitos):
+    # Acepta (nombre, hosts), dicts con Nombre/Hosts/Dispositivo/Interfaz o solo hosts
+    nombres, hosts, dispositivos, interfaces = [], [], [], []
+    for numero, requisito in enumerate(requisitos, 1):
+        if isinstance(requisito, dict):
+            nombres.append(requisito.get('Nombre', f"Red {numero}"))
+            hosts.append(requisito['Hosts'])
+            dispositivos.append(requisito.get('Dispositivo', ''))
+            interfaces.append(requisito.get('Interfaz', ''))
+        elif isinstance(requisito, (tuple, list)):
+            nombres.append(requisito[0])
+            hosts.append(requisito[1])
+            dispositivos.append(requisito[2] if len(requisito) > 2 else '')
+            interfaces.append(requisito[3] if len(requisito) > 3 else '')
+        else:
+            nombres.append(f"Red {numero}")
+            hosts.append(requisito)
+            dispositivos.append('')
+            interfaces.append('')
+    return nombres, np.asarray(hosts, dtype=np.int64), dispositivos, interfaces
+
+
+class PlanVLSM:
+    """Resultado de planificar_vlsm, con las subredes en orden de asignación"""
+
+    def __init__(self, red, nombres, hosts, prefijos, redes, dispositivos, interfaces, libres, reservadas):
+        self.red = red
+        self.nombres = nombres
+        self.hosts = hosts
+        self.prefijos = prefijos
+        self.redes = redes
+        self.dispositivos = dispositivos
+        self.interfaces = interfaces
+        self.libres = libres
+        self.reservadas = reservadas
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def bloques(self, tam_bloque=TAM_BLOQUE):
+        """Bloques de la tabla de subredes con las columnas de COLUMNAS_VLSM"""
+        for inicio in range(0, len(self), tam_bloque):
+            fin = min(inicio + tam_bloque, len(self))
+            redes = self.redes[inicio:fin]
+            tamanos = np.uint64(1) << (32 - self.prefijos[inicio:fin]).astype(np.uint64)
+            ultimas = (redes + tamanos - 1).astype(np.uint32)
+            mascaras = ((np.uint64(0xFFFFFFFF) << (32 - self.prefijos[inicio:fin]).astype(np.uint64))
+                        & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+            yield {
+                'Subred': np.array(self.nombres[inicio:fin], dtype=object),
+                'Hosts requeridos': self.hosts[inicio:fin],
+                'Dirección de red': ipv4_a_texto(redes),
+                'Prefijo': '/' + self.prefijos[inicio:fin].astype(str).astype(object),
+                'Máscara de subred': ipv4_a_texto(mascaras),
+                'Primera IP utilizable': ipv4_a_texto(redes + np.uint32(1)),
+                'Última IP utilizable': ipv4_a_texto(ultimas - np.uint32(1)),
+                'Dirección broadcast': ipv4_a_texto(ultimas),
+                'Hosts utilizables': (tamanos - 2).astype(np.int64),
+            }
+
+    def filas_dispositivos(self):
+        """
+        Filas de la tabla de dispositivos: la interfaz indicada en cada
+        requisito recibe la primera IP utilizable de su subred
+        """
+        for posicion, dispositivo in enumerate(self.dispositivos):
+            if not dispositivo:
+                continue
+            prefijo = int(self.prefijos[posicion])
+            red = ipaddress.IPv4Network((int(self.redes[posicion]), prefijo))
+            yield (dispositivo, self.interfaces[posicion], str(red.network_address + 1),
+                   str(red.netmask), 'N/D')
+
+    def fragmentacion(self):
+        """Resumen del espacio usado, desperdiciado dentro de los bloques y sobrante"""
+        totales = self.red.num_addresses
+        asignadas = int((np.uint64(1) << (32 - self.prefijos).astype(np.uint64)).sum())
+        requeridas = int((self.hosts + 2).sum())
+        reservadas = sum(1 << (32 - prefijo) for _, prefijo in self.reservadas)
+        tamanos_libres = [1 << (32 - prefijo) for _, prefijo in self.libres]
+        libres = sum(tamanos_libres)
+        mayor = max(tamanos_libres, default=0)
+        return {
+            'Direcciones totales': totales,
+            'Direcciones asignadas': asignadas,
+            'Direcciones requeridas': requeridas,
+            'Desperdicio interno': asignadas - requeridas,
+            'Direcciones reservadas': reservadas,
+            'Direcciones libres': libres,
+            'Bloques libres': len(self.libres),
+            'Mayor bloque libre': f"/{32 - mayor.bit_length() + 1}" if mayor else 'Ninguno',
+            # 0 cuando todo lo libre es un solo bloque; cerca de 1 si está muy partido
+            'Fragmentación externa': round(1 - mayor / libres, 4) if libres else 0.0,
+            'Uso de la red': round(asignadas / totales, 4),
+        }
+
+    def texto_libres(self):
+        return [f"{ipaddress.IPv4Address(inicio)}/{prefijo}" for inicio, prefijo in self.libres]
+
+
+def planificar_vlsm(red_base, requisitos, reservadas=()):
+    """
+    Asigna una subred a cada requisito de hosts, de la más grande a la más
+    chica (a igual tamaño, en el orden dado). `reservadas` son subredes de la
+    red base que ya están en uso y no se asignan.
+    """
+    asignador = AsignadorBuddy(red_base)
+    red = asignador.red
+    bloques_reservados = []
+    for subred in reservadas:
+        subred = ipaddress.ip_network(subred, strict=False)
+        if not subred.subnet_of(red):
+            raise ValueError(f"La subred reservada {subred} no pertenece a {red}")
+        asignador.reservar(int(subred.network_address), subred.prefixlen)
+        bloques_reservados.append((int(subred.network_address), subred.prefixlen))
+
+    nombres, hosts, dispositivos, interfaces = _normalizar_requisitos(requisitos)
+    prefijos = prefijos_para_hosts(hosts)
+    if len(prefijos) and prefijos.min() < red.prefixlen:
+        posicion = int(prefijos.argmin())
+        raise ValueError(f"'{nombres[posicion]}' pide {hosts[posicion]} hosts y no cabe en {red}")
+
+    # Mayor primero; argsort estable mantiene el orden dado entre iguales
+    orden = np.argsort(prefijos, kind='stable')
+    redes = np.empty(len(orden), dtype=np.uint32)
+    asignar = asignador.asignar
+    for posicion, prefijo in enumerate(prefijos[orden].tolist()):
+        inicio = asignar(prefijo)
+        if inicio is None:
+            original = int(orden[posicion])
+            raise ValueError(f"No queda espacio en {red} para '{nombres[original]}' ({hosts[original]} hosts)")
+        redes[posicion] = inicio
+
+    indices = orden.tolist()
+    return PlanVLSM(
+        red,
+        [nombres[i] for i in indices],
+        hosts[orden],
+        prefijos[orden].astype(np.int64),
+        redes,
+        [dispositivos[i] for i in indices],
+        [interfaces[i] for i in indices],
+        asignador.libres(),
+        bloques_reservados,
+    )
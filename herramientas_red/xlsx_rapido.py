@@ -0,0 +1,292 @@
+"""
+Escritura de .xlsx armando el XML de la hoja por columnas.
+
+En lugar de escribir celda por celda (openpyxl/xlsxwriter), el XML de cada
+columna de un bloque de filas se construye con operaciones NumPy y se vuelca
+directamente al zip. Solo cubre lo que necesitan los scripts: texto, números,
+booleanos, anchos de columna y los estilos de herramientas_red.estilos.
+Es un backend opcional de exportacion (se pide con backend='rapido'); por
+defecto se usa xlsxwriter.
+"""
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+
+from herramientas_red.estilos import ESTILOS
+
+# Caracteres de control que XML no admite
+_CONTROL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Caracteres que Excel no admite en el nombre de una hoja
+_NOMBRE_INVALIDO = re.compile(r'[\[\]:*?/\\]')
+
+_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_CABECERA_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_FUENTE = '<sz val="11"/>{color}<name val="Calibri"/><family val="2"/><scheme val="minor"/>'
+
+
+def letra_columna(numero):
+    """Convierte 1 -> A, 27 -> AA"""
+    letras = ''
+    while numero:
+        numero, resto = divmod(numero - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def nombre_hoja(nombre, usados):
+    """
+    Nombre válido para una hoja nueva: rechaza los caracteres que Excel no
+    admite, corta a 31 caracteres y numera los que quedan repetidos (Excel
+    no distingue mayúsculas). Agrega el nombre elegido a `usados`.
+    """
+    nombre = str(nombre)
+    if not nombre or _NOMBRE_INVALIDO.search(nombre) or nombre[0] == "'" or nombre[-1] == "'":
+        raise ValueError(f"Nombre de hoja inválido: '{nombre}' (no puede estar vacío, "
+                         "llevar []:*?/\\ ni empezar o terminar con apóstrofo)")
+    elegido = nombre[:31]
+    numero = 1
+    while elegido.lower() in usados:
+        numero += 1
+        sufijo = f"_{numero}"
+        elegido = nombre[:31 - len(sufijo)] + sufijo
+    usados.add(elegido.lower())
+    return elegido
+
+
+def hoja_de_estilos():
+    """Arma styles.xml con un xf por estilo de ESTILOS; devuelve (xml, índice por nombre)"""
+    fuentes = ['<font>' + _FUENTE.format(color='<color theme="1"/>') + '</font>']
+    rellenos = ['<fill><patternFill patternType="none"/></fill>',
+                '<fill><patternFill patternType="gray125"/></fill>']
+    bordes = ['<border><left/><right/><top/><bottom/><diagonal/></border>',
+              '<border><left style="thin"/><right style="thin"/><top style="thin"/>'
+              '<bottom style="thin"/><diagonal/></border>']
+    xfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>']
+    indices = {}
+
+    for nombre, propiedades in ESTILOS.items():
+        fuente = 0
+        if propiedades.get('negrita') or propiedades.get('color'):
+            negrita = '<b/>' if propiedades.get('negrita') else ''
+            color = f'<color rgb="00{propiedades["color"]}"/>' if propiedades.get('color') else ''
+            fuentes.append(f'<font>{negrita}{_FUENTE.format(color=color)}</font>')
+            fuente = len(fuentes) - 1
+        relleno = 0
+        if propiedades.get('relleno'):
+            rellenos.append(f'<fill><patternFill patternType="solid"><fgColor rgb="00{propiedades["relleno"]}"/>'
+                            f'<bgColor rgb="00{propiedades["relleno"]}"/></patternFill></fill>')
+            relleno = len(rellenos) - 1
+        borde = 1 if propiedades.get('borde') else 0
+
+        alineacion = ''
+        atributos = ''
+        if propiedades.get('horizontal'):
+            atributos += f' horizontal="{propiedades["horizontal"]}"'
+        if propiedades.get('vertical'):
+            atributos += f' vertical="{propiedades["vertical"]}"'
+        if propiedades.get('ajustar'):
+            atributos += ' wrapText="1"'
+        if atributos:
+            alineacion = f'<alignment{atributos}/>'
+        xfs.append(f'<xf numFmtId="0" fontId="{fuente}" fillId="{relleno}" borderId="{borde}" xfId="0" '
+                   f'applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">{alineacion}</xf>')
+        indices[nombre] = len(xfs) - 1
+
+    xml = (_CABECERA_XML + f'<styleSheet xmlns="{_NS}">'
+           f'<fonts count="{len(fuentes)}">{"".join(fuentes)}</fonts>'
+           f'<fills count="{len(rellenos)}">{"".join(rellenos)}</fills>'
+           f'<borders count="{len(bordes)}">{"".join(bordes)}</borders>'
+           '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+           f'<cellXfs count="{len(xfs)}">{"".join(xfs)}</cellXfs>'
+           '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+           '</styleSheet>')
+    return xml, indices
+
+
+def _texto_celda(valor):
+    # Fragmento que sigue a '<c r="A1' para un valor de texto
+    texto = _CONTROL.sub('', str(valor))
+    espacio = ' xml:space="preserve"' if texto != texto.strip() else ''
+    return f'" t="inlineStr"><is><t{espacio}>{escape(texto)}</t></is></c>'
+
+
+def _fragmento(valor):
+    """Fragmento XML (sin la referencia de celda) para un valor suelto, o None si va vacío"""
+    if valor is None or valor is pd.NA or valor == '':
+        return None
+    if isinstance(valor, (bool, np.bool_)):
+        return f'" t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, np.integer)):
+        return f'"><v>{valor}</v></c>'
+    if isinstance(valor, (float, np.floating)):
+        if np.isnan(valor):
+            return None
+        if np.isinf(valor):
+            return _texto_celda('inf' if valor > 0 else '-inf')
+        valor = float(valor)
+        return f'"><v>{int(valor) if valor.is_integer() else repr(valor)}</v></c>'
+    return _texto_celda(valor)
+
+
+def _fragmentos_columna(valores):
+    """
+    Devuelve (fragmentos, vacias) para una columna: el XML de cada celda a
+    partir del número de fila, y una máscara de celdas sin valor
+    """
+    if not isinstance(valores, np.ndarray):
+        valores = pd.Series(valores).to_numpy()
+    tipo = valores.dtype.kind
+    if tipo in 'iu':
+        return '"><v>' + valores.astype(str).astype(object) + '</v></c>', np.zeros(len(valores), bool)
+    if tipo == 'b':
+        return np.where(valores, '" t="b"><v>1</v></c>', '" t="b"><v>0</v></c>').astype(object), \
+            np.zeros(len(valores), bool)
+
+    # Texto, objetos mezclados o floats: se arma un fragmento por valor distinto
+    codigos, distintos = pd.factorize(valores, use_na_sentinel=True)
+    if tipo == 'O' and any(isinstance(valor, (int, float, np.number)) for valor in distintos):
+        # Para factorize True, 1 y 1.0 son el mismo valor: se separan por tipo
+        codigos, distintos = pd.factorize(
+            pd.Series([(type(valor), valor) for valor in valores], dtype=object), use_na_sentinel=True)
+        distintos = [valor for _, valor in distintos]
+    fragmentos = [_fragmento(valor) for valor in distintos]
+    vacios = np.array([f is None for f in fragmentos] + [True])
+    tabla = np.array([f or '' for f in fragmentos] + [''], dtype=object)
+    # El código -1 (NaN) cae en la entrada vacía agregada al final
+    return tabla[codigos], vacios[codigos]
+
+
+def _atributo_estilo(indices, nombre):
+    return f'" s="{indices[nombre]}' if nombre else ''
+
+
+def inicio_hoja(anchos=None):
+    """XML de una hoja hasta <sheetData>, con los anchos de columna"""
+    cols = ''
+    if anchos:
+        cols = '<cols>' + ''.join(f'<col min="{i}" max="{i}" width="{ancho}" customWidth="1"/>'
+                                  for i, ancho in enumerate(anchos, 1)) + '</cols>'
+    return _CABECERA_XML + f'<worksheet xmlns="{_NS}">{cols}<sheetData>'
+
+
+FIN_HOJA = '</sheetData></worksheet>'
+
+
+def xml_fila(valores, estilos, numero, indices):
+    """XML de una fila suelta (encabezados, títulos o fila vacía) en la fila `numero`"""
+    if estilos is None or isinstance(estilos, str):
+        estilos = [estilos] * len(valores)
+    celdas = []
+    for columna, (valor, estilo) in enumerate(zip(valores, estilos), 1):
+        fragmento = _fragmento(valor)
+        referencia = f'<c r="{letra_columna(columna)}{numero}{_atributo_estilo(indices, estilo)}'
+        if fragmento is not None:
+            celdas.append(referencia + fragmento)
+        elif estilo:
+            celdas.append(referencia + '"/>')
+    return f'<row r="{numero}">{"".join(celdas)}</row>'
+
+
+def xml_bloque(columnas, estilos, primera, indices):
+    """XML de un bloque de filas (lista de columnas del mismo largo) que empieza en la fila `primera`"""
+    filas = len(columnas[0])
+    estilos = estilos or [None] * len(columnas)
+    numeros = np.arange(primera, primera + filas).astype(str).astype(object)
+    xml = '<row r="' + numeros + '">'
+    for columna, (valores, estilo) in enumerate(zip(columnas, estilos), 1):
+        fragmentos, vacias = _fragmentos_columna(valores)
+        prefijo = f'<c r="{letra_columna(columna)}'
+        atributo = _atributo_estilo(indices, estilo)
+        celdas = prefijo + numeros + atributo + fragmentos
+        # Las celdas vacías se omiten, salvo que tengan estilo (p. ej. borde)
+        celdas[vacias] = (prefijo + numeros[vacias] + atributo + '"/>') if estilo else ''
+        xml = xml + celdas
+    xml = xml + '</row>'
+    return ''.join(xml.tolist())
+
+
+def partes_libro(hojas, estilos_xml):
+    """(nombre, xml) de las partes del libro que no son hojas, para los nombres de hoja dados"""
+    total = len(hojas)
+    hojas_tipo = ''.join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, total + 1))
+    hojas_libro = ''.join(f'<sheet name={quoteattr(nombre)} sheetId="{i}" r:id="rId{i}"/>'
+                          for i, nombre in enumerate(hojas, 1))
+    relaciones = ''.join(f'<Relationship Id="rId{i}" Type="{_NS_REL}/worksheet" '
+                         f'Target="worksheets/sheet{i}.xml"/>' for i in range(1, total + 1))
+    return [
+        ('[Content_Types].xml', _CABECERA_XML +
+         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+         '<Default Extension="rels" '
+         'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+         '<Default Extension="xml" ContentType="application/xml"/>'
+         '<Override PartName="/xl/workbook.xml" '
+         'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+         '<Override PartName="/xl/styles.xml" '
+         'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+         f'{hojas_tipo}</Types>'),
+        ('_rels/.rels', _CABECERA_XML +
+         f'<Relationships xmlns="{_NS_PKG}">'
+         f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+         '</Relationships>'),
+        ('xl/workbook.xml', _CABECERA_XML +
+         f'<workbook xmlns="{_NS}" xmlns:r="{_NS_REL}"><sheets>{hojas_libro}</sheets></workbook>'),
+        ('xl/_rels/workbook.xml.rels', _CABECERA_XML +
+         f'<Relationships xmlns="{_NS_PKG}">{relaciones}'
+         f'<Relationship Id="rId{total + 1}" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+         '</Relationships>'),
+        ('xl/styles.xml', estilos_xml),
+    ]
+
+
+class LibroRapido:
+    """Libro .xlsx que se escribe hoja por hoja y fila por fila, en orden"""
+
+    def __init__(self, archivo):
+        self._zip = zipfile.ZipFile(archivo, 'w', zipfile.ZIP_DEFLATED)
+        self._estilos_xml, self._estilos = hoja_de_estilos()
+        self._hojas = []
+        self._usados = set()
+        self._salida = None
+        self._fila = 0
+
+    def nueva_hoja(self, nombre, anchos=None):
+        self._cerrar_hoja()
+        self._hojas.append(nombre_hoja(nombre, self._usados))
+        self._salida = self._zip.open(f'xl/worksheets/sheet{len(self._hojas)}.xml', 'w', force_zip64=True)
+        self._salida.write(inicio_hoja(anchos).encode())
+        self._fila = 0
+
+    def fila(self, valores, estilos=None):
+        """Escribe una fila suelta (encabezados, títulos o fila vacía)"""
+        self._fila += 1
+        self._salida.write(xml_fila(valores, estilos, self._fila, self._estilos).encode())
+
+    def bloque(self, columnas, estilos=None):
+        """Escribe un bloque de filas dado como una lista de columnas del mismo largo"""
+        if not columnas or not len(columnas[0]):
+            return
+        self._salida.write(xml_bloque(columnas, estilos, self._fila + 1, self._estilos).encode())
+        self._fila += len(columnas[0])
+
+    def _cerrar_hoja(self):
+        if self._salida is not None:
+            self._salida.write(FIN_HOJA.encode())
+            self._salida.close()
+            self._salida = None
+
+    def cerrar(self):
+        if not self._hojas:
+            self.nueva_hoja('Sheet1')
+        self._cerrar_hoja()
+        for nombre, xml in partes_libro(self._hojas, self._estilos_xml):
+            self._zip.writestr(nombre, xml)
+        self._zip.close()
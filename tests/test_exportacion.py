@@ -0,0 +1,30 @@
+"""
+Pruebas del subsistema de exportación: el backend pedido tiene que escribir
+el formato de la extensión del archivo.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.exportacion import Hoja, Seccion, exportar
+
+
+def _hojas():
+    return [Hoja('Datos', [Seccion([[["R1", "S1"], [1, 2]]], encabezados=['Dispositivo', 'Número'])])]
+
+
+@pytest.mark.parametrize('archivo, backend', [('tablas.xlsx', 'csv'), ('tablas.csv', 'xlsxwriter'),
+                                              ('tablas.parquet', 'openpyxl'), ('tablas.xlsx', 'desconocido')])
+def test_backend_de_otro_formato(tmp_path, archivo, backend):
+    ruta = tmp_path / archivo
+    with pytest.raises(ValueError):
+        exportar(str(ruta), _hojas(), backend)
+    assert not ruta.exists()
+
+
+def test_backend_del_formato_del_archivo(tmp_path):
+    ruta = tmp_path / 'tablas.csv'
+    assert exportar(str(ruta), _hojas(), 'csv') == 2
+    assert ruta.read_text(encoding='utf-8-sig').splitlines() == ['Dispositivo,Número', 'R1,1', 'S1,2']
@@ -0,0 +1,129 @@
+"""
+Pruebas de ida y vuelta del zip que arma herramientas_red.incremental: el
+.xlsx se escribe a mano (segmentos deflate y CRC combinados), así que se
+abre con zipfile y openpyxl para verificar que lo que queda es un libro válido.
+El CSV se corta y reescribe por bytes, así que se compara con la tabla actual.
+"""
+import csv
+import os
+import random
+import sys
+import zipfile
+import zlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.incremental import (FILAS_BLOQUE, CsvIncremental, ExcelIncremental, _comprimir, _entrada,
+                                          archivo_cambios, combinar_crc32, escribir_zip)
+from herramientas_red.registros import TablaDirecciones
+from herramientas_red.tablas import TablaColumnar
+
+COLUMNAS = ["Dispositivo", "Interfaz", "Dirección IP", "Máscara de subred", "Puerta de enlace predeterminada"]
+
+
+def _fila(numero):
+    return (f"PC{numero}", "NIC", f"10.{numero >> 16 & 0xFF}.{numero >> 8 & 0xFF}.{numero & 0xFF}",
+            "255.0.0.0", "10.0.0.1")
+
+
+def _leer_hojas(archivo):
+    openpyxl = pytest.importorskip('openpyxl')
+    wb = openpyxl.load_workbook(archivo, read_only=True)
+    try:
+        return {ws.title: [tuple('' if valor is None else valor for valor in fila)
+                           for fila in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+def _esperado(tabla):
+    return [tuple(tabla.columnas)] + [tuple(fila[columna] for columna in tabla.columnas) for fila in tabla]
+
+
+def test_combinar_crc32_igual_a_zlib():
+    azar = random.Random(7)
+    datos = bytes(azar.getrandbits(8) for _ in range(70_000))
+    for _ in range(200):
+        corte = azar.randrange(len(datos) + 1)
+        primero, segundo = datos[:corte], datos[corte:]
+        assert combinar_crc32(zlib.crc32(primero), zlib.crc32(segundo), len(segundo)) == zlib.crc32(datos)
+    assert combinar_crc32(zlib.crc32(datos), 0, 0) == zlib.crc32(datos)
+    assert combinar_crc32(0, zlib.crc32(datos), len(datos)) == zlib.crc32(datos)
+
+
+def test_escribir_zip_con_segmentos(tmp_path):
+    textos = ['<a>' + 'x' * numero + '</a>' for numero in (0, 1, 100, 70_000)]
+    segmentos = [_comprimir(texto) for texto in textos] + [_comprimir('<fin/>', final=True)]
+    archivo = str(tmp_path / 'prueba.zip')
+    escribir_zip(archivo, [_entrada('hoja.xml', segmentos), _entrada('vacia.xml', [_comprimir('', final=True)])])
+
+    with zipfile.ZipFile(archivo) as libro:
+        assert libro.testzip() is None
+        assert libro.namelist() == ['hoja.xml', 'vacia.xml']
+        assert libro.read('hoja.xml').decode() == ''.join(textos) + '<fin/>'
+        assert libro.read('vacia.xml') == b''
+    assert not os.path.exists(archivo + '.tmp')
+
+
+@pytest.mark.parametrize('clase', [TablaColumnar, TablaDirecciones])
+def test_excel_incremental_ida_y_vuelta(tmp_path, clase):
+    archivo = str(tmp_path / 'tablas.xlsx')
+    tabla = clase(COLUMNAS, map(_fila, range(2 * FILAS_BLOQUE + 10)))
+    pruebas = TablaColumnar(["Prueba", "Verificado"], [("PC1 a PC2", "Sí")])
+    exportacion = ExcelIncremental(archivo)
+    hojas = [('Direcciones', tabla, None), ('Pruebas', pruebas, [20, 12])]
+
+    assert exportacion.exportar(hojas) == {'Direcciones': None, 'Pruebas': None}
+    assert exportacion.exportar(hojas) is None
+
+    # Filas nuevas y asignaciones en el primer bloque, el del medio y el último
+    tabla.extend(map(_fila, range(2 * FILAS_BLOQUE + 10, 3 * FILAS_BLOQUE + 5)))
+    for posicion in (0, FILAS_BLOQUE + 3, 2 * FILAS_BLOQUE + 9):
+        tabla.asignar(posicion, "Puerta de enlace predeterminada", "10.0.0.254")
+    cambios = exportacion.exportar(hojas)
+    assert list(cambios) == ['Direcciones']
+    assert len(cambios['Direcciones'][0]) == FILAS_BLOQUE - 5
+    assert cambios['Direcciones'][1] == [0, FILAS_BLOQUE + 3, 2 * FILAS_BLOQUE + 9]
+
+    with zipfile.ZipFile(archivo) as libro:
+        assert libro.testzip() is None
+    leidas = _leer_hojas(archivo)
+    assert list(leidas) == ['Direcciones', 'Pruebas']
+    assert leidas['Direcciones'] == _esperado(tabla)
+    assert leidas['Pruebas'] == _esperado(pruebas)
+
+
+def _leer_csv(archivo):
+    with open(archivo, newline='', encoding='utf-8-sig') as entrada:
+        return [tuple(fila) for fila in csv.reader(entrada)]
+
+
+@pytest.mark.parametrize('clase', [TablaColumnar, TablaDirecciones])
+def test_csv_incremental_siempre_tiene_la_tabla_actual(tmp_path, clase):
+    archivo = str(tmp_path / 'direcciones.csv')
+    tabla = clase(COLUMNAS, map(_fila, range(300)))
+    exportacion = CsvIncremental(archivo)
+    assert exportacion.exportar(tabla) is None
+    assert _leer_csv(archivo) == _esperado(tabla)
+
+    azar = random.Random(3)
+    for ronda in range(30):
+        nuevas = azar.choice([0, 0, 1, 40])
+        tabla.extend(map(_fila, range(len(tabla), len(tabla) + nuevas)))
+        posiciones = azar.sample(range(len(tabla)), azar.choice([0, 1, 5]))
+        for posicion in posiciones:
+            # Valores de distinto largo y con acentos: cambian los bytes de cada fila
+            tabla.asignar(posicion, "Dispositivo", azar.choice(["R1", "Router-Núcleo-Ñandú", f"PC{ronda}"]))
+            tabla.asignar(posicion, "Puerta de enlace predeterminada", f"10.0.{ronda}.1")
+        cambio = exportacion.exportar(tabla)
+        assert cambio[0] == nuevas
+        assert _leer_csv(archivo) == _esperado(tabla)
+
+    # El registro es un historial: la última anotación de cada fila tiene sus valores actuales
+    anotadas = {}
+    for fila in _leer_csv(archivo_cambios(archivo))[1:]:
+        anotadas[int(fila[1]) - 1] = fila[2:]
+    assert anotadas
+    for posicion, valores in anotadas.items():
+        assert valores == tuple(tabla.valor(posicion, columna) for columna in COLUMNAS)
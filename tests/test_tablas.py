@@ -0,0 +1,55 @@
+"""
+Pruebas de FilasVista: la tabla vista como lista de dicts debe comportarse
+como la lista que reemplaza, con los cambios escritos en la tabla.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.registros import TablaDirecciones
+from herramientas_red.tablas import FilasVista, TablaColumnar
+
+COLUMNAS = ["Dispositivo", "Interfaz", "Dirección IP"]
+FILAS = [("R1", "G0/0", "192.168.10.1"), ("S1", "VLAN 1", "192.168.10.2"), ("PC1", "NIC", "192.168.10.10")]
+
+
+@pytest.mark.parametrize('clase', [TablaColumnar, TablaDirecciones])
+def test_filas_vista_como_lista(clase):
+    estado = {'tabla': clase(COLUMNAS, FILAS), 'cambios': 0}
+
+    def reemplazar(filas):
+        estado['tabla'] = clase(COLUMNAS, filas)
+
+    def al_cambiar():
+        estado['cambios'] += 1
+
+    def vista():
+        return FilasVista(estado['tabla'], reemplazar, al_cambiar)
+
+    esperado = [dict(zip(COLUMNAS, fila)) for fila in FILAS]
+    assert vista() == esperado
+
+    vista()[2]["Dirección IP"] = "192.168.10.20"
+    esperado[2]["Dirección IP"] = "192.168.10.20"
+    vista().append({"Dispositivo": "PC2", "Interfaz": "NIC"})
+    esperado.append({"Dispositivo": "PC2", "Interfaz": "NIC", "Dirección IP": ""})
+    for fila, fila_esperada in zip(vista(), esperado):
+        if fila["Dispositivo"].startswith("PC"):
+            fila["Interfaz"] = fila_esperada["Interfaz"] = "F0"
+    assert vista() == esperado
+    assert list(estado['tabla']) == esperado
+    assert estado['cambios'] == 4
+
+    del vista()[0]
+    del esperado[0]
+    vista().insert(1, {"Dispositivo": "R2"})
+    esperado.insert(1, {"Dispositivo": "R2", "Interfaz": "", "Dirección IP": ""})
+    assert vista() == esperado
+    assert vista()[1:3] == esperado[1:3]
+
+    with pytest.raises(KeyError):
+        vista()[0]["Columna nueva"] = "x"
+    with pytest.raises(IndexError):
+        vista()[10]
@@ -0,0 +1,31 @@
+"""
+Pruebas de validar contra subredes declaradas: solo las filas cuya subred
+toca el espacio declarado se revisan como 'Fuera de subred'.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.validacion import validar
+
+DECLARADAS = ['192.168.0.0/26', '192.168.0.64/26']
+
+
+def _tipos(conflictos):
+    return sorted((conflicto['Tipo'], conflicto['Dirección']) for conflicto in conflictos)
+
+
+def test_filas_de_otras_redes_no_estan_fuera_de_subred():
+    # Interfaces del ISP con sus propias máscaras, como en el lab 11
+    ips = ['192.168.0.1', '192.168.0.65', '209.165.200.225', '209.165.201.1', '10.0.0.1']
+    mascaras = ['255.255.255.192', '255.255.255.192', '255.255.255.224', '255.255.255.252', '255.0.0.0']
+    assert validar(ips, mascaras, None, DECLARADAS) == []
+
+
+def test_filas_del_plan_fuera_de_las_subredes_declaradas():
+    ips = ['192.168.0.10', '192.168.0.200', '192.168.0.70']
+    mascaras = ['255.255.255.192', '255.255.255.0', '255.255.255.128']
+    assert [tipo for tipo in _tipos(validar(ips, mascaras, None, DECLARADAS)) if tipo[0] != 'Subredes solapadas'] == [
+        ('Fuera de subred', '192.168.0.200'),
+        ('Máscara distinta', '192.168.0.70'),
+    ]
@@ -0,0 +1,94 @@
+"""
+Pruebas de ida y vuelta del backend opcional 'rapido' (herramientas_red.xlsx_rapido):
+el XML del libro se arma a mano, así que se abre con openpyxl para verificar
+valores, estilos, anchos y nombres de hoja.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from herramientas_red.exportacion import Hoja, Seccion, elegir_backend, exportar
+from herramientas_red.xlsx_rapido import nombre_hoja
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+def _valores(ws):
+    return [tuple(fila) for fila in ws.iter_rows(values_only=True)]
+
+
+def test_rapido_no_es_el_backend_por_defecto():
+    assert elegir_backend('xlsx') != 'rapido'
+
+
+def test_ida_y_vuelta_valores_estilos_y_anchos(tmp_path):
+    archivo = str(tmp_path / 'rapido.xlsx')
+    columnas = [
+        np.array(['PC1', ' con espacios ', 'a < b & "c"', 'ctrl\x01'], dtype=object),
+        np.array([1, 2, 3, 4]),
+        np.array([1.5, np.nan, 2.0, -0.25]),
+        [True, False, None, ''],
+    ]
+    secciones = [
+        Seccion([[['Título']]], estilos='titulo'),
+        Seccion([columnas], encabezados=['Texto', 'Entero', 'Real', 'Mixto'], estilos='centro', espacio_antes=1),
+    ]
+    assert exportar(archivo, [Hoja('Datos', secciones, anchos=[20, 10, 10, 8])], 'rapido') == 5
+
+    wb = openpyxl.load_workbook(archivo)
+    ws = wb['Datos']
+    assert _valores(ws) == [
+        ('Título', None, None, None),
+        (None, None, None, None),
+        ('Texto', 'Entero', 'Real', 'Mixto'),
+        ('PC1', 1, 1.5, True),
+        (' con espacios ', 2, None, False),
+        ('a < b & "c"', 3, 2, None),
+        ('ctrl', 4, -0.25, None),
+    ]
+    assert ws['A1'].fill.fgColor.rgb.endswith('D9E1F2')
+    assert ws['A3'].font.b and ws['A3'].alignment.horizontal == 'center'
+    assert ws['C5'].border.left.style == 'thin' and ws['C5'].alignment.horizontal == 'center'
+    assert [ws.column_dimensions[letra].width for letra in 'ABCD'] == [20, 10, 10, 8]
+
+
+def test_hojas_repartidas_por_limite(tmp_path):
+    archivo = str(tmp_path / 'limite.xlsx')
+    filas = [(f"PC{numero}", numero) for numero in range(10)]
+    exportar(archivo, [Hoja('Dispositivos', [Seccion.desde_filas(filas, ['Dispositivo', 'Número'])])],
+             'rapido', max_filas_hoja=4)
+
+    wb = openpyxl.load_workbook(archivo, read_only=True)
+    assert wb.sheetnames == ['Dispositivos', 'Dispositivos_2', 'Dispositivos_3', 'Dispositivos_4']
+    leidas = [fila for ws in wb.worksheets for fila in _valores(ws) if fila != ('Dispositivo', 'Número')]
+    wb.close()
+    assert leidas == filas
+
+
+@pytest.mark.parametrize('nombre', ['Red 10/8', '[x]', 'a:b', 'que?', 'uno*', 'c\\d', "'citado'", ''])
+def test_nombre_de_hoja_invalido(tmp_path, nombre):
+    with pytest.raises(ValueError):
+        exportar(str(tmp_path / 'invalido.xlsx'), [Hoja(nombre, [Seccion([[[1]]])])], 'rapido')
+
+
+def test_nombres_repetidos_despues_de_cortar(tmp_path):
+    archivo = str(tmp_path / 'nombres.xlsx')
+    largo = 'Tabla de direcciones de la red principal'
+    hojas = [Hoja(largo + ' A', [Seccion([[[1]]])]), Hoja(largo + ' B', [Seccion([[[2]]])]),
+             Hoja('datos', [Seccion([[[3]]])]), Hoja('DATOS', [Seccion([[[4]]])])]
+    exportar(archivo, hojas, 'rapido')
+
+    wb = openpyxl.load_workbook(archivo)
+    assert wb.sheetnames == [largo[:31], largo[:29] + '_2', 'datos', 'DATOS_2']
+    assert [ws['A1'].value for ws in wb.worksheets] == [1, 2, 3, 4]
+
+
+def test_nombre_hoja():
+    usados = set()
+    assert nombre_hoja('x' * 40, usados) == 'x' * 31
+    assert nombre_hoja('x' * 35, usados) == 'x' * 29 + '_2'
+    assert nombre_hoja('X' * 31, usados) == 'X' * 29 + '_3'
+    assert usados == {'x' * 31, 'x' * 29 + '_2', 'x' * 29 + '_3'}